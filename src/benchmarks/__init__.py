@@ -0,0 +1,8 @@
+"""
+Benchmarks für Scanner und Matcher
+
+Die Module können direkt ausgeführt werden, z.B.:
+    python -m src.benchmarks.js_extraction
+    python -m src.benchmarks.pipeline --sizes 200 1000 --output baseline.json
+    python -m src.benchmarks.similarity --sizes 1000 10000 50000 --project-files 500
+"""
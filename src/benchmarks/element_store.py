@@ -0,0 +1,107 @@
+"""
+Benchmark: Speicherbedarf und Aufbauzeit von ElementStore gegenüber Pydantic-Modellen
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Sequence
+from src.models.element import CodeElement, DocElement, ElementType
+from src.models.element_store import ElementStore
+
+
+def generate_elements(count: int) -> Iterator[Any]:
+    """Erzeugt synthetische Elemente mit realistischer Feldbelegung (etwa 9 Code- auf 1 Doku-Element)"""
+    for index in range(count):
+        file_index = index // 25
+        if index % 10 == 9:
+            yield DocElement(
+                name=f"Abschnitt {index}",
+                type=ElementType.DOC_HEADING,
+                content=f"## Abschnitt {index}",
+                level=2,
+                line_number=index % 400,
+                file_path=f"/repo/docs/guide_{file_index}.md",
+                project_path="/repo"
+            )
+            continue
+        yield CodeElement(
+            name=f"handle_request_{index}",
+            type=ElementType.FUNCTION,
+            signature=f"def handle_request_{index}(self, request: Request, timeout: float = 1.0) -> Response",
+            parameters=[
+                {'name': 'self', 'type_annotation': None, 'default': None},
+                {'name': 'request', 'type_annotation': 'Request', 'default': None},
+                {'name': 'timeout', 'type_annotation': 'float', 'default': '1.0'}
+            ],
+            return_type="Response",
+            docstring=f"Bearbeitet Anfrage {index}",
+            line_number=index % 400,
+            file_path=f"/repo/src/service_{file_index}.py",
+            project_path="/repo",
+            code_snippet=f"def handle_request_{index}(self, request, timeout=1.0):\n    return self.dispatch(request)"
+        )
+
+
+def _measure(build: Callable[[], Any]) -> Dict[str, Any]:
+    """Misst Laufzeit und verbleibenden Speicher (tracemalloc) beim Aufbau einer Struktur"""
+    gc.collect()
+    start = time.perf_counter()
+    build()
+    seconds = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return {'seconds': seconds, 'bytes': memory}
+
+
+def run_benchmark(sizes: Sequence[int] = (10000, 50000, 100000)) -> List[Dict[str, Any]]:
+    """
+    Vergleicht eine Liste von Pydantic-Modellen mit einem ElementStore
+
+    Args:
+        sizes: Anzahl der Elemente pro Messung
+
+    Returns:
+        Eine Ergebniszeile pro Größe mit Bytes pro Element und Laufzeiten
+    """
+    results = []
+    for size in sizes:
+        models = _measure(lambda: list(generate_elements(size)))
+        store = _measure(lambda: ElementStore.from_elements(generate_elements(size)))
+
+        elements = ElementStore.from_elements(generate_elements(size))
+        start = time.perf_counter()
+        for _ in elements.code_elements():
+            pass
+        facade_seconds = time.perf_counter() - start
+
+        results.append({
+            'elements': size,
+            'model_bytes_per_element': models['bytes'] / size,
+            'store_bytes_per_element': store['bytes'] / size,
+            'model_seconds': models['seconds'],
+            'store_seconds': store['seconds'],
+            'facade_seconds': facade_seconds
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des spaltenorientierten Element-Speichers")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 100000],
+                        help="Anzahl der Elemente pro Messung")
+    args = parser.parse_args()
+
+    print(f"{'Elemente':>9} {'Modell B/El.':>13} {'Store B/El.':>12} {'Modelle s':>10} {'Store s':>8} {'Fassaden s':>11}")
+    for row in run_benchmark(args.sizes):
+        print(f"{row['elements']:>9} {row['model_bytes_per_element']:>13.0f} {row['store_bytes_per_element']:>12.0f} "
+              f"{row['model_seconds']:>10.3f} {row['store_seconds']:>8.3f} {row['facade_seconds']:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: Tokenizer-basierte JavaScript-Extraktion gegen den bisherigen regulären Ausdruck
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Sequence
+from src.core.config_manager import ProjectConfig
+from src.scanner.code_scanner import CodeScanner
+from src.scanner.js_extractor import JavaScriptExtractor
+from src.scanner.parse_context import ParseContext
+
+_MODULE_TEMPLATE = '''
+// Modul {index}: Hilfsfunktionen und Dienste
+import {{ request{index} }} from './api/{index}';
+
+/* Kommentar mit function inComment{index}() {{}} */
+const label{index} = "function inString{index}() {{}}";
+const message{index} = `Wert ${{format(value{index}, {{ precision: 2 }})}} für ${{label{index}}}`;
+
+export function compute{index}(a, b = {index}) {{
+  const total = sum(a, b) + parseInt(label{index}, 10);
+  if (total > {index}) {{
+    log(`zu groß: ${{total}}`);
+  }}
+  return transform(total, (x) => x * 2);
+}}
+
+export const handler{index} = async (req, res) => {{
+  const data = await load(req.params.id, {{ cache: true }});
+  res.json(normalize(data));
+}};
+
+export class Service{index} extends Base {{
+  constructor(options) {{
+    super(options);
+    this.items = new Map();
+  }}
+
+  fetch(id) {{
+    return this.items.get(id) || request{index}(id).then((r) => r.json());
+  }}
+
+  static create() {{ return new Service{index}(defaults()); }}
+}}
+'''
+
+
+def generate_javascript_source(module_count: int) -> str:
+    """Erzeugt synthetischen JavaScript-Quelltext mit Deklarationen, Aufrufen, Strings und Templates"""
+    return ''.join(_MODULE_TEMPLATE.format(index=index) for index in range(module_count))
+
+
+def _time(function: Callable[[], List], repeat: int) -> Dict[str, Any]:
+    """Misst die beste Laufzeit aus mehreren Wiederholungen"""
+    best = float('inf')
+    elements: List = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        elements = function()
+        best = min(best, time.perf_counter() - start)
+    return {'seconds': best, 'elements': len(elements)}
+
+
+def run_benchmark(sizes: Sequence[int] = (250, 500, 1000, 2000), repeat: int = 3) -> List[Dict[str, Any]]:
+    """
+    Vergleicht beide Extraktionswege für wachsende Quelltextgrößen
+
+    Args:
+        sizes: Anzahl der synthetischen Module pro Messung
+        repeat: Wiederholungen pro Messung (die schnellste zählt)
+
+    Returns:
+        Eine Ergebniszeile pro Größe mit Laufzeiten und Elementanzahlen
+    """
+    regex_scanner = CodeScanner(ProjectConfig(javascript_extractor="regex"))
+    results = []
+    for size in sizes:
+        source = generate_javascript_source(size)
+        context = ParseContext(Path("benchmark.js"), source)
+        # Beide Wege liefern die Felder der Elemente (ohne CodeElement-Modelle)
+        tokenizer = _time(lambda: JavaScriptExtractor(source).extract_fields(), repeat)
+        regex = _time(lambda: regex_scanner._extract_javascript_regex(context), repeat)
+        results.append({
+            'modules': size,
+            'bytes': len(source.encode('utf-8')),
+            'tokenizer_seconds': tokenizer['seconds'],
+            'tokenizer_elements': tokenizer['elements'],
+            'regex_seconds': regex['seconds'],
+            'regex_elements': regex['elements']
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der JavaScript-Extraktion")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[250, 500, 1000, 2000],
+                        help="Anzahl synthetischer Module pro Messung")
+    parser.add_argument('--repeat', type=int, default=3, help="Wiederholungen pro Messung")
+    args = parser.parse_args()
+
+    print(f"{'Module':>8} {'KB':>8} {'Tokenizer s':>12} {'Elemente':>9} {'Regex s':>10} {'Elemente':>9}")
+    for row in run_benchmark(args.sizes, args.repeat):
+        print(f"{row['modules']:>8} {row['bytes'] / 1024:>8.0f} {row['tokenizer_seconds']:>12.4f} "
+              f"{row['tokenizer_elements']:>9} {row['regex_seconds']:>10.4f} {row['regex_elements']:>9}")
+
+
+if __name__ == "__main__":
+    main()
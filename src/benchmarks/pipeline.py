@@ -0,0 +1,349 @@
+"""
+Benchmark: gesamte Pipeline auf synthetischen Projekten
+
+Misst Dateisuche, CodeScanner und DocScanner, den vollständigen Scan über
+UniversalScanner, AdvancedMatcherEngine.find_discrepancies sowie den
+ChromaUpdater gegen einen In-Process-Stub (ohne ChromaDB und Ollama).
+Die Ergebnisse werden als JSON gespeichert und lassen sich mit einem
+früheren Lauf vergleichen, z.B.:
+
+    python -m src.benchmarks.pipeline --sizes 200 1000 --output baseline.json
+    python -m src.benchmarks.pipeline --sizes 200 1000 --compare baseline.json
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+from src.benchmarks.synthetic_repo import generate_project
+from src.core.config_manager import ProjectConfig
+from src.matcher.advanced_matcher import AdvancedMatcherEngine
+from src.models.element import CodeElement
+from src.scanner.code_scanner import CodeScanner
+from src.scanner.doc_scanner import DocScanner
+from src.scanner.file_handler import FileHandler
+from src.scanner.framework_parsers import get_framework_parser
+from src.scanner.parallel_scanner import CODE_EXTENSIONS, DOC_EXTENSIONS
+from src.scanner.progress_callback import ScanProgressCallback
+from src.scanner.universal_scanner import UniversalScanner
+from src.updater.chroma_updater import ChromaUpdater
+
+# Reihenfolge der gemessenen Stufen
+STAGES = ('discovery', 'code_scan', 'doc_scan', 'full_scan', 'match', 'chroma_update')
+
+EMBEDDING_DIMENSIONS = 64
+
+
+class StubChromaClient:
+    """In-Process-Ersatz für ChromaDBClient, der nur zählt"""
+
+    def __init__(self):
+        self.collections: Dict[str, int] = {}
+        self.metadata: Dict[str, Dict] = {}
+
+    def health_check(self) -> bool:
+        return True
+
+    def get_collection_metadata(self, collection_name: str) -> Optional[Dict]:
+        return self.metadata.get(collection_name)
+
+    def delete_collection(self, collection_name: str) -> bool:
+        self.collections.pop(collection_name, None)
+        self.metadata.pop(collection_name, None)
+        return True
+
+    def create_collection(self, collection_name: str, metadata: Optional[Dict] = None) -> bool:
+        self.collections.setdefault(collection_name, 0)
+        self.metadata.setdefault(collection_name, metadata or {})
+        return True
+
+    def add_embeddings(self, collection_name: str, embeddings: List[List[float]],
+                       documents: List[str] = None, metadatas: List[Dict] = None,
+                       ids: List[str] = None) -> bool:
+        self.collections[collection_name] = self.collections.get(collection_name, 0) + len(embeddings)
+        return True
+
+
+class StubEmbeddingClient:
+    """Ersatz für den Ollama-Client mit deterministischen Embeddings aus einem Hash des Inhalts"""
+
+    def create_embedding(self, model: str, content: str) -> List[float]:
+        digest = hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=EMBEDDING_DIMENSIONS).digest()
+        return [byte / 255.0 for byte in digest]
+
+
+def create_stub_updater() -> ChromaUpdater:
+    """Erstellt einen ChromaUpdater, der gegen die In-Process-Stubs arbeitet"""
+    updater = ChromaUpdater.__new__(ChromaUpdater)
+    updater.chroma_client = StubChromaClient()
+    updater.ollama_client = StubEmbeddingClient()
+    updater.embedding_model = "benchmark"
+    updater._shared_embeddings = {}
+    updater.reused_embeddings = 0
+    return updater
+
+
+def _measure(function: Callable[[], int], repeat: int) -> Dict[str, Any]:
+    """
+    Führt eine Stufe mehrfach aus
+
+    Returns:
+        Schnellste und mittlere Wandzeit, CPU-Zeit des schnellsten Laufs und
+        die von der Stufe gemeldete Anzahl verarbeiteter Einträge
+    """
+    runs = []
+    items = 0
+    for _ in range(max(1, repeat)):
+        start_cpu = time.process_time()
+        start = time.perf_counter()
+        items = function()
+        runs.append((time.perf_counter() - start, time.process_time() - start_cpu))
+    best_seconds, best_cpu = min(runs)
+    return {
+        'seconds': best_seconds,
+        'median_seconds': statistics.median(seconds for seconds, _ in runs),
+        'cpu_seconds': best_cpu,
+        'items': items,
+        'items_per_second': items / best_seconds if best_seconds > 0 else 0.0
+    }
+
+
+def _benchmark_config() -> ProjectConfig:
+    config = ProjectConfig()
+    config.scan_paths = ["."]
+    config.use_scan_cache = False
+    config.project_type = "python_fastapi"
+    return config
+
+
+def run_pipeline(project_root: Path, repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+    """
+    Misst alle Stufen auf einem bestehenden Projekt
+
+    Args:
+        project_root: Projektverzeichnis (z.B. aus generate_project)
+        repeat: Wiederholungen pro Stufe (die schnellste zählt)
+
+    Returns:
+        Messwerte pro Stufe (siehe STAGES)
+    """
+    config = _benchmark_config()
+    file_handler = FileHandler(config)
+    code_scanner = CodeScanner(config)
+    doc_scanner = DocScanner(config)
+    framework_parser = get_framework_parser('fastapi')
+
+    manifests = file_handler.build_manifests(project_root)
+    entries = [entry for manifest in manifests for entry in manifest]
+    code_files = [entry.path for entry in entries if entry.suffix in CODE_EXTENSIONS]
+    doc_files = [entry.path for entry in entries if entry.suffix in DOC_EXTENSIONS]
+
+    code_elements: List[Any] = []
+    doc_elements: List[Any] = []
+
+    def discovery() -> int:
+        return sum(len(manifest) for manifest in file_handler.build_manifests(project_root))
+
+    def code_scan() -> int:
+        code_elements[:] = [element for path in code_files
+                            for element in code_scanner.scan_file(path, [framework_parser])]
+        return len(code_files)
+
+    def doc_scan() -> int:
+        doc_elements[:] = [element for path in doc_files for element in doc_scanner.scan_file(path)]
+        return len(doc_files)
+
+    def full_scan() -> int:
+        scanner = UniversalScanner(config, progress_callback=ScanProgressCallback(console=False))
+        return sum(1 for _ in scanner.scan_project_iter(str(project_root)))
+
+    stages = {
+        'discovery': _measure(discovery, repeat),
+        'code_scan': _measure(code_scan, repeat),
+        'doc_scan': _measure(doc_scan, repeat),
+        'full_scan': _measure(full_scan, repeat)
+    }
+
+    # Rohdaten der Framework-Parser werden vom Matcher und vom Updater nicht verarbeitet
+    matchable_code = [element for element in code_elements if isinstance(element, CodeElement)]
+    matcher = AdvancedMatcherEngine()
+
+    def match() -> int:
+        matcher.find_discrepancies(matchable_code, doc_elements)
+        return len(matchable_code) + len(doc_elements)
+
+    stages['match'] = _measure(match, repeat)
+
+    def chroma_update() -> int:
+        updater = create_stub_updater()
+        updater.update_chroma_with_elements(matchable_code, doc_elements, str(project_root))
+        return sum(updater.chroma_client.collections.values())
+
+    stages['chroma_update'] = _measure(chroma_update, repeat)
+    stages['code_scan']['elements'] = len(code_elements)
+    stages['doc_scan']['elements'] = len(doc_elements)
+    return stages
+
+
+def run_benchmark(sizes: Sequence[int] = (200, 1000), repeat: int = 3,
+                  language_mix: Optional[Mapping[str, float]] = None, seed: int = 42,
+                  large_doc_bytes: int = 200_000, work_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Erzeugt für jede Größe ein synthetisches Projekt und misst die Pipeline
+
+    Args:
+        sizes: Anzahl der Dateien pro Projekt
+        repeat: Wiederholungen pro Stufe
+        language_mix: Anteile pro Dateiendung (Standard: synthetic_repo.DEFAULT_LANGUAGE_MIX)
+        seed: Seed für die Projekterzeugung
+        large_doc_bytes: Größe der großen Markdown-Dokumente
+        work_dir: Verzeichnis für die Projekte (Standard: temporäres Verzeichnis, wird gelöscht)
+
+    Returns:
+        JSON-serialisierbares Ergebnis mit Umgebung, Parametern und Messwerten
+    """
+    results = []
+    base_dir = Path(work_dir) if work_dir else Path(tempfile.mkdtemp(prefix="daut_benchmark_"))
+    try:
+        for size in sizes:
+            project_root = base_dir / f"project_{size}"
+            if project_root.exists():
+                shutil.rmtree(project_root)
+            project = generate_project(project_root, file_count=size, language_mix=language_mix,
+                                       large_doc_bytes=large_doc_bytes, seed=seed)
+            results.append({
+                'files': size,
+                'project': project,
+                'stages': run_pipeline(project_root, repeat)
+            })
+    finally:
+        if not work_dir:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+    return {
+        'benchmark': 'pipeline',
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'parameters': {
+            'sizes': list(sizes),
+            'repeat': repeat,
+            'language_mix': dict(language_mix) if language_mix else None,
+            'seed': seed,
+            'large_doc_bytes': large_doc_bytes
+        },
+        'results': results
+    }
+
+
+def save_results(results: Dict[str, Any], output_path: str):
+    """Speichert Benchmark-Ergebnisse als JSON"""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+def load_results(input_path: str) -> Dict[str, Any]:
+    """Lädt gespeicherte Benchmark-Ergebnisse"""
+    with open(input_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    tolerance: float = 0.25) -> List[Dict[str, Any]]:
+    """
+    Vergleicht zwei Läufe und meldet Stufen, die deutlich langsamer geworden sind
+
+    Verglichen werden die schnellsten Laufzeiten für gleiche Projektgrößen.
+
+    Args:
+        baseline: Früherer Lauf (z.B. aus load_results)
+        current: Aktueller Lauf
+        tolerance: Erlaubte relative Verlangsamung (0.25 = 25%)
+
+    Returns:
+        Eine Zeile pro Regression mit Größe, Stufe, beiden Laufzeiten und Änderung
+    """
+    baseline_by_size = {row['files']: row['stages'] for row in baseline.get('results', [])}
+    regressions = []
+    for row in current.get('results', []):
+        baseline_stages = baseline_by_size.get(row['files'])
+        if not baseline_stages:
+            continue
+        for stage, measurement in row['stages'].items():
+            previous = baseline_stages.get(stage)
+            if not previous or previous['seconds'] <= 0:
+                continue
+            change = measurement['seconds'] / previous['seconds'] - 1
+            if change > tolerance:
+                regressions.append({
+                    'files': row['files'],
+                    'stage': stage,
+                    'baseline_seconds': previous['seconds'],
+                    'current_seconds': measurement['seconds'],
+                    'change': change
+                })
+    return regressions
+
+
+def _parse_mix(values: Optional[List[str]]) -> Optional[Dict[str, float]]:
+    """Wandelt Angaben wie py=0.6 md=0.4 in ein Mischungs-Dictionary um"""
+    if not values:
+        return None
+    mix = {}
+    for value in values:
+        extension, _, share = value.partition('=')
+        mix[extension.lstrip('.')] = float(share)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der gesamten Pipeline auf synthetischen Projekten")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[200, 1000], help="Anzahl der Dateien pro Projekt")
+    parser.add_argument('--repeat', type=int, default=3, help="Wiederholungen pro Stufe")
+    parser.add_argument('--mix', nargs='+', help="Anteile pro Dateiendung, z.B. py=0.6 js=0.2 md=0.2")
+    parser.add_argument('--seed', type=int, default=42, help="Seed für die Projekterzeugung")
+    parser.add_argument('--large-doc-bytes', type=int, default=200_000, help="Größe der großen Markdown-Dokumente")
+    parser.add_argument('--work-dir', help="Projekte hier erzeugen und behalten")
+    parser.add_argument('--output', help="Ergebnisse als JSON speichern")
+    parser.add_argument('--compare', help="Mit einem gespeicherten Lauf vergleichen")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Erlaubte Verlangsamung beim Vergleich")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sizes, args.repeat, _parse_mix(args.mix), args.seed,
+                            args.large_doc_bytes, args.work_dir)
+
+    print(f"\n{'Dateien':>8} {'Stufe':<14} {'s':>9} {'CPU s':>9} {'Einträge':>9} {'pro s':>10}")
+    for row in results['results']:
+        for stage in STAGES:
+            measurement = row['stages'][stage]
+            print(f"{row['files']:>8} {stage:<14} {measurement['seconds']:>9.3f} {measurement['cpu_seconds']:>9.3f} "
+                  f"{measurement['items']:>9} {measurement['items_per_second']:>10.0f}")
+
+    if args.output:
+        save_results(results, args.output)
+        print(f"Ergebnisse gespeichert: {args.output}")
+
+    if args.compare:
+        regressions = compare_results(load_results(args.compare), results, args.tolerance)
+        if regressions:
+            print("\nRegressionen:")
+            for regression in regressions:
+                print(f"  {regression['files']:>8} {regression['stage']:<14} {regression['baseline_seconds']:.3f} s -> "
+                      f"{regression['current_seconds']:.3f} s (+{regression['change'] * 100:.0f}%)")
+            sys.exit(1)
+        print("Keine Regressionen gegenüber dem Vergleichslauf")
+
+
+if __name__ == "__main__":
+    main()
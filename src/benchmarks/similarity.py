@@ -0,0 +1,221 @@
+"""
+Benchmark: Ähnlichkeitsmaße des Matchers gegen difflib
+
+Misst die Ähnlichkeitsmaße aus src.matcher.similarity für wachsende Textlängen
+und zwei Textprofile: "prose" (Wörter aus einem festen Vokabular) und "diverse"
+(großes Zeichenalphabet, bei dem difflib keine Zeichen als Junk verwirft und
+quadratisch wird). Optional wird zusätzlich der vollständige Matcher auf einem
+synthetischen Projekt mit jedem Maß gemessen, z.B.:
+
+    python -m src.benchmarks.similarity --sizes 1000 10000 50000 --project-files 500
+
+Mit --embedding-elements wird die blockweise Embedding-Ähnlichkeit gegen den
+paarweisen Vergleich in Python gemessen.
+"""
+import argparse
+import json
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from src.benchmarks.synthetic_repo import generate_project
+from src.core.config_manager import ProjectConfig
+from src.matcher.advanced_matcher import AdvancedMatcherEngine
+from src.matcher.embedding_similarity import blocked_top_k, normalize_rows, np
+from src.matcher.similarity import SIMILARITY_MEASURES, clear_caches
+from src.models.element import CodeElement
+from src.scanner.progress_callback import ScanProgressCallback
+from src.scanner.universal_scanner import UniversalScanner
+
+PROFILES = ('prose', 'diverse')
+BASELINE = 'difflib'
+
+
+def generate_text(rng: random.Random, length: int, profile: str) -> str:
+    """Erzeugt einen Text mit ungefähr length Zeichen im gewünschten Profil"""
+    if profile == 'diverse':
+        alphabet = [chr(code) for code in range(0x4e00, 0x4e00 + 400)] + list("abcdefghij ")
+        return ''.join(rng.choice(alphabet) for _ in range(length))
+    vocabulary_rng = random.Random(0)
+    vocabulary = [''.join(vocabulary_rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(vocabulary_rng.randint(3, 10)))
+                  for _ in range(2000)]
+    words, size = [], 0
+    while size < length:
+        word = rng.choice(vocabulary)
+        words.append(word)
+        size += len(word) + 1
+    return ' '.join(words)[:length]
+
+
+def _text_pair(rng: random.Random, length: int, profile: str):
+    """Dokument der Länge length und ein Docstring (ein Viertel), der zur Hälfte aus dem Dokument stammt"""
+    document = generate_text(rng, length, profile)
+    quarter = max(1, length // 4)
+    docstring = document[:quarter // 2] + generate_text(rng, quarter - quarter // 2, profile)
+    return docstring, document
+
+
+def run_benchmark(sizes: Sequence[int] = (1_000, 10_000, 50_000), repeat: int = 3,
+                  methods: Optional[Sequence[str]] = None, difflib_max_chars: int = 20_000,
+                  seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Misst alle Ähnlichkeitsmaße für jede Länge und jedes Profil
+
+    Args:
+        sizes: Länge der Dokumente in Zeichen
+        repeat: Wiederholungen pro Messung (die schnellste zählt, Caches werden jeweils geleert)
+        methods: Zu messende Maße (Standard: alle)
+        difflib_max_chars: Längere Dokumente werden mit difflib nicht gemessen (quadratische Laufzeit)
+        seed: Seed für die Texterzeugung
+
+    Returns:
+        Eine Zeile pro Profil und Länge mit Laufzeit und Ähnlichkeit je Maß
+    """
+    rng = random.Random(seed)
+    methods = list(methods or SIMILARITY_MEASURES)
+    rows = []
+    for profile in PROFILES:
+        for size in sizes:
+            docstring, document = _text_pair(rng, size, profile)
+            row = {'profile': profile, 'chars': size, 'methods': {}}
+            for method in methods:
+                if method == BASELINE and size > difflib_max_chars:
+                    row['methods'][method] = None
+                    continue
+                measure = SIMILARITY_MEASURES[method]()
+                best, value = float('inf'), 0.0
+                for _ in range(repeat):
+                    clear_caches()
+                    start = time.perf_counter()
+                    value = measure.similarity(docstring, document)
+                    best = min(best, time.perf_counter() - start)
+                row['methods'][method] = {'seconds': best, 'similarity': round(value, 4)}
+            rows.append(row)
+    return rows
+
+
+def run_matcher_benchmark(file_count: int = 300, methods: Optional[Sequence[str]] = None,
+                          seed: int = 42, work_dir: Optional[str] = None, workers: int = 1) -> Dict[str, Any]:
+    """
+    Misst find_discrepancies auf einem synthetischen Projekt mit jedem Ähnlichkeitsmaß
+
+    Args:
+        workers: Prozesse für die Konfliktanalyse (siehe AdvancedMatcherEngine)
+
+    Returns:
+        Anzahl der Elemente sowie Laufzeit und gemeldete Konflikte je Maß
+    """
+    base_dir = Path(work_dir) if work_dir else Path(tempfile.mkdtemp(prefix="daut_similarity_"))
+    project_root = base_dir / f"project_{file_count}"
+    try:
+        generate_project(project_root, file_count=file_count, seed=seed)
+        config = ProjectConfig()
+        config.scan_paths = ["."]
+        config.use_scan_cache = False
+        results = UniversalScanner(config, progress_callback=ScanProgressCallback(console=False)) \
+            .scan_project(str(project_root))
+    finally:
+        if not work_dir:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+    code_elements = [element for element in results['code_elements'] if isinstance(element, CodeElement)]
+    doc_elements = results['doc_elements']
+    timings = {}
+    for method in methods or SIMILARITY_MEASURES:
+        clear_caches()
+        start = time.perf_counter()
+        discrepancies = AdvancedMatcherEngine(similarity=method, workers=workers, parallel_min_pairs=0) \
+            .find_discrepancies(code_elements, doc_elements)
+        timings[method] = {
+            'seconds': time.perf_counter() - start,
+            'conflicts': sum(len(entry['conflict_analysis']) for entry in discrepancies['conflict_analysis'])
+        }
+    return {'code_elements': len(code_elements), 'doc_elements': len(doc_elements), 'workers': workers,
+            'methods': timings}
+
+
+def run_embedding_benchmark(element_count: int = 5_000, dimension: int = 384, k: int = 5,
+                            block_size: int = 2048, loop_max_elements: int = 1_000,
+                            seed: int = 42) -> Dict[str, Any]:
+    """
+    Misst blocked_top_k gegen den paarweisen Vergleich in Python auf Zufallsvektoren
+
+    Args:
+        element_count: Anzahl der Code- und der Dokumentations-Elemente
+        dimension: Dimension der Embeddings (384 wie all-MiniLM-L6-v2)
+        loop_max_elements: Größere Mengen werden paarweise nicht gemessen (quadratische Laufzeit)
+
+    Returns:
+        Laufzeiten beider Verfahren (None, wenn nicht gemessen)
+    """
+    rng = np.random.default_rng(seed)
+    code, _ = normalize_rows(rng.normal(size=(element_count, dimension)))
+    docs, _ = normalize_rows(rng.normal(size=(element_count, dimension)))
+
+    start = time.perf_counter()
+    blocked_top_k(code, docs, k, block_size)
+    blocked_seconds = time.perf_counter() - start
+
+    loop_seconds = None
+    if element_count <= loop_max_elements:
+        code_rows, doc_rows = code.tolist(), docs.tolist()
+        start = time.perf_counter()
+        for code_vector in code_rows:
+            scores = [sum(a * b for a, b in zip(code_vector, doc_vector)) for doc_vector in doc_rows]
+            sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:k]
+        loop_seconds = time.perf_counter() - start
+    return {'elements': element_count, 'dimension': dimension, 'block_size': block_size,
+            'blocked_seconds': blocked_seconds, 'loop_seconds': loop_seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Ähnlichkeitsmaße des Matchers")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 50_000],
+                        help="Länge der Dokumente in Zeichen")
+    parser.add_argument('--repeat', type=int, default=3, help="Wiederholungen pro Messung")
+    parser.add_argument('--difflib-max-chars', type=int, default=20_000,
+                        help="Maximale Dokumentlänge für die difflib-Vergleichsbasis")
+    parser.add_argument('--project-files', type=int, default=0,
+                        help="Zusätzlich den Matcher auf einem synthetischen Projekt dieser Größe messen")
+    parser.add_argument('--matcher-workers', type=int, default=1,
+                        help="Prozesse für die Konfliktanalyse im Matcher-Benchmark (0: ein Prozess pro CPU-Kern)")
+    parser.add_argument('--embedding-elements', type=int, default=0,
+                        help="Zusätzlich die Embedding-Ähnlichkeit für so viele Code- und Dokumentations-Elemente messen")
+    parser.add_argument('--output', help="Ergebnisse als JSON speichern")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.sizes, args.repeat, difflib_max_chars=args.difflib_max_chars)
+    methods = list(SIMILARITY_MEASURES)
+    print(f"{'Profil':>8} {'Zeichen':>8} " + " ".join(f"{method + ' ms':>14}" for method in methods))
+    for row in rows:
+        cells = []
+        for method in methods:
+            result = row['methods'].get(method)
+            cells.append(f"{result['seconds'] * 1000:>14.2f}" if result else f"{'-':>14}")
+        print(f"{row['profile']:>8} {row['chars']:>8} " + " ".join(cells))
+
+    output = {'similarity': rows}
+    if args.project_files:
+        matcher = run_matcher_benchmark(args.project_files, workers=args.matcher_workers)
+        output['matcher'] = matcher
+        print(f"\nMatcher ({matcher['code_elements']} Code-, {matcher['doc_elements']} Dokumentations-Elemente):")
+        for method, result in matcher['methods'].items():
+            print(f"  {method:>10}: {result['seconds']:.3f} s, {result['conflicts']} Konflikte")
+
+    if args.embedding_elements:
+        embedding = run_embedding_benchmark(args.embedding_elements)
+        output['embedding'] = embedding
+        loop = f"{embedding['loop_seconds']:.3f} s" if embedding['loop_seconds'] is not None else "-"
+        print(f"\nEmbeddings ({embedding['elements']} x {embedding['elements']}, Dimension {embedding['dimension']}): "
+              f"blockweise {embedding['blocked_seconds']:.3f} s, paarweise {loop}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(output, f, indent=2)
+        print(f"Ergebnisse gespeichert: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Erzeugung synthetischer Projekte für Benchmarks
+
+Die Projekte sind deterministisch (fester Seed) und enthalten eine einstellbare
+Mischung aus Python-, JavaScript- und Dokumentationsdateien, verschachtelte
+.gitignore-Dateien mit ignorierten Artefakten, große Markdown-Dokumente sowie
+FastAPI- und Express-Routen.
+"""
+import random
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Union
+
+# Standard-Mischung der Dateitypen (Anteile werden normiert)
+DEFAULT_LANGUAGE_MIX = {'py': 0.5, 'js': 0.2, 'ts': 0.05, 'md': 0.2, 'rst': 0.05}
+
+_PYTHON_FUNCTION = '''
+def {name}(value: int, factor: float = 1.0) -> float:
+    """Berechnet {name} für einen Wert
+
+    Args:
+        value: Eingabewert
+        factor: Skalierungsfaktor
+
+    Returns:
+        Skalierter Wert
+    """
+    result = value * factor
+    for step in range({steps}):
+        result += step
+    return result
+'''
+
+_PYTHON_CLASS = '''
+class {name}:
+    """Dienst {name}"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def fetch(self, identifier: str) -> dict:
+        return self.client.get(identifier)
+
+    def store(self, identifier: str, payload: dict) -> bool:
+        return self.client.put(identifier, payload)
+'''
+
+_FASTAPI_ROUTE = '''
+@app.get("/{resource}/{{item_id}}")
+async def get_{resource}(item_id: int):
+    return {{"id": item_id}}
+
+
+@app.post("/{resource}")
+async def create_{resource}(payload: dict):
+    return payload
+'''
+
+_JS_MODULE = '''
+// Modul {name}
+import {{ request }} from './api';
+
+export function {name}Load(id, options = {{}}) {{
+  const url = `/api/{name}/${{id}}`;
+  return request(url, {{ ...options, method: 'GET' }});
+}}
+
+export const {name}Handler = async (req, res) => {{
+  const data = await {name}Load(req.params.id);
+  res.json(data);
+}};
+
+export class {cls}Store {{
+  constructor() {{
+    this.items = new Map();
+  }}
+
+  get(id) {{
+    return this.items.get(id);
+  }}
+}}
+'''
+
+_EXPRESS_ROUTE = '''
+app.get('/{name}/:id', (req, res) => {{
+  res.json({{ id: req.params.id }});
+}});
+
+router.post('/{name}', async (req, res) => {{
+  res.status(201).json(req.body);
+}});
+'''
+
+
+def _normalize_mix(language_mix: Optional[Mapping[str, float]]) -> Dict[str, float]:
+    """Normiert die Anteile der Dateitypen auf eine Summe von 1"""
+    mix = {extension: share for extension, share in (language_mix or DEFAULT_LANGUAGE_MIX).items() if share > 0}
+    total = sum(mix.values())
+    if not total:
+        raise ValueError("language_mix enthält keinen positiven Anteil")
+    return {extension: share / total for extension, share in mix.items()}
+
+
+def _python_module(rng: random.Random, index: int, with_routes: bool) -> str:
+    parts = ['"""Synthetisches Modul {}"""\n'.format(index)]
+    if with_routes:
+        parts.append("from fastapi import FastAPI\n\napp = FastAPI()\n")
+    for number in range(rng.randint(3, 12)):
+        parts.append(_PYTHON_FUNCTION.format(name=f"compute_{index}_{number}", steps=rng.randint(1, 9)))
+    for number in range(rng.randint(0, 3)):
+        parts.append(_PYTHON_CLASS.format(name=f"Service{index}x{number}"))
+    if with_routes:
+        for number in range(rng.randint(1, 4)):
+            parts.append(_FASTAPI_ROUTE.format(resource=f"items_{index}_{number}"))
+    return ''.join(parts)
+
+
+def _javascript_module(rng: random.Random, index: int, with_routes: bool) -> str:
+    parts = []
+    if with_routes:
+        parts.append("const express = require('express');\nconst app = express();\nconst router = express.Router();\n")
+    for number in range(rng.randint(1, 5)):
+        parts.append(_JS_MODULE.format(name=f"module{index}x{number}", cls=f"Module{index}x{number}"))
+    if with_routes:
+        for number in range(rng.randint(1, 4)):
+            parts.append(_EXPRESS_ROUTE.format(name=f"res{index}x{number}"))
+    return ''.join(parts)
+
+
+def _markdown_document(rng: random.Random, index: int, target_bytes: int) -> str:
+    """Dokumentation, die teils existierende, teils veraltete Funktionen beschreibt"""
+    parts = [f"# Modul {index}\n\nÜbersicht über die Funktionen des Moduls.\n"]
+    length = len(parts[0])
+    section = 0
+    while length < target_bytes:
+        # Jede dritte Sektion beschreibt eine Funktion, die es nicht (mehr) gibt
+        name = f"compute_{index}_{section}" if section % 3 else f"legacy_{index}_{section}"
+        part = (
+            f"\n## {name}\n\n`{name}(value, factor)` berechnet einen skalierten Wert.\n\n"
+            f"Parameter:\n- value: Eingabewert\n- factor: Skalierungsfaktor\n\n"
+            f"```python\nresult = {name}({rng.randint(1, 99)}, 2.0)\n```\n"
+        )
+        parts.append(part)
+        length += len(part)
+        section += 1
+    return ''.join(parts)
+
+
+def _rst_document(index: int) -> str:
+    title = f"Modul {index}"
+    return f"{title}\n{'=' * len(title)}\n\nBeschreibung des Moduls.\n\nFunktionen\n----------\n\n* compute_{index}_1\n"
+
+
+def generate_project(root: Union[str, Path], file_count: int = 1000,
+                     language_mix: Optional[Mapping[str, float]] = None,
+                     files_per_directory: int = 25, large_doc_every: int = 50,
+                     large_doc_bytes: int = 200_000, route_share: float = 0.2,
+                     ignored_share: float = 0.1, seed: int = 42) -> Dict[str, int]:
+    """
+    Erzeugt ein synthetisches Projekt
+
+    Args:
+        root: Zielverzeichnis (wird angelegt)
+        file_count: Anzahl der zu scannenden Dateien
+        language_mix: Anteile pro Dateiendung ohne Punkt (z.B. {'py': 0.6, 'md': 0.4})
+        files_per_directory: Dateien pro Verzeichnis; Verzeichnisse werden zweistufig verschachtelt
+        large_doc_every: Jedes n-te Markdown-Dokument ist groß (0: keine großen Dokumente)
+        large_doc_bytes: Größe der großen Markdown-Dokumente in Bytes
+        route_share: Anteil der Python- und JavaScript-Dateien mit Framework-Routen
+        ignored_share: Zusätzliche, per .gitignore ausgeschlossene Dateien relativ zu file_count
+        seed: Seed des Zufallsgenerators
+
+    Returns:
+        Anzahl der erzeugten Dateien pro Endung sowie 'ignored' und 'bytes'
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    mix = _normalize_mix(language_mix)
+    extensions = list(mix)
+    weights = [mix[extension] for extension in extensions]
+
+    (root / ".gitignore").write_text("build/\n*.log\n__pycache__/\n", encoding='utf-8')
+    (root / "requirements.txt").write_text("fastapi\n", encoding='utf-8')
+
+    counts: Dict[str, int] = {extension: 0 for extension in extensions}
+    counts['ignored'] = 0
+    total_bytes = 0
+    markdown_index = 0
+
+    for index in range(file_count):
+        directory_index = index // max(1, files_per_directory)
+        directory = root / "src" / f"pkg_{directory_index // 10}" / f"mod_{directory_index % 10}"
+        if index % max(1, files_per_directory) == 0:
+            directory.mkdir(parents=True, exist_ok=True)
+            # Verschachtelte .gitignore-Dateien mit eigenen Mustern
+            (directory / ".gitignore").write_text("*.generated.py\ncache/\n", encoding='utf-8')
+
+        extension = rng.choices(extensions, weights)[0]
+        with_routes = rng.random() < route_share
+        if extension == 'py':
+            content = _python_module(rng, index, with_routes)
+        elif extension in ('js', 'ts', 'jsx', 'tsx'):
+            content = _javascript_module(rng, index, with_routes)
+        elif extension == 'md':
+            markdown_index += 1
+            large = large_doc_every and markdown_index % large_doc_every == 0
+            content = _markdown_document(rng, index, large_doc_bytes if large else rng.randint(500, 4000))
+        elif extension == 'rst':
+            content = _rst_document(index)
+        else:
+            content = f"Datei {index}\n"
+
+        path = directory / f"file_{index}.{extension}"
+        path.write_text(content, encoding='utf-8')
+        counts[extension] += 1
+        total_bytes += len(content.encode('utf-8'))
+
+    # Artefakte, die über .gitignore ausgeschlossen sein müssen
+    for index in range(int(file_count * ignored_share)):
+        directory_index = index // max(1, files_per_directory)
+        directory = root / "src" / f"pkg_{directory_index // 10}" / f"mod_{directory_index % 10}"
+        directory.mkdir(parents=True, exist_ok=True)
+        if index % 3 == 0:
+            target = directory / f"model_{index}.generated.py"
+        elif index % 3 == 1:
+            target = directory / "cache" / f"entry_{index}.py"
+        else:
+            target = root / "build" / f"bundle_{index}.py"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(_python_module(rng, index, False), encoding='utf-8')
+        counts['ignored'] += 1
+
+    counts['bytes'] = total_bytes
+    return counts
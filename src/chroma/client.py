@@ -1,6 +1,6 @@
 import chromadb
 from chromadb.config import Settings
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator, Tuple
 import requests
 
 
@@ -116,10 +116,55 @@ class ChromaDBClient:
             print(f"Fehler beim Hinzufügen von Embeddings zur Collection '{collection_name}': {e}")
             return False
 
-    def create_collection(self, collection_name: str) -> bool:
+    def get_embeddings(self, collection_name: str, batch_size: int = 1000) -> Iterator[Tuple[List[List[float]], List[Dict]]]:
+        """
+        Liest alle Embeddings einer Collection seitenweise
+
+        Args:
+            collection_name: Name der Collection
+            batch_size: Einträge pro Anfrage
+
+        Returns:
+            Iterator über (Embeddings, Metadaten) je Seite
+        """
+        collection = self.get_or_create_collection(collection_name)
+        if collection is None:
+            return
+        offset = 0
+        while True:
+            try:
+                page = collection.get(include=["embeddings", "metadatas"], limit=batch_size, offset=offset)
+            except Exception as e:
+                print(f"Fehler beim Lesen der Embeddings aus der Collection '{collection_name}': {e}")
+                return
+            embeddings = page.get('embeddings')
+            if embeddings is None or len(embeddings) == 0:
+                return
+            yield embeddings, page.get('metadatas') or [{}] * len(embeddings)
+            if len(embeddings) < batch_size:
+                return
+            offset += batch_size
+
+    def get_collection_metadata(self, collection_name: str) -> Optional[Dict]:
+        """Gibt die Metadaten einer Collection zurück oder None, wenn sie nicht existiert"""
+        try:
+            return self.client.get_collection(name=collection_name).metadata or {}
+        except Exception:
+            return None
+
+    def delete_collection(self, collection_name: str) -> bool:
+        """Löscht eine Collection mit allen Einträgen"""
+        try:
+            self.client.delete_collection(name=collection_name)
+            return True
+        except Exception as e:
+            print(f"Fehler beim Löschen der Collection '{collection_name}': {e}")
+            return False
+
+    def create_collection(self, collection_name: str, metadata: Optional[Dict] = None) -> bool:
         """Erstellt eine neue Collection"""
         try:
-            collection = self.client.create_collection(name=collection_name)
+            collection = self.client.create_collection(name=collection_name, metadata=metadata)
             return collection is not None
         except Exception as e:
             if "already exists" in str(e).lower():
@@ -8,7 +8,7 @@ class ProjectConfig(BaseModel):
     project_type: str = "universal"
     scan_paths: List[str] = ["."]
     exclude_patterns: List[str] = [
-        "node_modules", "venv", ".venv", "__pycache__", ".git",
+        "node_modules", "venv", ".venv", "__pycache__", ".git", ".daut_cache",
         "dist", "build", ".pytest_cache", ".vscode", ".idea",
         "target", "out", ".next", "coverage", ".tox", ".nox",
         "env", ".env", "env.bak", ".env.bak", "venv.bak", ".venv",
@@ -95,6 +95,26 @@ class ProjectConfig(BaseModel):
     ]
     scan_depth: int = 10  # Maximale Unterverzeichnisse
     max_file_size_mb: int = 10  # Maximale Dateigröße in MB für gescannte Dateien
+    use_scan_cache: bool = True  # Persistenter Cache für unveränderte Dateien
+    scan_cache_dir: Optional[str] = None  # Standard: <projekt>/.daut_cache
+    javascript_extractor: str = "tokenizer"  # "tokenizer" oder "regex" (bisherige Erkennung)
+    deduplicate_content: bool = True  # Dateien mit identischem Inhalt nur einmal parsen
+    lazy_content: bool = False  # Snippets und Dokumentinhalte nur als Byte-Bereich speichern, Text bei Bedarf laden
+    trace_allocations: bool = False  # Speicher-Spitzenwert mit tracemalloc messen (verlangsamt den Scan)
+    profiling: str = "off"  # "off", "files" (Zeiten pro Datei und Phase) oder "sampling" (zusätzlich Stichproben-Profiler)
+    profile_top_n: int = 20  # Anzahl der langsamsten Dateien im Profil-Bericht
+    profile_output: Optional[str] = None  # Zieldatei für die gefalteten Stacks im Modus "sampling"
+    similarity_method: str = "token_set"  # Ähnlichkeitsmaß des Matchers: "token_set", "shingle", "minhash" oder "difflib"
+    similarity_threshold: float = 0.7  # Unterhalb dieser Ähnlichkeit meldet der Matcher einen Signatur- oder Beschreibungskonflikt
+    matcher_workers: int = 1  # Prozesse für die Konfliktanalyse des Matchers; 1: seriell, 0: ein Prozess pro CPU-Kern
+    matcher_parallel_min_pairs: int = 500  # Parallele Konfliktanalyse erst ab so vielen zugeordneten Paaren
+    use_match_cache: bool = True  # Konflikte unveränderter Paare aus dem vorherigen Lauf übernehmen
+    fuzzy_match_threshold: Optional[float] = 0.75  # Minimale Trigramm-Ähnlichkeit für unscharf zugeordnete Überschriften; None: aus
+    use_embedding_similarity: bool = False  # Code und Dokumentation zusätzlich über die Embeddings aus der ChromaDB vergleichen
+    embedding_top_k: int = 5  # Dokumentations-Kandidaten je Code-Element in der Embedding-Analyse
+    embedding_low_similarity: float = 0.3  # Unterhalb dieser Kosinus-Ähnlichkeit gelten Paare bzw. Dokumente als auffällig
+    embedding_block_size: int = 2048  # Zeilen/Spalten pro Block der Matrixmultiplikation
+    file_enumeration: str = "auto"  # "walk", "git" (git ls-files) oder "auto" (git, falls verfügbar)
     framework_detection: Dict[str, List[str]] = {
         "python": ["requirements.txt", "pyproject.toml", "setup.py"],
         "javascript": ["package.json"],
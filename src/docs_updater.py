@@ -1,9 +1,12 @@
 import argparse
+import json
+from collections import deque
 from pathlib import Path
 from src.core.config_manager import ConfigManager
 from src.core.project_analyzer import ProjectAnalyzer
 from src.scanner.universal_scanner import UniversalScanner
 from src.matcher import MatcherEngine
+from src.models.element_store import ElementRow, ElementStore
 from src.updater.engine import UpdaterEngine
 from src.utils.structured_logging import get_logger
 
@@ -18,6 +21,11 @@ def main():
     parser.add_argument("--mode", choices=["scan", "analyze", "update", "dry-run"],
                        default="scan", help="Ausführungsmodus")
     parser.add_argument("--output", help="Ausgabeverzeichnis für Ergebnisse")
+    parser.add_argument("--stream", action="store_true",
+                       help="Ergebnisse dateiweise verarbeiten statt vollständig im Speicher zu halten")
+    parser.add_argument("--profile", choices=["files", "sampling"],
+                       help="Profiling: langsamste Dateien und Phasen ausgeben; bei 'sampling' "
+                            "zusätzlich gefaltete Stacks (scan_profile.folded im Ausgabeverzeichnis)")
 
     args = parser.parse_args()
 
@@ -37,8 +45,18 @@ def main():
     project_type = analyzer.detect_project_type(args.project_path)
     logger.info(f"Erkannter Projekttyp: {project_type}", extra_data={"project_type": project_type})
     
+    if args.profile:
+        config.profiling = args.profile
+        if args.output:
+            Path(args.output).mkdir(parents=True, exist_ok=True)
+            config.profile_output = str(Path(args.output) / "scan_profile.folded")
+
     # Scanner initialisieren und Projekt scannen
     scanner = UniversalScanner(config)
+    if args.stream:
+        run_streaming(scanner, args, logger)
+        return
+
     logger.info("Starte Projekt-Scan", extra_data={"project_path": args.project_path})
     results = scanner.scan_project(args.project_path)
 
@@ -48,24 +66,55 @@ def main():
         "doc_elements_found": len(results['doc_elements'])
     })
 
-    if args.mode in ["analyze", "update", "dry-run"]:
-        matcher = MatcherEngine()
-        logger.debug("Starte Diskrepanz-Analyse")
-        discrepancies = matcher.find_discrepancies(
-            results['code_elements'],
-            results['doc_elements']
-        )
-
-        logger.info(f"Gefundene Diskrepanzen:", extra_data={
-            "undocumented_code": len(discrepancies['undocumented_code']),
-            "outdated_documentation": len(discrepancies['outdated_documentation']),
-            "mismatched_elements": len(discrepancies['mismatched_elements'])
-        })
-
-        if args.mode in ["update", "dry-run"]:
-            logger.info("Update-Funktionalität würde hier implementiert werden...")
-            if args.mode == "dry-run":
-                logger.info("(Trockenlauf - keine tatsächlichen Änderungen werden vorgenommen)")
+    # Phasen nach dem Scan (embed, upsert, match) erscheinen im Performance-Bericht des Scanners
+    with scanner.performance_analyzer.activate():
+        # ChromaDB Aktualisierung nach dem Scannen, vor der Analyse (deren Embedding-Stufe nutzt die neuen Vektoren)
+        if args.mode in ["scan", "analyze", "update", "dry-run"]:
+            logger.info("Starte ChromaDB-Aktualisierung...")
+            updater = UpdaterEngine(config_path=args.service_config or "./service_config.json")
+            success = updater.update_chroma_db(
+                results['code_elements'],
+                results['doc_elements'],
+                args.project_path,
+                results.get('content_hashes')
+            )
+            if success:
+                logger.info("ChromaDB erfolgreich aktualisiert")
+            else:
+                logger.error("Fehler bei der ChromaDB-Aktualisierung")
+
+        if args.mode in ["analyze", "update", "dry-run"]:
+            matcher = MatcherEngine(config, project_path=args.project_path)
+            embeddings = None
+            if config.use_embedding_similarity and success:
+                embeddings = updater.load_element_embeddings(args.project_path)
+            logger.debug("Starte Diskrepanz-Analyse")
+            discrepancies = matcher.find_discrepancies(
+                results['code_elements'],
+                results['doc_elements'],
+                embeddings
+            )
+            logger.debug("Konfliktanalyse abgeschlossen", extra_data={
+                **matcher.advanced_matcher.last_run_statistics, **matcher.advanced_matcher.doc_sections.get_statistics()})
+            matcher.close()
+
+            logger.info(f"Gefundene Diskrepanzen:", extra_data={
+                "undocumented_code": len(discrepancies['undocumented_code']),
+                "outdated_documentation": len(discrepancies['outdated_documentation']),
+                "mismatched_elements": len(discrepancies['mismatched_elements'])
+            })
+            embedding_analysis = discrepancies.get('embedding_analysis')
+            if embedding_analysis:
+                logger.info("Embedding-Analyse abgeschlossen", extra_data={
+                    "likely_outdated": len(embedding_analysis['likely_outdated']),
+                    "low_similarity_pairs": len(embedding_analysis['low_similarity_pairs']),
+                    **embedding_analysis['statistics']
+                })
+
+            if args.mode in ["update", "dry-run"]:
+                logger.info("Update-Funktionalität würde hier implementiert werden...")
+                if args.mode == "dry-run":
+                    logger.info("(Trockenlauf - keine tatsächlichen Änderungen werden vorgenommen)")
 
     # Ergebnisse speichern
     if args.output:
@@ -79,19 +128,101 @@ def main():
 
         logger.info(f"Ergebnisse gespeichert", extra_data={"output_path": str(output_path / 'scan_results.json')})
 
-    # ChromaDB Aktualisierung nach dem Scannen und ggf. Update
-    if args.mode in ["scan", "analyze", "update", "dry-run"]:
+    _save_performance_report(scanner, args, logger)
+
+def run_streaming(scanner: UniversalScanner, args, logger):
+    """
+    Scannt das Projekt als Stream: Jede Datei wird in die JSON-Lines-Ausgabe
+    geschrieben und an die ChromaDB übergeben, bevor die nächste gescannt wird.
+    Für die Diskrepanz-Analyse schreiben die Scanner die Elemente direkt in einen
+    kompakten ElementStore, auf dessen Zeilen der Abgleich anschließend läuft.
+    """
+    logger.info("Starte Projekt-Scan (Stream)", extra_data={"project_path": args.project_path})
+    store = ElementStore() if args.mode in ["analyze", "update", "dry-run"] else None
+    stream = scanner.scan_project_iter(args.project_path, store)
+
+    output_file = None
+    if args.output:
+        output_path = Path(args.output)
+        output_path.mkdir(parents=True, exist_ok=True)
+        output_file = open(output_path / "scan_results.jsonl", "w", encoding="utf-8")
+        stream = _write_json_lines(stream, output_file)
+
+    try:
         logger.info("Starte ChromaDB-Aktualisierung...")
         updater = UpdaterEngine(config_path=args.service_config or "./service_config.json")
-        success = updater.update_chroma_db(
-            results['code_elements'],
-            results['doc_elements'],
-            args.project_path
-        )
-        if success:
-            logger.info("ChromaDB erfolgreich aktualisiert")
-        else:
-            logger.error("Fehler bei der ChromaDB-Aktualisierung")
+        success = updater.update_chroma_db_from_stream(stream, args.project_path)
+        # Falls die Aktualisierung abgebrochen wurde, den Scan trotzdem abschließen
+        deque(stream, maxlen=0)
+    finally:
+        if output_file:
+            output_file.close()
+
+    summary = scanner.scan_summary.as_dict()
+    logger.info(f"Scan abgeschlossen", extra_data={
+        "total_files_scanned": summary['total_files_scanned'],
+        "code_elements_found": summary['code_files'],
+        "doc_elements_found": summary['doc_files']
+    })
+    if success:
+        logger.info("ChromaDB erfolgreich aktualisiert")
+    else:
+        logger.error("Fehler bei der ChromaDB-Aktualisierung")
+
+    with scanner.performance_analyzer.activate():
+        if store is not None:
+            matcher = MatcherEngine(scanner.config, project_path=args.project_path)
+            embeddings = None
+            if scanner.config.use_embedding_similarity and success:
+                embeddings = updater.load_element_embeddings(args.project_path)
+            discrepancies = matcher.find_discrepancies_store(store, embeddings)
+            logger.debug("Konfliktanalyse abgeschlossen", extra_data={
+                **matcher.advanced_matcher.last_run_statistics, **matcher.advanced_matcher.doc_sections.get_statistics()})
+            matcher.close()
+            logger.info(f"Gefundene Diskrepanzen:", extra_data={
+                "undocumented_code": len(discrepancies['undocumented_code']),
+                "outdated_documentation": len(discrepancies['outdated_documentation']),
+                "mismatched_elements": len(discrepancies['mismatched_elements'])
+            })
+
+    _save_performance_report(scanner, args, logger)
+
+
+def _save_performance_report(scanner: UniversalScanner, args, logger):
+    """Speichert den Performance-Bericht inklusive der Phasen nach dem Scan (match, embed, upsert)"""
+    if not args.output:
+        return
+    report_path = Path(args.output) / "performance_report.json"
+    scanner.performance_analyzer.save_performance_report(str(report_path))
+    logger.info("Performance-Bericht gespeichert", extra_data={"output_path": str(report_path)})
+
+
+def _write_json_lines(stream, output_file):
+    """Schreibt jedes Dateiergebnis als eine JSON-Zeile und reicht es weiter"""
+    for result in stream:
+        record = {
+            'file_path': result.file_path,
+            'file_type': result.file_type,
+            'duplicate_of': result.duplicate_of,
+            'elements': result.elements
+        }
+        output_file.write(json.dumps(record, default=_json_default) + "\n")
+        yield result
+
+
+def _json_default(value):
+    """Serialisiert Pydantic-Modelle, Zeilen eines ElementStore und sonstige Werte für die JSON-Ausgabe"""
+    if isinstance(value, ElementRow):
+        value = value.to_model()
+        if isinstance(value, dict):
+            return value
+    if hasattr(value, 'model_dump'):
+        return value.model_dump(mode='json')
+    if hasattr(value, 'dict'):
+        # Pydantic v1; verschachtelte Werte ohne JSON-Entsprechung landen erneut hier
+        return value.dict()
+    return str(value)
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -65,7 +65,7 @@ def main():
     })
 
     if args.mode in ["analyze", "update", "dry-run", "ai-generate"]:
-        matcher = MatcherEngine()
+        matcher = MatcherEngine(config, project_path=args.project_path)
         logger.debug("Starte Diskrepanz-Analyse")
         discrepancies = matcher.find_discrepancies(
             results['code_elements'],
@@ -110,7 +110,8 @@ def main():
         success = updater.update_chroma_db(
             results['code_elements'],
             results['doc_elements'],
-            args.project_path
+            args.project_path,
+            results.get('content_hashes')
         )
         if success:
             logger.info("ChromaDB erfolgreich aktualisiert")
@@ -244,7 +244,8 @@ if discrepancies['undocumented_code']:
     success = updater.update_chroma_db(
         results['code_elements'],
         results['doc_elements'],
-        '{abs_project_path}'
+        '{abs_project_path}',
+        results.get('content_hashes')
     )
     if success:
         print('ChromaDB erfolgreich aktualisiert')
@@ -316,7 +317,8 @@ if discrepancies['undocumented_code']:
     success = updater.update_chroma_db(
         results['code_elements'],
         results['doc_elements'],
-        '{abs_project_path}'
+        '{abs_project_path}',
+        results.get('content_hashes')
     )
     if success:
         print('ChromaDB erfolgreich nach Merge aktualisiert')
@@ -0,0 +1,13 @@
+from .engine import MatcherEngine
+from .advanced_matcher import AdvancedMatcherEngine
+from .symbol_index import SymbolIndex
+from .match_cache import MatchCache
+from .doc_sections import DocSectionCache
+
+__all__ = [
+    "MatcherEngine",
+    "AdvancedMatcherEngine",
+    "SymbolIndex",
+    "MatchCache",
+    "DocSectionCache"
+]
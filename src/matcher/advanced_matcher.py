@@ -1,10 +1,17 @@
 """
 Erweiterter Konfliktlösungsmechanismus für Diskrepanzen zwischen Code und Dokumentation
 """
-from typing import Dict, List, Any, Optional, Tuple
+import concurrent.futures
+import hashlib
+import os
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple, Iterable, Union
 from src.models.element import CodeElement, DocElement
+from src.models.element_store import CODE_KIND, DOC_KIND, ElementRow, ElementStore, as_model, is_code_element
+from src.matcher.similarity import SimilarityMeasure, create_similarity
+from src.matcher.embedding_similarity import ElementEmbeddings, EmbeddingSimilarity
+from src.matcher.doc_sections import DocSectionCache, DocSections
+from src.matcher.symbol_index import SymbolIndex, MATCH_FUZZY
 from enum import Enum
-import difflib
 
 
 class ConflictType(Enum):
@@ -39,99 +46,435 @@ class ConflictResolutionResult:
         self.reason = reason
 
 
+class ConflictInput(NamedTuple):
+    """
+    Die Felder eines zugeordneten Paars, die die Konfliktanalyse verwendet
+
+    Nur diese Felder werden an die Worker-Prozesse übertragen, nicht die
+    vollständigen Code- und Dokumentations-Elemente.
+    """
+    parameters: Optional[List[Dict]]  # CodeElement.parameters
+    return_type: Optional[str]  # CodeElement.return_type
+    signature: Optional[str]  # CodeElement.signature
+    docstring: Optional[str]  # CodeElement.docstring
+    content: Optional[str]  # DocElement.content
+
+    @classmethod
+    def from_pair(cls, code_elem: CodeElement, doc_elem: DocElement) -> 'ConflictInput':
+        return cls(code_elem.parameters, code_elem.return_type, code_elem.signature,
+                   code_elem.docstring, doc_elem.content)
+
+    def content_hash(self) -> str:
+        """Hash der Felder beider Seiten; ändert sich, sobald Code oder Dokumentation des Paars sich ändert"""
+        return hashlib.blake2b(repr(tuple(self)).encode('utf-8'), digest_size=16).hexdigest()
+
+
+# Enum-Werte als Konstanten; der Zugriff auf .value ist beim Laden vieler Cache-Einträge spürbar
+_MISMATCHED_PARAMETERS = ConflictType.MISMATCHED_PARAMETERS.value
+_MISMATCHED_RETURN_TYPE = ConflictType.MISMATCHED_RETURN_TYPE.value
+_MISMATCHED_SIGNATURE = ConflictType.MISMATCHED_SIGNATURE.value
+_MISMATCHED_DESCRIPTION = ConflictType.MISMATCHED_DESCRIPTION.value
+
+
+def input_details(conflict_type: str, conflict_input: ConflictInput) -> Dict[str, Any]:
+    """
+    Die Konfliktdetails, die unverändert aus den Feldern des Paars stammen
+
+    Der MatchCache speichert diese Details nicht, sondern ergänzt sie beim Laden
+    aus den aktuellen Feldern (die bei einem Treffer identisch sind).
+    """
+    content = conflict_input.content or ""
+    if conflict_type == _MISMATCHED_PARAMETERS:
+        return {'code_parameters': conflict_input.parameters}
+    if conflict_type == _MISMATCHED_RETURN_TYPE:
+        return {'code_return_type': conflict_input.return_type}
+    if conflict_type == _MISMATCHED_SIGNATURE:
+        return {'code_signature': conflict_input.signature,
+                'doc_content': content[:200] + "..." if len(content) > 200 else content}
+    if conflict_type == _MISMATCHED_DESCRIPTION:
+        return {'code_docstring': conflict_input.docstring, 'doc_content': content}
+    return {}
+
+
+# Anzahl der Chunks pro Prozess; mehrere kleine Chunks gleichen Laufzeitunterschiede aus
+CHUNKS_PER_WORKER = 4
+
+# Matcher eines Worker-Prozesses, einmalig durch _init_conflict_worker erstellt
+_worker_matcher: Optional['AdvancedMatcherEngine'] = None
+
+
+def _init_conflict_worker(similarity: SimilarityMeasure, similarity_threshold: float,
+                          confidence_thresholds: Dict[str, float]):
+    """Initialisiert einen Worker-Prozess mit den Einstellungen des Matchers im Elternprozess"""
+    global _worker_matcher
+    _worker_matcher = AdvancedMatcherEngine(similarity=similarity, similarity_threshold=similarity_threshold)
+    _worker_matcher.confidence_thresholds = dict(confidence_thresholds)
+
+
+def _analyze_chunk(inputs: List[Tuple[ConflictInput, DocSections]]) -> List[List[Dict[str, Any]]]:
+    """Analysiert einen Chunk von Paaren in einem Worker-Prozess; ein Ergebnis pro Paar in Eingabereihenfolge"""
+    return [_worker_matcher._analyze_input(conflict_input, sections) for conflict_input, sections in inputs]
+
+
+def _is_documentable(code_elem: CodeElement) -> bool:
+    """Prüft, ob ein Code-Element Dokumentation benötigt (Funktionen, Klassen und API-Endpunkte)"""
+    return bool(code_elem.type) and code_elem.type.value in ('function', 'class', 'api_endpoint')
+
+
+def compact_scan_result(result: Any) -> Any:
+    """
+    Reduziert ein FileScanResult auf die für den Abgleich benötigten Daten
+
+    Entfernt Rohdaten der Framework-Parser und den vollständigen Dateiinhalt
+    (full_content) der Dokumentations-Elemente. Zeilen eines ElementStore bleiben
+    unverändert, ihr Inhalt liegt ohnehin nur einmal im Speicher.
+    """
+    if result.is_code:
+        elements = [elem for elem in result.elements if is_code_element(elem)]
+    else:
+        elements = []
+        for elem in result.elements:
+            if not isinstance(elem, ElementRow) and elem.full_content:
+                # Pydantic v2 bzw. v1
+                copy = getattr(elem, 'model_copy', None) or elem.copy
+                elem = copy(update={'full_content': None})
+            elements.append(elem)
+    return result._replace(elements=elements)
+
+
 class AdvancedMatcherEngine:
     """Erweiterter Matcher mit differenzierter Konfliktlösung"""
     
-    def __init__(self):
+    def __init__(self, similarity: Union[str, SimilarityMeasure, None] = None,
+                 similarity_threshold: Optional[float] = None,
+                 workers: Optional[int] = 1, parallel_min_pairs: int = 500, cache: Optional[Any] = None,
+                 fuzzy_threshold: Optional[float] = 0.75,
+                 embedding_stage: Optional[EmbeddingSimilarity] = None,
+                 doc_sections: Optional[DocSectionCache] = None):
+        """
+        Args:
+            similarity: Ähnlichkeitsmaß für Signatur- und Beschreibungskonflikte
+                        (Name aus similarity.SIMILARITY_MEASURES oder Instanz; Standard: token_set)
+            similarity_threshold: Unterhalb dieser Ähnlichkeit wird ein Konflikt gemeldet
+                                  (Standard: confidence_thresholds['medium'])
+            workers: Prozesse für die Konfliktanalyse (1: seriell, 0 oder None: ein Prozess pro CPU-Kern)
+            parallel_min_pairs: Mindestanzahl zugeordneter Paare für die parallele Analyse;
+                                bei weniger Paaren überwiegt der Start der Prozesse
+            cache: MatchCache mit den Konflikten des vorherigen Laufs; nur geänderte Paare werden analysiert
+            fuzzy_threshold: Minimale Trigramm-Ähnlichkeit für die unscharfe Zuordnung von Überschriften
+                             ohne exakten Treffer (None: nur exakte und normalisierte Namen)
+            embedding_stage: Einstellungen der Embedding-Analyse (Standard: EmbeddingSimilarity());
+                             ausgeführt wird sie nur, wenn find_discrepancies Embeddings erhält
+            doc_sections: Cache der geparsten Dokumentationsabschnitte (Standard: nur im Speicher);
+                          mit Datenbank werden die Abschnitte auch über Läufe hinweg wiederverwendet
+        """
         self.confidence_thresholds = {
             'high': 0.9,
             'medium': 0.7,
             'low': 0.5
         }
+        self.similarity = create_similarity(similarity)
+        self.similarity_threshold = (similarity_threshold if similarity_threshold is not None
+                                     else self.confidence_thresholds['medium'])
+        self.workers = workers
+        self.parallel_min_pairs = parallel_min_pairs
+        self.cache = cache
+        self.fuzzy_threshold = fuzzy_threshold
+        self.embedding_stage = embedding_stage or EmbeddingSimilarity()
+        self.doc_sections = doc_sections or DocSectionCache()
+        self.last_run_statistics: Dict[str, int] = {}
+
+    def analysis_fingerprint(self) -> str:
+        """Kennung der Einstellungen, die das Ergebnis der Konfliktanalyse beeinflussen (für den MatchCache)"""
+        thresholds = ",".join(f"{key}={value}" for key, value in sorted(self.confidence_thresholds.items()))
+        return f"{self.similarity.name}:{self.similarity_threshold}:{thresholds}"
     
-    def find_discrepancies(self, code_elements: List[CodeElement], doc_elements: List[DocElement]) -> Dict[str, Any]:
-        """Findet Diskrepanzen zwischen Code und Dokumentation mit differenzierter Analyse"""
+    def find_discrepancies_stream(self, file_results: Iterable[Any],
+                                  embeddings: Optional[ElementEmbeddings] = None) -> Dict[str, Any]:
+        """
+        Findet Diskrepanzen in einem gestreamten Scan
+
+        Für den Namensabgleich werden alle Elemente benötigt; behalten wird aber nur,
+        was der Abgleich verwendet. Der vollständige Dateiinhalt der Dokumentations-
+        Elemente (full_content) entfällt, Rohdaten der Framework-Parser ebenso.
+
+        Args:
+            file_results: Ergebnisse von UniversalScanner.scan_project_iter
+            embeddings: Gespeicherte Embeddings für die optionale Embedding-Analyse
+
+        Returns:
+            Diskrepanzen im Format von find_discrepancies
+        """
+        code_elements = []
+        doc_elements = []
+        for result in file_results:
+            result = compact_scan_result(result)
+            if result.is_code:
+                code_elements.extend(result.elements)
+            else:
+                doc_elements.extend(result.elements)
+        return self.find_discrepancies(code_elements, doc_elements, embeddings)
+
+    def find_discrepancies_store(self, store: ElementStore,
+                                 embeddings: Optional[ElementEmbeddings] = None) -> Dict[str, Any]:
+        """
+        Findet Diskrepanzen direkt auf den Zeilen eines ElementStore
+
+        Zuordnung und Konfliktanalyse lesen die Felder der ElementRow-Sichten;
+        Pydantic-Modelle entstehen nur für die gemeldeten Elemente.
+
+        Args:
+            store: Ergebnis von UniversalScanner.scan_project_store
+            embeddings: Gespeicherte Embeddings für die optionale Embedding-Analyse
+
+        Returns:
+            Diskrepanzen im Format von find_discrepancies
+        """
+        return self.find_discrepancies(list(store.rows(CODE_KIND)), list(store.rows(DOC_KIND)), embeddings)
+
+    def find_discrepancies(self, code_elements: List[CodeElement], doc_elements: List[DocElement],
+                           embeddings: Optional[ElementEmbeddings] = None) -> Dict[str, Any]:
+        """
+        Findet Diskrepanzen zwischen Code und Dokumentation mit differenzierter Analyse
+
+        Die Code-Elemente werden in einem SymbolIndex abgelegt, gleichnamige Elemente
+        (z.B. mehrere __init__) bleiben also erhalten. Jedes Dokumentations-Element
+        wird über den Index mit wenigen Dictionary-Zugriffen zugeordnet; ein Durchlauf
+        über beide Listen genügt. Überschriften ohne exakten Treffer werden über den
+        Trigramm-Index unscharf zugeordnet (siehe fuzzy_threshold).
+
+        Einträge in mismatched_elements und conflict_analysis enthalten Trefferstufe
+        und Konfidenz der Zuordnung; fuzzy_matches listet alle unscharfen Zuordnungen.
+
+        Als dokumentiert gilt ein Element nur, wenn es einer Dokumentation zugeordnet
+        wurde oder bei mehreren gleichnamigen Kandidaten in einer Datei mit demselben
+        Namen wie die Dokumentation liegt (docs/users.md -> users.py). Die übrigen
+        Kandidaten bleiben undokumentiert und werden in ambiguous_documentation
+        zusammen mit der Überschrift aufgeführt.
+
+        Code- und Dokumentations-Elemente können auch Zeilen eines ElementStore
+        (ElementRow) sein; die gemeldeten Elemente werden dann über to_model()
+        als Pydantic-Modelle zurückgegeben.
+
+        Args:
+            code_elements: Code-Elemente
+            doc_elements: Dokumentations-Elemente
+            embeddings: Gespeicherte Embeddings der Elemente; falls angegeben, enthält das
+                        Ergebnis zusätzlich embedding_analysis (siehe EmbeddingSimilarity)
+        """
         discrepancies = {
             'undocumented_code': [],
             'outdated_documentation': [],
             'mismatched_elements': [],
-            'conflict_analysis': []
+            'conflict_analysis': [],
+            'fuzzy_matches': [],
+            'ambiguous_documentation': []
         }
 
-        # Erstelle Lookup-Tabellen für einfachen Zugriff
-        code_lookup = {elem.name: elem for elem in code_elements}
-        doc_lookup = {elem.name: elem for elem in doc_elements}
-
-        # Finde undokumentierten Code
-        for code_elem in code_elements:
-            if code_elem.name not in doc_lookup:
-                # Ausschließlich nach Funktion, Klasse oder API-Endpunkt suchen
-                if code_elem.type and code_elem.type.value in ['function', 'class', 'api_endpoint']:
-                    discrepancies['undocumented_code'].append(code_elem)
-
-        # Finde veraltete Dokumentation
-        for doc_elem in doc_elements:
-            if doc_elem.name not in code_lookup:
-                discrepancies['outdated_documentation'].append(doc_elem)
-
-        # Finde Diskrepanzen zwischen vorhandenen Elementen mit differenzierter Analyse
-        for name in set(code_lookup.keys()) & set(doc_lookup.keys()):
-            code_elem = code_lookup[name]
-            doc_elem = doc_lookup[name]
-
-            # Führe eine detaillierte Konfliktanalyse durch
-            conflict_analysis = self._analyze_conflict(code_elem, doc_elem)
-            
+        index = SymbolIndex(code_elements)
+        documented = set()  # Positionen der dokumentierten Code-Elemente im Index
+        # (Trefferstufe, Schlüssel) -> (Kandidaten, Dokumentations-Elemente) für Namen mit mehreren Kandidaten
+        ambiguous: Dict[Tuple[str, str], Tuple[List[int], List[DocElement]]] = {}
+        pairs = []
+        match_info = []  # (Trefferstufe, Konfidenz) parallel zu pairs
+        pair_positions = []  # (Position im Index, Position in doc_elements) parallel zu pairs
+
+        # Ordne jedem Dokumentations-Element Code-Kandidaten zu
+        for doc_position, doc_elem in enumerate(doc_elements):
+            match = index.lookup_indexes(doc_elem.name, self.fuzzy_threshold)
+            if match is None:
+                discrepancies['outdated_documentation'].append(as_model(doc_elem))
+                continue
+            level, key, positions = match
+            if len(positions) == 1:
+                position = positions[0]
+            else:
+                nearby = index.file_candidates(level, key, doc_elem.file_path)
+                position = nearby[0] if nearby else positions[0]
+                documented.update(nearby)
+                ambiguous.setdefault((level, key), (positions, []))[1].append(doc_elem)
+            documented.add(position)
+            pairs.append((position, doc_elem))
+            pair_positions.append((position, doc_position))
+            confidence = index.match_confidence(level, doc_elem.name, key)
+            match_info.append((level, confidence))
+            if level == MATCH_FUZZY:
+                discrepancies['fuzzy_matches'].append({
+                    'doc_name': doc_elem.name,
+                    'doc_file': doc_elem.file_path,
+                    'element_name': index.elements[position].name,
+                    'qualified_name': index.qualified_name(position),
+                    'match_confidence': confidence
+                })
+
+        # Finde undokumentierten Code (ausschließlich Funktionen, Klassen und API-Endpunkte)
+        for position, code_elem in enumerate(index.elements):
+            if position not in documented and _is_documentable(code_elem):
+                discrepancies['undocumented_code'].append(as_model(code_elem))
+
+        # Gleichnamige Kandidaten, die eine Überschrift nicht eindeutig abdeckt
+        for (level, key), (positions, docs) in ambiguous.items():
+            others = [position for position in positions
+                      if position not in documented and _is_documentable(index.elements[position])]
+            if others:
+                discrepancies['ambiguous_documentation'].append({
+                    'doc_name': docs[0].name,
+                    'doc_files': sorted({doc.file_path or '' for doc in docs}),
+                    'match_level': level,
+                    'documented': [index.qualified_name(position) for position in positions if position in documented],
+                    'candidates': [index.qualified_name(position) for position in others]
+                })
+
+        # Finde Diskrepanzen zwischen zugeordneten Elementen mit differenzierter Analyse
+        inputs = [ConflictInput.from_pair(index.elements[position], doc_elem) for position, doc_elem in pairs]
+        if self.cache is not None:
+            keys = [self._pair_key(index, position, doc_elem) for position, doc_elem in pairs]
+            results = self._analyze_incremental(inputs, keys)
+        else:
+            results = self._analyze_inputs(inputs)
+            self.last_run_statistics = {'pairs': len(inputs), 'analyzed': len(inputs), 'reused': 0}
+        self.doc_sections.commit()
+        for (position, doc_elem), (level, confidence), conflict_analysis in zip(pairs, match_info, results):
+            code_elem = index.elements[position]
             if conflict_analysis:
                 discrepancies['mismatched_elements'].append({
-                    'code': code_elem,
-                    'documentation': doc_elem,
-                    'conflict_analysis': conflict_analysis
+                    'code': as_model(code_elem),
+                    'documentation': as_model(doc_elem),
+                    'conflict_analysis': conflict_analysis,
+                    'match_level': level,
+                    'match_confidence': confidence
                 })
                 
                 discrepancies['conflict_analysis'].append({
-                    'element_name': name,
-                    'conflict_analysis': conflict_analysis
+                    'element_name': code_elem.name,
+                    'qualified_name': index.qualified_name(position),
+                    'conflict_analysis': conflict_analysis,
+                    'match_level': level,
+                    'match_confidence': confidence
                 })
 
+        if embeddings is not None:
+            discrepancies['embedding_analysis'] = self.embedding_stage.analyze(
+                index.elements, doc_elements, embeddings, pair_positions, code_name=index.qualified_name)
+
         return discrepancies
 
+    @staticmethod
+    def _pair_key(index: SymbolIndex, position: int, doc_elem: DocElement) -> str:
+        """Schlüssel eines Paars für den MatchCache: Code-Element und Fundstelle der Dokumentation"""
+        return f"{index.qualified_name(position)}|{doc_elem.file_path or ''}:{doc_elem.line_number or ''}:{doc_elem.name}"
+
+    def _analyze_incremental(self, inputs: List[ConflictInput], keys: List[str]) -> List[List[Dict[str, Any]]]:
+        """
+        Analysiert nur Paare, deren Felder oder Zuordnung sich seit dem letzten Lauf geändert haben
+
+        Die übrigen Konflikte stammen aus dem Cache; Einträge für nicht mehr
+        vorhandene Paare werden entfernt.
+
+        Returns:
+            Konfliktliste pro Paar in Eingabereihenfolge
+        """
+        hashes = [conflict_input.content_hash() for conflict_input in inputs]
+        results = [self.cache.lookup(key, input_hash, conflict_input)
+                   for key, input_hash, conflict_input in zip(keys, hashes, inputs)]
+        changed = [position for position, result in enumerate(results) if result is None]
+
+        analyzed = self._analyze_inputs([inputs[position] for position in changed])
+        for position, conflicts in zip(changed, analyzed):
+            results[position] = conflicts
+            self.cache.store(keys[position], hashes[position], inputs[position], conflicts)
+        self.cache.prune(keys)
+        self.cache.commit()
+        self.last_run_statistics = {'pairs': len(inputs), 'analyzed': len(changed),
+                                    'reused': len(inputs) - len(changed)}
+        return results
+
+    def _analyze_inputs(self, inputs: List[ConflictInput]) -> List[List[Dict[str, Any]]]:
+        """
+        Analysiert alle zugeordneten Paare, bei genügend Paaren verteilt auf Worker-Prozesse
+
+        Die Abschnitte der Dokumentation werden vorab im Elternprozess aus dem
+        DocSectionCache geholt, sodass jeder Text nur einmal geparst wird. Die Paare
+        werden in zusammenhängende Chunks geteilt; executor.map liefert die Ergebnisse
+        in der Reihenfolge der Chunks, das Ergebnis ist also identisch mit der
+        seriellen Analyse.
+
+        Returns:
+            Konfliktliste pro Paar in Eingabereihenfolge
+        """
+        items = [(conflict_input, self.doc_sections.get(conflict_input.content)) for conflict_input in inputs]
+        process_count = self._process_count()
+        if process_count <= 1 or len(inputs) < max(1, self.parallel_min_pairs):
+            return [self._analyze_input(conflict_input, sections) for conflict_input, sections in items]
+
+        chunk_count = min(len(items), process_count * CHUNKS_PER_WORKER)
+        chunk_size = -(-len(items) // chunk_count)
+        chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+        results = []
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=process_count, initializer=_init_conflict_worker,
+                initargs=(self.similarity, self.similarity_threshold, self.confidence_thresholds)) as executor:
+            for chunk_results in executor.map(_analyze_chunk, chunks):
+                results.extend(chunk_results)
+        return results
+
+    def _process_count(self) -> int:
+        """Anzahl der Worker-Prozesse für die Konfliktanalyse (höchstens eine pro CPU-Kern)"""
+        cpu_count = os.cpu_count() or 1
+        if not self.workers:
+            return cpu_count
+        return max(1, min(self.workers, cpu_count))
+
     def _analyze_conflict(self, code_elem: CodeElement, doc_elem: DocElement) -> List[Dict[str, Any]]:
         """Führt eine detaillierte Konfliktanalyse durch"""
+        return self._analyze_input(ConflictInput.from_pair(code_elem, doc_elem))
+
+    def _analyze_input(self, conflict_input: ConflictInput,
+                       sections: Optional[DocSections] = None) -> List[Dict[str, Any]]:
+        """
+        Führt die Konfliktanalyse für die Felder eines Paars durch
+
+        Args:
+            conflict_input: Felder des Paars
+            sections: Bereits geparste Abschnitte der Dokumentation (Standard: aus dem DocSectionCache)
+        """
+        if sections is None:
+            sections = self.doc_sections.get(conflict_input.content)
         conflicts = []
         
         # 1. Parameter-Konflikte
-        param_conflict = self._analyze_parameter_conflicts(code_elem, doc_elem)
+        param_conflict = self._analyze_parameter_conflicts(conflict_input, sections)
         if param_conflict:
             conflicts.append(param_conflict)
         
         # 2. Rückgabetyp-Konflikte
-        return_conflict = self._analyze_return_type_conflicts(code_elem, doc_elem)
+        return_conflict = self._analyze_return_type_conflicts(conflict_input, sections)
         if return_conflict:
             conflicts.append(return_conflict)
         
         # 3. Signatur-Konflikte
-        signature_conflict = self._analyze_signature_conflicts(code_elem, doc_elem)
+        signature_conflict = self._analyze_signature_conflicts(conflict_input)
         if signature_conflict:
             conflicts.append(signature_conflict)
         
         # 4. Beschreibungs-Konflikte
-        description_conflict = self._analyze_description_conflicts(code_elem, doc_elem)
+        description_conflict = self._analyze_description_conflicts(conflict_input, sections)
         if description_conflict:
             conflicts.append(description_conflict)
         
         return conflicts
 
-    def _analyze_parameter_conflicts(self, code_elem: CodeElement, doc_elem: DocElement) -> Optional[Dict[str, Any]]:
+    def _analyze_parameter_conflicts(self, conflict_input: ConflictInput,
+                                     sections: DocSections) -> Optional[Dict[str, Any]]:
         """Analysiert Parameter-Konflikte"""
-        if not code_elem.parameters or not doc_elem.content:
+        if not conflict_input.parameters or not conflict_input.content:
             return None
         
-        # Extrahiere Parameter aus der Dokumentation
-        doc_params = self._extract_parameters_from_doc(doc_elem.content)
+        # Parameter aus der Dokumentation
+        doc_params = [{'name': name} for name in sections.parameters]
         
         # Vergleiche Parameterlisten
-        code_param_names = [p.get('name', '') for p in code_elem.parameters if isinstance(p, dict)]
+        code_param_names = [p.get('name', '') for p in conflict_input.parameters if isinstance(p, dict)]
         doc_param_names = [p.get('name', '') for p in doc_params if isinstance(p, dict)]
         
         missing_in_doc = set(code_param_names) - set(doc_param_names)
@@ -139,14 +482,14 @@ class AdvancedMatcherEngine:
         
         if missing_in_doc or extra_in_doc:
             resolution = self._resolve_parameter_conflict(
-                code_elem.parameters, doc_params, missing_in_doc, extra_in_doc
+                conflict_input.parameters, doc_params, missing_in_doc, extra_in_doc
             )
             
             return {
                 'conflict_type': ConflictType.MISMATCHED_PARAMETERS.value,
                 'resolution': resolution,
                 'details': {
-                    'code_parameters': code_elem.parameters,
+                    **input_details(ConflictType.MISMATCHED_PARAMETERS.value, conflict_input),
                     'doc_parameters': doc_params,
                     'missing_in_doc': list(missing_in_doc),
                     'extra_in_doc': list(extra_in_doc)
@@ -155,115 +498,85 @@ class AdvancedMatcherEngine:
         
         return None
 
-    def _analyze_return_type_conflicts(self, code_elem: CodeElement, doc_elem: DocElement) -> Optional[Dict[str, Any]]:
+    def _analyze_return_type_conflicts(self, conflict_input: ConflictInput,
+                                       sections: DocSections) -> Optional[Dict[str, Any]]:
         """Analysiert Rückgabetyp-Konflikte"""
-        if not code_elem.return_type or not doc_elem.content:
+        if not conflict_input.return_type or not conflict_input.content:
             return None
         
-        # Extrahiere Rückgabetyp aus der Dokumentation
-        doc_return_type = self._extract_return_type_from_doc(doc_elem.content)
+        # Rückgabetyp aus der Dokumentation
+        doc_return_type = sections.return_type
         
         # Vergleiche Rückgabetypen
-        if code_elem.return_type.lower() != doc_return_type.lower():
-            resolution = self._resolve_return_type_conflict(code_elem.return_type, doc_return_type)
+        if conflict_input.return_type.lower() != doc_return_type.lower():
+            resolution = self._resolve_return_type_conflict(conflict_input.return_type, doc_return_type)
             
             return {
                 'conflict_type': ConflictType.MISMATCHED_RETURN_TYPE.value,
                 'resolution': resolution,
                 'details': {
-                    'code_return_type': code_elem.return_type,
+                    **input_details(ConflictType.MISMATCHED_RETURN_TYPE.value, conflict_input),
                     'doc_return_type': doc_return_type
                 }
             }
         
         return None
 
-    def _analyze_signature_conflicts(self, code_elem: CodeElement, doc_elem: DocElement) -> Optional[Dict[str, Any]]:
+    def _analyze_signature_conflicts(self, conflict_input: ConflictInput) -> Optional[Dict[str, Any]]:
         """Analysiert Signatur-Konflikte"""
-        if not code_elem.signature or not doc_elem.content:
+        if not conflict_input.signature or not conflict_input.content:
             return None
         
         # Berechne die Ähnlichkeit zwischen Code-Signatur und Dokumentation
-        similarity = difflib.SequenceMatcher(
-            None, 
-            code_elem.signature.lower(), 
-            doc_elem.content.lower()
-        ).ratio()
+        similarity = self.similarity.similarity(conflict_input.signature, conflict_input.content)
         
-        if similarity < self.confidence_thresholds['medium']:
+        if similarity < self.similarity_threshold:
             resolution = self._resolve_signature_conflict(similarity)
             
             return {
                 'conflict_type': ConflictType.MISMATCHED_SIGNATURE.value,
                 'resolution': resolution,
                 'details': {
-                    'code_signature': code_elem.signature,
-                    'doc_content': doc_elem.content[:200] + "..." if len(doc_elem.content) > 200 else doc_elem.content,
-                    'similarity': similarity
+                    **input_details(ConflictType.MISMATCHED_SIGNATURE.value, conflict_input),
+                    'similarity': similarity,
+                    'similarity_method': self.similarity.name
                 }
             }
         
         return None
 
-    def _analyze_description_conflicts(self, code_elem: CodeElement, doc_elem: DocElement) -> Optional[Dict[str, Any]]:
+    def _analyze_description_conflicts(self, conflict_input: ConflictInput,
+                                       sections: DocSections) -> Optional[Dict[str, Any]]:
         """Analysiert Beschreibungs-Konflikte"""
-        if not code_elem.docstring or not doc_elem.content:
+        if not conflict_input.docstring or not conflict_input.content:
             return None
         
-        # Berechne die Ähnlichkeit zwischen Docstring und Dokumentation
-        similarity = difflib.SequenceMatcher(
-            None, 
-            code_elem.docstring.lower(), 
-            doc_elem.content.lower()
-        ).ratio()
+        # Berechne die Ähnlichkeit zwischen Docstring und Beschreibung (ohne Parameter, Rückgabe und Beispiele)
+        similarity = self.similarity.similarity(conflict_input.docstring,
+                                                sections.description or conflict_input.content)
         
-        if similarity < self.confidence_thresholds['medium']:
+        if similarity < self.similarity_threshold:
             resolution = self._resolve_description_conflict(similarity)
             
             return {
                 'conflict_type': ConflictType.MISMATCHED_DESCRIPTION.value,
                 'resolution': resolution,
                 'details': {
-                    'code_docstring': code_elem.docstring,
-                    'doc_content': doc_elem.content,
-                    'similarity': similarity
+                    **input_details(ConflictType.MISMATCHED_DESCRIPTION.value, conflict_input),
+                    'similarity': similarity,
+                    'similarity_method': self.similarity.name
                 }
             }
         
         return None
 
     def _extract_parameters_from_doc(self, doc_content: str) -> List[Dict[str, str]]:
-        """Extrahiert Parameter aus der Dokumentation"""
-        params = []
-        
-        # Einfache Extraktion von Parametern aus der Dokumentation
-        # In einer vollständigen Implementierung würde dies komplexere Parsing-Logik verwenden
-        lines = doc_content.split('\n')
-        for line in lines:
-            # Suche nach gängigen Parametern-Mustern
-            if any(keyword in line.lower() for keyword in ['param', 'parameter', 'args', 'arguments']):
-                # Extrahiere Parameternamen (vereinfacht)
-                import re
-                param_matches = re.findall(r'([a-zA-Z_][a-zA-Z0-9_]*)', line)
-                for match in param_matches:
-                    if len(match) > 1 and not any(keyword in match.lower() for keyword in ['param', 'parameter', 'args', 'arguments']):
-                        params.append({'name': match})
-        
-        return params
+        """Extrahiert Parameter aus der Dokumentation (siehe doc_sections.parse_doc_sections)"""
+        return [{'name': name} for name in self.doc_sections.get(doc_content).parameters]
 
     def _extract_return_type_from_doc(self, doc_content: str) -> str:
-        """Extrahiert den Rückgabetyp aus der Dokumentation"""
-        # Einfache Extraktion des Rückgabetyps aus der Dokumentation
-        lines = doc_content.split('\n')
-        for line in lines:
-            if any(keyword in line.lower() for keyword in ['return', 'returns', 'rueckgabe']):
-                # Extrahiere möglichen Typ (vereinfacht)
-                import re
-                type_matches = re.findall(r':\s*([a-zA-Z][a-zA-Z0-9_]*)', line)
-                if type_matches:
-                    return type_matches[0]
-        
-        return "unknown"
+        """Extrahiert den Rückgabetyp aus der Dokumentation (siehe doc_sections.parse_doc_sections)"""
+        return self.doc_sections.get(doc_content).return_type
 
     def _resolve_parameter_conflict(self, code_params: List[Dict], doc_params: List[Dict], 
                                    missing_in_doc: set, extra_in_doc: set) -> ConflictResolutionResult:
@@ -400,6 +713,7 @@ class AdvancedMatcherEngine:
                         'conflict_type': conflict['conflict_type'],
                         'resolution': conflict['resolution'].resolution_strategy.value,
                         'confidence': conflict['resolution'].confidence,
+                        'match_confidence': mismatch.get('match_confidence', 1.0),
                         'reason': conflict['resolution'].reason,
                         'suggested_action': self._get_action_description(conflict['resolution'].resolution_strategy)
                     })
@@ -0,0 +1,212 @@
+"""
+Strukturierte Abschnitte der Dokumentation für die Konfliktanalyse
+
+Der Inhalt eines Dokumentations-Elements wird einmal in Beschreibung,
+Parameter, Rückgabetyp und Beispiele zerlegt. Die Konfliktanalyse liest nur
+noch diese Abschnitte; gleicher Inhalt (z.B. ein Dokument, dem mehrere
+Code-Elemente zugeordnet sind) wird über seinen Hash nur einmal geparst.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+from src.scanner.scan_cache import prepare_cache_dir
+
+# Bei Änderungen am Parser erhöhen, damit gespeicherte Abschnitte verworfen werden
+PARSER_VERSION = 1
+SECTIONS_DB_NAME = "doc_sections.sqlite"
+
+_PARAM_KEYWORDS = ('param', 'parameter', 'args', 'arguments')
+_RETURN_KEYWORDS = ('return', 'returns', 'rueckgabe')
+_IDENTIFIER = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)')
+_TYPE_AFTER_COLON = re.compile(r':\s*([a-zA-Z][a-zA-Z0-9_]*)')
+_TABLE_SEPARATOR = set('|-: ')
+
+
+class DocSections(NamedTuple):
+    """Abschnitte eines Dokumentationstexts"""
+    description: str  # Fließtext ohne Parameter-, Rückgabe- und Beispielzeilen
+    parameters: List[str]  # Parameternamen in Reihenfolge des Auftretens
+    return_type: str  # Erster dokumentierter Rückgabetyp oder "unknown"
+    examples: List[str]  # Inhalt der Codeblöcke und Doctest-Zeilen
+
+
+EMPTY_SECTIONS = DocSections("", [], "unknown", [])
+
+
+def content_hash(content: str) -> str:
+    """Hash eines Dokumentationstexts (Schlüssel des DocSectionCache)"""
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def parse_doc_sections(content: Optional[str]) -> DocSections:
+    """
+    Zerlegt einen Dokumentationstext in einem Durchlauf über die Zeilen
+
+    - Parameter: Bezeichner in Zeilen mit "param", "args", ... sowie die erste
+      Spalte einer Markdown-Tabelle, deren Kopfzeile ein solches Wort enthält
+    - Rückgabetyp: erster Typ nach einem Doppelpunkt in einer Zeile mit "return"/"rueckgabe"
+    - Beispiele: Codeblöcke (``` bzw. ~~~) und Doctest-Zeilen (>>>); sie zählen
+      weder zu den Parametern noch zur Beschreibung
+    - Beschreibung: alle übrigen Zeilen
+
+    Args:
+        content: Inhalt des Dokumentations-Elements
+
+    Returns:
+        Die Abschnitte des Texts
+    """
+    if not content:
+        return EMPTY_SECTIONS
+    description, parameters, examples = [], [], []
+    return_type = None
+    fence, fence_lines = None, []
+    in_param_table = False
+
+    for line in content.split('\n'):
+        stripped = line.strip()
+        if fence:
+            if stripped.startswith(fence):
+                examples.append('\n'.join(fence_lines))
+                fence, fence_lines = None, []
+            else:
+                fence_lines.append(line)
+            continue
+        if stripped.startswith(('```', '~~~')):
+            fence = stripped[:3]
+            continue
+        if stripped.startswith('>>>'):
+            examples.append(stripped[3:].strip())
+            continue
+
+        if in_param_table and stripped.startswith('|'):
+            if not set(stripped) <= _TABLE_SEPARATOR:
+                match = _IDENTIFIER.search(stripped.strip('|').split('|')[0])
+                if match:
+                    parameters.append(match.group(1))
+            continue
+        in_param_table = False
+
+        lower = line.lower()
+        is_param = any(keyword in lower for keyword in _PARAM_KEYWORDS)
+        is_return = any(keyword in lower for keyword in _RETURN_KEYWORDS)
+        if is_return and return_type is None:
+            type_match = _TYPE_AFTER_COLON.search(line)
+            if type_match:
+                return_type = type_match.group(1)
+        if is_param:
+            if stripped.startswith('|'):
+                # Kopfzeile einer Parametertabelle; die Namen stehen in den folgenden Zeilen
+                in_param_table = True
+                continue
+            parameters.extend(name for name in _IDENTIFIER.findall(line)
+                              if len(name) > 1 and not any(keyword in name.lower() for keyword in _PARAM_KEYWORDS))
+        elif not is_return:
+            description.append(line)
+
+    if fence_lines:
+        examples.append('\n'.join(fence_lines))
+    return DocSections('\n'.join(description).strip(), parameters, return_type or "unknown", examples)
+
+
+class DocSectionCache:
+    """
+    Abschnitte der Dokumentation nach Hash des Inhalts
+
+    Ohne cache_dir lebt der Cache nur im Speicher (ein Matcher-Lauf). Mit
+    cache_dir werden neu geparste Abschnitte in einer SQLite-Datenbank abgelegt
+    und in späteren Läufen wiederverwendet; ältere Einträge werden oberhalb von
+    max_entries verworfen.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = 100_000):
+        """
+        Args:
+            cache_dir: Verzeichnis für die Datenbank (in der Regel das des Scan-Caches); None: nur im Speicher
+            max_entries: Maximale Anzahl gespeicherter Einträge in der Datenbank
+        """
+        self.max_entries = max_entries
+        self._sections: Dict[str, DocSections] = {}
+        self._pending: Dict[str, DocSections] = {}
+        self.hits = 0
+        self.parsed = 0
+
+        self.connection = None
+        if cache_dir is not None:
+            cache_dir = prepare_cache_dir(cache_dir)
+            self.db_path = cache_dir / SECTIONS_DB_NAME
+            self.connection = sqlite3.connect(str(self.db_path))
+            self._init_schema()
+
+    def _init_schema(self):
+        """Legt die Tabellen an und verwirft die Einträge einer anderen Parser-Version"""
+        cursor = self.connection.cursor()
+        cursor.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        cursor.execute("CREATE TABLE IF NOT EXISTS sections (content_hash TEXT PRIMARY KEY, sections TEXT)")
+        row = cursor.execute("SELECT value FROM meta WHERE key = 'parser_version'").fetchone()
+        if row is None or row[0] != str(PARSER_VERSION):
+            cursor.execute("DELETE FROM sections")
+            cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('parser_version', ?)",
+                           (str(PARSER_VERSION),))
+        self.connection.commit()
+
+    def get(self, content: Optional[str]) -> DocSections:
+        """
+        Gibt die Abschnitte eines Dokumentationstexts zurück und parst ihn nur beim ersten Mal
+
+        Args:
+            content: Inhalt des Dokumentations-Elements
+        """
+        if not content:
+            return EMPTY_SECTIONS
+        key = content_hash(content)
+        sections = self._sections.get(key)
+        if sections is None:
+            sections = self._load(key)
+            if sections is None:
+                sections = parse_doc_sections(content)
+                self.parsed += 1
+                if self.connection is not None:
+                    self._pending[key] = sections
+            else:
+                self.hits += 1
+            self._sections[key] = sections
+        else:
+            self.hits += 1
+        return sections
+
+    def _load(self, key: str) -> Optional[DocSections]:
+        """Liest die Abschnitte eines Hashs aus der Datenbank"""
+        if self.connection is None:
+            return None
+        row = self.connection.execute("SELECT sections FROM sections WHERE content_hash = ?", (key,)).fetchone()
+        return DocSections(*json.loads(row[0])) if row else None
+
+    def commit(self):
+        """Schreibt neu geparste Abschnitte und verwirft die ältesten Einträge oberhalb von max_entries"""
+        if self.connection is None:
+            return
+        if self._pending:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO sections (content_hash, sections) VALUES (?, ?)",
+                [(key, json.dumps(list(sections), ensure_ascii=False, separators=(',', ':')))
+                 for key, sections in self._pending.items()]
+            )
+            self._pending.clear()
+            self.connection.execute(
+                "DELETE FROM sections WHERE rowid <= (SELECT MAX(rowid) FROM sections) - ?", (self.max_entries,)
+            )
+        self.connection.commit()
+
+    def close(self):
+        """Schreibt ausstehende Änderungen und schließt die Datenbank"""
+        if self.connection is not None:
+            self.commit()
+            self.connection.close()
+            self.connection = None
+
+    def get_statistics(self) -> dict:
+        """Gibt die Anzahl wiederverwendeter und neu geparster Texte zurück"""
+        return {'sections_reused': self.hits, 'sections_parsed': self.parsed}
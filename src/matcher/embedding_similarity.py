@@ -0,0 +1,252 @@
+"""
+Embedding-basierte Ähnlichkeit zwischen Code- und Dokumentations-Elementen
+
+Die Embeddings, die der ChromaUpdater für Code und Dokumentation ablegt, werden
+als Matrizen geladen. Die Kosinus-Ähnlichkeit aller Paare entsteht blockweise
+durch Matrixmultiplikation; pro Block werden nur die k besten Dokumente je
+Code-Element und die beste Ähnlichkeit je Dokument behalten. Der Speicherbedarf
+hängt damit von der Blockgröße ab, nicht vom Produkt der Elementanzahlen.
+
+Zugeordnet werden die Vektoren über den qualifizierten Namen und die Zeile des
+Elements (siehe element_key), damit gleichnamige Methoden einer Datei ihre
+eigenen Embeddings behalten.
+"""
+import time
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+from src.models.element import CodeElement, DocElement
+from src.matcher.symbol_index import SymbolIndex
+
+try:
+    import numpy as np
+except ImportError:  # numpy wird mit chromadb installiert
+    np = None
+
+
+def element_key(qualified_name: str, line_number: Optional[int]) -> Tuple[str, int]:
+    """
+    Schlüssel eines Elements für die Zuordnung der Embeddings
+
+    Args:
+        qualified_name: Qualifizierter Name, für Code SymbolIndex.qualified_name ("datei::Klasse.methode"),
+                        für Dokumentation doc_qualified_name
+        line_number: Zeile des Elements (None wird als 0 abgelegt)
+    """
+    return qualified_name, line_number or 0
+
+
+def doc_qualified_name(doc_elem: Any) -> str:
+    """Qualifizierter Name eines Dokumentations-Elements ("datei::Überschrift")"""
+    return f"{doc_elem.file_path or ''}::{doc_elem.name}"
+
+
+class ElementEmbeddings(NamedTuple):
+    """Embeddings der Code- und Dokumentations-Elemente; Zeile i gehört zu keys[i]"""
+    code_keys: List[Hashable]
+    code_vectors: Any  # np.ndarray (Anzahl x Dimension)
+    doc_keys: List[Hashable]
+    doc_vectors: Any
+
+    @classmethod
+    def from_vectors(cls, code: Dict[Hashable, Sequence[float]],
+                     doc: Dict[Hashable, Sequence[float]]) -> 'ElementEmbeddings':
+        """Erstellt die Matrizen aus Dictionaries Schlüssel -> Vektor"""
+        return cls(list(code), _as_matrix(list(code.values())), list(doc), _as_matrix(list(doc.values())))
+
+
+def _as_matrix(vectors: List[Sequence[float]]) -> Any:
+    if not vectors:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def normalize_rows(matrix: Any) -> Tuple[Any, Any]:
+    """
+    Normiert die Zeilen auf Länge 1
+
+    Returns:
+        (normierte Matrix als float32, Maske der Zeilen mit Länge > 0); Nullvektoren
+        (Platzhalter, wenn kein Embedding erzeugt werden konnte) bleiben 0
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1) if matrix.size else np.zeros(len(matrix), dtype=np.float32)
+    valid = norms > 0
+    normalized = np.zeros_like(matrix)
+    normalized[valid] = matrix[valid] / norms[valid, None]
+    return normalized, valid
+
+
+def blocked_top_k(code_matrix: Any, doc_matrix: Any, k: int = 5,
+                  block_size: int = 2048) -> Tuple[Any, Any, Any]:
+    """
+    Berechnet die k ähnlichsten Dokumente je Code-Element in Blöcken
+
+    Beide Matrizen müssen zeilenweise normiert sein. Pro Block entsteht eine
+    Ähnlichkeitsmatrix von höchstens block_size x block_size Werten; die besten
+    Kandidaten werden mit argpartition ohne vollständige Sortierung bestimmt.
+
+    Args:
+        code_matrix: Normierte Code-Embeddings (n x d)
+        doc_matrix: Normierte Dokumentations-Embeddings (m x d)
+        k: Anzahl der Kandidaten je Code-Element
+        block_size: Zeilen bzw. Spalten pro Block
+
+    Returns:
+        (Indizes n x k, Ähnlichkeiten n x k absteigend sortiert, beste Ähnlichkeit je Dokument m)
+    """
+    n_code, n_doc = len(code_matrix), len(doc_matrix)
+    k = min(k, n_doc)
+    top_indices = np.zeros((n_code, k), dtype=np.int64)
+    top_scores = np.zeros((n_code, k), dtype=np.float32)
+    doc_best = np.full(n_doc, -np.inf, dtype=np.float32)
+    if not n_code or not k:
+        return top_indices, top_scores, doc_best
+
+    for code_start in range(0, n_code, block_size):
+        code_block = code_matrix[code_start:code_start + block_size]
+        best_scores = np.full((len(code_block), k), -np.inf, dtype=np.float32)
+        best_indices = np.zeros((len(code_block), k), dtype=np.int64)
+        for doc_start in range(0, n_doc, block_size):
+            scores = code_block @ doc_matrix[doc_start:doc_start + block_size].T
+            doc_slice = doc_best[doc_start:doc_start + scores.shape[1]]
+            np.maximum(doc_slice, scores.max(axis=0), out=doc_slice)
+
+            # Beste Kandidaten des Blocks mit den bisherigen zusammenführen
+            block_k = min(k, scores.shape[1])
+            candidates = np.argpartition(scores, -block_k, axis=1)[:, -block_k:]
+            merged_scores = np.concatenate([best_scores, np.take_along_axis(scores, candidates, axis=1)], axis=1)
+            merged_indices = np.concatenate([best_indices, candidates + doc_start], axis=1)
+            keep = np.argpartition(merged_scores, -k, axis=1)[:, -k:]
+            best_scores = np.take_along_axis(merged_scores, keep, axis=1)
+            best_indices = np.take_along_axis(merged_indices, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1, kind='stable')
+        top_scores[code_start:code_start + len(code_block)] = np.take_along_axis(best_scores, order, axis=1)
+        top_indices[code_start:code_start + len(code_block)] = np.take_along_axis(best_indices, order, axis=1)
+    return top_indices, top_scores, doc_best
+
+
+class EmbeddingSimilarity:
+    """
+    Optionale Matcher-Stufe auf Basis der gespeicherten Embeddings
+
+    Liefert je Code-Element die k ähnlichsten Dokumentations-Elemente, markiert
+    Dokumentation ohne ähnliches Code-Element als vermutlich veraltet und
+    zugeordnete Paare mit geringer Ähnlichkeit als verdächtig.
+    """
+
+    def __init__(self, top_k: int = 5, low_similarity: float = 0.3, block_size: int = 2048):
+        """
+        Args:
+            top_k: Anzahl der Dokumentations-Kandidaten je Code-Element
+            low_similarity: Unterhalb dieser Kosinus-Ähnlichkeit gilt ein Paar bzw. Dokument als auffällig
+            block_size: Zeilen bzw. Spalten pro Block der Matrixmultiplikation
+        """
+        self.top_k = top_k
+        self.low_similarity = low_similarity
+        self.block_size = block_size
+
+    def analyze(self, code_elements: Sequence[CodeElement], doc_elements: Sequence[DocElement],
+                embeddings: ElementEmbeddings,
+                pairs: Sequence[Tuple[int, int]] = (),
+                code_name: Optional[Callable[[int], str]] = None) -> Dict[str, Any]:
+        """
+        Vergleicht Code und Dokumentation über ihre Embeddings
+
+        Elemente ohne gespeichertes Embedding (oder mit Platzhalter-Nullvektor)
+        werden übersprungen. Die Vektoren werden wie beim Ablegen über
+        element_key aus qualifiziertem Namen und Zeile gefunden.
+
+        Args:
+            code_elements: Code-Elemente (ausschließlich CodeElement-Objekte)
+            doc_elements: Dokumentations-Elemente
+            embeddings: Geladene Embeddings (z.B. ChromaUpdater.load_element_embeddings)
+            pairs: Über den Namen zugeordnete Paare (Position in code_elements, Position in doc_elements)
+            code_name: Qualifizierter Name eines Code-Elements aus seiner Position, z.B.
+                       SymbolIndex.qualified_name (Standard: Index über code_elements)
+
+        Returns:
+            top_candidates, likely_outdated, low_similarity_pairs und statistics
+        """
+        if np is None:
+            print("Warnung: numpy ist nicht installiert, Embedding-Analyse wird übersprungen")
+            return {}
+        code_name = code_name or SymbolIndex(code_elements).qualified_name
+        start = time.perf_counter()
+        code_rows, code_positions = self._rows(
+            [element_key(code_name(position), element.line_number) for position, element in enumerate(code_elements)],
+            embeddings.code_keys)
+        doc_rows, doc_positions = self._rows(
+            [element_key(doc_qualified_name(element), element.line_number) for element in doc_elements],
+            embeddings.doc_keys)
+        code_matrix, code_positions = self._valid_rows(embeddings.code_vectors, code_rows, code_positions)
+        doc_matrix, doc_positions = self._valid_rows(embeddings.doc_vectors, doc_rows, doc_positions)
+
+        result = {'top_candidates': [], 'likely_outdated': [], 'low_similarity_pairs': []}
+        if len(code_matrix) and len(doc_matrix):
+            if code_matrix.shape[1] != doc_matrix.shape[1]:
+                print("Warnung: Code- und Dokumentations-Embeddings haben unterschiedliche Dimensionen")
+                return {}
+            top_indices, top_scores, doc_best = blocked_top_k(code_matrix, doc_matrix, self.top_k, self.block_size)
+            for row, position in enumerate(code_positions):
+                result['top_candidates'].append({
+                    'element_name': code_name(position),
+                    'candidates': [self._doc_entry(doc_elements[doc_positions[column]], score)
+                                   for column, score in zip(top_indices[row].tolist(), top_scores[row].tolist())]
+                })
+            for column in np.flatnonzero(doc_best < self.low_similarity).tolist():
+                entry = self._doc_entry(doc_elements[doc_positions[column]], float(doc_best[column]))
+                result['likely_outdated'].append(entry)
+            result['low_similarity_pairs'] = self._score_pairs(
+                pairs, code_matrix, doc_matrix, code_positions, doc_positions, doc_elements, code_name)
+
+        result['statistics'] = {
+            'code_vectors': len(code_matrix),
+            'doc_vectors': len(doc_matrix),
+            'seconds': time.perf_counter() - start
+        }
+        return result
+
+    @staticmethod
+    def _rows(element_keys: Sequence[Hashable], keys: Sequence[Hashable]) -> Tuple[List[int], List[int]]:
+        """Gibt die Matrixzeilen und Positionen der Elemente mit Embedding zurück"""
+        row_of = {key: row for row, key in enumerate(keys)}
+        rows, positions = [], []
+        for position, key in enumerate(element_keys):
+            row = row_of.get(key)
+            if row is not None:
+                rows.append(row)
+                positions.append(position)
+        return rows, positions
+
+    @staticmethod
+    def _valid_rows(vectors: Any, rows: List[int], positions: List[int]) -> Tuple[Any, List[int]]:
+        """Normiert die Zeilen der Elemente und entfernt Platzhalter-Nullvektoren"""
+        if not rows:
+            return np.zeros((0, 0), dtype=np.float32), []
+        matrix, valid = normalize_rows(vectors[rows])
+        return matrix[valid], [position for position, is_valid in zip(positions, valid.tolist()) if is_valid]
+
+    @staticmethod
+    def _doc_entry(doc_elem: DocElement, similarity: float) -> Dict[str, Any]:
+        return {'doc_name': doc_elem.name, 'doc_file': doc_elem.file_path, 'similarity': round(similarity, 4)}
+
+    def _score_pairs(self, pairs, code_matrix, doc_matrix, code_positions, doc_positions,
+                     doc_elements, code_name) -> List[Dict[str, Any]]:
+        """Berechnet die Ähnlichkeit der zugeordneten Paare zeilenweise und gibt die auffälligen zurück"""
+        code_row = {position: row for row, position in enumerate(code_positions)}
+        doc_row = {position: row for row, position in enumerate(doc_positions)}
+        known = [(code_position, doc_position) for code_position, doc_position in pairs
+                 if code_position in code_row and doc_position in doc_row]
+        if not known:
+            return []
+        code_rows = np.fromiter((code_row[code_position] for code_position, _ in known), dtype=np.int64, count=len(known))
+        doc_rows = np.fromiter((doc_row[doc_position] for _, doc_position in known), dtype=np.int64, count=len(known))
+        scores = np.einsum('ij,ij->i', code_matrix[code_rows], doc_matrix[doc_rows])
+
+        flagged = []
+        for index in np.flatnonzero(scores < self.low_similarity).tolist():
+            code_position, doc_position = known[index]
+            entry = self._doc_entry(doc_elements[doc_position], float(scores[index]))
+            entry['element_name'] = code_name(code_position)
+            flagged.append(entry)
+        return flagged
@@ -0,0 +1,106 @@
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional
+from src.core.config_manager import ProjectConfig
+from src.models.element import CodeElement, DocElement
+from src.models.element_store import ElementStore
+from src.matcher.advanced_matcher import AdvancedMatcherEngine
+from src.matcher.embedding_similarity import ElementEmbeddings, EmbeddingSimilarity
+from src.matcher.match_cache import MatchCache
+from src.matcher.doc_sections import DocSectionCache
+from src.scanner.scan_cache import CACHE_DIR_NAME
+from src.scanner.performance_analyzer import measure_phase
+
+class MatcherEngine:
+    def __init__(self, config: Optional[ProjectConfig] = None, project_path: Optional[str] = None):
+        """
+        Args:
+            config: Projektkonfiguration für Ähnlichkeitsmaß, Schwellenwert und Prozesse der Konfliktanalyse (optional)
+            project_path: Wurzelverzeichnis des Projekts; mit use_match_cache werden dort (bzw. in
+                          scan_cache_dir) die Konflikte und die geparsten Dokumentationsabschnitte
+                          für den nächsten Lauf gespeichert
+        """
+        # Verwende den erweiterten Matcher für differenzierte Konfliktanalyse
+        self.advanced_matcher = AdvancedMatcherEngine(
+            similarity=getattr(config, 'similarity_method', None),
+            similarity_threshold=getattr(config, 'similarity_threshold', None),
+            workers=getattr(config, 'matcher_workers', 1),
+            parallel_min_pairs=getattr(config, 'matcher_parallel_min_pairs', 500),
+            fuzzy_threshold=getattr(config, 'fuzzy_match_threshold', 0.75),
+            embedding_stage=EmbeddingSimilarity(
+                top_k=getattr(config, 'embedding_top_k', 5),
+                low_similarity=getattr(config, 'embedding_low_similarity', 0.3),
+                block_size=getattr(config, 'embedding_block_size', 2048)
+            )
+        )
+        cache_dir = self._cache_dir(config, project_path)
+        self.match_cache = self._open_match_cache(cache_dir)
+        self.advanced_matcher.cache = self.match_cache
+        self.section_cache = self._open_section_cache(cache_dir)
+        if self.section_cache is not None:
+            self.advanced_matcher.doc_sections = self.section_cache
+
+    @staticmethod
+    def _cache_dir(config: Optional[ProjectConfig], project_path: Optional[str]) -> Optional[Path]:
+        """Verzeichnis der persistenten Matcher-Caches oder None, falls deaktiviert"""
+        if config is None or not getattr(config, 'use_match_cache', False):
+            return None
+        if config.scan_cache_dir:
+            return Path(config.scan_cache_dir)
+        if project_path:
+            return Path(project_path) / CACHE_DIR_NAME
+        return None
+
+    def _open_match_cache(self, cache_dir: Optional[Path]) -> Optional[MatchCache]:
+        """Öffnet den persistenten Cache der Konfliktanalyse, falls aktiviert"""
+        if cache_dir is None:
+            return None
+        try:
+            return MatchCache(cache_dir, fingerprint=self.advanced_matcher.analysis_fingerprint())
+        except Exception as e:
+            print(f"Warnung: Matcher-Cache konnte nicht geöffnet werden: {e}")
+            return None
+
+    @staticmethod
+    def _open_section_cache(cache_dir: Optional[Path]) -> Optional[DocSectionCache]:
+        """Öffnet den persistenten Cache der Dokumentationsabschnitte, falls aktiviert"""
+        if cache_dir is None:
+            return None
+        try:
+            return DocSectionCache(cache_dir)
+        except Exception as e:
+            print(f"Warnung: Cache der Dokumentationsabschnitte konnte nicht geöffnet werden: {e}")
+            return None
+
+    def close(self):
+        """Schließt die Caches der Konfliktanalyse"""
+        if self.match_cache is not None:
+            self.match_cache.close()
+            self.match_cache = None
+            self.advanced_matcher.cache = None
+        if self.section_cache is not None:
+            self.section_cache.close()
+            self.section_cache = None
+            self.advanced_matcher.doc_sections = DocSectionCache()
+
+    def find_discrepancies(self, code_elements: List[CodeElement], doc_elements: List[DocElement],
+                           embeddings: Optional[ElementEmbeddings] = None) -> Dict[str, Any]:
+        """Findet Diskrepanzen zwischen Code und Dokumentation mit differenzierter Analyse (optional mit Embeddings)"""
+        # Verwende den erweiterten Matcher
+        with measure_phase('match'):
+            return self.advanced_matcher.find_discrepancies(code_elements, doc_elements, embeddings)
+
+    def find_discrepancies_stream(self, file_results: Iterable[Any],
+                                  embeddings: Optional[ElementEmbeddings] = None) -> Dict[str, Any]:
+        """Findet Diskrepanzen direkt aus den Ergebnissen von UniversalScanner.scan_project_iter"""
+        with measure_phase('match'):
+            return self.advanced_matcher.find_discrepancies_stream(file_results, embeddings)
+
+    def find_discrepancies_store(self, store: ElementStore,
+                                 embeddings: Optional[ElementEmbeddings] = None) -> Dict[str, Any]:
+        """Findet Diskrepanzen direkt auf den Zeilen eines ElementStore (UniversalScanner.scan_project_store)"""
+        with measure_phase('match'):
+            return self.advanced_matcher.find_discrepancies_store(store, embeddings)
+
+    def get_resolution_recommendations(self, discrepancies: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Gibt Empfehlungen für die Lösung von Konflikten"""
+        return self.advanced_matcher.get_resolution_recommendations(discrepancies)
\ No newline at end of file
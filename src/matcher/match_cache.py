@@ -0,0 +1,141 @@
+"""
+Persistenter Cache der Konfliktanalyse für inkrementelle Matcher-Läufe
+"""
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from src.matcher.advanced_matcher import (ConflictInput, ConflictResolutionResult, ConflictResolutionStrategy,
+                                          input_details)
+from src.scanner.scan_cache import prepare_cache_dir
+
+# Bei Änderungen an der Konfliktanalyse erhöhen, damit alte Einträge verworfen werden
+CACHE_VERSION = 2
+CACHE_DB_NAME = "match_cache.sqlite"
+
+_STRATEGIES = {strategy.value: strategy for strategy in ConflictResolutionStrategy}
+
+
+class MatchCache:
+    """
+    Speichert die Konflikte jedes zugeordneten Paars in einer SQLite-Datenbank
+
+    Schlüssel ist das Paar aus qualifiziertem Namen des Code-Elements und der
+    Position des Dokumentations-Elements; abgesichert ist der Eintrag über den
+    Hash der analysierten Felder beider Seiten. Ändert sich eine Seite, ändert
+    sich der Hash; wählt der Symbolindex nach hinzugekommenen oder entfernten
+    Elementen einen anderen Kandidaten, ändert sich der Schlüssel. In beiden
+    Fällen wird das Paar neu analysiert.
+
+    Gespeichert werden nur die Ergebnisse der Analyse; Details, die aus den
+    Feldern des Paars stammen (Docstring, Dokumentationsinhalt, ...), werden beim
+    Laden aus den aktuellen Feldern ergänzt.
+    """
+
+    def __init__(self, cache_dir: Path, fingerprint: str = ""):
+        """
+        Initialisiert den Cache
+
+        Args:
+            cache_dir: Verzeichnis für die Cache-Datenbank (in der Regel das des Scan-Caches)
+            fingerprint: Kennung der Analyse-Einstellungen; bei Abweichung wird der Cache geleert
+        """
+        self.cache_dir = prepare_cache_dir(cache_dir)
+        self.db_path = self.cache_dir / CACHE_DB_NAME
+        self.fingerprint = f"{CACHE_VERSION}:{fingerprint}"
+
+        self.hits = 0
+        self.misses = 0
+
+        self.connection = sqlite3.connect(str(self.db_path))
+        self._init_schema()
+
+    def _init_schema(self):
+        """Legt die Tabellen an und verwirft den Cache bei geänderten Einstellungen"""
+        cursor = self.connection.cursor()
+        cursor.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS pairs (pair_key TEXT PRIMARY KEY, input_hash TEXT, conflicts TEXT)"
+        )
+        row = cursor.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        if row is None or row[0] != self.fingerprint:
+            cursor.execute("DELETE FROM pairs")
+            cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)",
+                           (self.fingerprint,))
+        self.connection.commit()
+
+    def lookup(self, pair_key: str, input_hash: str,
+               conflict_input: ConflictInput) -> Optional[List[Dict[str, Any]]]:
+        """
+        Liefert die gespeicherten Konflikte eines Paars oder None bei einem Cache-Miss
+
+        Args:
+            pair_key: Schlüssel des Paars (siehe AdvancedMatcherEngine)
+            input_hash: Aktueller Hash der analysierten Felder (ConflictInput.content_hash)
+            conflict_input: Aktuelle Felder des Paars für die Details der Konflikte
+        """
+        row = self.connection.execute(
+            "SELECT input_hash, conflicts FROM pairs WHERE pair_key = ?", (pair_key,)
+        ).fetchone()
+        if row is None or row[0] != input_hash:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._deserialize_conflicts(row[1], conflict_input)
+
+    def store(self, pair_key: str, input_hash: str, conflict_input: ConflictInput,
+              conflicts: List[Dict[str, Any]]):
+        """Speichert die Konflikte eines Paars"""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO pairs (pair_key, input_hash, conflicts) VALUES (?, ?, ?)",
+            (pair_key, input_hash, self._serialize_conflicts(conflicts, conflict_input))
+        )
+
+    def prune(self, seen_keys: Iterable[str]):
+        """Entfernt Einträge für Paare, die im aktuellen Lauf nicht mehr vorkamen"""
+        seen = set(seen_keys)
+        stale = [(key,) for (key,) in self.connection.execute("SELECT pair_key FROM pairs")
+                 if key not in seen]
+        if stale:
+            self.connection.executemany("DELETE FROM pairs WHERE pair_key = ?", stale)
+
+    def commit(self):
+        """Schreibt ausstehende Änderungen in die Datenbank"""
+        self.connection.commit()
+
+    def close(self):
+        """Schreibt ausstehende Änderungen und schließt die Datenbank"""
+        self.connection.commit()
+        self.connection.close()
+
+    def get_statistics(self) -> dict:
+        """Gibt Trefferstatistiken des Caches zurück"""
+        total = self.hits + self.misses
+        return {
+            'cache_hits': self.hits,
+            'cache_misses': self.misses,
+            'hit_rate': (self.hits / total * 100) if total else 0.0,
+            'cache_path': str(self.db_path)
+        }
+
+    def _serialize_conflicts(self, conflicts: List[Dict[str, Any]], conflict_input: ConflictInput) -> str:
+        """Serialisiert Konflikte als JSON-Liste [Typ, Strategie, Konfidenz, Änderungen, Grund, Details]"""
+        payload = []
+        for conflict in conflicts:
+            resolution = conflict['resolution']
+            derived = input_details(conflict['conflict_type'], conflict_input)
+            details = {key: value for key, value in conflict['details'].items() if key not in derived}
+            payload.append([conflict['conflict_type'], resolution.resolution_strategy.value, resolution.confidence,
+                            resolution.suggested_changes, resolution.reason, details])
+        return json.dumps(payload, ensure_ascii=False, default=str, separators=(',', ':'))
+
+    def _deserialize_conflicts(self, payload: str, conflict_input: ConflictInput) -> List[Dict[str, Any]]:
+        """Stellt Konflikte aus dem JSON-Format wieder her"""
+        conflicts = []
+        for conflict_type, strategy, confidence, suggested_changes, reason, details in json.loads(payload):
+            conflicts.append({
+                'conflict_type': conflict_type,
+                'resolution': ConflictResolutionResult(_STRATEGIES[strategy], confidence, suggested_changes, reason),
+                'details': {**input_details(conflict_type, conflict_input), **details}
+            })
+        return conflicts
@@ -0,0 +1,169 @@
+"""
+Ähnlichkeitsmaße für die Konfliktanalyse des Matchers
+
+difflib.SequenceMatcher ist quadratisch in der Textlänge; beim Vergleich einer
+Signatur mit einem langen Dokument kann ein einzelnes Paar Sekunden dauern. Die
+Maße hier sind linear in der Eingabegröße und liefern wie difflib Werte zwischen
+0 und 1 (Dice-Koeffizient, vergleichbar mit SequenceMatcher.ratio), sodass die
+Schwellenwerte des Matchers weiter gelten:
+
+- token_set: Übereinstimmung der Wortmengen
+- shingle: Übereinstimmung der Zeichen-Shingles (exakt)
+- minhash: Schätzung der Shingle-Übereinstimmung über Bottom-k-MinHash-Sketches
+- difflib: bisheriges Verhalten als Vergleichsbasis
+"""
+import difflib
+import heapq
+import re
+import zlib
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, FrozenSet, Tuple, Type, Union
+
+_TOKEN = re.compile(r'[0-9a-zäöüß]+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _dice(intersection: int, first_size: int, second_size: int) -> float:
+    """Dice-Koeffizient 2|A∩B| / (|A| + |B|); zwei leere Mengen gelten als gleich"""
+    total = first_size + second_size
+    return 2 * intersection / total if total else 1.0
+
+
+@lru_cache(maxsize=1024)
+def _token_set(text: str) -> FrozenSet[str]:
+    """Wörter in Kleinbuchstaben; Bezeichner werden an Unterstrichen getrennt"""
+    return frozenset(_TOKEN.findall(text.lower()))
+
+
+@lru_cache(maxsize=1024)
+def _shingle_hashes(text: str, size: int) -> FrozenSet[int]:
+    """Hashes der Zeichen-Shingles des normalisierten Texts (Kleinbuchstaben, einfache Leerzeichen)"""
+    text = _WHITESPACE.sub(' ', text.lower()).strip()
+    if len(text) <= size:
+        return frozenset([zlib.crc32(text.encode('utf-8'))]) if text else frozenset()
+    return frozenset(zlib.crc32(text[index:index + size].encode('utf-8'))
+                     for index in range(len(text) - size + 1))
+
+
+class SimilarityMeasure(ABC):
+    """Basisklasse der Ähnlichkeitsmaße"""
+
+    name = ""
+
+    @abstractmethod
+    def similarity(self, first: str, second: str) -> float:
+        """
+        Berechnet die Ähnlichkeit zweier Texte
+
+        Returns:
+            Wert zwischen 0 (keine Übereinstimmung) und 1 (gleich)
+        """
+
+
+class SequenceMatcherSimilarity(SimilarityMeasure):
+    """difflib.SequenceMatcher.ratio (quadratisch, nur als Vergleichsbasis)"""
+
+    name = "difflib"
+
+    def similarity(self, first: str, second: str) -> float:
+        return difflib.SequenceMatcher(None, first.lower(), second.lower()).ratio()
+
+
+class TokenSetSimilarity(SimilarityMeasure):
+    """Dice-Koeffizient der Wortmengen; unabhängig von Reihenfolge und Wiederholungen"""
+
+    name = "token_set"
+
+    def similarity(self, first: str, second: str) -> float:
+        first_tokens, second_tokens = _token_set(first), _token_set(second)
+        return _dice(len(first_tokens & second_tokens), len(first_tokens), len(second_tokens))
+
+
+class ShingleSimilarity(SimilarityMeasure):
+    """Dice-Koeffizient der Zeichen-Shingles; berücksichtigt auch Wortteile und Reihenfolge"""
+
+    name = "shingle"
+
+    def __init__(self, shingle_size: int = 4):
+        self.shingle_size = shingle_size
+
+    def similarity(self, first: str, second: str) -> float:
+        first_shingles = _shingle_hashes(first, self.shingle_size)
+        second_shingles = _shingle_hashes(second, self.shingle_size)
+        return _dice(len(first_shingles & second_shingles), len(first_shingles), len(second_shingles))
+
+
+class MinHashSimilarity(SimilarityMeasure):
+    """
+    Schätzt die Shingle-Übereinstimmung über Bottom-k-MinHash-Sketches
+
+    Pro Text werden nur die sketch_size kleinsten Shingle-Hashes behalten; der
+    Vergleich zweier Sketches kostet damit unabhängig von der Textlänge O(k).
+    Bei Texten mit höchstens sketch_size Shingles ist das Ergebnis exakt.
+    """
+
+    name = "minhash"
+
+    def __init__(self, shingle_size: int = 4, sketch_size: int = 128):
+        self.shingle_size = shingle_size
+        self.sketch_size = sketch_size
+
+    def sketch(self, text: str) -> Tuple[int, FrozenSet[int]]:
+        """Gibt die Anzahl der Shingles und die kleinsten sketch_size Hashes zurück"""
+        return _bottom_k(text, self.shingle_size, self.sketch_size)
+
+    def similarity(self, first: str, second: str) -> float:
+        first_count, first_sketch = self.sketch(first)
+        second_count, second_sketch = self.sketch(second)
+        if not first_count or not second_count:
+            return 1.0 if first_count == second_count else 0.0
+        # Die k kleinsten Hashes der Vereinigung sind eine Stichprobe der Vereinigung
+        union_sample = heapq.nsmallest(self.sketch_size, first_sketch | second_sketch)
+        shared = sum(1 for value in union_sample if value in first_sketch and value in second_sketch)
+        jaccard = shared / len(union_sample)
+        # Umrechnung in den Dice-Koeffizienten, damit die Werte mit den anderen Maßen vergleichbar sind
+        return 2 * jaccard / (1 + jaccard)
+
+
+@lru_cache(maxsize=1024)
+def _bottom_k(text: str, shingle_size: int, sketch_size: int) -> Tuple[int, FrozenSet[int]]:
+    shingles = _shingle_hashes(text, shingle_size)
+    return len(shingles), frozenset(heapq.nsmallest(sketch_size, shingles))
+
+
+def clear_caches():
+    """Leert die Caches der Wortmengen, Shingles und Sketches (z.B. zwischen Benchmark-Läufen)"""
+    _token_set.cache_clear()
+    _shingle_hashes.cache_clear()
+    _bottom_k.cache_clear()
+
+
+SIMILARITY_MEASURES: Dict[str, Type[SimilarityMeasure]] = {
+    TokenSetSimilarity.name: TokenSetSimilarity,
+    ShingleSimilarity.name: ShingleSimilarity,
+    MinHashSimilarity.name: MinHashSimilarity,
+    SequenceMatcherSimilarity.name: SequenceMatcherSimilarity,
+}
+
+DEFAULT_SIMILARITY = TokenSetSimilarity.name
+
+
+def create_similarity(method: Union[str, SimilarityMeasure, None] = None) -> SimilarityMeasure:
+    """
+    Erstellt ein Ähnlichkeitsmaß
+
+    Args:
+        method: Name aus SIMILARITY_MEASURES, eine fertige Instanz oder None (Standard: token_set)
+
+    Returns:
+        Das Ähnlichkeitsmaß; bei unbekanntem Namen token_set
+    """
+    if isinstance(method, SimilarityMeasure):
+        return method
+    method = method or DEFAULT_SIMILARITY
+    measure_class = SIMILARITY_MEASURES.get(method)
+    if measure_class is None:
+        print(f"Warnung: Unbekanntes Ähnlichkeitsmaß '{method}', verwende {DEFAULT_SIMILARITY}")
+        measure_class = SIMILARITY_MEASURES[DEFAULT_SIMILARITY]
+    return measure_class()
@@ -0,0 +1,368 @@
+"""
+Symbolindex für den Abgleich von Code- und Dokumentations-Elementen
+
+Code-Elemente werden nicht nur über ihren Namen abgelegt, sondern über einen
+qualifizierten Namen (Datei und Klasse.methode), damit gleichnamige Elemente
+wie __init__, get oder run nicht zu einem Eintrag zusammenfallen. Zusätzliche
+Indizes nach Datei, Typ und normalisiertem Namen erlauben die Suche nach
+Kandidaten für eine Dokumentations-Überschrift mit wenigen Dictionary-Zugriffen.
+Überschriften, die keinem Namen exakt entsprechen ("MyService class"), werden
+über einen invertierten Trigramm-Index der normalisierten Namen zugeordnet.
+"""
+import bisect
+import math
+import os
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+from src.models.element import CodeElement, ElementType
+from src.models.element_store import is_code_element
+
+# Trefferstufen der Kandidatensuche, von exakt bis tolerant
+MATCH_NAME = "name"
+MATCH_QUALIFIED = "qualified"
+MATCH_LOWERCASE = "lowercase"
+MATCH_NORMALIZED = "normalized"
+MATCH_FUZZY = "fuzzy"
+
+# Konfidenz der Zuordnung je Trefferstufe; bei MATCH_FUZZY multipliziert mit der Trigramm-Ähnlichkeit
+MATCH_CONFIDENCE = {
+    MATCH_NAME: 1.0,
+    MATCH_QUALIFIED: 1.0,
+    MATCH_LOWERCASE: 0.95,
+    MATCH_NORMALIZED: 0.9,
+    MATCH_FUZZY: 0.85
+}
+
+# Wörter, mit denen Überschriften den Namen ergänzen ("MyService class", "Funktion get_user")
+_KIND_WORDS = frozenset({
+    'class', 'function', 'method', 'property', 'attribute', 'module', 'endpoint', 'decorator',
+    'klasse', 'funktion', 'methode', 'eigenschaft', 'attribut', 'modul', 'def', 'api'
+})
+
+_NON_IDENTIFIER = re.compile(r'[^0-9a-z.]')
+
+
+@lru_cache(maxsize=65536)
+def normalize_name(name: str) -> str:
+    """
+    Normalisiert einen Namen für den toleranten Abgleich
+
+    Backticks, Argumentlisten und Groß-/Kleinschreibung werden ignoriert, ebenso
+    Unterstriche, Bindestriche und Leerzeichen: "`get_user(id)`", "getUser" und
+    "Get User" ergeben alle "getuser".
+    """
+    name = name.strip().strip('`').split('(', 1)[0]
+    return _NON_IDENTIFIER.sub('', name.lower()).strip('.')
+
+
+def fuzzy_key(name: str) -> str:
+    """
+    Normalisiert eine Überschrift für die Trigramm-Suche
+
+    Wörter wie "class" oder "Funktion" werden entfernt, sofern daneben noch ein
+    Name steht: "MyService class" und "Klasse `MyService`" ergeben "myservice".
+    """
+    words = name.replace('`', ' ').split()
+    kept = [word for word in words if word.lower().strip('():') not in _KIND_WORDS]
+    return normalize_name(" ".join(kept or words))
+
+
+@lru_cache(maxsize=65536)
+def trigrams(key: str) -> FrozenSet[str]:
+    """Trigramme eines normalisierten Namens; Leerzeichen an den Rändern gewichten Anfang und Ende"""
+    padded = f" {key} "
+    return frozenset(padded[index:index + 3] for index in range(len(padded) - 2)) if key else frozenset()
+
+
+def trigram_similarity(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+    """Dice-Koeffizient zweier Trigramm-Mengen"""
+    total = len(first) + len(second)
+    return 2 * len(first & second) / total if total else 0.0
+
+
+def _file_stem(file_path: str) -> str:
+    """Dateiname ohne Endung in Kleinbuchstaben (schneller als Path(...).stem)"""
+    return os.path.splitext(os.path.basename(file_path))[0].lower()
+
+
+class SymbolMatch(NamedTuple):
+    """Ergebnis der Kandidatensuche für einen Namen"""
+    level: str  # MATCH_NAME, MATCH_QUALIFIED, MATCH_LOWERCASE, MATCH_NORMALIZED oder MATCH_FUZZY
+    key: str  # Schlüssel im Index der Trefferstufe
+    candidates: List[CodeElement]
+
+
+class SymbolIndex:
+    """
+    Index der Code-Elemente nach qualifiziertem Namen mit Sekundärindizes
+
+    Der qualifizierte Name hat die Form "datei::Klasse.methode" (bzw. "datei::name"
+    für Elemente ohne umgebende Klasse); die Klasse einer Methode wird aus den
+    Klassen-Elementen derselben Datei bestimmt. Aufbau und Suche sind linear
+    in der Anzahl der Elemente bzw. konstant pro Suche.
+    """
+
+    def __init__(self, elements: Iterable[Any] = ()):
+        """
+        Args:
+            elements: Code-Elemente (CodeElement oder Code-Zeilen eines ElementStore); andere Objekte
+                      (z.B. Rohdaten der Framework-Parser) werden übersprungen
+        """
+        self.elements: List[CodeElement] = []
+        self.local_names: List[str] = []  # "Klasse.methode" bzw. name, parallel zu elements
+        self.by_qualified_name: Dict[str, List[int]] = defaultdict(list)
+        self.by_local_name: Dict[str, List[int]] = defaultdict(list)
+        self.by_name: Dict[str, List[int]] = defaultdict(list)
+        self.by_lowercase_name: Dict[str, List[int]] = defaultdict(list)
+        self.by_normalized_name: Dict[str, List[int]] = defaultdict(list)
+        self.by_file: Dict[str, List[int]] = defaultdict(list)
+        self.by_file_stem: Dict[str, List[int]] = defaultdict(list)
+        self.by_type: Dict[str, List[int]] = defaultdict(list)
+        self._stems: Dict[str, str] = {}
+        # Trigramm -> (Trigramm-Anzahlen, normalisierte Namen) sortiert nach Anzahl; bei der ersten unscharfen Suche aufgebaut
+        self._trigram_postings: Optional[Dict[str, Tuple[List[int], List[str]]]] = None
+        self._key_trigrams: Dict[str, FrozenSet[str]] = {}
+        self._fuzzy_results: Dict[Tuple[str, float], List[Tuple[float, str]]] = {}
+        self.add_elements(elements)
+
+    def add_elements(self, elements: Iterable[Any]):
+        """
+        Fügt Code-Elemente hinzu
+
+        Klassen werden vor den übrigen Elementen einer Datei verarbeitet, damit
+        Methoden ihrer Klasse zugeordnet werden können.
+        """
+        elements = [element for element in elements if is_code_element(element)]
+        self._trigram_postings = None
+        self._fuzzy_results = {}
+        classes = self._collect_classes(elements)
+        for element in elements:
+            self._add(element, self._local_name(element, classes))
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    @staticmethod
+    def _collect_classes(elements: List[CodeElement]) -> Dict[str, Tuple[List[int], List[Tuple[str, set]]]]:
+        """Gibt pro Datei die Zeilen, Namen und Methodennamen der Klassen sortiert nach Zeilennummer zurück"""
+        by_file: Dict[str, List[CodeElement]] = defaultdict(list)
+        for element in elements:
+            if element.type == ElementType.CLASS and element.methods and element.line_number:
+                by_file[element.file_path or ""].append(element)
+        classes = {}
+        for file_path, file_classes in by_file.items():
+            file_classes.sort(key=lambda element: element.line_number)
+            classes[file_path] = (
+                [element.line_number for element in file_classes],
+                [(element.name, {method.get('name') for method in element.methods}) for element in file_classes]
+            )
+        return classes
+
+    @staticmethod
+    def _local_name(element: CodeElement, classes: Dict[str, Tuple[List[int], List[Tuple[str, set]]]]) -> str:
+        """Bestimmt "Klasse.methode" für Methoden, sonst den Namen"""
+        if element.type == ElementType.CLASS or not element.line_number:
+            return element.name
+        file_classes = classes.get(element.file_path or "")
+        if not file_classes:
+            return element.name
+        lines, class_methods = file_classes
+        # Die nächstgelegene vorangehende Klasse, die eine Methode dieses Namens hat
+        for position in range(bisect.bisect_left(lines, element.line_number) - 1, -1, -1):
+            class_name, method_names = class_methods[position]
+            if element.name in method_names:
+                return f"{class_name}.{element.name}"
+        return element.name
+
+    def _add(self, element: CodeElement, local_name: str):
+        index = len(self.elements)
+        self.elements.append(element)
+        self.local_names.append(local_name)
+        file_path = element.file_path or ""
+        self.by_qualified_name[f"{file_path}::{local_name}"].append(index)
+        self.by_name[element.name].append(index)
+        self.by_lowercase_name[element.name.lower()].append(index)
+        self.by_file[file_path].append(index)
+        stem = self._stems.get(file_path)
+        if stem is None:
+            stem = self._stems[file_path] = _file_stem(file_path)
+        self.by_file_stem[stem].append(index)
+        self.by_type[element.type.value if element.type else ""].append(index)
+        normalized = normalize_name(element.name)
+        if normalized:
+            self.by_normalized_name[normalized].append(index)
+        if local_name != element.name:
+            self.by_local_name[local_name].append(index)
+            self.by_normalized_name[normalize_name(local_name)].append(index)
+
+    def qualified_name(self, element_index: int) -> str:
+        """Gibt den qualifizierten Namen eines Elements zurück"""
+        return f"{self.elements[element_index].file_path or ''}::{self.local_names[element_index]}"
+
+    def get(self, qualified_name: str) -> List[CodeElement]:
+        """Gibt die Elemente mit einem qualifizierten Namen ("datei::Klasse.methode") zurück"""
+        return [self.elements[index] for index in self.by_qualified_name.get(qualified_name, ())]
+
+    def in_file(self, file_path: str) -> List[CodeElement]:
+        """Gibt die Elemente einer Datei zurück"""
+        return [self.elements[index] for index in self.by_file.get(file_path, ())]
+
+    def of_type(self, element_type: ElementType) -> List[CodeElement]:
+        """Gibt die Elemente eines Typs zurück"""
+        return [self.elements[index] for index in self.by_type.get(element_type.value, ())]
+
+    def lookup(self, name: str, fuzzy_threshold: Optional[float] = None) -> Optional[SymbolMatch]:
+        """
+        Sucht die Kandidaten für einen Namen, z.B. eine Dokumentations-Überschrift
+
+        Reihenfolge: exakter Name, "Klasse.methode", Name in Kleinbuchstaben,
+        normalisierter Name und, falls fuzzy_threshold gesetzt ist, der ähnlichste
+        normalisierte Name laut Trigramm-Index.
+
+        Returns:
+            SymbolMatch der ersten Stufe mit Kandidaten oder None
+        """
+        indexes = self.lookup_indexes(name, fuzzy_threshold)
+        if indexes is None:
+            return None
+        level, key, positions = indexes
+        return SymbolMatch(level, key, [self.elements[index] for index in positions])
+
+    def lookup_indexes(self, name: str, fuzzy_threshold: Optional[float] = None) -> Optional[Tuple[str, str, List[int]]]:
+        """Wie lookup, liefert aber die Positionen der Elemente im Index"""
+        positions = self.by_name.get(name)
+        if positions:
+            return MATCH_NAME, name, positions
+        positions = self.by_local_name.get(name)
+        if positions:
+            return MATCH_QUALIFIED, name, positions
+        lowercase = name.lower()
+        positions = self.by_lowercase_name.get(lowercase)
+        if positions:
+            return MATCH_LOWERCASE, lowercase, positions
+        normalized = normalize_name(name)
+        positions = self.by_normalized_name.get(normalized) if normalized else None
+        if positions:
+            return MATCH_NORMALIZED, normalized, positions
+        if fuzzy_threshold is not None:
+            candidates = self.fuzzy_candidates(name, fuzzy_threshold, limit=1)
+            if candidates:
+                key = candidates[0][1]
+                return MATCH_FUZZY, key, self.by_normalized_name[key]
+        return None
+
+    def fuzzy_candidates(self, name: str, threshold: float = 0.75, limit: int = 5) -> List[Tuple[float, str]]:
+        """
+        Sucht die normalisierten Namen mit der größten Trigramm-Ähnlichkeit zu einem Namen
+
+        Ein Name mit Dice-Ähnlichkeit >= threshold teilt mit der Anfrage mindestens
+        min_overlap Trigramme, kommt also in einem der (Anzahl - min_overlap + 1)
+        seltensten Trigramme der Anfrage vor, und hat eine Trigramm-Anzahl in einem
+        durch threshold begrenzten Bereich. Nur diese Abschnitte der Posting-Listen
+        werden gelesen; die Kosten hängen von der Seltenheit der Trigramme ab, nicht
+        von der Anzahl der Code-Elemente. Ergebnisse werden pro Anfrage gemerkt, da
+        sich Überschriften wie "Parameters" oft wiederholen.
+
+        Args:
+            name: Gesuchter Name, z.B. eine Dokumentations-Überschrift
+            threshold: Minimale Dice-Ähnlichkeit der Trigramme (0 < x <= 1)
+            limit: Maximale Anzahl der Kandidaten
+
+        Returns:
+            (Ähnlichkeit, normalisierter Name), absteigend nach Ähnlichkeit
+        """
+        key = fuzzy_key(name)
+        cached = self._fuzzy_results.get((key, threshold))
+        if cached is None:
+            cached = self._fuzzy_results[(key, threshold)] = self._search_trigrams(key, threshold)
+        return cached[:limit]
+
+    def _search_trigrams(self, key: str, threshold: float) -> List[Tuple[float, str]]:
+        query = trigrams(key)
+        if not query or threshold <= 0:
+            return []
+        postings = self._trigram_index()
+        size = len(query)
+        # Bereich der Trigramm-Anzahl eines Treffers und daraus die Mindestüberlappung
+        min_size = math.ceil(threshold / (2 - threshold) * size - 1e-9)
+        max_size = math.floor((2 - threshold) / threshold * size + 1e-9)
+        min_overlap = max(1, math.ceil(threshold * (size + min_size) / 2 - 1e-9))
+        rare = sorted(query, key=lambda gram: len(postings[gram][1]) if gram in postings else 0)
+        candidates = set()
+        for gram in rare[:size - min_overlap + 1]:
+            if gram in postings:
+                sizes, keys = postings[gram]
+                candidates.update(keys[bisect.bisect_left(sizes, min_size):bisect.bisect_right(sizes, max_size)])
+
+        scored = []
+        key_trigrams = self._key_trigrams
+        for candidate in candidates:
+            candidate_trigrams = key_trigrams[candidate]
+            score = 2 * len(query & candidate_trigrams) / (size + len(candidate_trigrams))
+            if score >= threshold:
+                scored.append((score, candidate))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return scored
+
+    def match_confidence(self, level: str, name: str, key: str) -> float:
+        """Konfidenz einer Zuordnung von name über den Schlüssel key der Trefferstufe level"""
+        confidence = MATCH_CONFIDENCE.get(level, 0.0)
+        if level == MATCH_FUZZY:
+            confidence *= trigram_similarity(trigrams(fuzzy_key(name)), trigrams(key))
+        return round(confidence, 3)
+
+    def _trigram_index(self) -> Dict[str, Tuple[List[int], List[str]]]:
+        """Invertierter Index Trigramm -> normalisierte Namen, sortiert nach deren Trigramm-Anzahl (einmalig aufgebaut)"""
+        if self._trigram_postings is None:
+            self._key_trigrams = {key: trigrams(key) for key in self.by_normalized_name}
+            postings: Dict[str, Tuple[List[int], List[str]]] = {}
+            # Namen nach Trigramm-Anzahl sortiert einfügen, damit jede Posting-Liste sortiert ist
+            for key, key_trigrams in sorted(self._key_trigrams.items(), key=lambda item: len(item[1])):
+                size = len(key_trigrams)
+                for gram in key_trigrams:
+                    entry = postings.get(gram)
+                    if entry is None:
+                        entry = postings[gram] = ([], [])
+                    entry[0].append(size)
+                    entry[1].append(key)
+            self._trigram_postings = postings
+        return self._trigram_postings
+
+    def matches_key(self, element_index: int, level: str, key: str) -> bool:
+        """Prüft, ob ein Element unter dem Schlüssel einer Trefferstufe abgelegt ist"""
+        element = self.elements[element_index]
+        if level == MATCH_NAME:
+            return element.name == key
+        if level == MATCH_QUALIFIED:
+            return self.local_names[element_index] == key
+        if level == MATCH_LOWERCASE:
+            return element.name.lower() == key
+        return key in (normalize_name(element.name), normalize_name(self.local_names[element_index]))
+
+    def best_candidate(self, level: str, key: str, positions: List[int],
+                       file_path: Optional[str] = None) -> int:
+        """
+        Wählt unter mehreren Kandidaten einen für die Konfliktanalyse
+
+        Bevorzugt wird ein Element aus einer Datei mit demselben Namen wie die
+        Dokumentation (docs/users.md -> users.py), sonst das erste Element. Geprüft
+        werden nur die Elemente dieser Dateien, nicht alle Kandidaten.
+        """
+        if len(positions) == 1 or not file_path:
+            return positions[0]
+        nearby = self.file_candidates(level, key, file_path)
+        return nearby[0] if nearby else positions[0]
+
+    def file_candidates(self, level: str, key: str, file_path: Optional[str]) -> List[int]:
+        """
+        Gibt die Kandidaten aus Dateien mit demselben Namen wie die Dokumentation zurück
+
+        Eine Datei hat denselben Namen wie sie selbst, Docstrings gehören also
+        immer zu den Elementen ihrer eigenen Datei.
+        """
+        if not file_path:
+            return []
+        return [index for index in self.by_file_stem.get(_file_stem(file_path), ())
+                if self.matches_key(index, level, key)]
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from enum import Enum
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
+from src.utils.content_provider import get_content_provider
 
 class ElementType(str, Enum):
     FUNCTION = "function"
@@ -27,6 +28,13 @@ class CodeElement(BaseModel):
     file_path: Optional[str] = None
     project_path: Optional[str] = None
     code_snippet: Optional[str] = None
+    snippet_span: Optional[Tuple[int, int]] = None  # Byte-Bereich des Snippets in file_path (lazy_content)
+
+    def get_code_snippet(self) -> Optional[str]:
+        """Gibt das Code-Snippet zurück und lädt es bei Bedarf aus der Datei"""
+        if self.code_snippet is None and self.snippet_span and self.file_path:
+            return get_content_provider().read_span(self.file_path, *self.snippet_span)
+        return self.code_snippet
 
 class DocElement(BaseModel):
     name: str
@@ -39,4 +47,11 @@ class DocElement(BaseModel):
     file_path: Optional[str] = None
     project_path: Optional[str] = None
     references: Optional[List[str]] = None  # Verweise auf Code-Elemente
-    format: Optional[str] = "md"  # Dateiformat (z.B. md, rst, txt)
\ No newline at end of file
+    format: Optional[str] = "md"  # Dateiformat (z.B. md, rst, txt)
+    content_span: Optional[Tuple[int, int]] = None  # Byte-Bereich von full_content in file_path (lazy_content)
+
+    def get_full_content(self) -> Optional[str]:
+        """Gibt den vollständigen Inhalt zurück und lädt ihn bei Bedarf aus der Datei"""
+        if self.full_content is None and self.content_span and self.file_path:
+            return get_content_provider().read_span(self.file_path, *self.content_span)
+        return self.full_content
\ No newline at end of file
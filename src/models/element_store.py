@@ -0,0 +1,451 @@
+"""
+Kompakter, spaltenorientierter Speicher für Code- und Dokumentations-Elemente
+
+Statt eines Pydantic-Objekts pro Element werden die Feldwerte in Spalten
+abgelegt:
+
+- wiederkehrende Zeichenketten (Pfade, Typangaben, ...) einmalig in einer String-Tabelle,
+  pro Zeile nur ihre ID in einem array
+- überwiegend eindeutige Texte (Name, Signatur, Docstring, Snippet, Inhalt) UTF-8-kodiert in einem
+  fortlaufenden bytearray, pro Zeile Startoffset und Längen
+- strukturierte Felder (Parameter, Methoden, ...) als marshal-Bytes, ebenfalls
+  dedupliziert
+- Typ, Zeilennummer, Ebene und Byte-Bereiche (lazy_content) direkt in arrays
+
+Die Scanner schreiben ihre Elemente über emit_element direkt als Zeilen in den
+Speicher (siehe UniversalScanner.scan_project_store). Zeilen werden über
+ElementRow-Sichten mit __slots__ gelesen; CodeElement- und DocElement-Objekte
+entstehen erst bei Bedarf über to_model().
+"""
+import marshal
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from .element import CodeElement, DocElement, ElementType
+from src.utils.content_provider import get_content_provider
+
+CODE_KIND = 0
+DOC_KIND = 1
+RAW_KIND = 2  # Dictionaries der Framework-Parser
+
+# Spaltenarten aller Felder beider Modelle
+INTERNED_FIELDS = ('return_type', 'import_from', 'file_path', 'project_path', 'language', 'format')
+TEXT_FIELDS = ('name', 'signature', 'docstring', 'code_snippet', 'content', 'full_content')
+INT_FIELDS = ('line_number', 'level')
+OBJECT_FIELDS = ('parameters', 'api_info', 'methods', 'imports', 'references')
+SPAN_FIELDS = ('snippet_span', 'content_span')
+
+_NONE = -1  # Markiert fehlende Werte in den arrays
+_FALLBACK = -2  # Wert liegt in ElementStore._fallback
+_ELEMENT_TYPES = list(ElementType)
+_TYPE_INDEX = {element_type: index for index, element_type in enumerate(_ELEMENT_TYPES)}
+
+
+def _field_names(model) -> tuple:
+    """Gibt die Feldnamen eines Pydantic-Modells zurück (Pydantic v1 und v2)"""
+    fields = getattr(model, 'model_fields', None) or model.__fields__
+    return tuple(fields)
+
+
+def _field_defaults(model) -> Dict[str, Any]:
+    """Gibt die Standardwerte der optionalen Felder eines Pydantic-Modells zurück (Pydantic v1 und v2)"""
+    fields = getattr(model, 'model_fields', None) or model.__fields__
+    return {
+        name: field.default for name, field in fields.items()
+        if not (field.is_required() if hasattr(field, 'is_required') else field.required)
+    }
+
+
+_MODEL_FIELDS = {
+    CODE_KIND: (CodeElement, _field_names(CodeElement)),
+    DOC_KIND: (DocElement, _field_names(DocElement)),
+}
+_MODEL_DEFAULTS = {
+    CODE_KIND: _field_defaults(CodeElement),
+    DOC_KIND: _field_defaults(DocElement),
+}
+
+
+class InternTable:
+    """Speichert jeden Wert einmal und vergibt fortlaufende Ganzzahl-IDs"""
+
+    __slots__ = ('values', '_ids')
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self._ids: Dict[Any, int] = {}
+
+    def add(self, value: Any) -> int:
+        """Gibt die ID eines Werts zurück (_NONE für None)"""
+        if value is None:
+            return _NONE
+        value_id = self._ids.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            self._ids[value] = value_id
+            self.values.append(value)
+        return value_id
+
+    def get(self, value_id: int) -> Any:
+        """Gibt den Wert zu einer ID zurück"""
+        return None if value_id == _NONE else self.values[value_id]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class ElementRow:
+    """
+    Sicht auf eine Zeile des ElementStore
+
+    Felder werden wie bei CodeElement/DocElement als Attribute gelesen, ebenso
+    stehen get_code_snippet() und get_full_content() zur Verfügung. to_model()
+    erzeugt bei Bedarf das entsprechende Pydantic-Modell.
+    """
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: 'ElementStore', index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def kind(self) -> int:
+        """CODE_KIND, DOC_KIND oder RAW_KIND"""
+        return self._store.kind(self._index)
+
+    def __getattr__(self, name: str) -> Any:
+        return self._store.get_value(self._index, name)
+
+    def to_model(self) -> Union[CodeElement, DocElement, Dict]:
+        """Erzeugt das Pydantic-Modell (bzw. das Dictionary) dieser Zeile"""
+        return self._store.to_model(self._index)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Gibt die Felder der Zeile zurück (wie model_dump des Modells bzw. das Dictionary eines Framework-Parsers)"""
+        return self._store.model_values(self._index)
+
+    def copy(self, update: Optional[Dict[str, Any]] = None) -> 'ElementRow':
+        """Legt eine Kopie der Zeile mit geänderten Feldern im selben Speicher an (wie BaseModel.copy)"""
+        return ElementRow(self._store, self._store.copy_row(self._index, update or {}))
+
+    def get_code_snippet(self) -> Optional[str]:
+        """Gibt das Code-Snippet zurück und lädt es bei Bedarf aus der Datei (wie CodeElement)"""
+        snippet = self.code_snippet
+        span = self.snippet_span
+        if snippet is None and span and self.file_path:
+            return get_content_provider().read_span(self.file_path, *span)
+        return snippet
+
+    def get_full_content(self) -> Optional[str]:
+        """Gibt den vollständigen Inhalt zurück und lädt ihn bei Bedarf aus der Datei (wie DocElement)"""
+        content = self.full_content
+        span = self.content_span
+        if content is None and span and self.file_path:
+            return get_content_provider().read_span(self.file_path, *span)
+        return content
+
+    def __repr__(self) -> str:
+        return f"ElementRow({self._index}, {self.name!r})"
+
+
+class ElementStore:
+    """
+    Spaltenorientierter Speicher für Scan-Elemente
+
+    Beispiel:
+        store = scanner.scan_project_store(path)
+        for row in store.rows(CODE_KIND):
+            print(row.name, row.line_number)
+    """
+
+    def __init__(self):
+        self.strings = InternTable()
+        self._objects = InternTable()  # marshal-Bytes der strukturierten Felder
+        self._text = bytearray()
+        self._kinds = array('b')
+        self._types = array('b')
+        self._text_offsets = array('q')
+        self._text_lengths: Dict[str, array] = {name: array('i') for name in TEXT_FIELDS}
+        self._string_columns: Dict[str, array] = {name: array('i') for name in INTERNED_FIELDS}
+        self._int_columns: Dict[str, array] = {name: array('i') for name in INT_FIELDS}
+        self._object_columns: Dict[str, array] = {name: array('i') for name in OBJECT_FIELDS}
+        # Byte-Bereiche als Start- und End-Spalte (Start _NONE für None)
+        self._span_columns: Dict[str, tuple] = {name: (array('q'), array('q')) for name in SPAN_FIELDS}
+        # Werte, die marshal nicht abbilden kann, sowie Framework-Dictionaries
+        self._fallback: Dict[tuple, Any] = {}
+
+    @classmethod
+    def from_elements(cls, elements: Iterable[Any]) -> 'ElementStore':
+        """Erstellt einen Speicher aus Elementen"""
+        store = cls()
+        store.extend(elements)
+        return store
+
+    def __len__(self) -> int:
+        return len(self._kinds)
+
+    def __getitem__(self, index: int) -> ElementRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return ElementRow(self, index)
+
+    def __iter__(self) -> Iterator[ElementRow]:
+        return (ElementRow(self, index) for index in range(len(self)))
+
+    def extend(self, elements: Iterable[Any]) -> None:
+        """Fügt mehrere Elemente hinzu"""
+        for element in elements:
+            self.add(element)
+
+    def add(self, element: Any) -> int:
+        """
+        Fügt ein Element hinzu
+
+        Args:
+            element: CodeElement, DocElement oder Dictionary eines Framework-Parsers
+
+        Returns:
+            Zeilenindex des Elements
+        """
+        if isinstance(element, CodeElement):
+            return self.append(CODE_KIND, element.__dict__)
+        if isinstance(element, DocElement):
+            return self.append(DOC_KIND, element.__dict__)
+        return self._append_raw(element)
+
+    def append(self, kind: int, values: Dict[str, Any]) -> int:
+        """
+        Fügt eine Zeile aus den Feldwerten eines Elements hinzu, ohne ein Modell zu erzeugen
+
+        Args:
+            kind: CODE_KIND oder DOC_KIND
+            values: Feldwerte wie die Schlüsselwortargumente von CodeElement bzw. DocElement;
+                    fehlende Felder erhalten den Standardwert des Modells
+
+        Returns:
+            Zeilenindex des Elements
+        """
+        if len(values) < len(_MODEL_FIELDS[kind][1]):
+            values = {**_MODEL_DEFAULTS[kind], **values}
+        index = len(self._kinds)
+        self._kinds.append(kind)
+        self._text_offsets.append(len(self._text))
+        self._types.append(_TYPE_INDEX[ElementType(values['type'])])
+        add_string = self.strings.add
+        for name, column in self._string_columns.items():
+            column.append(add_string(values.get(name)))
+        for name, column in self._int_columns.items():
+            value = values.get(name)
+            column.append(_NONE if value is None else value)
+        for name, column in self._text_lengths.items():
+            value = values.get(name)
+            if value is None:
+                column.append(_NONE)
+            else:
+                encoded = value.encode('utf-8', 'surrogatepass')
+                self._text += encoded
+                column.append(len(encoded))
+        for name, column in self._object_columns.items():
+            column.append(self._add_object(index, name, values.get(name)))
+        for name, (starts, ends) in self._span_columns.items():
+            span = values.get(name)
+            starts.append(_NONE if span is None else span[0])
+            ends.append(_NONE if span is None else span[1])
+        return index
+
+    def _append_raw(self, element: Any) -> int:
+        """Fügt ein Dictionary eines Framework-Parsers unverändert hinzu"""
+        index = len(self._kinds)
+        self._kinds.append(RAW_KIND)
+        self._text_offsets.append(len(self._text))
+        self._fallback[(index, None)] = element
+        self._types.append(_NONE)
+        for columns in (self._text_lengths, self._string_columns, self._int_columns, self._object_columns):
+            for column in columns.values():
+                column.append(_NONE)
+        for starts, ends in self._span_columns.values():
+            starts.append(_NONE)
+            ends.append(_NONE)
+        return index
+
+    def copy_row(self, index: int, update: Dict[str, Any]) -> int:
+        """
+        Fügt eine Kopie einer Zeile mit geänderten Feldern hinzu
+
+        Bei Dictionaries der Framework-Parser werden nur vorhandene Schlüssel geändert.
+
+        Returns:
+            Zeilenindex der Kopie
+        """
+        kind = self._kinds[index]
+        if kind == RAW_KIND:
+            raw = self._fallback[(index, None)]
+            if not isinstance(raw, dict):
+                return self._append_raw(raw)
+            return self._append_raw({**raw, **{key: value for key, value in update.items() if key in raw}})
+        return self.append(kind, {**self.row_values(index), **update})
+
+    def _add_object(self, index: int, name: str, value: Any) -> int:
+        """Speichert ein strukturiertes Feld dedupliziert als marshal-Bytes"""
+        if value is None:
+            return _NONE
+        try:
+            return self._objects.add(marshal.dumps(value))
+        except ValueError:
+            # Nicht serialisierbare Werte werden unverändert gehalten
+            self._fallback[(index, name)] = value
+            return _FALLBACK
+
+    def kind(self, index: int) -> int:
+        """Gibt die Art der Zeile zurück"""
+        return self._kinds[index]
+
+    def get_value(self, index: int, name: str) -> Any:
+        """
+        Liest ein Feld einer Zeile
+
+        Raises:
+            AttributeError: Wenn das Feld unbekannt ist
+        """
+        column = self._string_columns.get(name)
+        if column is not None:
+            return self.strings.get(column[index])
+        column = self._text_lengths.get(name)
+        if column is not None:
+            return self._get_text(index, name, column[index])
+        column = self._int_columns.get(name)
+        if column is not None:
+            value = column[index]
+            return None if value == _NONE else value
+        column = self._object_columns.get(name)
+        if column is not None:
+            return self._get_object(index, name, column[index])
+        columns = self._span_columns.get(name)
+        if columns is not None:
+            return self._get_span(index, columns)
+        if name == 'type':
+            type_index = self._types[index]
+            return None if type_index == _NONE else _ELEMENT_TYPES[type_index]
+        raise AttributeError(name)
+
+    def _get_text(self, index: int, name: str, length: int) -> Optional[str]:
+        """Liest ein Textfeld aus dem bytearray der Zeile"""
+        if length == _NONE:
+            return None
+        start = self._text_offsets[index]
+        for field in TEXT_FIELDS:
+            if field == name:
+                break
+            # Vorangehende Textfelder derselben Zeile überspringen
+            start += max(self._text_lengths[field][index], 0)
+        return self._text[start:start + length].decode('utf-8', 'surrogatepass')
+
+    @staticmethod
+    def _get_span(index: int, columns: tuple) -> Optional[tuple]:
+        """Liest einen Byte-Bereich"""
+        starts, ends = columns
+        start = starts[index]
+        return None if start == _NONE else (start, ends[index])
+
+    def _get_object(self, index: int, name: str, object_id: int) -> Any:
+        """Liest ein strukturiertes Feld (jeweils als neue Kopie)"""
+        if object_id == _NONE:
+            return None
+        if object_id == _FALLBACK:
+            return self._fallback[(index, name)]
+        return marshal.loads(self._objects.get(object_id))
+
+    def to_model(self, index: int) -> Union[CodeElement, DocElement, Dict]:
+        """Erzeugt das Pydantic-Modell einer Zeile ohne erneute Validierung"""
+        kind = self._kinds[index]
+        if kind == RAW_KIND:
+            return self._fallback[(index, None)]
+        model = _MODEL_FIELDS[kind][0]
+        values = self.model_values(index)
+        if hasattr(model, 'model_construct'):
+            return model.model_construct(**values)
+        return model.construct(**values)
+
+    def model_values(self, index: int) -> Dict[str, Any]:
+        """Gibt die Felder des Modells einer Zeile zurück (bei Framework-Dictionaries das Dictionary)"""
+        kind = self._kinds[index]
+        if kind == RAW_KIND:
+            return self._fallback[(index, None)]
+        row = self.row_values(index)
+        return {name: row[name] for name in _MODEL_FIELDS[kind][1]}
+
+    def row_values(self, index: int) -> Dict[str, Any]:
+        """Liest alle Felder einer Zeile in einem Durchgang"""
+        values: Dict[str, Any] = {'type': _ELEMENT_TYPES[self._types[index]]}
+        position = self._text_offsets[index]
+        text = self._text
+        for name, column in self._text_lengths.items():
+            length = column[index]
+            if length == _NONE:
+                values[name] = None
+            else:
+                values[name] = text[position:position + length].decode('utf-8', 'surrogatepass')
+                position += length
+        strings = self.strings
+        for name, column in self._string_columns.items():
+            values[name] = strings.get(column[index])
+        for name, column in self._int_columns.items():
+            value = column[index]
+            values[name] = None if value == _NONE else value
+        for name, column in self._object_columns.items():
+            values[name] = self._get_object(index, name, column[index])
+        for name, columns in self._span_columns.items():
+            values[name] = self._get_span(index, columns)
+        return values
+
+    def rows(self, kind: Optional[int] = None) -> Iterator[ElementRow]:
+        """Gibt Zeilensichten zurück, optional nur einer Art"""
+        for index, row_kind in enumerate(self._kinds):
+            if kind is None or row_kind == kind:
+                yield ElementRow(self, index)
+
+    def row(self, index: int) -> ElementRow:
+        """Gibt die Zeilensicht eines Zeilenindex zurück"""
+        return ElementRow(self, index)
+
+    def code_elements(self) -> Iterator[Union[CodeElement, Dict]]:
+        """Erzeugt die Code-Elemente (inkl. Framework-Dictionaries) in Einfügereihenfolge"""
+        for index, kind in enumerate(self._kinds):
+            if kind != DOC_KIND:
+                yield self.to_model(index)
+
+    def doc_elements(self) -> Iterator[DocElement]:
+        """Erzeugt die Dokumentations-Elemente in Einfügereihenfolge"""
+        for index, kind in enumerate(self._kinds):
+            if kind == DOC_KIND:
+                yield self.to_model(index)
+
+
+def is_code_element(element: Any) -> bool:
+    """Prüft, ob ein Element ein CodeElement oder die Code-Zeile eines ElementStore ist"""
+    return isinstance(element, CodeElement) or (isinstance(element, ElementRow) and element.kind == CODE_KIND)
+
+
+def as_model(element: Any) -> Any:
+    """Gibt zu einer Zeilensicht das Pydantic-Modell zurück, andere Elemente unverändert"""
+    return element.to_model() if isinstance(element, ElementRow) else element
+
+
+def emit_element(kind: int, values: Dict[str, Any], store: Optional[ElementStore] = None) -> Any:
+    """
+    Gibt ein von einem Scanner extrahiertes Element aus
+
+    Mit store wird das Element direkt als Zeile geschrieben und als ElementRow
+    zurückgegeben, ohne dass ein Pydantic-Modell entsteht; ohne store wird wie
+    bisher das (validierte) CodeElement bzw. DocElement erzeugt.
+
+    Args:
+        kind: CODE_KIND oder DOC_KIND
+        values: Feldwerte des Elements
+        store: Zielspeicher oder None
+    """
+    if store is None:
+        return _MODEL_FIELDS[kind][0](**values)
+    return ElementRow(store, store.append(kind, values))
@@ -1,111 +1,173 @@
 import ast
 import re
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Union
-from ..models.element import CodeElement, ElementType
+from typing import List, Dict, Any, Union, Optional, Tuple
+from ..models.element import ElementType
+from ..models.element_store import CODE_KIND, ElementStore, emit_element
 from ..core.config_manager import ProjectConfig
 from .go_rust_parsers import GoParser, RustParser
+from .framework_parsers import FrameworkParser
+from .parse_context import ParseContext, NodeExtractor, dispatch_ast
+from .performance_analyzer import get_active_analyzer, measure_phase, record_phase
+from .js_extractor import JavaScriptExtractor
+
+class CodeScanner(NodeExtractor):
+    # Knotentypen für den gemeinsamen AST-Durchlauf (siehe parse_context)
+    node_types = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Import, ast.ImportFrom)
 
-class CodeScanner:
     def __init__(self, config: ProjectConfig):
         self.config = config
     
-    def scan_file(self, file_path: Path) -> List[CodeElement]:
-        """Scannt eine Code-Datei und extrahiert alle relevanten Elemente"""
+    def scan_file(self, file_path: Path, framework_parsers: Optional[List[FrameworkParser]] = None,
+                  data: Optional[bytes] = None, store: Optional[ElementStore] = None) -> List[Any]:
+        """
+        Scannt eine Code-Datei und extrahiert alle relevanten Elemente
+
+        Args:
+            file_path: Pfad zur Datei
+            framework_parsers: Optionale Framework-Parser; sie verwenden denselben
+                               Parse-Kontext und AST-Durchlauf, ihre Elemente werden angehängt
+            data: Bereits gelesene Dateibytes (Python und JavaScript; sonst wird die Datei gelesen)
+            store: ElementStore, in den die Elemente direkt geschrieben werden; die
+                   Rückgabe enthält dann ElementRow-Sichten statt CodeElement-Modellen
+
+        Returns:
+            Code-Elemente (CodeElement bzw. ElementRow), gefolgt von den Elementen der Framework-Parser
+        """
         elements = []
+        framework_elements = []
+        framework_parsers = [parser for parser in framework_parsers or [] if parser.is_relevant(file_path)]
 
         if file_path.suffix.lower() == '.py':
-            elements = self._scan_python_file(file_path)
+            elements, framework_elements = self._scan_python_file(file_path, framework_parsers, data, store)
         elif file_path.suffix.lower() in ['.js', '.jsx', '.ts', '.tsx']:
-            elements = self._scan_javascript_file(file_path)
+            elements, framework_elements = self._scan_javascript_file(file_path, framework_parsers, data, store)
         elif file_path.suffix.lower() == '.go':
-            elements = self._scan_go_file(file_path)
+            elements = self._scan_go_file(file_path, store)
         elif file_path.suffix.lower() == '.rs':
-            elements = self._scan_rust_file(file_path)
+            elements = self._scan_rust_file(file_path, store)
 
-        # Hinzufügen von Dateiinformationen zu jedem Element
-        for element in elements:
-            element.file_path = str(file_path)
-            element.project_path = str(file_path.parent)
+        if store is not None:
+            # Dictionaries der Framework-Parser werden unverändert als Zeilen abgelegt
+            framework_elements = [store.row(store.add(element)) for element in framework_elements]
 
-        return elements
+        return elements + framework_elements
     
-    def _scan_python_file(self, file_path: Path) -> List[CodeElement]:
-        """Scannt eine Python-Datei mit AST"""
+    def _scan_python_file(self, file_path: Path, framework_parsers: List[FrameworkParser],
+                          data: Optional[bytes] = None,
+                          store: Optional[ElementStore] = None) -> Tuple[List[Any], List[Dict[str, Any]]]:
+        """Scannt eine Python-Datei mit AST (ein Lese-, Parse- und Durchlaufvorgang für alle Extraktoren)"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            tree = ast.parse(content)
+            with measure_phase('read'):
+                context = ParseContext.from_file(file_path, data, store)
         except Exception as e:
             print(f"Fehler beim Parsen von {file_path}: {e}")
-            return []
-        
-        elements = []
-        
-        for node in ast.walk(tree):
-            element = None
-            
-            if isinstance(node, ast.FunctionDef):
-                element = self._extract_function_info(node, file_path, content)
-            elif isinstance(node, ast.AsyncFunctionDef):
-                element = self._extract_function_info(node, file_path, content)
-            elif isinstance(node, ast.ClassDef):
-                element = self._extract_class_info(node, file_path, content)
-            elif isinstance(node, ast.Import):
-                element = self._extract_import_info(node, file_path)
-            elif isinstance(node, ast.ImportFrom):
-                element = self._extract_import_from_info(node, file_path)
-            
-            if element:
-                elements.append(element)
-        
-        return elements
+            return [], []
+        with measure_phase('parse'):
+            tree = context.tree
+        if tree is None:
+            print(f"Fehler beim Parsen von {file_path}: {context.parse_error}")
+            return [], []
+
+        results = self._dispatch_measured(context, [self] + framework_parsers)
+        framework_elements = [element for result in results[1:] for element in result]
+        return results[0], framework_elements
+
+    @staticmethod
+    def _dispatch_measured(context: ParseContext, extractors: List[NodeExtractor]) -> List[List[Any]]:
+        """
+        Führt den gemeinsamen AST-Durchlauf aus und misst ihn
+
+        Die Zeit der Framework-Parser wird als Phase framework-parse, der Rest des
+        Durchlaufs als extract erfasst.
+        """
+        if get_active_analyzer() is None:
+            return dispatch_ast(context, extractors)
+        if len(extractors) == 1:
+            with measure_phase('extract'):
+                return dispatch_ast(context, extractors)
+
+        timings = [0.0] * len(extractors)
+        start_cpu = time.thread_time()
+        start = time.perf_counter()
+        results = dispatch_ast(context, extractors, timings)
+        wall_seconds = time.perf_counter() - start
+        cpu_seconds = time.thread_time() - start_cpu
+
+        framework_seconds = min(sum(timings[1:]), wall_seconds)
+        # Die CPU-Zeit wird im Verhältnis der Wandzeiten aufgeteilt
+        share = framework_seconds / wall_seconds if wall_seconds > 0 else 0.0
+        record_phase('framework-parse', framework_seconds, cpu_seconds * share)
+        record_phase('extract', wall_seconds - framework_seconds, cpu_seconds * (1 - share))
+        return results
 
-    def _scan_go_file(self, file_path: Path) -> List[CodeElement]:
+    def extract_node(self, node: ast.AST, context: ParseContext) -> List[Any]:
+        """Extrahiert das Code-Element eines AST-Knotens"""
+        element = None
+
+        if isinstance(node, ast.FunctionDef):
+            element = self._extract_function_info(node, context)
+        elif isinstance(node, ast.AsyncFunctionDef):
+            element = self._extract_function_info(node, context)
+        elif isinstance(node, ast.ClassDef):
+            element = self._extract_class_info(node, context)
+        elif isinstance(node, ast.Import):
+            element = self._extract_import_info(node, context)
+        elif isinstance(node, ast.ImportFrom):
+            element = self._extract_import_from_info(node, context)
+
+        return [element] if element else []
+
+    def _scan_go_file(self, file_path: Path, store: Optional[ElementStore] = None) -> List[Any]:
         """Scannt eine Go-Datei"""
         go_parser = GoParser()
-        go_elements = go_parser.parse_file(file_path)
+        # Der Go-Parser liest und extrahiert in einem Schritt
+        with measure_phase('extract'):
+            go_elements = go_parser.parse_file(file_path)
 
         code_elements = []
         for elem in go_elements:
-            code_element = CodeElement(
-                name=elem['name'],
-                type=ElementType.FUNCTION if elem['type'] == 'function' else
-                     ElementType.CLASS if elem['type'] in ['struct', 'interface'] else
-                     ElementType.FUNCTION,
-                signature=elem.get('signature', ''),
-                line_number=elem.get('line_number'),
-                file_path=elem.get('file_path'),
-                code_snippet=elem.get('code_snippet', ''),
-                docstring=''  # Go-Dokumentation könnte hier extrahiert werden
-            )
-            code_elements.append(code_element)
+            code_elements.append(emit_element(CODE_KIND, {
+                'name': elem['name'],
+                'type': ElementType.FUNCTION if elem['type'] == 'function' else
+                        ElementType.CLASS if elem['type'] in ['struct', 'interface'] else
+                        ElementType.FUNCTION,
+                'signature': elem.get('signature', ''),
+                'line_number': elem.get('line_number'),
+                'file_path': str(file_path),
+                'project_path': str(file_path.parent),
+                'code_snippet': elem.get('code_snippet', ''),
+                'docstring': ''  # Go-Dokumentation könnte hier extrahiert werden
+            }, store))
 
         return code_elements
 
-    def _scan_rust_file(self, file_path: Path) -> List[CodeElement]:
+    def _scan_rust_file(self, file_path: Path, store: Optional[ElementStore] = None) -> List[Any]:
         """Scannt eine Rust-Datei"""
         rust_parser = RustParser()
-        rust_elements = rust_parser.parse_file(file_path)
+        # Der Rust-Parser liest und extrahiert in einem Schritt
+        with measure_phase('extract'):
+            rust_elements = rust_parser.parse_file(file_path)
 
         code_elements = []
         for elem in rust_elements:
-            code_element = CodeElement(
-                name=elem['name'],
-                type=ElementType.FUNCTION if elem['type'] == 'function' else
-                     ElementType.CLASS if elem['type'] in ['struct', 'enum', 'trait'] else
-                     ElementType.FUNCTION,
-                signature=elem.get('signature', ''),
-                line_number=elem.get('line_number'),
-                file_path=elem.get('file_path'),
-                code_snippet=elem.get('code_snippet', ''),
-                docstring=''  # Rust-Dokumentation könnte hier extrahiert werden
-            )
-            code_elements.append(code_element)
+            code_elements.append(emit_element(CODE_KIND, {
+                'name': elem['name'],
+                'type': ElementType.FUNCTION if elem['type'] == 'function' else
+                        ElementType.CLASS if elem['type'] in ['struct', 'enum', 'trait'] else
+                        ElementType.FUNCTION,
+                'signature': elem.get('signature', ''),
+                'line_number': elem.get('line_number'),
+                'file_path': str(file_path),
+                'project_path': str(file_path.parent),
+                'code_snippet': elem.get('code_snippet', ''),
+                'docstring': ''  # Rust-Dokumentation könnte hier extrahiert werden
+            }, store))
 
         return code_elements
 
-    def _extract_function_info(self, node: ast.AST, file_path: Path, content: str) -> CodeElement:
+    def _extract_function_info(self, node: ast.AST, context: ParseContext) -> Any:
         """Extrahiert Informationen aus einer Python-Funktion"""
         # Parameter extrahieren
         args = []
@@ -156,27 +218,27 @@ class CodeScanner:
                     api_method = decorator.id.upper()
         
         # Code-Snippet extrahieren
-        lines = content.split('\n')
         start_line = node.lineno
         end_line = getattr(node, 'end_lineno', node.lineno + 10)  # Falls end_lineno nicht verfügbar
-        code_snippet = '\n'.join(lines[start_line-1:end_line])
+        code_snippet, snippet_span = self._get_snippet(context, start_line, end_line)
         
-        return CodeElement(
-            name=node.name,
-            type=ElementType.API_ENDPOINT if is_api else ElementType.FUNCTION,
-            signature=ast.unparse(node),
-            parameters=args,
-            return_type=return_annotation,
-            docstring=docstring,
-            api_info={
+        return context.emit({
+            'name': node.name,
+            'type': ElementType.API_ENDPOINT if is_api else ElementType.FUNCTION,
+            'signature': context.get_header(node),
+            'parameters': args,
+            'return_type': return_annotation,
+            'docstring': docstring,
+            'api_info': {
                 'endpoint': api_path,
                 'method': api_method
             } if is_api else None,
-            line_number=node.lineno,
-            code_snippet=code_snippet
-        )
+            'line_number': node.lineno,
+            'code_snippet': code_snippet,
+            'snippet_span': snippet_span
+        })
     
-    def _extract_class_info(self, node: ast.AST, file_path: Path, content: str) -> CodeElement:
+    def _extract_class_info(self, node: ast.AST, context: ParseContext) -> Any:
         """Extrahiert Informationen aus einer Python-Klasse"""
         methods = []
         for item in node.body:
@@ -188,51 +250,97 @@ class CodeScanner:
         
         docstring = ast.get_docstring(node) or ""
         
-        lines = content.split('\n')
         start_line = node.lineno
         end_line = getattr(node, 'end_lineno', node.lineno + len(node.body) * 5)
-        code_snippet = '\n'.join(lines[start_line-1:end_line])
+        code_snippet, snippet_span = self._get_snippet(context, start_line, end_line)
         
-        return CodeElement(
-            name=node.name,
-            type=ElementType.CLASS,
-            signature=ast.unparse(node),
-            methods=methods,
-            docstring=docstring,
-            line_number=node.lineno,
-            code_snippet=code_snippet
-        )
+        return context.emit({
+            'name': node.name,
+            'type': ElementType.CLASS,
+            'signature': context.get_header(node),
+            'methods': methods,
+            'docstring': docstring,
+            'line_number': node.lineno,
+            'code_snippet': code_snippet,
+            'snippet_span': snippet_span
+        })
     
-    def _extract_import_info(self, node: ast.AST, file_path: Path) -> CodeElement:
+    def _get_snippet(self, context: ParseContext, start_line: int, end_line: int) -> Tuple[Optional[str], Optional[Tuple[int, int]]]:
+        """
+        Gibt das Snippet der Zeilen start_line bis end_line zurück
+
+        Bei lazy_content wird statt des Texts nur der Byte-Bereich in der Datei
+        gespeichert; Klassen und ihre Methoden teilen sich so denselben Dateiinhalt.
+        """
+        if self.config.lazy_content:
+            return None, context.line_span(start_line, end_line)
+        return context.get_lines(start_line, end_line), None
+
+    def _extract_import_info(self, node: ast.AST, context: ParseContext) -> Any:
         """Extrahiert Import-Informationen"""
         names = [alias.name for alias in node.names]
-        return CodeElement(
-            name=', '.join(names),
-            type=ElementType.IMPORT,
-            imports=names,
-            line_number=node.lineno
-        )
+        return context.emit({
+            'name': ', '.join(names),
+            'type': ElementType.IMPORT,
+            'imports': names,
+            'line_number': node.lineno
+        })
     
-    def _extract_import_from_info(self, node: ast.AST, file_path: Path) -> CodeElement:
+    def _extract_import_from_info(self, node: ast.AST, context: ParseContext) -> Any:
         """Extrahiert Import-from-Informationen"""
         module = node.module or ''
         names = [alias.name for alias in node.names]
-        return CodeElement(
-            name=f"from {module}: {', '.join(names)}",
-            type=ElementType.IMPORT,
-            imports=names,
-            import_from=module,
-            line_number=node.lineno
-        )
+        return context.emit({
+            'name': f"from {module}: {', '.join(names)}",
+            'type': ElementType.IMPORT,
+            'imports': names,
+            'import_from': module,
+            'line_number': node.lineno
+        })
     
-    def _scan_javascript_file(self, file_path: Path) -> List[CodeElement]:
+    def _scan_javascript_file(self, file_path: Path, framework_parsers: List[FrameworkParser],
+                              data: Optional[bytes] = None,
+                              store: Optional[ElementStore] = None) -> Tuple[List[Any], List[Dict[str, Any]]]:
         """Scannt eine JavaScript-Datei"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            with measure_phase('read'):
+                context = ParseContext.from_file(file_path, data, store)
         except:
-            return []
+            return [], []
+
+        with measure_phase('extract'):
+            if getattr(self.config, 'javascript_extractor', 'tokenizer') == 'regex':
+                fields = self._extract_javascript_regex(context)
+            else:
+                fields = JavaScriptExtractor(context.source, context.line_index).extract_fields()
+                if self.config.lazy_content:
+                    # Snippets umfassen ganze Zeilen und lassen sich als Byte-Bereich ablegen
+                    for values in fields:
+                        snippet = values.get('code_snippet')
+                        if snippet is not None and values['line_number']:
+                            end_line = values['line_number'] + snippet.count('\n')
+                            values['snippet_span'] = context.line_span(values['line_number'], end_line)
+                            values['code_snippet'] = None
+            elements = [context.emit(values) for values in fields]
+
+        # Framework-Parser (z.B. Express) verwenden den bereits gelesenen Quelltext
+        framework_elements = []
+        if framework_parsers:
+            with measure_phase('framework-parse'):
+                for parser in framework_parsers:
+                    framework_elements.extend(parser.parse_context(context))
         
+        return elements, framework_elements
+
+    def _extract_javascript_regex(self, context: ParseContext) -> List[Dict[str, Any]]:
+        """
+        Bisherige Extraktion über reguläre Ausdrücke
+
+        Erkennt auch Aufrufe als Funktionen; nur noch für Vergleiche und als Rückfall
+        über javascript_extractor = "regex" verfügbar. Gibt wie
+        JavaScriptExtractor.extract_fields die Felder der Elemente zurück.
+        """
+        content = context.source
         elements = []
         
         # Funktionen (inkl. Arrow-Funktionen)
@@ -243,34 +351,34 @@ class CodeScanner:
         # Funktionen finden
         for match in re.finditer(function_pattern, content):
             func_name = match.group(1)
-            line_start = content[:match.start()].count('\n') + 1
-            elements.append(CodeElement(
-                name=func_name,
-                type=ElementType.FUNCTION,
-                line_number=line_start,
-                signature=match.group(0)
-            ))
+            line_start = context.line_number_at(match.start())
+            elements.append({
+                'name': func_name,
+                'type': ElementType.FUNCTION,
+                'line_number': line_start,
+                'signature': match.group(0)
+            })
         
         # Arrow-Funktionen finden
         for match in re.finditer(arrow_function_pattern, content):
             func_name = match.group(1)
-            line_start = content[:match.start()].count('\n') + 1
-            elements.append(CodeElement(
-                name=func_name,
-                type=ElementType.FUNCTION,
-                line_number=line_start,
-                signature=match.group(0)
-            ))
+            line_start = context.line_number_at(match.start())
+            elements.append({
+                'name': func_name,
+                'type': ElementType.FUNCTION,
+                'line_number': line_start,
+                'signature': match.group(0)
+            })
         
         # Klassen finden
         for match in re.finditer(class_pattern, content):
             class_name = match.group(1)
-            line_start = content[:match.start()].count('\n') + 1
-            elements.append(CodeElement(
-                name=class_name,
-                type=ElementType.CLASS,
-                line_number=line_start,
-                signature=match.group(0)
-            ))
-        
+            line_start = context.line_number_at(match.start())
+            elements.append({
+                'name': class_name,
+                'type': ElementType.CLASS,
+                'line_number': line_start,
+                'signature': match.group(0)
+            })
+
         return elements
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+Erkennung von Dateien mit identischem Inhalt
+
+Vendorte Kopien, generierte Clients und kopierte Beispiele werden nur einmal
+geparst; die Elemente der ersten Kopie werden auf alle weiteren Pfade übertragen.
+Gehasht werden nur Dateien, deren Endung und Größe mit einer anderen Datei
+übereinstimmen; bekannte Hashes (Git-Blob-ID, Scan-Cache) ersparen das Lesen.
+"""
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from .file_manifest import FileEntry
+from ..models.element import ElementType
+
+
+class DuplicateIndex:
+    """Ordnet doppelte Dateien ihrer ersten Kopie (in Scan-Reihenfolge) zu"""
+
+    def __init__(self):
+        self.content_hashes: Dict[str, str] = {}  # Pfad -> Inhalts-Hash (nur Dateien mit Kopien)
+        self._canonical: Dict[str, str] = {}  # Kopie -> erste Datei mit gleichem Inhalt
+        self._pending: Dict[str, int] = {}  # Erste Datei -> Anzahl noch ausstehender Kopien
+        self._results: Dict[str, List[Any]] = {}  # Erste Datei -> Elemente bis zur letzten Kopie
+        self.hashed_files = 0
+
+    @classmethod
+    def build(cls, entries: Iterable[FileEntry],
+              hash_entry: Callable[[FileEntry], Optional[str]]) -> 'DuplicateIndex':
+        """
+        Ermittelt die Gruppen identischer Dateien
+
+        Args:
+            entries: Dateien in Scan-Reihenfolge
+            hash_entry: Liefert den Inhalts-Hash einer Datei (oder None, wenn nicht lesbar)
+
+        Returns:
+            Index mit den Duplikat-Beziehungen
+        """
+        index = cls()
+
+        # Nur Dateien mit gleicher Endung und Größe können identisch sein
+        by_size: Dict[Tuple[str, int], List[FileEntry]] = {}
+        seen = set()
+        for entry in entries:
+            if entry.path in seen:
+                # Überlappende Scan-Pfade liefern dieselbe Datei mehrfach
+                continue
+            seen.add(entry.path)
+            by_size.setdefault((entry.suffix, entry.size), []).append(entry)
+
+        for candidates in by_size.values():
+            if len(candidates) < 2:
+                continue
+            by_hash: Dict[str, List[str]] = {}
+            for entry in candidates:
+                content_hash = hash_entry(entry)
+                index.hashed_files += 1
+                if content_hash is not None:
+                    by_hash.setdefault(content_hash, []).append(str(entry.path))
+
+            for content_hash, paths in by_hash.items():
+                if len(paths) < 2:
+                    continue
+                canonical = paths[0]
+                index._pending[canonical] = len(paths) - 1
+                for path in paths:
+                    index.content_hashes[path] = content_hash
+                for path in paths[1:]:
+                    index._canonical[path] = canonical
+        return index
+
+    @property
+    def duplicate_files(self) -> int:
+        """Anzahl der Dateien, die nicht selbst geparst werden müssen"""
+        return len(self._canonical)
+
+    def content_hash(self, path: str) -> Optional[str]:
+        """Gibt den Inhalts-Hash einer Datei mit Kopien zurück"""
+        return self.content_hashes.get(path)
+
+    def duplicate_of(self, path: str) -> Optional[str]:
+        """Gibt die erste Datei mit gleichem Inhalt zurück (None, wenn path selbst die erste ist)"""
+        return self._canonical.get(path)
+
+    def remember(self, path: str, elements: List[Any]) -> None:
+        """Behält die Elemente einer ersten Datei, bis alle Kopien verarbeitet sind"""
+        if path in self._pending:
+            self._results[path] = elements
+
+    def take(self, path: str) -> Optional[List[Any]]:
+        """
+        Gibt die Elemente für eine Kopie zurück, mit auf path umgeschriebenem Dateipfad
+
+        Returns:
+            Elemente oder None, wenn die erste Datei nicht gescannt wurde
+        """
+        canonical = self._canonical.get(path)
+        elements = self._results.get(canonical)
+        if elements is None:
+            return None
+        self._pending[canonical] -= 1
+        if self._pending[canonical] == 0:
+            # Letzte Kopie: Elemente der ersten Datei werden nicht mehr benötigt
+            del self._results[canonical]
+        return relocate_elements(elements, path)
+
+
+def relocate_elements(elements: List[Any], file_path: str) -> List[Any]:
+    """
+    Kopiert Elemente auf einen anderen Dateipfad mit identischem Inhalt
+
+    Zeilennummern und Byte-Bereiche bleiben gültig, da der Inhalt übereinstimmt.
+    Aus dem Pfad abgeleitete Felder werden neu gesetzt: Das dateiweite
+    Dokumentations-Element heißt wie die Kopie (DocScanner verwendet den Dateinamen).
+    """
+    path = Path(file_path)
+    project_path = str(path.parent)
+    relocated = []
+    for element in elements:
+        if isinstance(element, dict):
+            element = dict(element)
+            if 'file_path' in element:
+                element['file_path'] = file_path
+            if element.get('type') == ElementType.DOCUMENTATION.value:
+                element['name'] = path.stem
+        else:
+            update = {'file_path': file_path, 'project_path': project_path}
+            if element.type == ElementType.DOCUMENTATION:
+                update['name'] = path.stem
+            # Pydantic v2 bzw. v1; Zeilen eines ElementStore werden im Speicher kopiert
+            copy = getattr(element, 'model_copy', None) or element.copy
+            element = copy(update=update)
+        relocated.append(element)
+    return relocated
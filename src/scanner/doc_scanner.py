@@ -1,38 +1,59 @@
 import re
 from pathlib import Path
-from typing import List
-from ..models.element import DocElement, ElementType
+from typing import Any, Dict, List, Optional
+from ..models.element import ElementType
+from ..models.element_store import DOC_KIND, ElementStore, emit_element
 from ..core.config_manager import ProjectConfig
+from .line_index import LineIndex
+from ..utils.content_provider import decode_text
+from .performance_analyzer import measure_phase
 
 class DocScanner:
     def __init__(self, config: ProjectConfig):
         self.config = config
     
-    def scan_file(self, file_path: Path) -> List[DocElement]:
-        """Scannt eine Dokumentationsdatei und extrahiert alle relevanten Elemente"""
+    def scan_file(self, file_path: Path, data: Optional[bytes] = None,
+                  store: Optional[ElementStore] = None) -> List[Any]:
+        """
+        Scannt eine Dokumentationsdatei und extrahiert alle relevanten Elemente
+
+        Args:
+            file_path: Pfad zur Datei
+            data: Bereits gelesene Dateibytes (die Datei wird dann nicht erneut gelesen)
+            store: ElementStore, in den die Elemente direkt geschrieben werden; die
+                   Rückgabe enthält dann ElementRow-Sichten statt DocElement-Modellen
+        """
         elements = []
         
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-        except:
-            return elements
+        if data is None:
+            try:
+                with measure_phase('read'):
+                    with open(file_path, 'rb') as f:
+                        data = f.read()
+            except:
+                return elements
+        content = decode_text(data)
         
-        if file_path.suffix.lower() == '.md':
-            elements = self._scan_markdown_file(content, file_path)
-        elif file_path.suffix.lower() == '.rst':
-            elements = self._scan_rst_file(content, file_path)
-        elif file_path.suffix.lower() == '.txt':
-            elements = self._scan_txt_file(content, file_path)
+        with measure_phase('parse'):
+            if file_path.suffix.lower() == '.md':
+                elements = self._scan_markdown_file(content, file_path)
+            elif file_path.suffix.lower() == '.rst':
+                elements = self._scan_rst_file(content, file_path)
+            elif file_path.suffix.lower() == '.txt':
+                elements = self._scan_txt_file(content, file_path)
         
         # Hinzufügen von Dateiinformationen zu jedem Element
-        for element in elements:
-            element.file_path = str(file_path)
-            element.project_path = str(file_path.parent)
+        for values in elements:
+            values['file_path'] = str(file_path)
+            values['project_path'] = str(file_path.parent)
+            if self.config.lazy_content and values.get('full_content') is not None:
+                # Nur der Byte-Bereich wird gespeichert, der Inhalt wird bei Bedarf geladen
+                values['full_content'] = None
+                values['content_span'] = (0, len(data))
         
-        return elements
+        return [emit_element(DOC_KIND, values, store) for values in elements]
     
-    def _scan_markdown_file(self, content: str, file_path: Path) -> List[DocElement]:
+    def _scan_markdown_file(self, content: str, file_path: Path) -> List[Dict[str, Any]]:
         """Scannt eine Markdown-Datei"""
         elements = []
         
@@ -46,75 +67,76 @@ class DocScanner:
             if match:
                 level = len(match.group(1))
                 title = match.group(2).strip()
-                elements.append(DocElement(
-                    name=title,
-                    type=ElementType.DOC_HEADING,
-                    level=level,
-                    content=line.strip(),
-                    line_number=i + 1
-                ))
+                elements.append({
+                    'name': title,
+                    'type': ElementType.DOC_HEADING,
+                    'level': level,
+                    'content': line.strip(),
+                    'line_number': i + 1
+                })
         
         # Code-Blöcke extrahieren
+        line_index = LineIndex(content)
         for match in re.finditer(code_block_pattern, content, re.DOTALL):
             language = match.group(1) or 'text'
             code = match.group(2).strip()
-            # Find line number by counting newlines before this match
-            line_number = content[:match.start()].count('\n') + 1
-            elements.append(DocElement(
-                name=f"Code block ({language})",
-                type=ElementType.DOC_CODE_BLOCK,
-                language=language,
-                content=code,
-                line_number=line_number
-            ))
+            line_number = line_index.line_number(match.start())
+            elements.append({
+                'name': f"Code block ({language})",
+                'type': ElementType.DOC_CODE_BLOCK,
+                'language': language,
+                'content': code,
+                'line_number': line_number
+            })
         
         # Dateiweiter Inhalt als allgemeines Dokument
-        elements.append(DocElement(
-            name=file_path.stem,
-            type=ElementType.DOCUMENTATION,
-            content=content[:1000],  # Erste 1000 Zeichen als Vorschau
-            full_content=content
-        ))
+        elements.append({
+            'name': file_path.stem,
+            'type': ElementType.DOCUMENTATION,
+            'content': content[:1000],  # Erste 1000 Zeichen als Vorschau
+            'full_content': content
+        })
         
         return elements
     
-    def _scan_rst_file(self, content: str, file_path: Path) -> List[DocElement]:
+    def _scan_rst_file(self, content: str, file_path: Path) -> List[Dict[str, Any]]:
         """Scannt eine reStructuredText-Datei"""
         elements = []
         
         # RST-Überschriften extrahieren (vereinfachte Variante)
         # RST verwendet verschiedene Zeichen zum Unterstreichen
         rst_heading_pattern = r'^([^\n]+)\n([=]+|-|~|`|#|\*|\.){2,}$'
+        line_index = LineIndex(content)
         
         for match in re.finditer(rst_heading_pattern, content, re.MULTILINE):
             title = match.group(1).strip()
-            elements.append(DocElement(
-                name=title,
-                type=ElementType.DOC_HEADING,
-                content=match.group(0),
-                line_number=content[:match.start()].count('\n') + 1
-            ))
+            elements.append({
+                'name': title,
+                'type': ElementType.DOC_HEADING,
+                'content': match.group(0),
+                'line_number': line_index.line_number(match.start())
+            })
         
         # Dateiweiter Inhalt als allgemeines Dokument
-        elements.append(DocElement(
-            name=file_path.stem,
-            type=ElementType.DOCUMENTATION,
-            content=content[:1000],  # Erste 1000 Zeichen als Vorschau
-            full_content=content
-        ))
+        elements.append({
+            'name': file_path.stem,
+            'type': ElementType.DOCUMENTATION,
+            'content': content[:1000],  # Erste 1000 Zeichen als Vorschau
+            'full_content': content
+        })
         
         return elements
     
-    def _scan_txt_file(self, content: str, file_path: Path) -> List[DocElement]:
+    def _scan_txt_file(self, content: str, file_path: Path) -> List[Dict[str, Any]]:
         """Scannt eine Text-Datei"""
         elements = []
         
         # Einfache Struktur für Textdateien
-        elements.append(DocElement(
-            name=file_path.stem,
-            type=ElementType.DOCUMENTATION,
-            content=content[:2000],  # Erste 2000 Zeichen
-            full_content=content
-        ))
+        elements.append({
+            'name': file_path.stem,
+            'type': ElementType.DOCUMENTATION,
+            'content': content[:2000],  # Erste 2000 Zeichen
+            'full_content': content
+        })
         
         return elements
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+Kompakte Kodierung von Scan-Elementen für den Austausch zwischen Prozessen
+
+Statt vollständiger Pydantic-Objekte werden Tupel der Feldwerte in fester
+Reihenfolge übertragen und als marshal-Bytes verpackt. Der Elternprozess
+stellt daraus ohne erneute Validierung wieder Modelle her.
+"""
+import marshal
+import sys
+from typing import Any, List, Tuple
+from src.models.element import CodeElement, DocElement, ElementType
+
+CODE_RECORD = 'c'
+DOC_RECORD = 'd'
+RAW_RECORD = 'r'
+
+# Felder, deren Werte sich innerhalb einer Datei wiederholen
+_INTERNED_FIELDS = ('file_path', 'project_path')
+
+
+def _field_names(model) -> Tuple[str, ...]:
+    """Gibt die Feldnamen eines Pydantic-Modells zurück (Pydantic v1 und v2)"""
+    fields = getattr(model, 'model_fields', None) or model.__fields__
+    return tuple(fields)
+
+
+CODE_FIELDS = _field_names(CodeElement)
+DOC_FIELDS = _field_names(DocElement)
+
+
+def _construct(model, values: dict):
+    """Erstellt ein Modell ohne Validierung (Pydantic v1 und v2)"""
+    if hasattr(model, 'model_construct'):
+        return model.model_construct(**values)
+    return model.construct(**values)
+
+
+def _encode_values(element, fields: Tuple[str, ...]) -> tuple:
+    """Liest die Feldwerte eines Elements in fester Reihenfolge aus"""
+    values = []
+    for name in fields:
+        value = getattr(element, name)
+        if isinstance(value, ElementType):
+            value = value.value
+        elif name in _INTERNED_FIELDS and value is not None:
+            # Gleiche Objekte werden von marshal nur einmal geschrieben
+            value = sys.intern(value)
+        values.append(value)
+    return tuple(values)
+
+
+def encode_element(element: Any) -> tuple:
+    """
+    Kodiert ein Element als kompaktes Tupel
+
+    Args:
+        element: CodeElement, DocElement oder Dictionary eines Framework-Parsers
+
+    Returns:
+        Tupel aus Typkennung und Feldwerten
+    """
+    if isinstance(element, CodeElement):
+        return (CODE_RECORD, _encode_values(element, CODE_FIELDS))
+    if isinstance(element, DocElement):
+        return (DOC_RECORD, _encode_values(element, DOC_FIELDS))
+    return (RAW_RECORD, element)
+
+
+def decode_element(record: tuple) -> Any:
+    """Stellt ein mit encode_element kodiertes Element wieder her"""
+    kind, values = record
+    if kind == RAW_RECORD:
+        return values
+    model, fields = (CodeElement, CODE_FIELDS) if kind == CODE_RECORD else (DocElement, DOC_FIELDS)
+    data = dict(zip(fields, values))
+    data['type'] = ElementType(data['type'])
+    return _construct(model, data)
+
+
+def pack_records(records: List[tuple]) -> bytes:
+    """Verpackt kodierte Datensätze als Bytes"""
+    return marshal.dumps(records)
+
+
+def unpack_records(data: bytes) -> List[tuple]:
+    """Entpackt mit pack_records erzeugte Bytes"""
+    return marshal.loads(data)
@@ -1,12 +1,26 @@
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Optional
 from collections import defaultdict
 import mimetypes
 import json
+from .streaming_stats import QuantileSketch, ReservoirSample
 
 
 class FileAnalyzer:
-    def __init__(self):
+    """
+    Sammelt Filterstatistiken eines Scans
+
+    Der Speicherbedarf ist unabhängig von der Anzahl der Dateien: gezählt wird pro
+    Erweiterung und Verzeichnis, Dateigrößen gehen in einen Quantil-Sketch und von
+    den Dateipfaden wird nur eine Stichprobe für die Anzeige behalten. Analyzer
+    einzelner Worker werden mit merge zusammengeführt.
+    """
+
+    def __init__(self, sample_size: int = 1000):
+        """
+        Args:
+            sample_size: Maximale Anzahl behaltener Pfade je eingeschlossener und ausgeschlossener Dateien
+        """
         self.scan_statistics = {
             'total_files': 0,
             'included_files': 0,
@@ -14,21 +28,26 @@ class FileAnalyzer:
             'file_types': defaultdict(int),
             'excluded_dirs': defaultdict(int),
             'excluded_file_extensions': defaultdict(int),  # defaultdict für Erweiterungen ausgeschlossener Dateien
-            'file_sizes': [],
-            'by_extension': defaultdict(int)
+            'file_size_sketch': QuantileSketch(),
+            'by_extension': defaultdict(int),
+            'by_directory': defaultdict(int)  # Eingeschlossene Dateien pro Verzeichnis
         }
-        self.filtered_files = []
-        self.excluded_files = []
+        self.sample_size = sample_size
+        # Stichproben der Pfade (unterstützen "in", len() und Iteration)
+        self.filtered_files = ReservoirSample(sample_size)
+        self.excluded_files = ReservoirSample(sample_size, seed=1)
 
-    def analyze_file(self, file_path: Path, is_included: bool = True) -> None:
+    def analyze_file(self, file_path: Path, is_included: bool = True, file_size: Optional[int] = None) -> None:
         """
         Analysiert eine Datei und aktualisiert die Statistiken
         
         Args:
             file_path: Der Pfad zur Datei
             is_included: Ob die Datei eingeschlossen wurde oder ausgeschlossen wurde
+            file_size: Bereits bekannte Dateigröße (z.B. aus dem Datei-Manifest)
         """
-        file_size = file_path.stat().st_size
+        if file_size is None:
+            file_size = file_path.stat().st_size
         file_ext = file_path.suffix.lower()
         
         # Aktualisiere allgemeine Statistiken
@@ -38,11 +57,12 @@ class FileAnalyzer:
             self.scan_statistics['included_files'] += 1
             self.scan_statistics['file_types'][self._get_file_type(file_ext)] += 1
             self.scan_statistics['by_extension'][file_ext] += 1
-            self.scan_statistics['file_sizes'].append(file_size)
-            self.filtered_files.append(file_path)
+            self.scan_statistics['by_directory'][str(file_path.parent)] += 1
+            self.scan_statistics['file_size_sketch'].add(file_size)
+            self.filtered_files.add(file_path)
         else:
             self.scan_statistics['excluded_files'] += 1
-            self.excluded_files.append(file_path)
+            self.excluded_files.add(file_path)
             self.scan_statistics['excluded_file_extensions'][file_ext] += 1
 
     def analyze_directory_exclusion(self, dir_path: Path) -> None:
@@ -55,20 +75,35 @@ class FileAnalyzer:
         dir_name = dir_path.name
         self.scan_statistics['excluded_dirs'][dir_name] += 1
 
+    def merge(self, other: 'FileAnalyzer') -> None:
+        """
+        Übernimmt die Statistiken eines anderen Analyzers (z.B. eines Workers)
+
+        Args:
+            other: Analyzer, dessen Zähler, Sketch und Stichproben addiert werden
+        """
+        for key in ('total_files', 'included_files', 'excluded_files'):
+            self.scan_statistics[key] += other.scan_statistics[key]
+        for key in ('file_types', 'excluded_dirs', 'excluded_file_extensions', 'by_extension', 'by_directory'):
+            counts = self.scan_statistics[key]
+            for name, count in other.scan_statistics[key].items():
+                counts[name] += count
+        self.scan_statistics['file_size_sketch'].merge(other.scan_statistics['file_size_sketch'])
+        self.filtered_files.merge(other.filtered_files)
+        self.excluded_files.merge(other.excluded_files)
+
     def get_scan_report(self) -> Dict:
         """
         Gibt einen umfassenden Bericht über den Scanvorgang zurück
+
+        filtered_files und excluded_files enthalten höchstens sample_size Pfade;
+        file_samples gibt an, ob die Listen vollständig sind.
         
         Returns:
             Ein Dictionary mit detaillierten Scan-Statistiken
         """
         # Berechne zusätzliche Statistiken
-        if self.scan_statistics['file_sizes']:
-            avg_size = sum(self.scan_statistics['file_sizes']) / len(self.scan_statistics['file_sizes'])
-            max_size = max(self.scan_statistics['file_sizes'])
-            min_size = min(self.scan_statistics['file_sizes'])
-        else:
-            avg_size = max_size = min_size = 0
+        sizes = self.scan_statistics['file_size_sketch']
 
         report = {
             'summary': {
@@ -81,13 +116,23 @@ class FileAnalyzer:
             'file_extensions': dict(self.scan_statistics['by_extension']),
             'excluded_directories': dict(self.scan_statistics['excluded_dirs']),
             'excluded_file_extensions': dict(self.scan_statistics['excluded_file_extensions']),
+            'directories': dict(self.scan_statistics['by_directory']),
             'file_size_stats': {
-                'average_size_bytes': avg_size,
-                'max_size_bytes': max_size,
-                'min_size_bytes': min_size
+                'average_size_bytes': sizes.mean,
+                'max_size_bytes': sizes.max or 0,
+                'min_size_bytes': sizes.min or 0,
+                'total_size_bytes': sizes.total,
+                'median_size_bytes': sizes.quantile(0.5),
+                'p90_size_bytes': sizes.quantile(0.9),
+                'p99_size_bytes': sizes.quantile(0.99)
             },
             'filtered_files': [str(f) for f in self.filtered_files],
-            'excluded_files': [str(f) for f in self.excluded_files]
+            'excluded_files': [str(f) for f in self.excluded_files],
+            'file_samples': {
+                'sample_size': self.sample_size,
+                'filtered_files_complete': self.filtered_files.is_complete,
+                'excluded_files_complete': self.excluded_files.is_complete
+            }
         }
         
         return report
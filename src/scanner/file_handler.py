@@ -1,53 +1,357 @@
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Set, Tuple, Dict, FrozenSet, Pattern
 import os
-from fnmatch import fnmatch
+import re
+import stat
+from fnmatch import translate
 import git
 from .gitignore_handler import GitIgnoreHandler
+from .file_manifest import FileEntry, FileManifest
+from .git_file_lister import list_git_files, list_ignored_paths, GitListedFile
 from ..core.config_manager import ProjectConfig
 
+# Verzeichnisnamen, die beim Durchlauf grundsätzlich nicht betreten werden
+_EXCLUDE_DIR_INDICATORS = ['venv', 'node_modules', '__pycache__', '.git', 'dist', 'build',
+                           '.pytest_cache', '.vscode', '.idea', 'target', 'out', '.next',
+                           'coverage', '.tox', '.nox', 'env', '.env', 'env.bak', '.env.bak',
+                           '__bundle', 'Pods', '.dart_tool', '.pub', 'vendor', 'bower_components',
+                           '.npm', '.yarn', 'jspm_packages', '.angular', '.nuxt', '.next',
+                           '.vercel', '.netlify', '.cache', 'tmp', 'temp', '.tmp', '.temp',
+                           '__pycache__', '.python-version', '.rvmrc', '.gem', 'CMakeFiles',
+                           'CMakeCache.txt', '.swp', '.swo', '*.swp', '*.swo', 'node_modules',
+                           '.serverless', '.dynamodb', '.fusebox', '.nyc_output', '.sass-cache',
+                           'coverage', 'lib-cov', '*.lcov', '.nyc_output', '.istanbul', 'e2e',
+                           'nightwatch', 'webdriver', '.grunt', '.lock-wscript', 'npm-debug.log',
+                           'yarn-debug.log', 'yarn-error.log', '.yarn-integrity', '.yarn-metadata',
+                           'node_modules', '.npm', '.node_repl_history', '.nvm', '.rbenv',
+                           '.ruby-version', '.bundle', 'vendor/bundle', 'vendor/cache', 'vendor/gems',
+                           'vendor/ruby', 'Pods', '.paket', 'paket-files', '.paket', 'packages',
+                           'lib', 'obj', 'TestResults', '*.nupkg', '.nuget', 'packages.lock.json',
+                           '.pypirc', '.python-history', '.pytest_cache', '.hypothesis', 'site-packages',
+                           'pip-log.txt', 'pip-delete-this-directory.txt', '.tox', '.coverage',
+                           'htmlcov', '.cover', '.hypothesis', '.pytest_cache', '.pyre', '.pytype',
+                           'mypy_cache', '.mypy_cache', 'venv', 'ENV', 'env', 'env.bak', '.env',
+                           '.env.bak', 'venv.bak', '.venv', 'ENV', '.ENV', 'env', 'venv',
+                           'ENV', 'env.bak', '.env', '.env.bak', 'venv.bak', '.venv', '.venv',
+                           '.pytest_cache', '.coverage', 'htmlcov', '.cover', '.hypothesis',
+                           '__pycache__', '*.pyc', '__pycache__', '*.pyc', '*.pyo', '*.pyd',
+                           '.Python', 'pip-log.txt', 'pip-delete-this-directory.txt', '.spyderproject',
+                           '.spyproject', '.ropeproject', 'site-packages', '.mypy_cache',
+                           'mypy_cache', '.dmypy.json', 'dmypy.json', '.pyre', '.pytype',
+                           'pyrightconfig.json', '.vs', '.vscode', '.idea', '.sublime-workspace',
+                           '.sublimelintcache', '*.sublime-project', '.project', '.c9', '*.c9revisions',
+                           '*_c9s', '.settings', '.vscode', '.history', '.vagrant', 'vagrant-*.out',
+                           'vagrant-*.err', 'CACHEDIR.TAG', 'node_modules', '.npm', '.node_repl_history',
+                           'npm-debug.log*', 'yarn-debug.log*', 'yarn-error.log*', '.nyc_output',
+                           'coverage', 'coverage/lcov-report', '.nyc_output', 'nyc_output',
+                           '.istanbul', 'e2e', 'nightwatch', 'webdriver', 'node_modules', '.npm',
+                           '.node_repl_history', '.nvm', '.rbenv', '.ruby-version', '.bundle',
+                           'vendor/bundle', 'vendor/cache', 'vendor/gems', 'vendor/ruby',
+                           'paket-files', '.paket', 'packages', 'lib', 'obj', 'TestResults',
+                           '*.nupkg', '.nuget', 'packages.lock.json', '.paket', '.pypirc',
+                           '.python-history', '.pytest_cache', '.hypothesis', 'site-packages',
+                           'pip-log.txt', 'pip-delete-this-directory.txt', '.tox', '.coverage',
+                           'htmlcov', '.cover', '.hypothesis', '.pytest_cache', '.pyre', '.pytype',
+                           'mypy_cache', '.mypy_cache', 'venv', 'ENV', 'env', 'env.bak', '.env',
+                           '.env.bak', 'venv.bak', '.venv']
+
+
+# Verzeichnisse, in denen liegende Dateien nie eingeschlossen werden
+_EXCLUDE_FILE_DIRS = ['venv', 'node_modules', '__pycache__', '.git', 'dist', 'build', '.pytest_cache', '.vscode', '.idea', 'target', 'out', '.next', 'coverage', '.tox', '.nox', 'env', '.env', 'env.bak', '.env.bak', '__bundle', 'Pods', '.dart_tool', '.pub', 'vendor', 'bower_components', '.npm', '.yarn', 'jspm_packages', '.angular', '.nuxt', '.next', '.vercel', '.netlify', '.cache', 'tmp', 'temp', '.tmp', '.temp']
+
+
+def _split_indicators(indicators: List[str]) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+    """Teilt Verzeichnis-Indikatoren in einzelne Namen und mehrteilige Pfade auf"""
+    names = frozenset(indicator for indicator in indicators if '/' not in indicator)
+    paths = tuple(sorted({f'/{indicator}/' for indicator in indicators if '/' in indicator}))
+    return names, paths
+
+
+_DIR_INDICATOR_NAMES, _DIR_INDICATOR_PATHS = _split_indicators(_EXCLUDE_DIR_INDICATORS)
+_FILE_DIR_NAMES, _FILE_DIR_PATHS = _split_indicators(_EXCLUDE_FILE_DIRS)
+
+
+def _matches_indicators(path_str: str, names: FrozenSet[str], paths: Tuple[str, ...]) -> bool:
+    """Prüft, ob ein Pfadbestandteil einem der Indikatoren entspricht"""
+    if any(part in names for part in path_str.split('/')):
+        return True
+    if paths:
+        padded = f'/{path_str}/'
+        return any(indicator in padded for indicator in paths)
+    return False
+
+
+def compile_fnmatch_patterns(patterns: List[str]) -> Pattern:
+    """Fasst fnmatch-Muster (ohne Groß-/Kleinschreibung) zu einem regulären Ausdruck zusammen"""
+    if not patterns:
+        return re.compile(r'(?!)')
+    return re.compile('|'.join(translate(pattern.lower()) for pattern in dict.fromkeys(patterns)))
+
+
 class FileHandler:
     def __init__(self, config: ProjectConfig):
         self.config = config
         self.gitignore_handler = None
+        self._compiled_patterns: Dict[Tuple[str, ...], Pattern] = {}
+        self._active_filters: Optional[Tuple[Pattern, Pattern, Pattern]] = None
 
     def get_filtered_files(self, scan_path: Path) -> List[Path]:
         """Gibt eine Liste von Dateien zurück, die den Filterkriterien entsprechen"""
-        files = []
+        return self.build_manifest(scan_path).paths
 
-        # Initialisiere den GitIgnoreHandler
-        self.gitignore_handler = GitIgnoreHandler(scan_path)
+    def build_manifests(self, project_path: Path) -> List[FileManifest]:
+        """
+        Erstellt die Manifeste für alle konfigurierten Scan-Pfade eines Projekts
 
-        for root, dirs, filenames in os.walk(scan_path):
-            root_path = Path(root)
+        Dateien, die über mehrere (überlappende) Scan-Pfade erreichbar sind,
+        erscheinen nur im ersten Manifest.
+        """
+        project_path = Path(project_path)
+        seen_files: Set[Tuple[int, int]] = set()
+        manifests = []
+        for scan_path_str in self.config.scan_paths:
+            scan_path = project_path / scan_path_str
+            if not scan_path.exists():
+                continue
+            manifests.append(self.build_manifest(scan_path, seen_files))
+        return manifests
 
-            # Entferne auszuschließende Verzeichnisse bereits hier,
-            # bevor Dateien darin untersucht werden
-            dirs[:] = [d for d in dirs if not self._should_exclude_dir(d, root_path, self.config.exclude_patterns)]
+    def build_manifest(self, scan_path: Path, seen_files: Optional[Set[Tuple[int, int]]] = None) -> FileManifest:
+        """
+        Durchläuft einen Scan-Pfad genau einmal und erstellt das Datei-Manifest
 
-            # Entferne .git-verzeichnisse wenn .git nicht in include_patterns ist
-            if '.git' not in self.config.include_patterns:
-                dirs[:] = [d for d in dirs if d != '.git']
+        Größe, mtime und Inode stammen aus dem DirEntry des Durchlaufs, sodass
+        nachgelagerte Schritte keine weiteren stat()-Aufrufe pro Datei benötigen.
+        Ausgeschlossene und gitignorierte Verzeichnisse werden nicht betreten.
 
-            # Dateien filtern
-            for filename in filenames:
-                file_path = Path(root) / filename
+        Args:
+            scan_path: Zu durchlaufendes Verzeichnis
+            seen_files: Gemeinsame Menge bereits erfasster (Gerät, Inode)-Paare, um
+                        Dateien aus überlappenden Scan-Pfaden nur einmal aufzunehmen
+        """
+        scan_path = Path(scan_path)
+        seen_files = seen_files if seen_files is not None else set()
+        # Filtermuster einmal pro Durchlauf kompilieren
+        self._active_filters = self._compile_filters()
+        try:
+            enumeration = self.config.file_enumeration
+            if enumeration in ('git', 'auto'):
+                listed = list_git_files(scan_path)
+                if listed is not None:
+                    return self._collect_git_files(scan_path, listed, seen_files)
+                if enumeration == 'git':
+                    print(f"Warnung: {scan_path} liegt nicht in einem Git-Repository, verwende Verzeichnisdurchlauf")
+            return self._walk(scan_path, seen_files)
+        finally:
+            self._active_filters = None
 
-                # Größe prüfen
-                if file_path.stat().st_size > self.config.max_file_size_mb * 1024 * 1024:
+    def _collect_git_files(self, scan_path: Path, listed: List[GitListedFile],
+                           seen_files: Set[Tuple[int, int]]) -> FileManifest:
+        """
+        Erstellt das Manifest aus der Dateiliste von git ls-files
+
+        Ignorierte Dateien sind bereits von Git ausgefiltert; angewendet werden nur
+        noch die Ausschluss- und Einschlussmuster der Konfiguration. Von Git
+        ignorierte Dateien und Verzeichnisse in docs- und auto_docs-Verzeichnissen
+        beliebiger Tiefe werden wie beim Verzeichnisdurchlauf trotzdem gescannt.
+        """
+        manifest = FileManifest(scan_path)
+        manifest.enumeration = 'git'
+        max_size = self.config.max_file_size_mb * 1024 * 1024
+        skip_git_dir = '.git' not in self.config.include_patterns
+        dir_excluded: Dict[str, bool] = {'': False}
+
+        for listed_file in listed:
+            directory, _, _ = listed_file.path.rpartition('/')
+            if self._is_git_dir_excluded(scan_path, directory, dir_excluded, manifest, skip_git_dir):
+                continue
+            self._add_git_file(manifest, scan_path, listed_file.path, listed_file.blob_id, seen_files, max_size)
+
+        manifest.directories_walked = len(dir_excluded)
+
+        # Ausnahme: auto_docs und docs Verzeichnisse (in beliebiger Tiefe) immer scannen, auch wenn gitignored.
+        # Git meldet ein ignoriertes Verzeichnis nur als Ganzes, seine übergeordneten Verzeichnisse
+        # sind also nicht ignoriert; das entspricht den Verzeichnissen, die der Durchlauf betritt.
+        in_doc_dir = self._is_doc_dir(scan_path)
+        for ignored_path in list_ignored_paths(scan_path) or []:
+            is_dir = ignored_path.endswith('/')
+            relative_path = ignored_path.rstrip('/')
+            directory = relative_path if is_dir else relative_path.rpartition('/')[0]
+            if not (in_doc_dir or any(part in ('docs', 'auto_docs') for part in directory.split('/'))):
+                continue
+            if self._is_git_dir_excluded(scan_path, directory, dir_excluded, manifest, skip_git_dir):
+                continue
+            if is_dir:
+                walked = self._walk(scan_path / relative_path, seen_files)
+                manifest.directories_walked += walked.directories_walked
+                for entry in walked:
+                    manifest.add(entry)
+            else:
+                self._add_git_file(manifest, scan_path, relative_path, None, seen_files, max_size)
+
+        return manifest
+
+    def _add_git_file(self, manifest: FileManifest, scan_path: Path, relative_path: str, blob_id: Optional[str],
+                      seen_files: Set[Tuple[int, int]], max_size: int):
+        """Nimmt eine von Git gemeldete Datei nach Filter-, Größen- und Duplikatprüfung ins Manifest auf"""
+        file_path = scan_path / relative_path
+        if not self._should_include_file(file_path, base_path=scan_path):
+            return
+
+        try:
+            file_stat = file_path.stat()
+        except OSError:
+            return
+        if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_size > max_size:
+            return
+
+        file_key = (file_stat.st_dev, file_stat.st_ino)
+        if file_key in seen_files:
+            return
+        seen_files.add(file_key)
+
+        manifest.add(FileEntry(
+            path=file_path,
+            size=file_stat.st_size,
+            mtime_ns=file_stat.st_mtime_ns,
+            inode=file_stat.st_ino,
+            blob_id=blob_id
+        ))
+
+    def _is_git_dir_excluded(self, scan_path: Path, directory: str, dir_excluded: Dict[str, bool],
+                             manifest: FileManifest, skip_git_dir: bool) -> bool:
+        """Prüft (mit Cache) die Verzeichnisse eines von Git gemeldeten Pfads gegen die Ausschlussmuster"""
+        cached = dir_excluded.get(directory)
+        if cached is not None:
+            return cached
+
+        parent, _, name = directory.rpartition('/')
+        excluded = self._is_git_dir_excluded(scan_path, parent, dir_excluded, manifest, skip_git_dir)
+        if not excluded:
+            parent_path = scan_path / parent if parent else scan_path
+            excluded = (skip_git_dir and name == '.git') or \
+                self._should_exclude_dir(name, parent_path, self.config.exclude_patterns, base_path=scan_path)
+            if excluded:
+                manifest.excluded_dirs.append(parent_path / name)
+
+        dir_excluded[directory] = excluded
+        return excluded
+
+    def _walk(self, scan_path: Path, seen_files: Set[Tuple[int, int]]) -> FileManifest:
+        """Führt den eigentlichen Verzeichnisdurchlauf für build_manifest aus"""
+        manifest = FileManifest(scan_path)
+        max_size = self.config.max_file_size_mb * 1024 * 1024
+        skip_git_dir = '.git' not in self.config.include_patterns
+
+        # .gitignore-Dateien werden während des Durchlaufs gemeldet statt separat gesucht
+        self.gitignore_handler = GitIgnoreHandler(scan_path, preload=False)
+        gitignore = self.gitignore_handler
+
+        # Schutz vor Symlink-Schleifen: bereits besuchte Verzeichnisse (Gerät, Inode)
+        try:
+            root_stat = scan_path.stat()
+        except OSError:
+            return manifest
+        visited_dirs = {(root_stat.st_dev, root_stat.st_ino)}
+
+        # Ausnahme: auto_docs und docs Verzeichnisse immer scannen, auch wenn gitignored
+        stack = [(scan_path, self._is_doc_dir(scan_path))]
+        while stack:
+            directory, is_doc_dir = stack.pop()
+            try:
+                with os.scandir(directory) as iterator:
+                    dir_entries = sorted(iterator, key=lambda entry: entry.name)
+            except OSError:
+                continue
+            manifest.directories_walked += 1
+
+            if any(entry.name == '.gitignore' for entry in dir_entries):
+                gitignore.add_gitignore(directory)
+
+            subdirectories = []
+            for entry in dir_entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+
+                if is_dir:
+                    dir_path = Path(entry.path)
+                    child_is_doc_dir = is_doc_dir or entry.name in ('docs', 'auto_docs')
+                    if (skip_git_dir and entry.name == '.git') or \
+                            self._should_exclude_dir(entry.name, directory, self.config.exclude_patterns, base_path=scan_path) or \
+                            (not child_is_doc_dir and gitignore.matches(dir_path, is_dir=True)):
+                        # Verzeichnis wird nicht betreten (Pruning)
+                        manifest.excluded_dirs.append(dir_path)
+                        continue
+                    try:
+                        dir_stat = entry.stat()
+                    except OSError:
+                        continue
+                    dir_key = (dir_stat.st_dev, dir_stat.st_ino)
+                    if dir_key in visited_dirs:
+                        continue
+                    visited_dirs.add(dir_key)
+                    subdirectories.append((dir_path, child_is_doc_dir))
                     continue
 
-                # Prüfen, ob Datei in Gitignore ist (verwendet den GitIgnoreHandler)
-                # Ausnahme: auto_docs und docs Verzeichnisse immer scannen, auch wenn gitignored
-                is_doc_dir = 'auto_docs' in str(file_path).split(os.sep) or 'docs' in str(file_path).split(os.sep)
-                if not is_doc_dir and self.gitignore_handler and self.gitignore_handler.is_ignored(file_path):
+                file_path = Path(entry.path)
+
+                # Prüfen, ob Datei in Gitignore ist; übergeordnete Verzeichnisse sind bereits geprüft
+                if not is_doc_dir and gitignore.matches(file_path):
                     continue
 
                 # Datei-Filter anwenden
-                if self._should_include_file(file_path):
-                    files.append(file_path)
+                if not self._should_include_file(file_path, base_path=scan_path):
+                    continue
+
+                try:
+                    file_stat = entry.stat()
+                except OSError:
+                    continue
+
+                # Größe prüfen
+                if file_stat.st_size > max_size:
+                    continue
 
-        return files
+                file_key = (file_stat.st_dev, file_stat.st_ino)
+                if file_key in seen_files:
+                    continue
+                seen_files.add(file_key)
+
+                manifest.add(FileEntry(
+                    path=file_path,
+                    size=file_stat.st_size,
+                    mtime_ns=file_stat.st_mtime_ns,
+                    inode=file_stat.st_ino
+                ))
+
+            # Umgekehrt einfügen, damit Unterverzeichnisse in alphabetischer Reihenfolge folgen
+            stack.extend(reversed(subdirectories))
+
+        return manifest
+
+    def _is_doc_dir(self, path: Path) -> bool:
+        """Prüft, ob ein Pfad in einem docs- oder auto_docs-Verzeichnis liegt"""
+        parts = Path(path).parts
+        return 'auto_docs' in parts or 'docs' in parts
+
+    def _compile_filters(self) -> Tuple[Pattern, Pattern, Pattern]:
+        """Kompiliert Ausschluss-, Dateiausschluss- und Einschlussmuster der Konfiguration"""
+        return (
+            self._compiled(self.config.exclude_patterns),
+            self._compiled(self.config.exclude_files),
+            self._compiled(self.config.include_patterns)
+        )
+
+    def _compiled(self, patterns: List[str]) -> Pattern:
+        """Gibt den (zwischengespeicherten) kombinierten Ausdruck für eine Musterliste zurück"""
+        key = tuple(patterns)
+        compiled = self._compiled_patterns.get(key)
+        if compiled is None:
+            compiled = compile_fnmatch_patterns(patterns)
+            self._compiled_patterns[key] = compiled
+        return compiled
     
     def _is_git_ignored(self, file_path: Path, git_repo) -> bool:
         """Prüft, ob eine Datei von Git ignoriert wird"""
@@ -65,92 +369,48 @@ class FileHandler:
     
     def _should_exclude(self, name: str, patterns: List[str]) -> bool:
         """Prüft, ob ein Name aufgrund der Ausschlussmuster ausgeschlossen werden sollte"""
-        for pattern in patterns:
-            if fnmatch(name.lower(), pattern.lower()):
-                return True
-        return False
+        if self._active_filters and patterns is self.config.exclude_patterns:
+            regex = self._active_filters[0]
+        else:
+            regex = self._compiled(patterns)
+        return regex.match(name.lower()) is not None
     
-    def _should_exclude_dir(self, dir_name: str, parent_path: Path, patterns: List[str]) -> bool:
+    def _should_exclude_dir(self, dir_name: str, parent_path: Path, patterns: List[str],
+                            base_path: Optional[Path] = None) -> bool:
         """Prüft, ob ein Verzeichnis basierend auf Ausschlussmustern ausgeschlossen werden sollte"""
         # Prüfe den Verzeichnisnamen selbst
         if self._should_exclude(dir_name, patterns):
             return True
 
-        # Prüfe den vollständigen Pfad
-        full_path = parent_path / dir_name
-        full_path_str = str(full_path).lower()
-
-        exclude_indicators = ['venv', 'node_modules', '__pycache__', '.git', 'dist', 'build',
-                             '.pytest_cache', '.vscode', '.idea', 'target', 'out', '.next',
-                             'coverage', '.tox', '.nox', 'env', '.env', 'env.bak', '.env.bak',
-                             '__bundle', 'Pods', '.dart_tool', '.pub', 'vendor', 'bower_components',
-                             '.npm', '.yarn', 'jspm_packages', '.angular', '.nuxt', '.next',
-                             '.vercel', '.netlify', '.cache', 'tmp', 'temp', '.tmp', '.temp',
-                             '__pycache__', '.python-version', '.rvmrc', '.gem', 'CMakeFiles',
-                             'CMakeCache.txt', '.swp', '.swo', '*.swp', '*.swo', 'node_modules',
-                             '.serverless', '.dynamodb', '.fusebox', '.nyc_output', '.sass-cache',
-                             'coverage', 'lib-cov', '*.lcov', '.nyc_output', '.istanbul', 'e2e',
-                             'nightwatch', 'webdriver', '.grunt', '.lock-wscript', 'npm-debug.log',
-                             'yarn-debug.log', 'yarn-error.log', '.yarn-integrity', '.yarn-metadata',
-                             'node_modules', '.npm', '.node_repl_history', '.nvm', '.rbenv',
-                             '.ruby-version', '.bundle', 'vendor/bundle', 'vendor/cache', 'vendor/gems',
-                             'vendor/ruby', 'Pods', '.paket', 'paket-files', '.paket', 'packages',
-                             'lib', 'obj', 'TestResults', '*.nupkg', '.nuget', 'packages.lock.json',
-                             '.pypirc', '.python-history', '.pytest_cache', '.hypothesis', 'site-packages',
-                             'pip-log.txt', 'pip-delete-this-directory.txt', '.tox', '.coverage',
-                             'htmlcov', '.cover', '.hypothesis', '.pytest_cache', '.pyre', '.pytype',
-                             'mypy_cache', '.mypy_cache', 'venv', 'ENV', 'env', 'env.bak', '.env',
-                             '.env.bak', 'venv.bak', '.venv', 'ENV', '.ENV', 'env', 'venv',
-                             'ENV', 'env.bak', '.env', '.env.bak', 'venv.bak', '.venv', '.venv',
-                             '.pytest_cache', '.coverage', 'htmlcov', '.cover', '.hypothesis',
-                             '__pycache__', '*.pyc', '__pycache__', '*.pyc', '*.pyo', '*.pyd',
-                             '.Python', 'pip-log.txt', 'pip-delete-this-directory.txt', '.spyderproject',
-                             '.spyproject', '.ropeproject', 'site-packages', '.mypy_cache',
-                             'mypy_cache', '.dmypy.json', 'dmypy.json', '.pyre', '.pytype',
-                             'pyrightconfig.json', '.vs', '.vscode', '.idea', '.sublime-workspace',
-                             '.sublimelintcache', '*.sublime-project', '.project', '.c9', '*.c9revisions',
-                             '*_c9s', '.settings', '.vscode', '.history', '.vagrant', 'vagrant-*.out',
-                             'vagrant-*.err', 'CACHEDIR.TAG', 'node_modules', '.npm', '.node_repl_history',
-                             'npm-debug.log*', 'yarn-debug.log*', 'yarn-error.log*', '.nyc_output',
-                             'coverage', 'coverage/lcov-report', '.nyc_output', 'nyc_output',
-                             '.istanbul', 'e2e', 'nightwatch', 'webdriver', 'node_modules', '.npm',
-                             '.node_repl_history', '.nvm', '.rbenv', '.ruby-version', '.bundle',
-                             'vendor/bundle', 'vendor/cache', 'vendor/gems', 'vendor/ruby',
-                             'paket-files', '.paket', 'packages', 'lib', 'obj', 'TestResults',
-                             '*.nupkg', '.nuget', 'packages.lock.json', '.paket', '.pypirc',
-                             '.python-history', '.pytest_cache', '.hypothesis', 'site-packages',
-                             'pip-log.txt', 'pip-delete-this-directory.txt', '.tox', '.coverage',
-                             'htmlcov', '.cover', '.hypothesis', '.pytest_cache', '.pyre', '.pytype',
-                             'mypy_cache', '.mypy_cache', 'venv', 'ENV', 'env', 'env.bak', '.env',
-                             '.env.bak', 'venv.bak', '.venv']
-
-        for indicator in exclude_indicators:
-            if f'/{indicator}/' in full_path_str or full_path_str.endswith('/' + indicator) or \
-               full_path_str.startswith(indicator + '/') or indicator == os.path.basename(full_path_str):
-                return True
-
-        return False
-
-    def _should_include_file(self, file_path: Path) -> bool:
+        # Prüfe den vollständigen Pfad (relativ zum Scan-Pfad, falls angegeben,
+        # damit z.B. ein Projekt unter /tmp nicht komplett ausgeschlossen wird)
+        full_path = self._relative_to_base(Path(parent_path) / dir_name, base_path)
+        full_path_str = full_path.as_posix().lower()
+        return _matches_indicators(full_path_str, _DIR_INDICATOR_NAMES, _DIR_INDICATOR_PATHS)
+
+    def _relative_to_base(self, path: Path, base_path: Optional[Path]) -> Path:
+        """Gibt den Pfad relativ zum Scan-Pfad zurück, sofern möglich"""
+        if base_path is None:
+            return path
+        try:
+            return path.relative_to(base_path)
+        except ValueError:
+            return path
+
+    def _should_include_file(self, file_path: Path, base_path: Optional[Path] = None) -> bool:
         """Prüft, ob eine Datei eingeschlossen werden sollte"""
         filename = file_path.name.lower()
+        _, exclude_files, include_patterns = self._active_filters or self._compile_filters()
 
         # Ausschlussdateien prüfen
-        for exclude_pattern in self.config.exclude_files:
-            if fnmatch(filename, exclude_pattern.lower()):
-                return False
+        if exclude_files.match(filename):
+            return False
 
         # Ausschluss für bestimmte Verzeichnisse (z.B. venv, node_modules)
         # Prüfe, ob der Dateipfad bestimmte Ausschluss-Verzeichnisse enthält
-        file_path_str = str(file_path).lower()
-        exclude_dirs = ['venv', 'node_modules', '__pycache__', '.git', 'dist', 'build', '.pytest_cache', '.vscode', '.idea', 'target', 'out', '.next', 'coverage', '.tox', '.nox', 'env', '.env', 'env.bak', '.env.bak', '__bundle', 'Pods', '.dart_tool', '.pub', 'vendor', 'bower_components', '.npm', '.yarn', 'jspm_packages', '.angular', '.nuxt', '.next', '.vercel', '.netlify', '.cache', 'tmp', 'temp', '.tmp', '.temp']
-        for exclude_dir in exclude_dirs:
-            if f'/{exclude_dir}/' in file_path_str or file_path_str.startswith(exclude_dir + '/') or file_path_str.endswith('/' + exclude_dir) or exclude_dir == os.path.basename(file_path_str):
-                return False
+        file_path_str = self._relative_to_base(file_path, base_path).as_posix().lower()
+        if _matches_indicators(file_path_str, _FILE_DIR_NAMES, _FILE_DIR_PATHS):
+            return False
 
         # Einschlussmuster prüfen
-        for include_pattern in self.config.include_patterns:
-            if fnmatch(filename, include_pattern.lower()):
-                return True
-
-        return False
\ No newline at end of file
+        return include_patterns.match(filename) is not None
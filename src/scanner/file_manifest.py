@@ -0,0 +1,55 @@
+"""
+Datei-Manifest: Ergebnis eines einzigen Verzeichnisdurchlaufs
+"""
+from pathlib import Path
+from typing import List, NamedTuple, Iterator, Optional
+
+
+class FileEntry(NamedTuple):
+    """Eine Datei im Manifest mit den beim Durchlauf ermittelten Metadaten"""
+    path: Path
+    size: int
+    mtime_ns: int
+    inode: int
+    blob_id: Optional[str] = None  # Git-Blob-ID, falls aus dem Git-Index bekannt
+
+    @property
+    def suffix(self) -> str:
+        """Dateierweiterung in Kleinbuchstaben"""
+        return self.path.suffix.lower()
+
+
+class FileManifest:
+    """
+    Liste aller relevanten Dateien eines Scan-Pfads
+
+    Das Manifest wird einmal pro Scan erstellt; Zählung, Filterstatistik und
+    Scannen arbeiten anschließend nur noch mit den hier gespeicherten Metadaten.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.entries: List[FileEntry] = []
+        self.excluded_dirs: List[Path] = []
+        self.directories_walked = 0
+        self.enumeration = 'walk'  # 'walk' oder 'git'
+
+    def add(self, entry: FileEntry) -> None:
+        """Fügt einen Dateieintrag hinzu"""
+        self.entries.append(entry)
+
+    @property
+    def paths(self) -> List[Path]:
+        """Gibt die Pfade aller Dateien zurück"""
+        return [entry.path for entry in self.entries]
+
+    @property
+    def total_size(self) -> int:
+        """Gesamtgröße aller Dateien in Bytes"""
+        return sum(entry.size for entry in self.entries)
+
+    def __iter__(self) -> Iterator[FileEntry]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
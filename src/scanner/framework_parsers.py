@@ -2,67 +2,86 @@
 Basisklasse und Implementierungen für Framework-spezifische Code-Parser
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 import ast
 import re
+from .parse_context import ParseContext, NodeExtractor, dispatch_ast
 
 
-class FrameworkParser(ABC):
-    """Abstrakte Basisklasse für Framework-spezifische Parser"""
-    
-    @abstractmethod
+class FrameworkParser(NodeExtractor, ABC):
+    """
+    Abstrakte Basisklasse für Framework-spezifische Parser
+
+    AST-basierte Parser implementieren extract_node und werden vom CodeScanner
+    im selben Durchlauf wie die allgemeine Extraktion aufgerufen.
+    """
+
+    # Dateiendungen, für die der Parser zuständig ist
+    file_suffixes: Tuple[str, ...] = ('.py',)
+
+    def is_relevant(self, file_path: Path) -> bool:
+        """Prüft, ob der Parser für eine Datei zuständig ist"""
+        return file_path.suffix.lower() in self.file_suffixes
+
     def parse_file(self, file_path: Path) -> List[Dict[str, Any]]:
         """Parst eine Datei und gibt eine Liste von Code-Elementen zurück"""
-        pass
+        if not self.is_relevant(file_path):
+            return []
+        try:
+            context = ParseContext.from_file(file_path)
+        except Exception:
+            return []
+        return self.parse_context(context)
+
+    def parse_context(self, context: ParseContext) -> List[Dict[str, Any]]:
+        """Parst eine bereits gelesene Datei aus ihrem Parse-Kontext"""
+        return dispatch_ast(context, [self])[0]
     
     @abstractmethod
     def get_framework_name(self) -> str:
         """Gibt den Namen des Frameworks zurück"""
         pass
 
+    def _get_code_snippet(self, context: ParseContext, node) -> str:
+        """Extrahiert einen Code-Snippet für das Node"""
+        start_line = node.lineno - 1
+        end_line = getattr(node, 'end_lineno', start_line + 10)
+        # Begrenze den Snippet auf maximal 20 Zeilen
+        end_line = min(end_line, start_line + 20)
+        return context.get_lines(start_line + 1, end_line)
+
 
 class FastAPIParser(FrameworkParser):
     """Parser für FastAPI-Anwendungen"""
+
+    node_types = (ast.FunctionDef,)
     
     def get_framework_name(self) -> str:
         return "fastapi"
     
-    def parse_file(self, file_path: Path) -> List[Dict[str, Any]]:
-        """Parst eine Python-Datei auf FastAPI-Elemente"""
+    def extract_node(self, node: ast.AST, context: ParseContext) -> List[Dict[str, Any]]:
+        """Extrahiert FastAPI-Endpunkte aus einer Funktion"""
         elements = []
-        
-        if file_path.suffix.lower() != '.py':
-            return elements
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            tree = ast.parse(content)
-        except Exception:
-            return elements
-        
-        # Suche nach FastAPI-spezifischen Mustern
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                # Prüfe auf FastAPI-Router-Dekoratoren
-                for decorator in node.decorator_list:
-                    if isinstance(decorator, ast.Call):
-                        decorator_name = self._get_decorator_name(decorator)
-                        if decorator_name in ['app.get', 'app.post', 'app.put', 'app.delete', 'app.patch', 
-                                            'router.get', 'router.post', 'router.put', 'router.delete', 'router.patch']:
-                            # Extrahiere API-Informationen
-                            api_info = self._extract_api_info(decorator, node)
-                            element = {
-                                'name': node.name,
-                                'type': 'api_endpoint',
-                                'signature': ast.unparse(node),
-                                'api_info': api_info,
-                                'line_number': node.lineno,
-                                'file_path': str(file_path),
-                                'code_snippet': self._get_code_snippet(content, node)
-                            }
-                            elements.append(element)
+
+        # Prüfe auf FastAPI-Router-Dekoratoren
+        for decorator in node.decorator_list:
+            if isinstance(decorator, ast.Call):
+                decorator_name = self._get_decorator_name(decorator)
+                if decorator_name in ['app.get', 'app.post', 'app.put', 'app.delete', 'app.patch', 
+                                    'router.get', 'router.post', 'router.put', 'router.delete', 'router.patch']:
+                    # Extrahiere API-Informationen
+                    api_info = self._extract_api_info(decorator, node)
+                    element = {
+                        'name': node.name,
+                        'type': 'api_endpoint',
+                        'signature': context.get_header(node),
+                        'api_info': api_info,
+                        'line_number': node.lineno,
+                        'file_path': str(context.file_path),
+                        'code_snippet': self._get_code_snippet(context, node)
+                    }
+                    elements.append(element)
         
         return elements
     
@@ -120,56 +139,36 @@ class FastAPIParser(FrameworkParser):
             api_info['description'] = docstring.strip()
         
         return api_info
-    
-    def _get_code_snippet(self, content: str, node) -> str:
-        """Extrahiert einen Code-Snippet für das Node"""
-        lines = content.split('\n')
-        start_line = node.lineno - 1
-        end_line = getattr(node, 'end_lineno', start_line + 10)
-        # Begrenze den Snippet auf maximal 20 Zeilen
-        end_line = min(end_line, start_line + 20)
-        return '\n'.join(lines[start_line:end_line])
 
 
 class FlaskParser(FrameworkParser):
     """Parser für Flask-Anwendungen"""
+
+    node_types = (ast.FunctionDef,)
     
     def get_framework_name(self) -> str:
         return "flask"
     
-    def parse_file(self, file_path: Path) -> List[Dict[str, Any]]:
-        """Parst eine Python-Datei auf Flask-Elemente"""
+    def extract_node(self, node: ast.AST, context: ParseContext) -> List[Dict[str, Any]]:
+        """Extrahiert Flask-Routen aus einer Funktion"""
         elements = []
-        
-        if file_path.suffix.lower() != '.py':
-            return elements
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            tree = ast.parse(content)
-        except Exception:
-            return elements
-        
-        # Suche nach Flask-spezifischen Mustern
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                # Prüfe auf Flask-Route-Dekoratoren
-                for decorator in node.decorator_list:
-                    if isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute):
-                        if decorator.func.attr == 'route':
-                            # Extrahiere Route-Informationen
-                            route_info = self._extract_route_info(decorator, node)
-                            element = {
-                                'name': node.name,
-                                'type': 'api_endpoint',
-                                'signature': ast.unparse(node),
-                                'api_info': route_info,
-                                'line_number': node.lineno,
-                                'file_path': str(file_path),
-                                'code_snippet': self._get_code_snippet(content, node)
-                            }
-                            elements.append(element)
+
+        # Prüfe auf Flask-Route-Dekoratoren
+        for decorator in node.decorator_list:
+            if isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute):
+                if decorator.func.attr == 'route':
+                    # Extrahiere Route-Informationen
+                    route_info = self._extract_route_info(decorator, node)
+                    element = {
+                        'name': node.name,
+                        'type': 'api_endpoint',
+                        'signature': context.get_header(node),
+                        'api_info': route_info,
+                        'line_number': node.lineno,
+                        'file_path': str(context.file_path),
+                        'code_snippet': self._get_code_snippet(context, node)
+                    }
+                    elements.append(element)
         
         return elements
     
@@ -213,35 +212,20 @@ class FlaskParser(FrameworkParser):
             route_info['description'] = docstring.strip()
         
         return route_info
-    
-    def _get_code_snippet(self, content: str, node) -> str:
-        """Extrahiert einen Code-Snippet für das Node"""
-        lines = content.split('\n')
-        start_line = node.lineno - 1
-        end_line = getattr(node, 'end_lineno', start_line + 10)
-        # Begrenze den Snippet auf maximal 20 Zeilen
-        end_line = min(end_line, start_line + 20)
-        return '\n'.join(lines[start_line:end_line])
 
 
 class ExpressParser(FrameworkParser):
     """Parser für Express.js-Anwendungen"""
+
+    file_suffixes = ('.js', '.ts')
     
     def get_framework_name(self) -> str:
         return "express"
     
-    def parse_file(self, file_path: Path) -> List[Dict[str, Any]]:
-        """Parst eine JavaScript-Datei auf Express-Elemente"""
+    def parse_context(self, context: ParseContext) -> List[Dict[str, Any]]:
+        """Parst eine JavaScript-Datei auf Express-Elemente (regulärer Ausdruck statt AST)"""
         elements = []
-        
-        if file_path.suffix.lower() not in ['.js', '.ts']:
-            return elements
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-        except Exception:
-            return elements
+        file_path = context.file_path
         
         # Reguläre Ausdrücke für Express-Router
         # Muster für app.get('/path', handler) oder router.post('/path', handler)
@@ -251,9 +235,7 @@ class ExpressParser(FrameworkParser):
             r'(app|router|express)\.(get|post|put|delete|patch|all)\s*\(\s*["\']([^"\']+)["\']\s*,\s*\([^)]*\)\s*=>'
         ]
         
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines, 1):
+        for i, line in enumerate(context.lines, 1):
             for pattern in patterns:
                 matches = re.finditer(pattern, line, re.IGNORECASE)
                 for match in matches:
@@ -280,58 +262,47 @@ class ExpressParser(FrameworkParser):
 
 class DjangoParser(FrameworkParser):
     """Parser für Django-Anwendungen"""
+
+    node_types = (ast.FunctionDef, ast.ClassDef)
     
     def get_framework_name(self) -> str:
         return "django"
     
-    def parse_file(self, file_path: Path) -> List[Dict[str, Any]]:
-        """Parst eine Python-Datei auf Django-Elemente"""
+    def extract_node(self, node: ast.AST, context: ParseContext) -> List[Dict[str, Any]]:
+        """Extrahiert Django-Views aus einer Funktion oder Klasse"""
         elements = []
+
+        # Prüfe auf Django-spezifische Klassen oder Funktionen
+        is_django_view = False
         
-        if file_path.suffix.lower() != '.py':
-            return elements
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            tree = ast.parse(content)
-        except Exception:
-            return elements
+        # Funktionen mit bestimmten Mustern
+        if isinstance(node, ast.FunctionDef):
+            # Prüfe auf common Django view patterns
+            if any(pattern in node.name.lower() for pattern in ['view', 'get', 'post', 'put', 'delete']):
+                is_django_view = True
         
-        # Suche nach Django Views
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
-                # Prüfe auf Django-spezifische Klassen oder Funktionen
-                is_django_view = False
-                
-                # Funktionen mit bestimmten Mustern
-                if isinstance(node, ast.FunctionDef):
-                    # Prüfe auf common Django view patterns
-                    if any(pattern in node.name.lower() for pattern in ['view', 'get', 'post', 'put', 'delete']):
+        # Klassen, die von Django-Klassen erben
+        elif isinstance(node, ast.ClassDef):
+            for base in node.bases:
+                if isinstance(base, ast.Attribute):
+                    base_name = self._get_attribute_name(base)
+                    if any(django_base in base_name.lower() for django_base in 
+                           ['view', 'apiview', 'generic', 'django']):
                         is_django_view = True
-                
-                # Klassen, die von Django-Klassen erben
-                elif isinstance(node, ast.ClassDef):
-                    for base in node.bases:
-                        if isinstance(base, ast.Attribute):
-                            base_name = self._get_attribute_name(base)
-                            if any(django_base in base_name.lower() for django_base in 
-                                   ['view', 'apiview', 'generic', 'django']):
-                                is_django_view = True
-                        elif isinstance(base, ast.Name) and 'view' in base.id.lower():
-                            is_django_view = True
-                
-                if is_django_view:
-                    element = {
-                        'name': node.name,
-                        'type': 'django_view',
-                        'signature': ast.unparse(node),
-                        'line_number': node.lineno,
-                        'file_path': str(file_path),
-                        'code_snippet': self._get_code_snippet(content, node)
-                    }
-                    elements.append(element)
+                elif isinstance(base, ast.Name) and 'view' in base.id.lower():
+                    is_django_view = True
         
+        if is_django_view:
+            element = {
+                'name': node.name,
+                'type': 'django_view',
+                'signature': context.get_header(node),
+                'line_number': node.lineno,
+                'file_path': str(context.file_path),
+                'code_snippet': self._get_code_snippet(context, node)
+            }
+            elements.append(element)
+
         return elements
     
     def _get_attribute_name(self, attr_node) -> str:
@@ -341,15 +312,6 @@ class DjangoParser(FrameworkParser):
         elif isinstance(attr_node, ast.Name):
             return attr_node.id
         return ""
-    
-    def _get_code_snippet(self, content: str, node) -> str:
-        """Extrahiert einen Code-Snippet für das Node"""
-        lines = content.split('\n')
-        start_line = node.lineno - 1
-        end_line = getattr(node, 'end_lineno', start_line + 10)
-        # Begrenze den Snippet auf maximal 20 Zeilen
-        end_line = min(end_line, start_line + 20)
-        return '\n'.join(lines[start_line:end_line])
 
 
 # Factory-Funktion zur Erstellung von Framework-Parsern
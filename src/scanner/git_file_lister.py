@@ -0,0 +1,112 @@
+"""
+Dateiauflistung über den Git-Index (git ls-files)
+"""
+import os
+import subprocess
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Dict, Set
+
+# Eingecheckte, geänderte, gelöschte und nicht ignorierte neue Dateien in einem Aufruf
+GIT_LS_FILES_COMMAND = [
+    'git', 'ls-files', '--cached', '--others', '--modified', '--deleted',
+    '-t', '--stage', '--exclude-standard', '-z'
+]
+
+# Ignorierte Dateien; vollständig ignorierte Verzeichnisse erscheinen als ein Eintrag "<Pfad>/"
+GIT_LS_IGNORED_COMMAND = [
+    'git', 'ls-files', '--others', '--ignored', '--exclude-standard', '--directory', '-z'
+]
+
+# Modi, deren Blob-ID dem Dateiinhalt entspricht
+_REGULAR_FILE_MODES = ('100644', '100755')
+_SUBMODULE_MODE = '160000'
+
+
+class GitListedFile(NamedTuple):
+    """Eine von Git gemeldete Datei"""
+    path: str  # Relativ zum aufgelisteten Verzeichnis, mit / getrennt
+    blob_id: Optional[str]  # Nur gesetzt, wenn die Arbeitskopie dem Index entspricht
+
+
+def list_git_files(directory: Path, timeout: float = 60.0) -> Optional[List[GitListedFile]]:
+    """
+    Listet alle nicht ignorierten Dateien unterhalb eines Verzeichnisses über Git auf
+
+    Args:
+        directory: Verzeichnis innerhalb eines Git-Arbeitsverzeichnisses
+        timeout: Maximale Laufzeit des Git-Aufrufs in Sekunden
+
+    Returns:
+        Nach Pfad sortierte Liste der Dateien oder None, wenn das Verzeichnis
+        nicht in einem Git-Repository liegt oder Git nicht verfügbar ist
+    """
+    output = _run_git(GIT_LS_FILES_COMMAND, directory, timeout)
+    return parse_ls_files_output(output) if output is not None else None
+
+
+def list_ignored_paths(directory: Path, timeout: float = 60.0) -> Optional[List[str]]:
+    """
+    Listet die von Git ignorierten Pfade unterhalb eines Verzeichnisses auf
+
+    Returns:
+        Relative Pfade (mit / getrennt); Verzeichnisse enden mit "/" und werden nicht
+        weiter aufgelöst. None, wenn Git nicht verfügbar ist
+    """
+    output = _run_git(GIT_LS_IGNORED_COMMAND, directory, timeout)
+    return [path for path in output.split('\0') if path] if output is not None else None
+
+
+def _run_git(command: List[str], directory: Path, timeout: float) -> Optional[str]:
+    """Führt einen Git-Befehl im Verzeichnis aus und gibt die Ausgabe zurück (None bei Fehlern)"""
+    try:
+        result = subprocess.run(
+            command, cwd=str(directory),
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=timeout
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return os.fsdecode(result.stdout)
+
+
+def parse_ls_files_output(output: str) -> List[GitListedFile]:
+    """
+    Wertet die Ausgabe von GIT_LS_FILES_COMMAND aus
+
+    Jeder Datensatz hat die Form "<Tag> <Modus> <Blob-ID> <Stufe>\\t<Pfad>" bzw.
+    "? <Pfad>" für neue Dateien. Geänderte (C), gelöschte (R) und konfliktbehaftete
+    Dateien erscheinen zusätzlich zum Index-Eintrag (H).
+    """
+    blob_ids: Dict[str, Optional[str]] = {}
+    stale: Set[str] = set()
+    removed: Set[str] = set()
+
+    for record in output.split('\0'):
+        if not record:
+            continue
+        tag, _, rest = record.partition(' ')
+        if tag == '?':
+            blob_ids.setdefault(rest, None)
+            continue
+
+        meta, _, path = rest.partition('\t')
+        fields = meta.split(' ')
+        if len(fields) != 3:
+            continue
+        mode, blob_id, stage = fields
+        if mode == _SUBMODULE_MODE:
+            # Submodule sind Verzeichnisse eines anderen Repositorys
+            continue
+        if tag == 'R':
+            removed.add(path)
+        elif tag == 'C' or stage != '0' or mode not in _REGULAR_FILE_MODES:
+            # Inhalt weicht vom Index ab (oder ist ein Symlink), Blob-ID nicht verwendbar
+            stale.add(path)
+        blob_ids.setdefault(path, blob_id)
+
+    return [
+        GitListedFile(path, None if path in stale else blob_id)
+        for path, blob_id in sorted(blob_ids.items())
+        if path not in removed
+    ]
@@ -1,56 +1,264 @@
 import os
 import re
 from pathlib import Path
-from typing import List, Set
-from git import Repo, GitCommandError
+from typing import List, Dict, Optional, NamedTuple
+
+
+class GitIgnoreRule(NamedTuple):
+    """Eine einzelne, vorkompilierte .gitignore-Regel"""
+    pattern: str
+    regex: str
+    negated: bool
+    dir_only: bool
+
+
+def compile_gitignore_rule(line: str) -> Optional[GitIgnoreRule]:
+    """
+    Übersetzt eine Zeile einer .gitignore-Datei in eine Regel
+
+    Unterstützt Negationen (!), Verzeichnis-Regeln (abschließendes /),
+    verankerte Muster (/ am Anfang oder in der Mitte) sowie *, ?, [...] und **.
+
+    Args:
+        line: Zeile aus einer .gitignore-Datei
+
+    Returns:
+        Die Regel oder None für Kommentare und Leerzeilen
+    """
+    line = line.rstrip('\n').rstrip('\r')
+    # Nachgestellte Leerzeichen werden ignoriert, sofern nicht mit \ maskiert
+    stripped = line.rstrip(' ')
+    if stripped.endswith('\\') and len(stripped) < len(line):
+        stripped += ' '
+    line = stripped
+
+    if not line or line.startswith('#'):
+        return None
+
+    negated = False
+    if line.startswith('!'):
+        negated = True
+        line = line[1:]
+    elif line.startswith('\\!') or line.startswith('\\#'):
+        line = line[1:]
+
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+
+    # Enthält das Muster einen Schrägstrich (außer am Ende), ist es relativ zum
+    # Verzeichnis der .gitignore verankert, sonst passt es auf jeder Ebene
+    anchored = '/' in line
+    line = line.lstrip('/')
+
+    body = _translate_glob(line)
+    try:
+        re.compile(body)
+    except re.error:
+        return None
+    prefix = '' if anchored else '(?:.*/)?'
+    return GitIgnoreRule(pattern=line, regex=prefix + body, negated=negated, dir_only=dir_only)
+
+
+def _translate_glob(pattern: str) -> str:
+    """Übersetzt ein .gitignore-Glob-Muster in einen regulären Ausdruck"""
+    regex = []
+    i = 0
+    length = len(pattern)
+    while i < length:
+        char = pattern[i]
+        if char == '*':
+            if pattern.startswith('**', i):
+                at_start = i == 0 or pattern[i - 1] == '/'
+                at_end = i + 2 == length
+                followed_by_slash = pattern.startswith('/', i + 2)
+                if at_start and followed_by_slash:
+                    # "**/" passt auf null oder mehr Verzeichnisse
+                    regex.append('(?:.*/)?')
+                    i += 3
+                    continue
+                if at_start and at_end:
+                    # "/**" am Ende passt auf alles darunter
+                    regex.append('.*')
+                    i += 2
+                    continue
+            # Weitere aufeinanderfolgende Sterne verhalten sich wie ein einzelner
+            while i < length and pattern[i] == '*':
+                i += 1
+            regex.append('[^/]*')
+            continue
+        if char == '?':
+            regex.append('[^/]')
+        elif char == '[':
+            j = i + 1
+            if j < length and pattern[j] in '!^':
+                j += 1
+            if j < length and pattern[j] == ']':
+                j += 1
+            end = pattern.find(']', j)
+            if end == -1:
+                regex.append(re.escape(char))
+            else:
+                content = pattern[i + 1:end]
+                if content[:1] in ('!', '^'):
+                    content = '^' + content[1:]
+                regex.append('[' + content.replace('[', '\\[') + ']')
+                i = end
+        elif char == '\\' and i + 1 < length:
+            i += 1
+            regex.append(re.escape(pattern[i]))
+        else:
+            regex.append(re.escape(char))
+        i += 1
+    return ''.join(regex)
+
+
+class GitIgnoreRuleSet:
+    """
+    Die Regeln einer .gitignore-Datei, zusammengefasst zu wenigen kombinierten Ausdrücken
+
+    Aufeinanderfolgende Regeln gleicher Polarität werden zu einem Ausdruck
+    zusammengefasst. Die Auswertung läuft von hinten nach vorne, sodass wie bei
+    Git die letzte passende Regel entscheidet.
+    """
+
+    def __init__(self, rules: List[GitIgnoreRule]):
+        self.rules = rules
+        self._file_groups = self._compile_groups([rule for rule in rules if not rule.dir_only])
+        self._dir_groups = self._compile_groups(rules)
+
+    @staticmethod
+    def _compile_groups(rules: List[GitIgnoreRule]) -> List[tuple]:
+        """Fasst aufeinanderfolgende Regeln gleicher Polarität zusammen (umgekehrte Reihenfolge)"""
+        groups = []
+        current: List[str] = []
+        current_negated = None
+        for rule in rules:
+            if current and rule.negated != current_negated:
+                groups.append((current_negated, current))
+                current = []
+            current_negated = rule.negated
+            current.append(rule.regex)
+        if current:
+            groups.append((current_negated, current))
+
+        compiled = []
+        for negated, regexes in reversed(groups):
+            combined = '|'.join(f'(?:{regex})' for regex in regexes)
+            compiled.append((negated, re.compile(f'(?:{combined})', re.DOTALL)))
+        return compiled
+
+    def match(self, relative_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Wertet die Regeln für einen relativen Pfad aus
+
+        Returns:
+            True (ignoriert), False (explizit wieder eingeschlossen) oder None (keine Regel passt)
+        """
+        for negated, regex in (self._dir_groups if is_dir else self._file_groups):
+            if regex.fullmatch(relative_path):
+                return not negated
+        return None
 
 
 class GitIgnoreHandler:
     """
     Klasse zur Behandlung von .gitignore-Dateien, einschließlich verschachtelter .gitignore-Dateien
     """
-    
-    def __init__(self, base_path: Path):
+
+    def __init__(self, base_path: Path, preload: bool = True):
         """
         Initialisiert den GitIgnoreHandler
-        
+
         Args:
             base_path: Basisverzeichnis des Projekts
+            preload: Ob alle .gitignore-Dateien sofort per eigenem Verzeichnisdurchlauf
+                     geladen werden. Bei False meldet der Aufrufer gefundene Dateien
+                     über add_gitignore().
         """
         self.base_path = Path(base_path)
-        self.repo = None
-        
-        # Versuche, ein Git-Repository zu finden
-        try:
-            self.repo = Repo(self.base_path, search_parent_directories=True)
-        except:
-            # Kein Git-Repository vorhanden
-            pass
-            
-        self.ignored_patterns = {}
-        self._load_gitignore_patterns()
-    
+        self.ignored_patterns: Dict[str, List[str]] = {}
+        self.rule_sets: Dict[str, GitIgnoreRuleSet] = {}
+        self._exclude_rules: Optional[tuple] = None
+        self._top_dir = str(self.base_path)
+        self._dir_cache: Dict[str, bool] = {}
+
+        self._load_repository_rules()
+        if preload:
+            self._load_gitignore_patterns()
+
+    def _load_repository_rules(self):
+        """
+        Lädt die Regeln oberhalb des Basisverzeichnisses bis zur Wurzel des Git-Repositorys
+
+        Dazu gehören .gitignore-Dateien übergeordneter Verzeichnisse und .git/info/exclude.
+        """
+        repo_root = None
+        for candidate in [self.base_path] + list(self.base_path.parents):
+            if (candidate / '.git').exists():
+                repo_root = candidate
+                break
+        if repo_root is None:
+            return
+
+        self._top_dir = str(repo_root)
+        current = self.base_path.parent
+        while repo_root == current or repo_root in current.parents:
+            if (current / '.gitignore').is_file():
+                self.add_gitignore(current)
+            current = current.parent
+
+        exclude_file = repo_root / '.git' / 'info' / 'exclude'
+        if exclude_file.is_file():
+            rules = self._compile_patterns(self._read_gitignore_patterns(exclude_file))
+            if rules:
+                self._exclude_rules = (str(repo_root), GitIgnoreRuleSet(rules))
+
     def _load_gitignore_patterns(self):
         """
         Lädt .gitignore-Muster rekursiv für jedes Verzeichnis
+
+        Ignorierte Verzeichnisse werden dabei nicht betreten.
         """
         for root, dirs, files in os.walk(self.base_path):
             root_path = Path(root)
-            
-            # Prüfe auf .gitignore-Datei im aktuellen Verzeichnis
-            gitignore_path = root_path / '.gitignore'
-            if gitignore_path.exists():
-                # Lese Muster aus der .gitignore-Datei
-                patterns = self._read_gitignore_patterns(gitignore_path)
-                self.ignored_patterns[str(root_path)] = patterns
-    
+            if '.gitignore' in files:
+                self.add_gitignore(root_path)
+            dirs[:] = [d for d in dirs if d != '.git' and not self.matches(root_path / d, is_dir=True)]
+
+    def add_gitignore(self, directory: Path):
+        """
+        Lädt die .gitignore-Datei eines Verzeichnisses, das beim Durchlauf gefunden wurde
+
+        Args:
+            directory: Verzeichnis, das eine .gitignore-Datei enthält
+        """
+        directory = Path(directory)
+        patterns = self._read_gitignore_patterns(directory / '.gitignore')
+        self.ignored_patterns[str(directory)] = patterns
+        rules = self._compile_patterns(patterns)
+        if rules:
+            self.rule_sets[str(directory)] = GitIgnoreRuleSet(rules)
+        # Neue Regeln können frühere Ergebnisse für Verzeichnisse ändern
+        self._dir_cache.clear()
+
+    def _compile_patterns(self, patterns: List[str]) -> List[GitIgnoreRule]:
+        """Kompiliert eine Liste von Mustern zu Regeln"""
+        rules = []
+        for pattern in patterns:
+            rule = compile_gitignore_rule(pattern)
+            if rule:
+                rules.append(rule)
+        return rules
+
     def _read_gitignore_patterns(self, gitignore_path: Path) -> List[str]:
         """
         Liest Muster aus einer .gitignore-Datei
-        
+
         Args:
             gitignore_path: Pfad zur .gitignore-Datei
-            
+
         Returns:
             Liste von Muster-Strings
         """
@@ -64,161 +272,102 @@ class GitIgnoreHandler:
                         patterns.append(line)
         except Exception:
             pass  # Ignoriere Datei, wenn nicht lesbar
-        
+
         return patterns
 
     def _matches_pattern(self, file_path: Path, pattern: str) -> bool:
         """
         Prüft, ob ein Dateipfad mit einem .gitignore-Muster übereinstimmt
-        
+
         Args:
             file_path: Zu prüfender Dateipfad
-            pattern: .gitignore-Muster
-            
+            pattern: .gitignore-Muster (relativ zum Basisverzeichnis)
+
         Returns:
             True, wenn der Pfad mit dem Muster übereinstimmt
         """
-        # Konvertiere alle Backslashes zu Slashes (für Windows-Kompatibilität)
-        path_str = str(file_path).replace('\\', '/')
-        pattern = pattern.replace('\\', '/')
-        
-        # Behandle absolute Pfade relativ zum Basisverzeichnis
         try:
-            rel_path = file_path.relative_to(self.base_path).as_posix()
+            rel_path = Path(file_path).relative_to(self.base_path).as_posix()
         except ValueError:
             # Pfad ist nicht innerhalb des Basisverzeichnisses
             return False
-        
-        # Prüfe auf Übereinstimmung mit dem Muster
-        return self._path_matches_pattern(rel_path, pattern)
 
-    def _path_matches_pattern(self, path: str, pattern: str) -> bool:
-        """
-        Prüft, ob ein Pfad mit einem .gitignore-Muster übereinstimmt
-        
-        Args:
-            path: Relativer Pfad (zum Basisverzeichnis)
-            pattern: .gitignore-Muster
-            
-        Returns:
-            True, wenn der Pfad mit dem Muster übereinstimmt
-        """
-        # Entferne führende Slashes
-        path = path.lstrip('/')
-        
-        # Konvertiere .gitignore-Muster zu regulären Ausdrücken
-        # Dies ist eine vereinfachte Implementierung; für vollständige .gitignore-Unterstützung
-        # müsste man eine komplexere Musteranpassung implementieren
-        
-        # Entferne führende ! (für Negationen), die wir hier vorerst ignorieren
-        if pattern.startswith('!'):
-            return False  # Ignoriere Negationen vorerst
-            
-        # Ersetze .gitignore-spezifische Symbole durch reguläre Ausdrücke
-        regex_pattern = pattern
-        
-        # Behandle Muster, die mit / beginnen (nur im aktuellen Verzeichnis)
-        if pattern.startswith('/'):
-            regex_pattern = f'^{self._convert_to_regex(pattern[1:])}'
-        # Globale Muster, die überall gelten
-        elif pattern.startswith('**/'):
-            regex_pattern = f'{self._convert_to_regex(pattern)}'
-        # Standardmuster
-        else:
-            regex_pattern = f'{self._convert_to_regex(pattern)}'
-            
-        # Füge .* hinzu, wenn das Muster keinen globalen Match beinhaltet
-        if not pattern.startswith('**/'):
-            if '/' in pattern:
-                # Wenn Muster Schrägstriche enthält, prüfe als exakter Pfad
-                pass
-            else:
-                # Wenn Muster keinen Schrägstrich enthält, kann es überall vorkommen
-                regex_pattern = f'.*/{regex_pattern}'
-        
-        # Versuche, mit regulärem Ausdruck zu matchen
-        try:
-            return re.match(regex_pattern, path, re.IGNORECASE) is not None
-        except re.error:
-            # Falls das Muster ungültigen Regex enthält
+        rule = compile_gitignore_rule(pattern)
+        if rule is None:
             return False
+        return GitIgnoreRuleSet([rule]).match(rel_path, Path(file_path).is_dir()) is True
 
-    def _convert_to_regex(self, pattern: str) -> str:
+    def matches(self, path: Path, is_dir: bool = False) -> bool:
         """
-        Konvertiert ein .gitignore-Muster zu einem regulären Ausdruck
-        
+        Wertet die geladenen Regeln für genau diesen Pfad aus
+
+        Übergeordnete Verzeichnisse werden nicht geprüft; beim Verzeichnisdurchlauf
+        sind sie bereits ausgewertet und ignorierte Verzeichnisse nicht betreten worden.
+
         Args:
-            pattern: .gitignore-Muster
-            
+            path: Zu prüfender Pfad
+            is_dir: Ob der Pfad ein Verzeichnis ist (für Regeln mit abschließendem /)
+
         Returns:
-            Regulärer Ausdruck
-        """
-        # Escape spezielle Regex-Zeichen, aber lasse .gitignore-Symbole zu
-        regex = re.escape(pattern)
-        
-        # Wandele .gitignore-Symbole zurück
-        # ** -> .*
-        regex = regex.replace('\\*\\*\\/', '.*\/')
-        regex = regex.replace('\\*\\*', '.*')
-        
-        # * -> [^/]* (beliebige Zeichen außer Schrägstrich)
-        regex = regex.replace('\\*', '[^/]*')
-        
-        # ? -> [^/] (ein beliebiges Zeichen außer Schrägstrich)
-        regex = regex.replace('\\?', '[^/]')
-        
-        # [] werden bereits escaped, also belassen wir es dabei
-        
-        return f"({regex})"
-
-    def is_ignored(self, file_path: Path) -> bool:
+            True, wenn der Pfad ignoriert wird
+        """
+        path_str = str(path)
+        directory = os.path.dirname(path_str)
+
+        # Tiefere .gitignore-Dateien haben Vorrang vor höher liegenden
+        while True:
+            rule_set = self.rule_sets.get(directory)
+            if rule_set is not None:
+                result = rule_set.match(self._relative(path_str, directory), is_dir)
+                if result is not None:
+                    return result
+            if directory == self._top_dir:
+                break
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+
+        if self._exclude_rules:
+            root, rule_set = self._exclude_rules
+            if path_str.startswith(root + os.sep):
+                return rule_set.match(self._relative(path_str, root), is_dir) is True
+        return False
+
+    @staticmethod
+    def _relative(path_str: str, directory: str) -> str:
+        """Gibt den Pfad relativ zum Verzeichnis im Git-Format (mit /) zurück"""
+        relative = path_str[len(directory):].lstrip(os.sep)
+        return relative.replace(os.sep, '/') if os.sep != '/' else relative
+
+    def is_ignored(self, file_path: Path, is_dir: bool = False) -> bool:
         """
         Prüft, ob eine Datei von .gitignore ignoriert wird
-        
+
         Args:
             file_path: Zu prüfender Dateipfad
-            
+            is_dir: Ob der Pfad ein Verzeichnis ist
+
         Returns:
-            True, wenn die Datei ignoriert wird
-        """
-        # Kurzschluss, wenn Git-Repository vorhanden und Datei durch Git ignoriert wird
-        if self.repo:
-            try:
-                relative_path = str(file_path.relative_to(self.repo.working_dir).as_posix())
-                if self.repo.ignored(relative_path):
-                    return True
-            except ValueError:
-                # Datei liegt außerhalb des Repositorys
-                pass
-            except GitCommandError:
-                # Wenn Git-Fehler auftritt, verwende unsere Implementierung
-                pass
-        
-        # Prüfe das Dateipfad relativ zu den .gitignore-Dateien
+            True, wenn die Datei oder eines ihrer übergeordneten Verzeichnisse ignoriert wird
+        """
         file_path = Path(file_path)
-        
-        # Prüfe für alle relevanten Verzeichnisse
-        # Gehe von der Datei aus nach oben bis zur Wurzel
-        current_dir = file_path.parent
-        while current_dir != current_dir.parent and self.base_path in current_dir.parents:
-            dir_str = str(current_dir)
-            if dir_str in self.ignored_patterns:
-                patterns = self.ignored_patterns[dir_str]
-                for pattern in patterns:
-                    if self._matches_pattern(file_path, pattern):
-                        return True
-            
-            # Gehe eine Ebene höher
-            parent = current_dir.parent
-            if parent == current_dir:  # Hat die Wurzel erreicht
-                break
-            current_dir = parent
-        
-        # Prüfe auch das Basisverzeichnis
-        base_dir_str = str(self.base_path)
-        if base_dir_str in self.ignored_patterns:
-            for pattern in self.ignored_patterns[base_dir_str]:
-                if self._matches_pattern(file_path, pattern):
-                    return True
-        
-        return False
\ No newline at end of file
+        if self._is_dir_ignored(str(file_path.parent)):
+            return True
+        return self.matches(file_path, is_dir=is_dir)
+
+    def _is_dir_ignored(self, directory: str) -> bool:
+        """Prüft (mit Cache), ob ein Verzeichnis selbst oder ein übergeordnetes ignoriert wird"""
+        cached = self._dir_cache.get(directory)
+        if cached is not None:
+            return cached
+
+        parent = os.path.dirname(directory)
+        if directory == self._top_dir or parent == directory or \
+                not directory.startswith(self._top_dir + os.sep):
+            result = False
+        else:
+            result = self._is_dir_ignored(parent) or self.matches(Path(directory), is_dir=True)
+
+        self._dir_cache[directory] = result
+        return result
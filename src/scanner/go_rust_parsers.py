@@ -5,6 +5,7 @@ from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 import re
+from .line_index import LineIndex
 
 
 class GoParser:
@@ -32,12 +33,13 @@ class GoParser:
         function_matches = re.finditer(function_pattern, content)
         
         lines = content.split('\n')
+        line_index = LineIndex(content)
         
         for match in function_matches:
             func_name = match.group(1)
             
             # Finde die Zeile, in der die Funktion definiert ist
-            line_start = content[:match.start()].count('\n')
+            line_start = line_index.line_number(match.start()) - 1
             line_content = lines[line_start] if line_start < len(lines) else ""
             
             element = {
@@ -58,7 +60,7 @@ class GoParser:
         
         for match in struct_matches:
             struct_name = match.group(1)
-            line_start = content[:match.start()].count('\n')
+            line_start = line_index.line_number(match.start()) - 1
             line_content = lines[line_start] if line_start < len(lines) else ""
             
             element = {
@@ -79,7 +81,7 @@ class GoParser:
         
         for match in interface_matches:
             interface_name = match.group(1)
-            line_start = content[:match.start()].count('\n')
+            line_start = line_index.line_number(match.start()) - 1
             line_content = lines[line_start] if line_start < len(lines) else ""
             
             element = {
@@ -120,6 +122,7 @@ class RustParser:
             return elements
         
         lines = content.split('\n')
+        line_index = LineIndex(content)
         
         # Extrahiere Funktionen (inkl. async, unsafe, etc.)
         function_pattern = r'(?P<attrs>(?:#\[[^\]]*\]\s*)*)\s*(?P<visibility>pub\s+)?(?:async\s+|unsafe\s+|const\s+)?fn\s+(?P<name>[a-zA-Z_][a-zA-Z0-9_]*)\s*\([^)]*\)\s*(?:->\s*[^{;]*)?'
@@ -130,7 +133,7 @@ class RustParser:
             visibility = match.group('visibility')
             attrs = match.group('attrs').strip() if match.group('attrs') else ""
             
-            line_start = content[:match.start()].count('\n')
+            line_start = line_index.line_number(match.start()) - 1
             line_content = lines[line_start] if line_start < len(lines) else ""
             
             element = {
@@ -155,7 +158,7 @@ class RustParser:
             visibility = match.group('visibility')
             attrs = match.group('attrs').strip() if match.group('attrs') else ""
             
-            line_start = content[:match.start()].count('\n')
+            line_start = line_index.line_number(match.start()) - 1
             line_content = lines[line_start] if line_start < len(lines) else ""
             
             element = {
@@ -180,7 +183,7 @@ class RustParser:
             visibility = match.group('visibility')
             attrs = match.group('attrs').strip() if match.group('attrs') else ""
             
-            line_start = content[:match.start()].count('\n')
+            line_start = line_index.line_number(match.start()) - 1
             line_content = lines[line_start] if line_start < len(lines) else ""
             
             element = {
@@ -205,7 +208,7 @@ class RustParser:
             visibility = match.group('visibility')
             attrs = match.group('attrs').strip() if match.group('attrs') else ""
             
-            line_start = content[:match.start()].count('\n')
+            line_start = line_index.line_number(match.start()) - 1
             line_content = lines[line_start] if line_start < len(lines) else ""
             
             element = {
@@ -0,0 +1,662 @@
+"""
+Tokenizer-basierte Extraktion von Deklarationen aus JavaScript/TypeScript
+
+Der Quelltext wird einmal linear in Tokens zerlegt; Zeichenketten, Kommentare,
+Template-Literale und reguläre Ausdrücke werden dabei übersprungen. Ein zweiter
+linearer Durchlauf über die Tokens erkennt echte Deklarationen: Funktionen,
+Arrow-/const-Funktionen, Klassen, Methoden, Methoden in Objektliteralen und
+exportierte Deklarationen. Die Klammerpaare werden einmal in einem Durchlauf
+über die Tokens bestimmt.
+Aufrufe wie foo(bar) erzeugen im Gegensatz zum regulären Ausdruck keine Elemente.
+"""
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from ..models.element import CodeElement, ElementType
+from .line_index import LineIndex
+
+# Jeder Treffer überspringt führenden Leerraum und liefert genau ein Token (oder einen Kommentar)
+_TOKEN_PATTERN = re.compile(r'''
+    \s*(?:
+    (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<name>(?:[^\W\d]|\$)(?:\w|\$)*)
+  | (?P<num>\d[\w.]*|\.\d\w*)
+  | (?P<str>'(?:[^'\\\n]|\\.)*'?|"(?:[^"\\\n]|\\.)*"?)
+  | (?P<punct>=>|\.\.\.|\?\.|[{}()\[\];,<>:=.*?!+\-%&|^~@\#/`])
+  | (?P<other>.)
+    )
+''', re.VERBOSE | re.DOTALL)
+
+_REGEX_LITERAL = re.compile(r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+_TEMPLATE_CHUNK = re.compile(r'(?:[^`\\$]|\\.|\$(?!\{))*', re.DOTALL)
+
+# Schlüsselwörter, nach denen ein / einen regulären Ausdruck beginnt
+_REGEX_PREFIX_KEYWORDS = frozenset([
+    'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete',
+    'void', 'throw', 'instanceof', 'yield', 'await'
+])
+
+# Modifikatoren vor Deklarationen bzw. Klassen-Membern
+_DECLARATION_MODIFIERS = frozenset(['export', 'default', 'declare', 'async', 'abstract'])
+_MEMBER_MODIFIERS = frozenset([
+    'static', 'async', 'get', 'set', 'public', 'private', 'protected',
+    'readonly', 'override', 'abstract', 'declare', 'accessor'
+])
+_NOT_MEMBER_NAMES = frozenset(['if', 'for', 'while', 'switch', 'catch', 'return', 'function', 'new'])
+_OBJECT_MODIFIERS = frozenset(['async', 'get', 'set'])
+# Tokens, nach denen { ein Objektliteral und keinen Block öffnet
+_OBJECT_PREFIXES = frozenset(['=', '(', '[', ',', ':', '?', 'return'])
+_BRACKETS = {')': '(', ']': '[', '}': '{'}
+
+
+class JsToken(NamedTuple):
+    """Ein Token des JavaScript-Quelltexts"""
+    kind: str  # name, num, str, regex, punct
+    value: str
+    start: int
+    end: int
+
+
+def tokenize_javascript(source: str) -> List[JsToken]:
+    """
+    Zerlegt JavaScript/TypeScript-Quelltext in einem linearen Durchlauf in Tokens
+
+    Kommentare und Leerraum werden verworfen; Zeichenketten, Template-Literale
+    und reguläre Ausdrücke erscheinen als einzelne Tokens, Ausdrücke in ${...}
+    werden normal zerlegt.
+    """
+    tokens: List[JsToken] = []
+    template_stack: List[int] = []  # Klammertiefe beim Öffnen von ${
+    brace_depth = 0
+    position = 0
+    length = len(source)
+    append = tokens.append
+    new_token = tuple.__new__
+
+    while position < length:
+        # finditer liefert Tokens, bis ein Sonderfall (Template, regulärer Ausdruck) neu aufsetzt
+        for match in _TOKEN_PATTERN.finditer(source, position):
+            kind = match.lastgroup
+            if kind is None:
+                # Nur noch Leerraum bis zum Ende
+                position = length
+                break
+            start, end = match.span(kind)
+            position = end
+            if kind == 'comment' or kind == 'other':
+                continue
+            value = match.group(kind)
+
+            if kind == 'punct':
+                if value == '`':
+                    position = _scan_template(source, end, tokens, template_stack, brace_depth, start)
+                    break
+                if value == '/' and _regex_allowed(tokens):
+                    regex = _REGEX_LITERAL.match(source, start)
+                    if regex:
+                        append(new_token(JsToken, ('regex', regex.group(), start, regex.end())))
+                        position = regex.end()
+                        break
+                if value == '{':
+                    brace_depth += 1
+                elif value == '}':
+                    if template_stack and template_stack[-1] == brace_depth:
+                        # Ende eines ${...}-Ausdrucks: Template-Literal fortsetzen
+                        template_stack.pop()
+                        position = _scan_template(source, end, tokens, template_stack, brace_depth, start)
+                        break
+                    brace_depth -= 1
+
+            append(new_token(JsToken, (kind, value, start, end)))
+        else:
+            position = length
+
+    return tokens
+
+
+def _scan_template(source: str, position: int, tokens: List[JsToken], template_stack: List[int],
+                   brace_depth: int, token_start: int) -> int:
+    """Liest ein Template-Literal bis zum Ende oder bis zum nächsten ${ und gibt die neue Position zurück"""
+    position = _TEMPLATE_CHUNK.match(source, position).end()
+    if source.startswith('${', position):
+        template_stack.append(brace_depth)
+        position += 2
+    elif position < len(source):
+        position += 1  # abschließendes `
+    tokens.append(JsToken('str', '`', token_start, position))
+    return position
+
+
+def _regex_allowed(tokens: List[JsToken]) -> bool:
+    """Prüft, ob an der aktuellen Stelle ein regulärer Ausdruck statt einer Division stehen kann"""
+    if not tokens:
+        return True
+    previous = tokens[-1]
+    if previous.kind == 'name':
+        return previous.value in _REGEX_PREFIX_KEYWORDS
+    if previous.kind in ('num', 'str', 'regex'):
+        return False
+    return previous.value not in (')', ']', '}')
+
+
+class _Header(NamedTuple):
+    """Kopf einer Funktion: Parameterbereich und Beginn des Rumpfs"""
+    params: Tuple[int, int]  # Token-Indizes von ( und )
+    end: int  # Token-Index des Rumpfs ({) bzw. des Kopfendes
+    has_body: bool
+
+
+class JavaScriptExtractor:
+    """Erkennt Deklarationen in einer Token-Folge"""
+
+    def __init__(self, source: str, line_index: Optional[LineIndex] = None):
+        self.source = source
+        self.line_index = line_index or LineIndex(source)
+        self.tokens = tokenize_javascript(source)
+        self._lines: Optional[List[str]] = None
+        self._pairs: Optional[Dict[int, int]] = None
+
+    def extract(self) -> List[CodeElement]:
+        """Gibt alle erkannten Deklarationen in Quelltextreihenfolge zurück"""
+        return [CodeElement(**fields) for fields in self.extract_fields()]
+
+    def extract_fields(self) -> List[Dict[str, Any]]:
+        """
+        Gibt die Felder aller erkannten Deklarationen in Quelltextreihenfolge zurück
+
+        Die Dictionaries entsprechen den Schlüsselwortargumenten von CodeElement;
+        der CodeScanner schreibt sie ohne Zwischenmodell in den ElementStore.
+        """
+        tokens = self.tokens
+        elements: List[Dict[str, Any]] = []
+        body_opens: Dict[int, Tuple[Dict[str, Any], Optional[Dict[str, Any]]]] = {}
+        consumed = set()
+        open_bodies: List[Tuple[int, Dict[str, Any], Optional[Dict[str, Any]]]] = []
+        class_stack: List[Tuple[int, Dict[str, Any]]] = []
+        object_depths: List[int] = []  # Klammertiefen offener Objektliterale
+        member_starts = set()
+        brace_depth = 0
+
+        for index, token in enumerate(tokens):
+            value = token.value
+            if token.kind == 'punct':
+                if value == '@' and class_stack and class_stack[-1][0] == brace_depth:
+                    # Nach einem Dekorator beginnt ein neues Member
+                    member_starts.add(self._skip_decorator(index))
+                elif value == '{':
+                    brace_depth += 1
+                    opened = body_opens.pop(index, None)
+                    if opened:
+                        element, class_element = opened
+                        open_bodies.append((brace_depth, element, class_element))
+                        if class_element is element:
+                            class_stack.append((brace_depth, element))
+                    elif index > 0 and tokens[index - 1].value in _OBJECT_PREFIXES:
+                        object_depths.append(brace_depth)
+                elif value == '}':
+                    if object_depths and object_depths[-1] == brace_depth:
+                        object_depths.pop()
+                    if open_bodies and open_bodies[-1][0] == brace_depth:
+                        _, element, class_element = open_bodies.pop()
+                        element['code_snippet'] = self._snippet(element['line_number'], token.end)
+                        if class_stack and class_stack[-1][1] is element:
+                            class_stack.pop()
+                    brace_depth -= 1
+                continue
+
+            if token.kind != 'name' or index in consumed or self._is_property(index):
+                continue
+
+            found = None
+            if value == 'function':
+                found = self._function_declaration(index)
+            elif value == 'class':
+                found = self._class_declaration(index)
+            elif value in ('const', 'let', 'var'):
+                found = self._variable_function(index, consumed)
+            elif value in ('exports', 'module'):
+                found = self._commonjs_export(index, consumed)
+            elif class_stack and class_stack[-1][0] == brace_depth:
+                # Private Member (#name) beginnen mit dem #-Token
+                start = index - 1 if self.tokens[index - 1].value == '#' else index
+                if start in member_starts or self._is_member_start(start):
+                    found = self._class_member(start, class_stack[-1][1], consumed)
+            elif object_depths and object_depths[-1] == brace_depth and tokens[index - 1].value in ('{', ','):
+                found = self._object_member(index, consumed)
+
+            if found:
+                element, body_index, is_class = found
+                elements.append(element)
+                if body_index is not None:
+                    body_opens[body_index] = (element, element if is_class else None)
+
+        return elements
+
+    # --- Deklarationen -------------------------------------------------------
+
+    def _function_declaration(self, index: int):
+        """function [*] NAME (...) { ... }"""
+        position = index + 1
+        if self._value(position) == '*':
+            position += 1
+        if self._kind(position) != 'name':
+            # Anonyme Funktionsausdrücke werden über die Zuweisung erkannt
+            return None
+        name = self.tokens[position].value
+        header = self._function_header(position + 1)
+        if header is None:
+            return None
+        start = self._declaration_start(index)
+        return self._function_element(name, start, header), self._body_index(header), False
+
+    def _class_declaration(self, index: int):
+        """class NAME [extends ...] { ... }"""
+        if self._kind(index + 1) != 'name' or self._value(index + 1) in ('extends', 'implements'):
+            return None
+        name = self.tokens[index + 1].value
+        body_index = self._find_class_body(index + 2)
+        if body_index is None:
+            return None
+        start = self._declaration_start(index)
+        element = {
+            'name': name,
+            'type': ElementType.CLASS,
+            'signature': self._text(start, body_index),
+            'methods': [],
+            'line_number': self._line(start)
+        }
+        return element, body_index, True
+
+    def _variable_function(self, index: int, consumed: set):
+        """const NAME [: Typ] = [async] (...) => ... bzw. = function (...) { ... }"""
+        if self._kind(index + 1) != 'name':
+            return None
+        name = self.tokens[index + 1].value
+        position = self._skip_type_annotation(index + 2)
+        if self._value(position) != '=':
+            return None
+        header = self._function_value(position + 1, consumed)
+        if header is None:
+            return None
+        start = self._declaration_start(index)
+        return self._function_element(name, start, header), self._body_index(header), False
+
+    def _commonjs_export(self, index: int, consumed: set):
+        """exports.NAME = ... bzw. module.exports.NAME = ..."""
+        position = index
+        if self._value(position) == 'module':
+            if self._value(position + 1) != '.' or self._value(position + 2) != 'exports':
+                return None
+            position += 2
+        if self._value(position + 1) != '.' or self._kind(position + 2) != 'name' or self._value(position + 3) != '=':
+            return None
+        name = self.tokens[position + 2].value
+        header = self._function_value(position + 4, consumed)
+        if header is None:
+            return None
+        return self._function_element(name, index, header), self._body_index(header), False
+
+    def _class_member(self, index: int, class_element: Dict[str, Any], consumed: set):
+        """Methoden und Arrow-Funktions-Felder im Klassenrumpf"""
+        position = index
+        modifiers = []
+        while self._value(position) in _MEMBER_MODIFIERS and \
+                (self._kind(position + 1) == 'name' or self._value(position + 1) in ('*', '#', '[')):
+            modifiers.append(self._value(position))
+            position += 1
+        if self._value(position) == '*':
+            position += 1
+        private_prefix = ''
+        if self._value(position) == '#':
+            private_prefix = '#'
+            position += 1
+        if self._kind(position) != 'name' or self._value(position) in _NOT_MEMBER_NAMES:
+            return None
+
+        name = private_prefix + self.tokens[position].value
+        position += 1
+        if self._value(position) in ('?', '!'):
+            position += 1
+
+        if self._value(position) in ('(', '<'):
+            header = self._function_header(position)
+        else:
+            # Feld mit Funktionswert: name = (...) => ...
+            position = self._skip_type_annotation(position)
+            if self._value(position) != '=':
+                return None
+            header = self._function_value(position + 1, consumed)
+        if header is None:
+            return None
+
+        element = self._function_element(name, index, header)
+        class_element['methods'].append({
+            'name': name,
+            'is_private': name.startswith(('_', '#')) or 'private' in modifiers
+        })
+        return element, self._body_index(header), False
+
+    def _object_member(self, index: int, consumed: set):
+        """Methoden und Funktionswerte in Objektliteralen: { name() {...}, name: function () {...} }"""
+        position = index
+        while self._value(position) in _OBJECT_MODIFIERS and \
+                (self._kind(position + 1) == 'name' or self._value(position + 1) == '*'):
+            position += 1
+        if self._value(position) == '*':
+            position += 1
+        if self._kind(position) != 'name':
+            return None
+        name = self.tokens[position].value
+        position += 1
+
+        if self._value(position) in ('(', '<'):
+            # Kurzschreibweise: nur mit Rumpf, sonst handelt es sich nicht um eine Methode
+            header = self._function_header(position)
+            if header is not None and not header.has_body:
+                return None
+        elif self._value(position) == ':':
+            header = self._function_value(position + 1, consumed)
+        else:
+            return None
+        if header is None:
+            return None
+        return self._function_element(name, index, header), self._body_index(header), False
+
+    # --- Hilfsfunktionen für Köpfe ------------------------------------------
+
+    def _function_value(self, position: int, consumed: set) -> Optional[_Header]:
+        """Erkennt einen Funktionswert nach einem = (function-Ausdruck oder Arrow-Funktion)"""
+        if self._value(position) == 'async':
+            position += 1
+        if self._value(position) == 'function':
+            consumed.add(position)
+            position += 1
+            if self._value(position) == '*':
+                position += 1
+            if self._kind(position) == 'name':
+                position += 1
+            return self._function_header(position)
+        if self._kind(position) == 'name' and self._value(position + 1) == '=>':
+            return self._arrow_body(position + 1, (position, position))
+        if self._value(position) in ('(', '<'):
+            position = self._skip_generics(position)
+            if self._value(position) != '(':
+                return None
+            close = self._matching(position)
+            if close is None:
+                return None
+            arrow = self._skip_type_annotation(close + 1)
+            if self._value(arrow) != '=>':
+                return None
+            return self._arrow_body(arrow, (position, close))
+        return None
+
+    def _arrow_body(self, arrow: int, params: Tuple[int, int]) -> _Header:
+        """Kopf einer Arrow-Funktion; der Rumpf beginnt optional mit {"""
+        if self._value(arrow + 1) == '{':
+            return _Header(params, arrow + 1, True)
+        return _Header(params, arrow, False)
+
+    def _function_header(self, position: int) -> Optional[_Header]:
+        """Liest [<Generics>] (Parameter) [: Rückgabetyp] bis zum Rumpf"""
+        position = self._skip_generics(position)
+        if self._value(position) != '(':
+            return None
+        close = self._matching(position)
+        if close is None:
+            return None
+        end = self._skip_type_annotation(close + 1)
+        value = self._value(end)
+        if value == '{':
+            return _Header((position, close), end, True)
+        if value in (';', None) or self._kind(end) == 'name':
+            # Überladung/Deklaration ohne Rumpf (TypeScript)
+            return _Header((position, close), close, False)
+        return None
+
+    def _find_class_body(self, position: int) -> Optional[int]:
+        """Sucht die öffnende Klammer des Klassenrumpfs (nach extends/implements)"""
+        depth = 0
+        tokens = self.tokens
+        while position < len(tokens):
+            value = tokens[position].value
+            if tokens[position].kind == 'punct':
+                if value in '([':
+                    depth += 1
+                elif value in ')]':
+                    depth -= 1
+                elif value == '{':
+                    if depth == 0:
+                        return position
+                    close = self._matching(position)
+                    if close is None:
+                        return None
+                    position = close
+                elif value in (';', '}') and depth == 0:
+                    return None
+            position += 1
+        return None
+
+    def _skip_type_annotation(self, position: int) -> int:
+        """Überspringt eine TypeScript-Typannotation (: Typ) und gibt die Position danach zurück"""
+        if self._value(position) != ':':
+            return position
+        position += 1
+        depth = 0
+        tokens = self.tokens
+        while position < len(tokens):
+            token = tokens[position]
+            value = token.value
+            if token.kind == 'punct':
+                if value in ('(', '[', '<'):
+                    depth += 1
+                elif value in (')', ']', '>'):
+                    if depth == 0:
+                        return position
+                    depth -= 1
+                elif value == '{':
+                    previous = tokens[position - 1].value
+                    if depth == 0 and previous not in (':', '|', '&', ',', '=>', '<', '('):
+                        return position
+                    # Objekttyp überspringen
+                    close = self._matching(position)
+                    if close is None:
+                        return position
+                    position = close
+                elif value == '=>' and depth == 0 and tokens[position - 1].value != ')':
+                    return position
+                elif value in ('=', ';', ',', '}') and depth == 0:
+                    return position
+            position += 1
+        return position
+
+    def _skip_generics(self, position: int) -> int:
+        """Überspringt eine Liste von Typparametern <...>"""
+        if self._value(position) != '<':
+            return position
+        depth = 0
+        tokens = self.tokens
+        while position < len(tokens):
+            value = tokens[position].value
+            if value == '<':
+                depth += 1
+            elif value == '>':
+                depth -= 1
+                if depth == 0:
+                    return position + 1
+            elif value in ('{', '}', ';', ')'):
+                return position
+            position += 1
+        return position
+
+    def _matching(self, position: int) -> Optional[int]:
+        """Gibt den Index der schließenden Klammer zur öffnenden an position zurück"""
+        if self._pairs is None:
+            self._pairs = self._bracket_pairs()
+        return self._pairs.get(position)
+
+    def _bracket_pairs(self) -> Dict[int, int]:
+        """
+        Bestimmt alle Klammerpaare in einem Durchlauf über die Tokens
+
+        Jede Klammerart hat einen eigenen Stapel; nicht geschlossene Klammern
+        erhalten keinen Eintrag.
+        """
+        pairs: Dict[int, int] = {}
+        stacks: Dict[str, List[int]] = {opening: [] for opening in _BRACKETS.values()}
+        for index, token in enumerate(self.tokens):
+            if token.kind != 'punct':
+                continue
+            value = token.value
+            if value in stacks:
+                stacks[value].append(index)
+            elif value in _BRACKETS:
+                stack = stacks[_BRACKETS[value]]
+                if stack:
+                    pairs[stack.pop()] = index
+        return pairs
+
+    # --- Elemente ------------------------------------------------------------
+
+    def _function_element(self, name: str, start: int, header: _Header) -> Dict[str, Any]:
+        """Erstellt die Felder eines Funktionselements aus Name, Startposition und Kopf"""
+        end_token = self.tokens[header.end]
+        signature_end = header.end if header.has_body else header.end + 1
+        element = {
+            'name': name,
+            'type': ElementType.FUNCTION,
+            'signature': self._text(start, signature_end),
+            'parameters': self._parameters(*header.params),
+            'line_number': self._line(start)
+        }
+        if not header.has_body:
+            element['code_snippet'] = self._snippet(element['line_number'], end_token.end)
+        return element
+
+    def _parameters(self, open_index: int, close_index: int) -> List[Dict]:
+        """Zerlegt die Parameterliste in Name, Typannotation und Standardwert"""
+        if open_index == close_index:
+            # Einzelner Parameter ohne Klammern (x => ...)
+            return [{'name': self.tokens[open_index].value, 'type_annotation': None, 'default': None}]
+
+        parameters = []
+        segment_start = open_index + 1
+        depth = 0
+        for index in range(open_index + 1, close_index):
+            token = self.tokens[index]
+            if token.kind != 'punct':
+                continue
+            if token.value in ('(', '[', '{', '<'):
+                depth += 1
+            elif token.value in (')', ']', '}', '>'):
+                depth -= 1
+            elif token.value == ',' and depth == 0:
+                if segment_start < index:
+                    parameters.append(self._parameter(segment_start, index))
+                segment_start = index + 1
+        if segment_start < close_index:
+            parameters.append(self._parameter(segment_start, close_index))
+        return parameters
+
+    def _parameter(self, start: int, end: int) -> Dict:
+        """Beschreibt einen Parameter aus den Tokens start bis end (exklusiv)"""
+        colon = equals = None
+        depth = 0
+        for index in range(start, end):
+            token = self.tokens[index]
+            value = token.value
+            if token.kind != 'punct':
+                continue
+            if value in ('(', '[', '{', '<'):
+                depth += 1
+            elif value in (')', ']', '}', '>'):
+                depth -= 1
+            elif depth == 0 and value == ':' and colon is None and equals is None:
+                colon = index
+            elif depth == 0 and value == '=' and equals is None:
+                equals = index
+        name_end = colon if colon is not None else equals if equals is not None else end
+        type_end = equals if equals is not None else end
+        return {
+            'name': self._text(start, name_end).rstrip('?'),
+            'type_annotation': self._text(colon + 1, type_end) if colon is not None else None,
+            'default': self._text(equals + 1, end) if equals is not None else None
+        }
+
+    # --- Token-Hilfen --------------------------------------------------------
+
+    def _value(self, index: int) -> Optional[str]:
+        return self.tokens[index].value if index < len(self.tokens) else None
+
+    def _kind(self, index: int) -> Optional[str]:
+        return self.tokens[index].kind if index < len(self.tokens) else None
+
+    def _is_property(self, index: int) -> bool:
+        """Prüft, ob ein Name nach einem Punkt steht (Eigenschaftszugriff)"""
+        return index > 0 and self.tokens[index - 1].value in ('.', '?.')
+
+    def _is_member_start(self, index: int) -> bool:
+        """Prüft, ob ein Name am Anfang eines Klassen-Members steht"""
+        if index == 0:
+            return False
+        previous = self.tokens[index - 1]
+        if previous.kind == 'punct' and previous.value in ('{', '}', ';'):
+            return True
+        if previous.kind == 'punct' and previous.value not in (')', ']'):
+            return False
+        # Ohne Semikolon: neues Member in einer neuen Zeile (automatische Semikolon-Einfügung)
+        return '\n' in self.source[previous.end:self.tokens[index].start]
+
+    def _skip_decorator(self, index: int) -> int:
+        """Überspringt einen Dekorator (@name.attr(...)) und gibt den Index danach zurück"""
+        position = index + 1
+        if self._kind(position) != 'name':
+            return position
+        position += 1
+        while self._value(position) == '.' and self._kind(position + 1) == 'name':
+            position += 2
+        if self._value(position) == '(':
+            close = self._matching(position)
+            if close is not None:
+                position = close + 1
+        return position
+
+    def _declaration_start(self, index: int) -> int:
+        """Bezieht vorangestellte Modifikatoren (export, default, async, ...) in die Deklaration ein"""
+        while index > 0 and self.tokens[index - 1].value in _DECLARATION_MODIFIERS \
+                and not self._is_property(index - 1):
+            index -= 1
+        return index
+
+    def _body_index(self, header: _Header) -> Optional[int]:
+        return header.end if header.has_body else None
+
+    def _text(self, start: int, end: int) -> str:
+        """Quelltext der Tokens start bis end (exklusiv) mit zusammengefasstem Leerraum"""
+        if end <= start:
+            return ''
+        text = self.source[self.tokens[start].start:self.tokens[end - 1].end]
+        return ' '.join(text.split())
+
+    def _line(self, token_index: int) -> int:
+        return self.line_index.line_number(self.tokens[token_index].start)
+
+    def _snippet(self, start_line: int, end_offset: int) -> str:
+        """Zeilen von start_line bis zur Zeile des End-Offsets"""
+        if self._lines is None:
+            self._lines = self.source.split('\n')
+        end_line = self.line_index.line_number(max(0, end_offset - 1))
+        return '\n'.join(self._lines[start_line - 1:end_line])
+
+
+def extract_javascript_elements(source: str, line_index: Optional[LineIndex] = None) -> List[CodeElement]:
+    """
+    Extrahiert Deklarationen aus JavaScript/TypeScript-Quelltext
+
+    Args:
+        source: Quelltext der Datei
+        line_index: Bereits vorhandener Zeilenindex des Quelltexts
+
+    Returns:
+        Liste der gefundenen Funktionen, Methoden und Klassen
+    """
+    return JavaScriptExtractor(source, line_index).extract()
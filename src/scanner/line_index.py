@@ -0,0 +1,31 @@
+"""
+Zeilenindex für reguläre Ausdrücke: Zuordnung von Zeichen-Offsets zu Zeilennummern
+"""
+import re
+from bisect import bisect_right
+from typing import List
+
+_NEWLINE = re.compile('\n')
+
+
+class LineIndex:
+    """
+    Speichert die Anfangs-Offsets aller Zeilen eines Textes
+
+    Der Index wird einmal pro Datei aufgebaut; jede Abfrage kostet danach nur
+    eine binäre Suche statt content[:offset].count('\\n').
+    """
+
+    __slots__ = ('line_offsets',)
+
+    def __init__(self, text: str):
+        self.line_offsets: List[int] = [0]
+        self.line_offsets.extend(match.end() for match in _NEWLINE.finditer(text))
+
+    def line_number(self, offset: int) -> int:
+        """Gibt die (1-basierte) Zeilennummer eines Zeichen-Offsets zurück"""
+        return bisect_right(self.line_offsets, offset)
+
+    def __len__(self) -> int:
+        """Anzahl der Zeilen"""
+        return len(self.line_offsets)
@@ -3,25 +3,136 @@ Modul für parallele Dateiverarbeitung zur Verbesserung der Performance
 """
 import asyncio
 import concurrent.futures
+import heapq
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Tuple
 import os
 import threading
+import time
 from src.core.config_manager import ProjectConfig
 from src.scanner.code_scanner import CodeScanner
 from src.scanner.doc_scanner import DocScanner
 from src.scanner.file_handler import FileHandler
+from src.scanner.file_analyzer import FileAnalyzer
+from src.scanner.streaming_stats import QuantileSketch
+from src.scanner.file_manifest import FileEntry
+from src.scanner import element_codec
+from src.scanner.performance_analyzer import PerformanceAnalyzer, bind_active_analyzer, measure_phase
+from src.scanner.scan_profiler import ScanProfiler, create_profiler
+from src.scanner.progress_callback import ScanProgressCallback
 from src.models.element import CodeElement, DocElement
 
+CODE_EXTENSIONS = ('.py', '.js', '.jsx', '.ts', '.tsx')
+DOC_EXTENSIONS = ('.md', '.rst', '.txt')
+
+# Anzahl der Chunks pro Prozess; mehrere kleine Chunks gleichen Laufzeitunterschiede aus
+CHUNKS_PER_WORKER = 4
+
+# Scanner eines Worker-Prozesses, einmalig durch _init_worker erstellt
+_worker_code_scanner: Optional[CodeScanner] = None
+_worker_doc_scanner: Optional[DocScanner] = None
+# Misst Phasen und Dateien im Worker; die Werte gehen mit jedem Chunk an den Elternprozess
+_worker_analyzer: Optional[PerformanceAnalyzer] = None
+
+
+def _init_worker(config: ProjectConfig):
+    """Initialisiert einen Worker-Prozess mit der Projektkonfiguration des Elternprozesses"""
+    global _worker_code_scanner, _worker_doc_scanner, _worker_analyzer
+    _worker_code_scanner = CodeScanner(config)
+    _worker_doc_scanner = DocScanner(config)
+    _worker_analyzer = PerformanceAnalyzer()
+    _worker_analyzer.profiler = ScanProfiler(top_n=0, record_all=True)
+    _worker_analyzer.start_timing()
+
+
+def _scan_chunk(file_paths: List[str]) -> Tuple[bytes, List[Any], Dict[str, Any], FileAnalyzer]:
+    """
+    Scannt einen Chunk von Dateien in einem Worker-Prozess
+
+    Returns:
+        Mit element_codec verpackte Liste von (Kennung, kodierte Elemente) je Datei,
+        die Dateiprofile, die im Chunk gemessenen Phasen und die Dateistatistik des Chunks
+    """
+    records = []
+    # Zähler, Größen-Sketch und Pfad-Stichprobe bleiben klein und werden im Elternprozess zusammengeführt
+    file_analyzer = FileAnalyzer()
+    for file_path_str in file_paths:
+        file_path = Path(file_path_str)
+        file_ext = file_path.suffix.lower()
+        if file_ext not in CODE_EXTENSIONS and file_ext not in DOC_EXTENSIONS:
+            continue
+        try:
+            file_analyzer.analyze_file(file_path, is_included=True)
+        except OSError:
+            pass
+        _worker_analyzer.begin_file()
+        start = time.perf_counter()
+        try:
+            if file_ext in CODE_EXTENSIONS:
+                kind, elements = 'code', _worker_code_scanner.scan_file(file_path)
+            else:
+                kind, elements = 'doc', _worker_doc_scanner.scan_file(file_path)
+        except Exception as e:
+            print(f"Fehler beim Scannen der Datei {file_path_str}: {e}")
+            continue
+        finally:
+            _worker_analyzer.record_file(file_ext, time.perf_counter() - start, file_path_str)
+        records.append((kind, [element_codec.encode_element(element) for element in elements]))
+    return (element_codec.pack_records(records), _worker_analyzer.profiler.take_records(),
+            _worker_analyzer.take_phases(), file_analyzer)
+
+
+def split_into_balanced_chunks(entries: List[FileEntry], chunk_count: int) -> List[List[str]]:
+    """
+    Verteilt Dateien nach Größe auf Chunks mit möglichst gleicher Gesamtgröße
+
+    Die größten Dateien werden zuerst jeweils dem bisher kleinsten Chunk
+    zugeordnet (Longest-Processing-Time-Heuristik).
+
+    Args:
+        entries: Dateien mit Größenangabe aus dem Manifest
+        chunk_count: Gewünschte Anzahl von Chunks
+
+    Returns:
+        Liste nicht leerer Chunks mit Dateipfaden
+    """
+    chunk_count = max(1, min(chunk_count, len(entries)))
+    heap = [(0, index) for index in range(chunk_count)]
+    chunks: List[List[str]] = [[] for _ in range(chunk_count)]
+    for entry in sorted(entries, key=lambda item: item.size, reverse=True):
+        total, index = heapq.heappop(heap)
+        chunks[index].append(str(entry.path))
+        # Auch leere Dateien verursachen Aufwand
+        heapq.heappush(heap, (total + entry.size + 1, index))
+    return [chunk for chunk in chunks if chunk]
+
 
 class ParallelScanner:
     """Scanner mit paralleler Verarbeitung für verbesserte Performance"""
     
-    def __init__(self, config: ProjectConfig, max_workers: Optional[int] = None):
+    def __init__(self, config: ProjectConfig, max_workers: Optional[int] = None,
+                 performance_analyzer: Optional[PerformanceAnalyzer] = None,
+                 progress_callback: Optional[ScanProgressCallback] = None):
+        """
+        Args:
+            config: Projektkonfiguration
+            max_workers: Maximale Anzahl an Workern
+            performance_analyzer: Analyzer für die Messung (Standard: eigener Analyzer
+                                  mit Profiler gemäß config.profiling)
+            progress_callback: Empfänger der Fortschrittsereignisse
+        """
         self.config = config
+        self.progress_callback = progress_callback or ScanProgressCallback()
+        if performance_analyzer is None:
+            performance_analyzer = PerformanceAnalyzer(
+                trace_allocations=getattr(config, 'trace_allocations', False))
+            performance_analyzer.profiler = create_profiler(config)
+        self.performance_analyzer = performance_analyzer
         self.code_scanner = CodeScanner(config)
         self.doc_scanner = DocScanner(config)
         self.file_handler = FileHandler(config)
+        # Filterstatistik des letzten Scans (beim Prozess-Pool aus den Workern zusammengeführt)
+        self.file_analyzer = FileAnalyzer()
         
         # Setze maximale Anzahl Worker (Standard: Anzahl der CPU-Kerne)
         self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
@@ -35,32 +146,53 @@ class ParallelScanner:
             use_threading: Ob Threading (statt Multiprocessing) verwendet werden soll
         """
         project_path = Path(project_path)
+        start_time = self.performance_analyzer.start_timing()
         
-        # Sammle alle zu scannenden Dateien
-        all_files = []
-        scan_paths_list = []
-        
-        for scan_path_str in self.config.scan_paths:
-            scan_path = project_path / scan_path_str
-            if not scan_path.exists():
-                continue
-            scan_paths_list.append(scan_path)
-            
-            # Hole alle relevanten Dateien
-            files = self.file_handler.get_filtered_files(scan_path)
-            all_files.extend(files)
+        # Sammle alle zu scannenden Dateien (ein Verzeichnisdurchlauf pro Scan-Pfad)
+        self.progress_callback.set_stage('discovery')
+        with measure_phase('walk'):
+            manifests = self.file_handler.build_manifests(project_path)
+        all_entries = [entry for manifest in manifests for entry in manifest]
+        all_files = [entry.path for entry in all_entries]
         
         print(f"Starte parallelen Scan von {len(all_files)} Dateien mit {self.max_workers} Workern...")
+        self.progress_callback.update_total_directories(len(manifests))
+        self.progress_callback.update_total_files(
+            sum(1 for entry in all_entries if entry.suffix in CODE_EXTENSIONS or entry.suffix in DOC_EXTENSIONS))
+        self.progress_callback.set_stage('scan')
+
+        self.file_analyzer = FileAnalyzer()
+        size_sketch = QuantileSketch()
+        for manifest in manifests:
+            for excluded_dir in manifest.excluded_dirs:
+                self.file_analyzer.analyze_directory_exclusion(excluded_dir)
+        for entry in all_entries:
+            size_sketch.add(entry.size)
+            is_included = entry.suffix in CODE_EXTENSIONS or entry.suffix in DOC_EXTENSIONS
+            # Eingeschlossene Dateien zählen im Prozess-Pool die Worker
+            if not is_included or use_threading:
+                self.file_analyzer.analyze_file(entry.path, is_included=is_included, file_size=entry.size)
         
         # Initialisiere Ergebnisse
         code_elements = []
         doc_elements = []
         
         # Wähle die geeignete Methode für parallele Verarbeitung
-        if use_threading:
-            code_elements, doc_elements = self._process_files_with_threading(all_files)
-        else:
-            code_elements, doc_elements = self._process_files_with_multiprocessing(all_files)
+        try:
+            if use_threading:
+                code_elements, doc_elements = self._process_files_with_threading(all_files)
+            else:
+                code_elements, doc_elements = self._process_files_with_multiprocessing(all_entries)
+        finally:
+            self.progress_callback.finish()
+            self.performance_analyzer.stop_timing(
+                start_time,
+                files_processed=len(code_elements) + len(doc_elements),
+                file_sizes=size_sketch,
+                directories_scanned=len(manifests)
+            )
+            if self.performance_analyzer.profiler:
+                self.performance_analyzer.profiler.finish(getattr(self.config, 'profile_output', None))
         
         return {
             'code_elements': code_elements,
@@ -70,8 +202,9 @@ class ParallelScanner:
                 'code_files': len(code_elements),
                 'doc_files': len(doc_elements),
                 'project_path': str(project_path),
-                'workers_used': self.max_workers
-            }
+                'workers_used': self.max_workers if use_threading else self._process_count()
+            },
+            'performance_report': self.performance_analyzer.get_performance_report()
         }
     
     def _process_files_with_threading(self, files: List[Path]) -> tuple[List[CodeElement], List[DocElement]]:
@@ -93,120 +226,92 @@ class ParallelScanner:
         # Verarbeite Code-Dateien parallel
         if code_files:
             with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                code_results = list(executor.map(self._scan_code_file, code_files))
+                code_results = executor.map(bind_active_analyzer(self._scan_code_file), code_files)
                 # Entferne None-Werte und flache Liste
-                for result in code_results:
+                for file_path, result in zip(code_files, code_results):
+                    self.progress_callback.scanning_file(file_path)
                     if result:
                         code_elements.extend(result)
         
         # Verarbeite Dokumentations-Dateien parallel
         if doc_files:
             with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                doc_results = list(executor.map(self._scan_doc_file, doc_files))
+                doc_results = executor.map(bind_active_analyzer(self._scan_doc_file), doc_files)
                 # Entferne None-Werte und flache Liste
-                for result in doc_results:
+                for file_path, result in zip(doc_files, doc_results):
+                    self.progress_callback.scanning_file(file_path)
                     if result:
                         doc_elements.extend(result)
         
         return code_elements, doc_elements
     
-    def _process_files_with_multiprocessing(self, files: List[Path]) -> tuple[List[CodeElement], List[DocElement]]:
-        """Verarbeitet Dateien mit Multiprocessing"""
-        # Für Multiprocessing müssen wir eine andere Herangehensweise wählen,
-        # da die Scanner-Klassen nicht direkt serialisierbar sind
+    def _process_files_with_multiprocessing(self, entries: List[FileEntry]) -> tuple[List[CodeElement], List[DocElement]]:
+        """
+        Verarbeitet Dateien mit einem Prozess-Pool
+
+        Jeder Worker erhält die Projektkonfiguration einmalig über den Initializer.
+        Die Dateien werden in nach Größe ausgeglichenen Chunks übergeben und die
+        Ergebnisse als kompakte Datensätze zurückgeliefert.
+        """
         code_elements = []
         doc_elements = []
-        
-        # Gruppiere Dateien nach Typ
-        code_files = []
-        doc_files = []
-        
-        for file_path in files:
-            file_ext = file_path.suffix.lower()
-            if file_ext in ['.py', '.js', '.jsx', '.ts', '.tsx']:
-                code_files.append(file_path)
-            elif file_ext in ['.md', '.rst', '.txt']:
-                doc_files.append(file_path)
-        
-        # Verarbeite Code-Dateien parallel
-        if code_files:
-            with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-                # Wir übergeben nur Dateipfade und erstellen Scanner innerhalb der Prozesse
-                file_paths = [str(f) for f in code_files]
-                code_results = list(executor.map(self._scan_code_file_multiprocess, file_paths))
-                # Entferne None-Werte und flache Liste
-                for result in code_results:
-                    if result:
-                        code_elements.extend(result)
-        
-        # Verarbeite Dokumentations-Dateien parallel
-        if doc_files:
-            with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-                file_paths = [str(f) for f in doc_files]
-                doc_results = list(executor.map(self._scan_doc_file_multiprocess, file_paths))
-                # Entferne None-Werte und flache Liste
-                for result in doc_results:
-                    if result:
-                        doc_elements.extend(result)
-        
+
+        scan_entries = [entry for entry in entries
+                        if entry.suffix in CODE_EXTENSIONS or entry.suffix in DOC_EXTENSIONS]
+        if not scan_entries:
+            return code_elements, doc_elements
+
+        process_count = self._process_count()
+        chunks = split_into_balanced_chunks(scan_entries, process_count * CHUNKS_PER_WORKER)
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=process_count,
+                                                    initializer=_init_worker,
+                                                    initargs=(self.config,)) as executor:
+            for chunk, (packed, profiles, phases, chunk_analyzer) in zip(chunks, executor.map(_scan_chunk, chunks)):
+                # Fortschritt wird pro Chunk gemeldet
+                self.progress_callback.files_completed(len(chunk), Path(chunk[-1]))
+                self.file_analyzer.merge(chunk_analyzer)
+                # Messwerte der Worker übernehmen
+                self.performance_analyzer.add_file_profiles(profiles)
+                self.performance_analyzer.merge_phases(phases)
+                for kind, records in element_codec.unpack_records(packed):
+                    target = code_elements if kind == 'code' else doc_elements
+                    target.extend(element_codec.decode_element(record) for record in records)
+
         return code_elements, doc_elements
+
+    def _process_count(self) -> int:
+        """Anzahl der Worker-Prozesse (höchstens eine pro CPU-Kern)"""
+        return max(1, min(self.max_workers, os.cpu_count() or 1))
     
     def _scan_code_file(self, file_path: Path) -> Optional[List[CodeElement]]:
         """Scannt eine einzelne Code-Datei (für Threading)"""
-        try:
-            return self.code_scanner.scan_file(file_path)
-        except Exception as e:
-            print(f"Fehler beim Scannen der Datei {file_path}: {e}")
-            return None
+        return self._scan_file_measured(self.code_scanner.scan_file, file_path)
     
     def _scan_doc_file(self, file_path: Path) -> Optional[List[DocElement]]:
         """Scannt eine einzelne Dokumentations-Datei (für Threading)"""
+        return self._scan_file_measured(self.doc_scanner.scan_file, file_path)
+
+    def _scan_file_measured(self, scan_file: Callable[[Path], List[Any]], file_path: Path) -> Optional[List[Any]]:
+        """Scannt eine Datei und erfasst ihre Verarbeitungszeit"""
+        self.performance_analyzer.begin_file()
+        start = time.perf_counter()
         try:
-            return self.doc_scanner.scan_file(file_path)
+            return scan_file(file_path)
         except Exception as e:
             print(f"Fehler beim Scannen der Datei {file_path}: {e}")
             return None
-    
-    @staticmethod
-    def _scan_code_file_multiprocess(file_path_str: str) -> Optional[List[CodeElement]]:
-        """Scannt eine einzelne Code-Datei (für Multiprocessing)"""
-        from src.core.config_manager import ProjectConfig
-        from src.scanner.code_scanner import CodeScanner
-        
-        # Erstelle temporäre Konfiguration (in der Praxis müsste dies anders gelöst werden)
-        config = ProjectConfig()
-        scanner = CodeScanner(config)
-        
-        try:
-            file_path = Path(file_path_str)
-            return scanner.scan_file(file_path)
-        except Exception as e:
-            print(f"Fehler beim Scannen der Datei {file_path_str}: {e}")
-            return None
-    
-    @staticmethod
-    def _scan_doc_file_multiprocess(file_path_str: str) -> Optional[List[DocElement]]:
-        """Scannt eine einzelne Dokumentations-Datei (für Multiprocessing)"""
-        from src.core.config_manager import ProjectConfig
-        from src.scanner.doc_scanner import DocScanner
-        
-        # Erstelle temporäre Konfiguration (in der Praxis müsste dies anders gelöst werden)
-        config = ProjectConfig()
-        scanner = DocScanner(config)
-        
-        try:
-            file_path = Path(file_path_str)
-            return scanner.scan_file(file_path)
-        except Exception as e:
-            print(f"Fehler beim Scannen der Datei {file_path_str}: {e}")
-            return None
+        finally:
+            self.performance_analyzer.record_file(file_path.suffix.lower(), time.perf_counter() - start,
+                                                  str(file_path))
 
 
 class AsyncScanner:
     """Scanner mit asynchroner Verarbeitung"""
     
-    def __init__(self, config: ProjectConfig):
+    def __init__(self, config: ProjectConfig, progress_callback: Optional[ScanProgressCallback] = None):
         self.config = config
+        self.progress_callback = progress_callback or ScanProgressCallback()
         self.code_scanner = CodeScanner(config)
         self.doc_scanner = DocScanner(config)
         self.file_handler = FileHandler(config)
@@ -215,49 +320,47 @@ class AsyncScanner:
         """Scannt das Projekt asynchron"""
         project_path = Path(project_path)
         
-        # Sammle alle zu scannenden Dateien
-        all_files = []
-        scan_paths_list = []
-        
-        for scan_path_str in self.config.scan_paths:
-            scan_path = project_path / scan_path_str
-            if not scan_path.exists():
-                continue
-            scan_paths_list.append(scan_path)
-            
-            # Hole alle relevanten Dateien
-            files = self.file_handler.get_filtered_files(scan_path)
-            all_files.extend(files)
+        # Sammle alle zu scannenden Dateien (ein Verzeichnisdurchlauf pro Scan-Pfad)
+        self.progress_callback.set_stage('discovery')
+        manifests = self.file_handler.build_manifests(project_path)
+        all_files = [entry.path for manifest in manifests for entry in manifest]
         
         print(f"Starte asynchronen Scan von {len(all_files)} Dateien...")
         
         # Gruppiere Dateien nach Typ
         code_files = [f for f in all_files if f.suffix.lower() in ['.py', '.js', '.jsx', '.ts', '.tsx']]
         doc_files = [f for f in all_files if f.suffix.lower() in ['.md', '.rst', '.txt']]
+        self.progress_callback.update_total_directories(len(manifests))
+        self.progress_callback.update_total_files(len(code_files) + len(doc_files))
+        self.progress_callback.set_stage('scan')
         
         # Verarbeite Dateien asynchron
         code_elements = []
         doc_elements = []
         
-        # Verarbeite Code-Dateien asynchron
-        if code_files:
-            code_tasks = [self._scan_code_file_async(f) for f in code_files]
-            code_results = await asyncio.gather(*code_tasks, return_exceptions=True)
-            for result in code_results:
-                if isinstance(result, list):
-                    code_elements.extend(result)
-                elif isinstance(result, Exception):
-                    print(f"Fehler bei asynchronem Scannen: {result}")
-        
-        # Verarbeite Dokumentations-Dateien asynchron
-        if doc_files:
-            doc_tasks = [self._scan_doc_file_async(f) for f in doc_files]
-            doc_results = await asyncio.gather(*doc_tasks, return_exceptions=True)
-            for result in doc_results:
-                if isinstance(result, list):
-                    doc_elements.extend(result)
-                elif isinstance(result, Exception):
-                    print(f"Fehler bei asynchronem Scannen: {result}")
+        try:
+            # Verarbeite Code-Dateien asynchron
+            if code_files:
+                code_tasks = [self._scan_code_file_async(f) for f in code_files]
+                code_results = await asyncio.gather(*code_tasks, return_exceptions=True)
+                for result in code_results:
+                    if isinstance(result, list):
+                        code_elements.extend(result)
+                    elif isinstance(result, Exception):
+                        print(f"Fehler bei asynchronem Scannen: {result}")
+            
+            # Verarbeite Dokumentations-Dateien asynchron
+            if doc_files:
+                doc_tasks = [self._scan_doc_file_async(f) for f in doc_files]
+                doc_results = await asyncio.gather(*doc_tasks, return_exceptions=True)
+                for result in doc_results:
+                    if isinstance(result, list):
+                        doc_elements.extend(result)
+                    elif isinstance(result, Exception):
+                        print(f"Fehler bei asynchronem Scannen: {result}")
+        finally:
+            # Abschlussmeldung wie bei UniversalScanner und ParallelScanner
+            self.progress_callback.finish()
         
         return {
             'code_elements': code_elements,
@@ -267,15 +370,22 @@ class AsyncScanner:
                 'code_files': len(code_elements),
                 'doc_files': len(doc_elements),
                 'project_path': str(project_path)
-            }
+            },
+            'progress_info': self.progress_callback.get_progress_info()
         }
     
     async def _scan_code_file_async(self, file_path: Path) -> Optional[List[CodeElement]]:
         """Scannt eine einzelne Code-Datei asynchron"""
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.code_scanner.scan_file, file_path)
+        try:
+            return await loop.run_in_executor(None, bind_active_analyzer(self.code_scanner.scan_file), file_path)
+        finally:
+            self.progress_callback.scanning_file(file_path)
     
     async def _scan_doc_file_async(self, file_path: Path) -> Optional[List[DocElement]]:
         """Scannt eine einzelne Dokumentations-Datei asynchron"""
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.doc_scanner.scan_file, file_path)
\ No newline at end of file
+        try:
+            return await loop.run_in_executor(None, bind_active_analyzer(self.doc_scanner.scan_file), file_path)
+        finally:
+            self.progress_callback.scanning_file(file_path)
\ No newline at end of file
@@ -0,0 +1,227 @@
+"""
+Gemeinsamer Parse-Kontext: jede Quelldatei wird einmal gelesen, einmal geparst
+und in einem einzigen AST-Durchlauf an alle registrierten Extraktoren verteilt
+"""
+import ast
+import io
+import re
+import time
+import tokenize
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .line_index import LineIndex
+from ..models.element_store import CODE_KIND, ElementStore, emit_element
+from ..utils.content_provider import decode_text, line_spans
+
+
+class ParseContext:
+    """Quelltext, Zeilentabelle und AST einer Datei"""
+
+    def __init__(self, file_path: Path, source: str, data: Optional[bytes] = None,
+                 store: Optional[ElementStore] = None):
+        self.file_path = Path(file_path)
+        self.source = source
+        self.data = data  # Rohe Dateibytes für Byte-Bereiche (lazy_content)
+        self.store = store  # Ziel der Code-Elemente (None: CodeElement-Modelle)
+        self.parse_error: Optional[Exception] = None
+        self._tree: Optional[ast.AST] = None
+        self._parsed = False
+        self._lines: Optional[List[str]] = None
+        self._line_index: Optional[LineIndex] = None
+        self._byte_lines: Optional[Tuple[List[int], List[int]]] = None
+
+    @classmethod
+    def from_file(cls, file_path: Path, data: Optional[bytes] = None,
+                  store: Optional[ElementStore] = None) -> 'ParseContext':
+        """
+        Liest eine Datei und erstellt den Kontext
+
+        Args:
+            file_path: Pfad zur Datei
+            data: Bereits gelesene Dateibytes (die Datei wird dann nicht erneut gelesen)
+            store: ElementStore, in den emit die Code-Elemente schreibt
+
+        Raises:
+            OSError: Wenn die Datei nicht gelesen werden kann
+        """
+        if data is None:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        return cls(file_path, decode_text(data), data, store)
+
+    def emit(self, values: Dict[str, Any]) -> Any:
+        """
+        Gibt ein Code-Element dieser Datei aus
+
+        Ergänzt Datei- und Projektpfad und schreibt die Felder direkt als Zeile in
+        den ElementStore des Kontexts (ElementRow); ohne Speicher wird ein
+        CodeElement erzeugt.
+
+        Args:
+            values: Felder des Elements (Schlüsselwortargumente von CodeElement)
+        """
+        values['file_path'] = str(self.file_path)
+        values['project_path'] = str(self.file_path.parent)
+        return emit_element(CODE_KIND, values, self.store)
+
+    @property
+    def tree(self) -> Optional[ast.AST]:
+        """Python-AST der Datei (wird beim ersten Zugriff genau einmal geparst)"""
+        if not self._parsed:
+            self._parsed = True
+            try:
+                self._tree = ast.parse(self.source)
+            except Exception as e:
+                self.parse_error = e
+        return self._tree
+
+    @property
+    def lines(self) -> List[str]:
+        """Zeilen des Quelltexts"""
+        if self._lines is None:
+            self._lines = self.source.split('\n')
+        return self._lines
+
+    @property
+    def line_index(self) -> LineIndex:
+        """Zeilenindex des Quelltexts für die Zuordnung von Offsets zu Zeilen"""
+        if self._line_index is None:
+            self._line_index = LineIndex(self.source)
+        return self._line_index
+
+    def line_number_at(self, offset: int) -> int:
+        """Gibt die (1-basierte) Zeilennummer eines Zeichen-Offsets zurück"""
+        return self.line_index.line_number(offset)
+
+    def get_lines(self, start_line: int, end_line: int) -> str:
+        """Gibt die Zeilen start_line bis end_line (1-basiert, inklusive) zurück"""
+        return '\n'.join(self.lines[start_line - 1:end_line])
+
+    def line_span(self, start_line: int, end_line: int) -> Tuple[int, int]:
+        """
+        Gibt den Byte-Bereich der Zeilen start_line bis end_line in der Datei zurück
+
+        Der Bereich entspricht get_lines(start_line, end_line), wenn er über den
+        ContentProvider gelesen wird.
+        """
+        if self._byte_lines is None:
+            data = self.data if self.data is not None else self.source.encode('utf-8')
+            self._byte_lines = line_spans(data)
+        starts, ends = self._byte_lines
+        last = len(ends)
+        start_line = min(max(start_line, 1), last)
+        end_line = min(max(end_line, start_line), last)
+        return starts[start_line - 1], ends[end_line - 1]
+
+    def get_header(self, node: ast.AST) -> str:
+        """
+        Gibt den Kopf einer def- oder class-Anweisung ohne Rumpf zurück
+
+        Es werden nur die Zeilen von der def-/class-Zeile bis zum abschließenden
+        Doppelpunkt gelesen; Dekoratoren, Kommentare und der Rumpf entfallen.
+        Mehrzeilige Köpfe werden zu einer Zeile zusammengefasst.
+        """
+        start_line = node.lineno
+        end_line = node.body[0].lineno if getattr(node, 'body', None) else start_line
+        segment = self.get_lines(start_line, max(start_line, end_line))[node.col_offset:]
+
+        parts = []
+        depth = 0
+        try:
+            for token in tokenize.generate_tokens(io.StringIO(segment).readline):
+                if token.type == tokenize.OP:
+                    if token.string in '([{':
+                        depth += 1
+                    elif token.string in ')]}':
+                        depth -= 1
+                    elif token.string == ':' and depth == 0:
+                        break
+                if token.type in (tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE):
+                    continue
+                parts.append(token)
+            else:
+                parts = []
+        except (tokenize.TokenError, SyntaxError):
+            parts = []
+
+        if not parts:
+            # Rückfall: erste Zeile ohne abschließenden Doppelpunkt
+            return self.lines[start_line - 1].strip().rstrip(':')
+        return _join_tokens(parts)
+
+
+_NO_SPACE_AFTER = re.compile(r'[(\[{]$')
+_NO_SPACE_BEFORE = (')', ']', '}', ',')
+
+
+def _join_tokens(tokens: List[tokenize.TokenInfo]) -> str:
+    """Setzt Tokens mit ihren ursprünglichen Abständen innerhalb einer Zeile zusammen"""
+    text = tokens[0].string
+    for previous, token in zip(tokens, tokens[1:]):
+        if token.start[0] == previous.end[0]:
+            text += ' ' * (token.start[1] - previous.end[1])
+        elif not _NO_SPACE_AFTER.search(text) and token.string not in _NO_SPACE_BEFORE:
+            # Zeilenumbruch innerhalb des Kopfs
+            text += ' '
+        text += token.string
+    return text
+
+
+class NodeExtractor:
+    """
+    Basisklasse für Extraktoren, die vom gemeinsamen AST-Durchlauf aufgerufen werden
+
+    node_types legt fest, für welche AST-Knotentypen extract_node aufgerufen wird.
+    """
+
+    node_types: Tuple[type, ...] = ()
+
+    def extract_node(self, node: ast.AST, context: ParseContext) -> List[Any]:
+        """Extrahiert Elemente aus einem AST-Knoten"""
+        return []
+
+
+def dispatch_ast(context: ParseContext, extractors: Sequence[NodeExtractor],
+                 timings: Optional[List[float]] = None) -> List[List[Any]]:
+    """
+    Durchläuft den AST einmal und übergibt jeden Knoten an die zuständigen Extraktoren
+
+    Args:
+        context: Parse-Kontext der Datei
+        extractors: Registrierte Extraktoren
+        timings: Optional eine Liste mit einem Eintrag pro Extraktor, zu dem die
+                 in extract_node verbrachte Zeit (Sekunden) addiert wird
+
+    Returns:
+        Für jeden Extraktor die Liste seiner Elemente in Durchlaufreihenfolge
+        (leer, wenn die Datei nicht geparst werden konnte)
+    """
+    results: List[List[Any]] = [[] for _ in extractors]
+    tree = context.tree
+    if tree is None:
+        return results
+
+    handlers: Dict[type, List[Tuple[List[Any], NodeExtractor]]] = {}
+    for result, extractor in zip(results, extractors):
+        for node_type in extractor.node_types:
+            handlers.setdefault(node_type, []).append((result, extractor))
+
+    if timings is not None:
+        # Eigene Schleife, damit der Durchlauf ohne Messung nicht langsamer wird
+        positions = {id(extractor): index for index, extractor in enumerate(extractors)}
+        perf_counter = time.perf_counter
+        for node in ast.walk(tree):
+            node_handlers = handlers.get(type(node))
+            if node_handlers:
+                for result, extractor in node_handlers:
+                    start = perf_counter()
+                    result.extend(extractor.extract_node(node, context))
+                    timings[positions[id(extractor)]] += perf_counter() - start
+        return results
+
+    for node in ast.walk(tree):
+        node_handlers = handlers.get(type(node))
+        if node_handlers:
+            for result, extractor in node_handlers:
+                result.extend(extractor.extract_node(node, context))
+    return results
@@ -1,9 +1,147 @@
+"""
+Messung der Scan-Performance
+
+Wand- und CPU-Zeit stammen aus time.perf_counter bzw. resource.getrusage
+(ersatzweise time.process_time), der Speicher aus der RSS des Prozesses und
+optional aus den tracemalloc-Spitzenwerten. Zusätzlich werden die Phasen der
+Pipeline (PHASES) einzeln gemessen und die Latenz pro Dateityp als Histogramm
+erfasst. Alle Werte erscheinen in der bisherigen Struktur von get_performance_report.
+
+Ziel von measure_phase und record_phase ist der Analyzer, der im aktuellen
+Kontext (contextvars) aktiv ist: start_timing aktiviert ihn bis stop_timing,
+activate für spätere Abschnitte wie Abgleich und Aktualisierung. Mehrere
+Scanner im selben Prozess (z.B. parallele UI-Sitzungen) schreiben so nicht in
+die Berichte der anderen.
+"""
+import contextvars
 import time
 import os
-import gc
-from pathlib import Path
-from typing import Dict, List, Optional
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
 from dataclasses import dataclass
+from .streaming_stats import QuantileSketch
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+if TYPE_CHECKING:
+    from .scan_profiler import FileProfile, ScanProfiler
+
+# Phasen der Pipeline in Verarbeitungsreihenfolge
+PHASES = ('walk', 'read', 'parse', 'extract', 'framework-parse', 'match', 'embed', 'upsert', 'generate')
+
+# Obergrenzen der Histogramm-Buckets in Millisekunden (der letzte Bucket ist offen)
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 10000)
+
+
+def _cpu_seconds() -> float:
+    """CPU-Zeit (User + System) des Prozesses in Sekunden"""
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return usage.ru_utime + usage.ru_stime
+    return time.process_time()
+
+
+def _children_cpu_seconds() -> float:
+    """CPU-Zeit beendeter Kindprozesse (z.B. Prozess-Pool-Worker) in Sekunden"""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _current_rss_bytes() -> Optional[int]:
+    """Aktuelle RSS des Prozesses (None, wenn nicht ermittelbar)"""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """Höchste RSS des Prozesses seit dem Start (None, wenn nicht ermittelbar)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux meldet Kilobytes, macOS Bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _total_memory_bytes() -> Optional[int]:
+    """Physischer Arbeitsspeicher des Systems (None, wenn nicht ermittelbar)"""
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class LatencyHistogram:
+    """Histogramm der Verarbeitungszeiten mit festen, logarithmisch gestuften Buckets"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def add(self, seconds: float):
+        """Erfasst eine Messung"""
+        milliseconds = seconds * 1000
+        index = 0
+        while index < len(LATENCY_BUCKETS_MS) and milliseconds > LATENCY_BUCKETS_MS[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def quantile_ms(self, q: float) -> float:
+        """
+        Schätzt ein Quantil über die Bucket-Obergrenzen
+
+        Returns:
+            Obergrenze des Buckets, in dem das Quantil liegt (für den offenen
+            letzten Bucket das gemessene Maximum)
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if bucket_count and seen >= rank:
+                if index < len(LATENCY_BUCKETS_MS):
+                    return min(float(LATENCY_BUCKETS_MS[index]), self.max_seconds * 1000)
+                break
+        return self.max_seconds * 1000
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Gibt das Histogramm für den Performance-Bericht zurück"""
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            'files': self.count,
+            'total_seconds': round(self.total_seconds, 6),
+            'mean_ms': round(self.total_seconds * 1000 / self.count, 3) if self.count else 0,
+            'p50_ms': round(self.quantile_ms(0.5), 3),
+            'p95_ms': round(self.quantile_ms(0.95), 3),
+            'max_ms': round(self.max_seconds * 1000, 3),
+            'histogram': {label: count for label, count in zip(labels, self.buckets) if count}
+        }
+
+
+@dataclass
+class PhaseStats:
+    """Summierte Messwerte einer Phase"""
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    calls: int = 0
 
 
 @dataclass
@@ -12,91 +150,288 @@ class PerformanceMetrics:
     start_time: float
     end_time: float
     duration: float
-    cpu_percent: float  # Dies wird jetzt als geschätzter Wert berechnet
-    memory_percent: float  # Dies wird jetzt als geschätzter Wert berechnet
-    memory_used_mb: float
+    cpu_percent: float  # CPU-Zeit / Wandzeit, bezogen auf einen Kern (kann mit Threads 100 übersteigen)
+    memory_percent: float  # RSS bezogen auf den physischen Arbeitsspeicher
+    memory_used_mb: float  # RSS am Ende der Messung
     files_processed: int
-    file_sizes: List[int]
+    file_size_sketch: QuantileSketch  # Dateigrößen ohne Einzelwerte
     directories_scanned: int
     avg_file_size: float
     largest_file: int
     smallest_file: int
+    cpu_seconds: float = 0.0
+    children_cpu_seconds: float = 0.0
+    peak_rss_mb: Optional[float] = None  # Höchste RSS des Prozesses seit dem Start
+    tracemalloc_peak_mb: Optional[float] = None  # Nur bei trace_allocations
+    cpu_count: int = 1
 
 
 class PerformanceAnalyzer:
     """Klasse zur Analyse der Scan-Performance"""
 
-    def __init__(self):
+    def __init__(self, trace_allocations: bool = False):
+        """
+        Args:
+            trace_allocations: Python-Allokationen mit tracemalloc verfolgen
+                               (genauer Spitzenwert, verlangsamt den Scan aber deutlich)
+        """
         self.metrics: Optional[PerformanceMetrics] = None
+        self.trace_allocations = trace_allocations
+        self.phases: Dict[str, PhaseStats] = {}
+        self.file_latencies: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._start_perf = 0.0
+        self._start_cpu = 0.0
+        self._start_children_cpu = 0.0
+        self._owns_tracemalloc = False
+        self._context_token: Optional[contextvars.Token] = None
+        # Profiling-Modus (siehe scan_profiler); erhält die Phasen jeder Datei
+        self.profiler: Optional['ScanProfiler'] = None
 
     def start_timing(self) -> float:
-        """Startet die Zeitmessung"""
+        """
+        Startet die Zeitmessung
+
+        Setzt Phasen und Latenz-Histogramme zurück und macht diesen Analyzer bis
+        stop_timing zum Ziel von measure_phase und record_phase im aktuellen Kontext.
+        """
+        with self._lock:
+            self.phases = {}
+            self.file_latencies = {}
+        if self.trace_allocations:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                self._owns_tracemalloc = True
+        self._start_cpu = _cpu_seconds()
+        self._start_children_cpu = _children_cpu_seconds()
+        self._start_perf = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.start()
+        self._deactivate()
+        self._context_token = _active_analyzer.set(self)
         return time.time()
 
     def stop_timing(self, start_time: float, files_processed: int = 0,
-                   file_sizes: List[int] = None, directories_scanned: int = 0) -> PerformanceMetrics:
-        """Stoppt die Zeitmessung und sammelt Metriken"""
+                   file_sizes: Union[QuantileSketch, List[int], None] = None,
+                   directories_scanned: int = 0) -> PerformanceMetrics:
+        """
+        Stoppt die Zeitmessung und sammelt Metriken
+
+        Args:
+            start_time: Rückgabewert von start_timing
+            files_processed: Anzahl verarbeiteter Elemente
+            file_sizes: Dateigrößen als QuantileSketch (eine Liste wird in einen Sketch übernommen)
+            directories_scanned: Anzahl gescannter Verzeichnisse
+        """
         end_time = time.time()
-        duration = end_time - start_time
+        duration = time.perf_counter() - self._start_perf if self._start_perf else end_time - start_time
+        cpu_seconds = _cpu_seconds() - self._start_cpu
+        if self.profiler is not None:
+            self.profiler.stop()
+        children_cpu_seconds = _children_cpu_seconds() - self._start_children_cpu
+        self._deactivate()
 
-        # Schätzung der CPU-Auslastung basierend auf Dauer und Anzahl verarbeiteter Dateien
-        if duration > 0:
-            # Geschätzte CPU-Last - je mehr Dateien pro Zeit, desto höher die Last
-            estimated_cpu = min(100.0, (files_processed / duration) * 0.1)  # Skalierungsfaktor
-        else:
-            estimated_cpu = 0.0
+        tracemalloc_peak_mb = None
+        if self.trace_allocations and tracemalloc.is_tracing():
+            tracemalloc_peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+                self._owns_tracemalloc = False
 
-        # Speicherberechnung unter Verwendung der Python-interner gc-Statistik
-        # und Schätzung des Dateigrößenverbrauchs
-        import sys
-        memory_allocated_estimate = sum(file_sizes) / (1024 * 1024) if file_sizes else 0  # in MB
+        # CPU-Auslastung wie bei top: CPU-Zeit pro Wandzeit, ein voll ausgelasteter Kern = 100%
+        cpu_percent = (cpu_seconds + children_cpu_seconds) / duration * 100 if duration > 0 else 0.0
 
-        # Annahme: Basis-Speicherbedarf plus Dateiinhalte
-        estimated_memory_mb = memory_allocated_estimate + 10  # Basisbedarf in MB
-        estimated_memory_percent = min(100.0, (estimated_memory_mb / 1024) * 10)  # Schätzung (angenommen 8GB RAM)
+        rss = _current_rss_bytes()
+        peak_rss = _peak_rss_bytes()
+        if rss is None:
+            rss = peak_rss or 0
+        total_memory = _total_memory_bytes()
+        memory_percent = rss / total_memory * 100 if total_memory else 0.0
 
         # Datei-Metriken
-        if file_sizes:
-            avg_file_size = sum(file_sizes) / len(file_sizes) if file_sizes else 0
-            largest_file = max(file_sizes) if file_sizes else 0
-            smallest_file = min(file_sizes) if file_sizes else 0
+        if isinstance(file_sizes, QuantileSketch):
+            size_sketch = file_sizes
         else:
-            avg_file_size = largest_file = smallest_file = 0
+            size_sketch = QuantileSketch()
+            for size in file_sizes or []:
+                size_sketch.add(size)
+        avg_file_size = size_sketch.mean
+        largest_file = size_sketch.max or 0
+        smallest_file = size_sketch.min or 0
 
         self.metrics = PerformanceMetrics(
             start_time=start_time,
             end_time=end_time,
             duration=duration,
-            cpu_percent=estimated_cpu,
-            memory_percent=estimated_memory_percent,
-            memory_used_mb=estimated_memory_mb,
+            cpu_percent=cpu_percent,
+            memory_percent=memory_percent,
+            memory_used_mb=rss / (1024 * 1024),
             files_processed=files_processed,
-            file_sizes=file_sizes or [],
+            file_size_sketch=size_sketch,
             directories_scanned=directories_scanned,
             avg_file_size=avg_file_size,
             largest_file=largest_file,
-            smallest_file=smallest_file
+            smallest_file=smallest_file,
+            cpu_seconds=cpu_seconds,
+            children_cpu_seconds=children_cpu_seconds,
+            peak_rss_mb=peak_rss / (1024 * 1024) if peak_rss else None,
+            tracemalloc_peak_mb=tracemalloc_peak_mb,
+            cpu_count=os.cpu_count() or 1
         )
 
         return self.metrics
-    
+
+    def _deactivate(self):
+        """Beendet die mit start_timing gesetzte Aktivierung im aktuellen Kontext"""
+        token, self._context_token = self._context_token, None
+        if token is None:
+            return
+        try:
+            _active_analyzer.reset(token)
+        except ValueError:
+            # Token aus einem anderen Kontext (z.B. Generator in einem anderen Thread fortgesetzt)
+            if _active_analyzer.get() is self:
+                _active_analyzer.set(None)
+
+    @contextmanager
+    def activate(self) -> Iterator['PerformanceAnalyzer']:
+        """
+        Macht diesen Analyzer für einen Abschnitt zum Ziel von measure_phase und record_phase
+
+        Für Phasen nach dem Scan (match, embed, upsert), die im selben Bericht
+        erscheinen sollen.
+        """
+        token = _active_analyzer.set(self)
+        try:
+            yield self
+        finally:
+            _active_analyzer.reset(token)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Misst Wand- und CPU-Zeit eines Abschnitts und ordnet sie einer Phase zu
+
+        Die CPU-Zeit ist die des ausführenden Threads (time.thread_time); andere
+        Threads eines Thread-Pools werden der Phase also nicht angerechnet.
+
+        Args:
+            name: Name der Phase (siehe PHASES)
+        """
+        start_cpu = time.thread_time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(name, time.perf_counter() - start, time.thread_time() - start_cpu)
+
+    def record_phase(self, name: str, wall_seconds: float, cpu_seconds: float = 0.0, calls: int = 1):
+        """Addiert extern gemessene Zeiten zu einer Phase"""
+        with self._lock:
+            stats = self.phases.get(name)
+            if stats is None:
+                stats = self.phases[name] = PhaseStats()
+            stats.wall_seconds += wall_seconds
+            stats.cpu_seconds += cpu_seconds
+            stats.calls += calls
+        if self.profiler is not None:
+            self.profiler.add_stage(name, wall_seconds)
+
+    def merge_phases(self, phases: Dict[str, PhaseStats]):
+        """Übernimmt die Phasen eines anderen Analyzers (z.B. aus einem Worker-Prozess)"""
+        for name, stats in phases.items():
+            self.record_phase(name, stats.wall_seconds, stats.cpu_seconds, stats.calls)
+
+    def take_phases(self) -> Dict[str, PhaseStats]:
+        """Gibt die bisher gemessenen Phasen zurück und setzt sie zurück"""
+        with self._lock:
+            phases, self.phases = self.phases, {}
+        return phases
+
+    def begin_file(self):
+        """Beginnt die Messung einer Datei im aktuellen Thread (nur im Profiling-Modus relevant)"""
+        if self.profiler is not None:
+            self.profiler.begin_file()
+
+    def record_file(self, file_type: str, seconds: float, file_path: Optional[str] = None):
+        """
+        Erfasst die Verarbeitungszeit einer Datei
+
+        Args:
+            file_type: Dateiendung (z.B. '.py')
+            seconds: Dauer von Lesen bis Extraktion
+            file_path: Pfad der Datei; im Profiling-Modus wird damit die seit
+                       begin_file gemessene Datei abgeschlossen
+        """
+        self._add_latency(file_type, seconds)
+        if self.profiler is not None and file_path is not None:
+            self.profiler.finish_file(file_path, file_type, seconds)
+
+    def add_file_profiles(self, profiles: Iterable['FileProfile']):
+        """Übernimmt in Worker-Prozessen gemessene Dateien"""
+        for profile in profiles:
+            self._add_latency(profile.file_type, profile.seconds)
+            if self.profiler is not None:
+                self.profiler.add_file(profile)
+
+    def _add_latency(self, file_type: str, seconds: float):
+        with self._lock:
+            histogram = self.file_latencies.get(file_type)
+            if histogram is None:
+                histogram = self.file_latencies[file_type] = LatencyHistogram()
+            histogram.add(seconds)
+
+    def get_phase_report(self) -> Dict[str, Dict[str, Any]]:
+        """Gibt die gemessenen Phasen in Pipeline-Reihenfolge zurück"""
+        with self._lock:
+            names = [name for name in PHASES if name in self.phases]
+            names += sorted(name for name in self.phases if name not in PHASES)
+            return {
+                name: {
+                    'wall_seconds': round(self.phases[name].wall_seconds, 6),
+                    'cpu_seconds': round(self.phases[name].cpu_seconds, 6),
+                    'calls': self.phases[name].calls
+                }
+                for name in names
+            }
+
     def get_performance_report(self) -> Dict:
-        """Gibt einen detaillierten Performance-Bericht zurück"""
+        """
+        Gibt einen detaillierten Performance-Bericht zurück
+
+        Phasen, die nach stop_timing gemessen werden (z.B. match, embed, upsert
+        und generate nach dem Scan), erscheinen bei jedem erneuten Aufruf.
+        Im Profiling-Modus enthält der Bericht zusätzlich den Schlüssel profile.
+        """
         if not self.metrics:
             return {"error": "No performance metrics collected yet"}
-        
-        return {
+
+        with self._lock:
+            latency_by_type = {
+                file_type: histogram.as_dict()
+                for file_type, histogram in sorted(self.file_latencies.items())
+            }
+
+        report = {
             "timing": {
                 "start_time": self.metrics.start_time,
                 "end_time": self.metrics.end_time,
                 "duration_seconds": self.metrics.duration,
-                "duration_readable": f"{self.metrics.duration:.2f} seconds"
+                "duration_readable": f"{self.metrics.duration:.2f} seconds",
+                "cpu_seconds": round(self.metrics.cpu_seconds, 6),
+                "children_cpu_seconds": round(self.metrics.children_cpu_seconds, 6),
+                "phases": self.get_phase_report()
             },
             "system_resources": {
-                "cpu_percent": self.metrics.cpu_percent,
-                "memory_percent": self.metrics.memory_percent,
+                "cpu_percent": round(self.metrics.cpu_percent, 2),
+                "cpu_count": self.metrics.cpu_count,
+                "memory_percent": round(self.metrics.memory_percent, 2),
                 "memory_used_mb": round(self.metrics.memory_used_mb, 2),
-                "memory_used_gb": round(self.metrics.memory_used_mb / 1024, 2)
+                "memory_used_gb": round(self.metrics.memory_used_mb / 1024, 2),
+                "peak_rss_mb": round(self.metrics.peak_rss_mb, 2) if self.metrics.peak_rss_mb is not None else None,
+                "tracemalloc_peak_mb": round(self.metrics.tracemalloc_peak_mb, 2) if self.metrics.tracemalloc_peak_mb is not None else None
             },
             "file_processing": {
                 "files_processed": self.metrics.files_processed,
@@ -104,60 +439,122 @@ class PerformanceAnalyzer:
                 "avg_file_size_bytes": round(self.metrics.avg_file_size, 2),
                 "largest_file_bytes": self.metrics.largest_file,
                 "smallest_file_bytes": self.metrics.smallest_file,
-                "total_data_processed_mb": round(sum(self.metrics.file_sizes) / (1024 * 1024), 2) if self.metrics.file_sizes else 0
+                "median_file_size_bytes": round(self.metrics.file_size_sketch.quantile(0.5), 2),
+                "p95_file_size_bytes": round(self.metrics.file_size_sketch.quantile(0.95), 2),
+                "total_data_processed_mb": round(self.metrics.file_size_sketch.total / (1024 * 1024), 2),
+                "latency_by_type": latency_by_type
             },
             "performance_indicators": {
                 "files_per_second": round(self.metrics.files_processed / self.metrics.duration, 2) if self.metrics.duration > 0 else 0,
+                "cpu_utilization": round(self.metrics.cpu_percent / self.metrics.cpu_count, 2),
                 "efficiency_score": self._calculate_efficiency_score()
             }
         }
-    
+        if self.profiler is not None:
+            report["profile"] = self.profiler.get_report()
+        return report
+
     def _calculate_efficiency_score(self) -> float:
         """Berechnet einen Effizienz-Score basierend auf verschiedenen Metriken"""
         if not self.metrics:
             return 0.0
-        
+
         # Berechnung des Effizienz-Scores
         # Je niedriger der Speicher- und CPU-Verbrauch, desto höher der Score
         # Je höher die Verarbeitungsgeschwindigkeit, desto höher der Score
-        
-        # Normiere die Werte auf 0-100 Skala
-        cpu_efficiency = max(0, 100 - self.metrics.cpu_percent)
+
+        # Normiere die Werte auf 0-100 Skala (CPU bezogen auf alle Kerne)
+        cpu_efficiency = max(0, 100 - self.metrics.cpu_percent / self.metrics.cpu_count)
         memory_efficiency = max(0, 100 - self.metrics.memory_percent)
-        
+
         # Geschwindigkeitseffizienz - je höher desto besser
         speed_efficiency = min(100, (self.metrics.files_processed / self.metrics.duration) * 10) if self.metrics.duration > 0 else 0
-        
+
         # Kombiniere die Effizienzen (kann nach Bedarf angepasst werden)
         efficiency_score = (cpu_efficiency * 0.3 + memory_efficiency * 0.3 + speed_efficiency * 0.4)
-        
+
         return round(min(100, efficiency_score), 2)
-    
+
     def print_performance_summary(self):
         """Gibt eine Zusammenfassung der Performance auf der Konsole aus"""
         if not self.metrics:
             print("No performance metrics collected yet")
             return
-        
+
         report = self.get_performance_report()
         timing = report["timing"]
         resources = report["system_resources"]
         processing = report["file_processing"]
         indicators = report["performance_indicators"]
-        
+
         print("\n=== Performance-Zusammenfassung ===")
-        print(f"Dauer: {timing['duration_readable']}")
+        print(f"Dauer: {timing['duration_readable']} (CPU: {timing['cpu_seconds']:.2f} s)")
         print(f"CPU-Auslastung: {resources['cpu_percent']:.2f}%")
         print(f"Speichernutzung: {resources['memory_used_mb']:.2f} MB ({resources['memory_percent']:.2f}%)")
+        if resources['peak_rss_mb'] is not None:
+            print(f"Speicher-Spitze (RSS): {resources['peak_rss_mb']:.2f} MB")
+        if resources['tracemalloc_peak_mb'] is not None:
+            print(f"Speicher-Spitze (tracemalloc): {resources['tracemalloc_peak_mb']:.2f} MB")
         print(f"Dateien verarbeitet: {processing['files_processed']}")
         print(f"Verzeichnisse gescannt: {processing['directories_scanned']}")
         print(f"Durchsatz: {indicators['files_per_second']} Dateien/Sekunde")
         print(f"Effizienz-Score: {indicators['efficiency_score']}/100")
-    
+        for name, stats in timing['phases'].items():
+            print(f"  {name:<16} {stats['wall_seconds']:>9.3f} s  CPU {stats['cpu_seconds']:>8.3f} s  ({stats['calls']}x)")
+
     def save_performance_report(self, output_path: str):
         """Speichert den Performance-Bericht in einer Datei"""
         import json
-        
+
         report = self.get_performance_report()
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False, default=str)
\ No newline at end of file
+            json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+
+
+# Im aktuellen Kontext aktiver Analyzer; Ziel von measure_phase und record_phase
+_active_analyzer: contextvars.ContextVar[Optional[PerformanceAnalyzer]] = contextvars.ContextVar(
+    'daut_active_analyzer', default=None)
+
+
+def get_active_analyzer() -> Optional[PerformanceAnalyzer]:
+    """Gibt den im aktuellen Kontext aktiven Analyzer zurück (start_timing bzw. activate)"""
+    return _active_analyzer.get()
+
+
+def bind_active_analyzer(function: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Bindet eine Funktion an den aktuellen Kontext, z.B. für Thread-Pools
+
+    Threads übernehmen den Kontext des Aufrufers nicht; ohne Bindung würden
+    Phasen in Pool-Threads nicht gemessen. Jeder Aufruf läuft in einer eigenen
+    Kopie des Kontexts und kann daher parallel zu anderen stattfinden.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(function, *args, **kwargs)
+    return run
+
+
+@contextmanager
+def measure_phase(name: str) -> Iterator[None]:
+    """
+    Misst einen Abschnitt für den aktiven Analyzer
+
+    Scanner, Matcher und Updater melden ihre Phasen hierüber, ohne den Analyzer
+    selbst zu kennen. Ohne aktiven Analyzer (z.B. in Prozess-Pool-Workern) wird
+    nichts gemessen.
+    """
+    analyzer = _active_analyzer.get()
+    if analyzer is None:
+        yield
+        return
+    with analyzer.phase(name):
+        yield
+
+
+def record_phase(name: str, wall_seconds: float, cpu_seconds: float = 0.0, calls: int = 1):
+    """Addiert extern gemessene Zeiten zu einer Phase des aktiven Analyzers"""
+    analyzer = _active_analyzer.get()
+    if analyzer is not None:
+        analyzer.record_phase(name, wall_seconds, cpu_seconds, calls)
@@ -1,29 +1,105 @@
-from typing import Callable, Optional
+import threading
+import time
+from typing import Callable, Optional, NamedTuple
 from pathlib import Path
 from typing import List, Dict, Any
 
 
+class ProgressEvent(NamedTuple):
+    """Zusammengefasster Fortschritt einer Phase"""
+    stage: str  # z.B. 'discovery' oder 'scan'
+    current: int
+    total: int
+    description: str
+    elapsed_seconds: float  # Seit Beginn der Phase
+    files_per_second: float
+    eta_seconds: Optional[float]  # None, solange kein Durchsatz bekannt ist
+    final: bool = False
+
+    @property
+    def percentage(self) -> float:
+        """Fortschritt in Prozent"""
+        return (self.current / self.total) * 100 if self.total > 0 else 0.0
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """Formatiert eine Dauer für die Fortschrittsanzeige (z.B. 1:05 oder 0:07)"""
+    if seconds is None:
+        return "?"
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
 class ScanProgressCallback:
     """
     Callback-Klasse zur Verfolgung des Scan-Fortschritts
+
+    Dateien werden einzeln gezählt, gemeldet wird aber gebündelt: ein Ereignis
+    entsteht frühestens nach min_interval Sekunden oder nach batch_size Dateien
+    (Standard: 1% der Gesamtanzahl) sowie immer für die erste und letzte Datei.
+    So bleibt die Zahl der Konsolenausgaben und UI-Aktualisierungen auch bei
+    sehr großen Projekten klein.
     """
-    def __init__(self):
+    def __init__(self, min_interval: float = 0.2, batch_size: Optional[int] = None,
+                 console: bool = True):
+        """
+        Args:
+            min_interval: Mindestabstand zwischen zwei Ereignissen in Sekunden
+            batch_size: Ereignis spätestens nach so vielen Dateien (None: 1% der Gesamtanzahl)
+            console: Fortschritt auf der Konsole ausgeben
+        """
         self.total_directories = 0
         self.directories_scanned = 0
         self.total_files = 0
         self.files_scanned = 0
         self.current_directory = ""
         self.progress_callback: Optional[Callable[[int, int, str], None]] = None
+        self.event_callback: Optional[Callable[[ProgressEvent], None]] = None
+        self.min_interval = min_interval
+        self.batch_size = batch_size
+        self.console = console
+        self.stage = "scan"
+        self.events_emitted = 0
+        self.last_event: Optional[ProgressEvent] = None
+        self._stage_started = time.perf_counter()
+        self._stage_start_count = 0
+        self._last_emit_time = 0.0
+        self._last_emit_count = 0
+        self._last_file: Optional[Path] = None
+        self._lock = threading.Lock()
 
     def set_progress_callback(self, callback: Callable[[int, int, str], None]):
         """
         Setzt die Callback-Funktion zur Fortschrittsanzeige
-        
+
         Args:
             callback: Funktion mit Signatur callback(current, total, description)
         """
         self.progress_callback = callback
 
+    def set_event_callback(self, callback: Callable[[ProgressEvent], None]):
+        """
+        Setzt eine Callback-Funktion, die die gebündelten Ereignisse mit Durchsatz,
+        Restzeit und Phase erhält
+
+        Args:
+            callback: Funktion mit Signatur callback(event)
+        """
+        self.event_callback = callback
+
+    def set_stage(self, stage: str):
+        """Beginnt eine neue Phase; Durchsatz und Restzeit beziehen sich auf die Phase"""
+        with self._lock:
+            self.stage = stage
+            self._stage_started = time.perf_counter()
+            self._stage_start_count = self.files_scanned
+            self._last_emit_time = 0.0
+            self._last_emit_count = self.files_scanned
+
     def update_total_directories(self, count: int):
         """Aktualisiert die Gesamtanzahl der zu scannenden Verzeichnisse"""
         self.total_directories = count
@@ -38,29 +114,86 @@ class ScanProgressCallback:
         self.directories_scanned += 1
         if self.progress_callback:
             self.progress_callback(
-                self.directories_scanned, 
-                self.total_directories, 
+                self.directories_scanned,
+                self.total_directories,
                 f"Scanne Verzeichnis: {directory.name}"
             )
 
     def scanning_file(self, file_path: Path):
-        """Wird aufgerufen, wenn eine Datei gescannt wird"""
-        self.files_scanned += 1
+        """Wird für jede gescannte Datei aufgerufen (seriell vor, parallel nach dem Scannen)"""
+        self.files_completed(1, file_path)
 
-        # Standard-Ausgabe wenn kein Callback gesetzt
-        if self.total_files > 0:
-            percentage = (self.files_scanned / self.total_files) * 100
-            print(f"\r🔍 Scanning: [{self.files_scanned}/{self.total_files}] {percentage:.1f}% - {file_path.name[:50]}", end='', flush=True)
+    def files_completed(self, count: int, last_file: Optional[Path] = None):
+        """
+        Zählt mehrere verarbeitete Dateien auf einmal (z.B. einen Chunk eines Worker-Prozesses)
+
+        Args:
+            count: Anzahl der Dateien
+            last_file: Zuletzt verarbeitete Datei für die Beschreibung
+        """
+        with self._lock:
+            self.files_scanned += count
+            if last_file is not None:
+                self._last_file = Path(last_file)
+            now = time.perf_counter()
+            if not self._should_emit(now):
+                return
+            # Mit der letzten Datei ist die Phase abgeschlossen
+            event = self._create_event(now, final=self.files_scanned >= self.total_files > 0)
+        self._emit(event)
+
+    def finish(self):
+        """Meldet den abschließenden Stand der Phase (auch wenn zuletzt gedrosselt wurde)"""
+        with self._lock:
+            if self.last_event is not None and self.last_event.final \
+                    and self.last_event.current == self.files_scanned and self.last_event.stage == self.stage:
+                return
+            event = self._create_event(time.perf_counter(), final=True)
+        self._emit(event)
+        if self.console and self.total_files > 0:
+            print()
+
+    def _should_emit(self, now: float) -> bool:
+        """Entscheidet, ob der aktuelle Stand gemeldet wird"""
+        pending = self.files_scanned - self._last_emit_count
+        if self.events_emitted == 0 or self.files_scanned >= self.total_files > 0:
+            return True
+        batch_size = self.batch_size or max(1, self.total_files // 100)
+        since_last = now - self._last_emit_time
+        # Genug neue Dateien und Mindestabstand erreicht; bei langsamen Scans spätestens nach 5 Intervallen
+        return (pending >= batch_size and since_last >= self.min_interval) or since_last >= self.min_interval * 5
+
+    def _create_event(self, now: float, final: bool) -> ProgressEvent:
+        elapsed = now - self._stage_started
+        done = self.files_scanned
+        rate = (done - self._stage_start_count) / elapsed if elapsed > 0 else 0.0
+        remaining = max(0, self.total_files - done)
+        eta = remaining / rate if rate > 0 else None
+        name = self._last_file.name if self._last_file is not None else ""
+        self._last_emit_time = now
+        self._last_emit_count = done
+        self.events_emitted += 1
+        event = ProgressEvent(self.stage, done, self.total_files, f"Scanne Datei: {name}",
+                              elapsed, rate, eta, final)
+        self.last_event = event
+        return event
+
+    def _emit(self, event: ProgressEvent):
+        """Gibt ein Ereignis auf der Konsole aus und reicht es an die Callbacks weiter"""
+        if self.console and event.total > 0:
+            name = self._last_file.name[:50] if self._last_file is not None else ""
+            print(f"\r🔍 Scanning: [{event.current}/{event.total}] {event.percentage:.1f}% "
+                  f"- {event.files_per_second:.0f} Dateien/s - ETA {format_duration(event.eta_seconds)} - {name}",
+                  end='', flush=True)
 
         if self.progress_callback:
-            self.progress_callback(
-                self.files_scanned,
-                self.total_files,
-                f"Scanne Datei: {file_path.name}"
-            )
+            self.progress_callback(event.current, event.total, event.description)
+        if self.event_callback:
+            self.event_callback(event)
 
     def get_progress_info(self) -> Dict[str, Any]:
         """Gibt Informationen über den aktuellen Fortschritt zurück"""
+        event = self.last_event
         return {
             'directories_scanned': self.directories_scanned,
             'total_directories': self.total_directories,
@@ -68,5 +201,9 @@ class ScanProgressCallback:
             'total_files': self.total_files,
             'current_directory': self.current_directory,
             'directory_percentage': (self.directories_scanned / max(1, self.total_directories)) * 100,
-            'file_percentage': (self.files_scanned / max(1, self.total_files)) * 100
-        }
\ No newline at end of file
+            'file_percentage': (self.files_scanned / max(1, self.total_files)) * 100,
+            'stage': self.stage,
+            'files_per_second': event.files_per_second if event else 0.0,
+            'eta_seconds': event.eta_seconds if event else None,
+            'events_emitted': self.events_emitted
+        }
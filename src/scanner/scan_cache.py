@@ -0,0 +1,243 @@
+"""
+Persistenter, inkrementeller Scan-Cache für den UniversalScanner
+"""
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import List, Optional, Any, Iterable
+from src.models.element import CodeElement, DocElement
+from src.models.element_store import CODE_KIND, DOC_KIND, RAW_KIND, ElementRow, ElementStore
+
+# Bei Änderungen an der Extraktionslogik erhöhen, damit alte Einträge verworfen werden
+CACHE_VERSION = 4
+CACHE_DIR_NAME = ".daut_cache"
+# Inhalt der .gitignore im Cache-Verzeichnis (wie bei .pytest_cache), damit der Cache
+# in gescannten Repositories nicht als unversionierte Datei auftaucht
+CACHE_GITIGNORE = "# Automatisch von DAUT erstellt.\n*\n"
+
+
+def compute_content_hash(data: bytes) -> str:
+    """
+    Berechnet den Inhalts-Hash einer Datei
+
+    Das Format entspricht einer Git-Blob-ID, sodass Hashes aus dem Git-Index
+    direkt mit den hier berechneten Werten vergleichbar sind.
+    """
+    header = f"blob {len(data)}\0".encode('ascii')
+    return hashlib.sha1(header + data).hexdigest()
+
+
+def hash_file(file_path: Path) -> Optional[str]:
+    """Berechnet den Inhalts-Hash einer Datei auf der Festplatte"""
+    try:
+        with open(file_path, 'rb') as f:
+            return compute_content_hash(f.read())
+    except OSError:
+        return None
+
+
+def _unchanged(file_path: Path, size: int, mtime_ns: int) -> bool:
+    """Prüft, ob Größe und mtime einer Datei noch den angegebenen Werten entsprechen"""
+    try:
+        stat = Path(file_path).stat()
+    except OSError:
+        return False
+    return stat.st_size == size and stat.st_mtime_ns == mtime_ns
+
+
+def prepare_cache_dir(cache_dir: Path) -> Path:
+    """
+    Legt ein Cache-Verzeichnis an und schließt es über eine eigene .gitignore von Git aus
+
+    Args:
+        cache_dir: Verzeichnis für Cache-Datenbanken
+
+    Returns:
+        Das Verzeichnis als Path
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    gitignore = cache_dir / ".gitignore"
+    if not gitignore.exists():
+        try:
+            gitignore.write_text(CACHE_GITIGNORE, encoding="utf-8")
+        except OSError as e:
+            print(f"Warnung: .gitignore im Cache-Verzeichnis {cache_dir} nicht schreibbar: {e}")
+    return cache_dir
+
+
+def _model_to_dict(element) -> dict:
+    """Serialisiert ein Pydantic-Modell (kompatibel mit Pydantic v1 und v2)"""
+    if hasattr(element, 'model_dump'):
+        return element.model_dump()
+    return element.dict()
+
+
+class ScanCache:
+    """
+    Speichert die extrahierten Elemente jeder Datei in einer SQLite-Datenbank
+
+    Einträge sind über Pfad, mtime, Größe und Inhalts-Hash abgesichert:
+    Stimmen mtime und Größe, wird der Eintrag ohne Lesen der Datei verwendet.
+    Hat sich nur die mtime geändert, entscheidet der Inhalts-Hash.
+    """
+
+    def __init__(self, project_path: Path, cache_dir: Optional[Path] = None, fingerprint: str = ""):
+        """
+        Initialisiert den Scan-Cache
+
+        Args:
+            project_path: Wurzelverzeichnis des Projekts
+            cache_dir: Verzeichnis für die Cache-Datenbank (Standard: <projekt>/.daut_cache)
+            fingerprint: Kennung der Scan-Konfiguration; bei Abweichung wird der Cache geleert
+        """
+        self.project_path = Path(project_path)
+        self.cache_dir = prepare_cache_dir(cache_dir if cache_dir else self.project_path / CACHE_DIR_NAME)
+        self.db_path = self.cache_dir / "scan_cache.sqlite"
+        self.fingerprint = f"{CACHE_VERSION}:{fingerprint}"
+
+        self.hits = 0
+        self.misses = 0
+
+        self.connection = sqlite3.connect(str(self.db_path))
+        self._init_schema()
+
+    def _init_schema(self):
+        """Legt die Tabellen an und verwirft den Cache bei geänderter Konfiguration"""
+        cursor = self.connection.cursor()
+        cursor.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, "
+            "content_hash TEXT, elements TEXT)"
+        )
+        row = cursor.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        if row is None or row[0] != self.fingerprint:
+            cursor.execute("DELETE FROM files")
+            cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)",
+                           (self.fingerprint,))
+        self.connection.commit()
+
+    def lookup(self, file_path: Path, size: int, mtime_ns: int,
+               content_hash: Optional[str] = None, store: Optional[ElementStore] = None) -> Optional[List[Any]]:
+        """
+        Liefert die gecachten Elemente einer Datei oder None bei einem Cache-Miss
+
+        Args:
+            file_path: Pfad zur Datei
+            size: Aktuelle Dateigröße in Bytes
+            mtime_ns: Aktuelle Änderungszeit in Nanosekunden
+            content_hash: Bereits bekannter Inhalts-Hash, z.B. die Blob-ID aus dem Git-Index
+            store: ElementStore, in den die Elemente ohne Pydantic-Modelle geschrieben werden
+        """
+        key = str(file_path)
+        row = self.connection.execute(
+            "SELECT mtime_ns, size, content_hash, elements FROM files WHERE path = ?", (key,)
+        ).fetchone()
+
+        if row is None or row[1] != size:
+            self.misses += 1
+            return None
+
+        cached_mtime, _, cached_hash, payload = row
+        if cached_mtime != mtime_ns:
+            # mtime geändert (z.B. durch git checkout), Inhalt kann trotzdem identisch sein
+            if (content_hash or hash_file(file_path)) != cached_hash:
+                self.misses += 1
+                return None
+            self.connection.execute("UPDATE files SET mtime_ns = ? WHERE path = ?", (mtime_ns, key))
+
+        self.hits += 1
+        return self._deserialize_elements(payload, store)
+
+    def known_hash(self, file_path: Path, size: int, mtime_ns: int) -> Optional[str]:
+        """Gibt den gespeicherten Inhalts-Hash zurück, wenn Größe und mtime unverändert sind"""
+        row = self.connection.execute(
+            "SELECT mtime_ns, size, content_hash FROM files WHERE path = ?", (str(file_path),)
+        ).fetchone()
+        if row is None or row[0] != mtime_ns or row[1] != size:
+            return None
+        return row[2]
+
+    def store(self, file_path: Path, elements: List[Any], size: int, mtime_ns: int,
+              content_hash: Optional[str] = None):
+        """
+        Speichert die Elemente einer Datei im Cache
+
+        Args:
+            file_path: Pfad zur Datei
+            elements: Extrahierte Elemente (CodeElement, DocElement oder Framework-Dicts)
+            size: Dateigröße vor dem Scannen
+            mtime_ns: Änderungszeit vor dem Scannen
+            content_hash: Hash der gescannten Bytes; ohne Hash wird die Datei erneut gelesen und
+                          der Eintrag verworfen, falls sie sich seit size/mtime_ns geändert hat
+        """
+        if content_hash is None:
+            content_hash = hash_file(file_path)
+            if content_hash is None or not _unchanged(file_path, size, mtime_ns):
+                return
+        self.connection.execute(
+            "INSERT OR REPLACE INTO files (path, mtime_ns, size, content_hash, elements) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (str(file_path), mtime_ns, size, content_hash, self._serialize_elements(elements))
+        )
+
+    def prune(self, seen_paths: Iterable[str]):
+        """Entfernt Einträge für Dateien, die im aktuellen Scan nicht mehr vorkamen"""
+        seen = set(seen_paths)
+        stale = [(path,) for (path,) in self.connection.execute("SELECT path FROM files")
+                 if path not in seen]
+        if stale:
+            self.connection.executemany("DELETE FROM files WHERE path = ?", stale)
+
+    def commit(self):
+        """Schreibt ausstehende Änderungen in die Datenbank"""
+        self.connection.commit()
+
+    def close(self):
+        """Schreibt ausstehende Änderungen und schließt die Datenbank"""
+        self.connection.commit()
+        self.connection.close()
+
+    def get_statistics(self) -> dict:
+        """Gibt Trefferstatistiken des Caches zurück"""
+        total = self.hits + self.misses
+        return {
+            'cache_hits': self.hits,
+            'cache_misses': self.misses,
+            'hit_rate': (self.hits / total * 100) if total else 0.0,
+            'cache_path': str(self.db_path)
+        }
+
+    def _serialize_elements(self, elements: List[Any]) -> str:
+        """Serialisiert Elemente als JSON mit Typkennung"""
+        payload = []
+        for element in elements:
+            if isinstance(element, ElementRow):
+                kind = {CODE_KIND: 'code', DOC_KIND: 'doc', RAW_KIND: 'raw'}[element.kind]
+                payload.append([kind, element.as_dict()])
+            elif isinstance(element, CodeElement):
+                payload.append(['code', _model_to_dict(element)])
+            elif isinstance(element, DocElement):
+                payload.append(['doc', _model_to_dict(element)])
+            else:
+                # Framework-Parser liefern einfache Dictionaries
+                payload.append(['raw', element])
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+    def _deserialize_elements(self, payload: str, store: Optional[ElementStore] = None) -> List[Any]:
+        """Stellt Elemente aus dem JSON-Format wieder her (mit store als Zeilen des Speichers)"""
+        if store is not None:
+            kinds = {'code': CODE_KIND, 'doc': DOC_KIND}
+            return [store.row(store.append(kinds[kind], data) if kind in kinds else store.add(data))
+                    for kind, data in json.loads(payload)]
+        elements = []
+        for kind, data in json.loads(payload):
+            if kind == 'code':
+                elements.append(CodeElement(**data))
+            elif kind == 'doc':
+                elements.append(DocElement(**data))
+            else:
+                elements.append(data)
+        return elements
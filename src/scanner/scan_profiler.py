@@ -0,0 +1,275 @@
+"""
+Profiling-Modus des Scanners
+
+Im Modus "files" wird jede Datei durch alle Phasen (read, parse, extract, ...)
+gemessen; der Bericht nennt die langsamsten Dateien insgesamt und pro Phase,
+um pathologische Eingaben wie minifizierte Bundles oder riesige Markdown-Dateien
+zu finden. Im Modus "sampling" läuft zusätzlich ein Stichproben-Profiler über den
+gesamten Scan, dessen Stacks im gefalteten Format (flamegraph.pl, speedscope)
+gespeichert werden können.
+"""
+import heapq
+import itertools
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+from .performance_analyzer import PHASES
+
+PROFILING_MODES = ('off', 'files', 'sampling')
+
+
+class FileProfile(NamedTuple):
+    """Gemessene Zeiten einer Datei"""
+    file_path: str
+    file_type: str
+    seconds: float
+    stages: Dict[str, float]  # Phase -> Wandzeit in Sekunden
+
+
+class StackSampler:
+    """
+    Stichproben-Profiler auf Basis von sys._current_frames
+
+    Ein Hintergrund-Thread liest in festen Abständen die Stacks aller anderen
+    Threads und zählt sie; der Thread-Name bildet jeweils den obersten Frame.
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 128):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._labels: Dict[Any, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Startet die Stichprobennahme"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="daut-stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Beendet die Stichprobennahme"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self._sample(own_ident)
+
+    def _sample(self, own_ident: int):
+        """Zählt den aktuellen Stack jedes Threads"""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def _label(self, code) -> str:
+        """Gibt die Bezeichnung eines Frames zurück (funktion (datei.py:zeile))"""
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def write_folded(self, output_path: str):
+        """
+        Speichert die Stacks im gefalteten Format ("frame;frame;frame anzahl")
+
+        Die Datei lässt sich mit flamegraph.pl, speedscope oder inferno darstellen.
+        """
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class ScanProfiler:
+    """Misst jede Datei durch alle Phasen und behält die langsamsten"""
+
+    def __init__(self, top_n: int = 20, sampling: bool = False, sample_interval: float = 0.005,
+                 record_all: bool = False):
+        """
+        Args:
+            top_n: Anzahl der langsamsten Dateien im Bericht (insgesamt und pro Phase)
+            sampling: Zusätzlich den Stichproben-Profiler ausführen
+            sample_interval: Abstand der Stichproben in Sekunden
+            record_all: Alle Dateiprofile für take_records behalten (Worker-Prozesse)
+        """
+        self.top_n = top_n
+        self.sampler = StackSampler(sample_interval) if sampling else None
+        self.record_all = record_all
+        self.files_profiled = 0
+        self._records: List[FileProfile] = []
+        self._slowest_files: List[Any] = []
+        self._slowest_by_stage: Dict[str, List[Any]] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def start(self):
+        """Setzt die Messwerte zurück und startet ggf. den Stichproben-Profiler"""
+        with self._lock:
+            self.files_profiled = 0
+            self._records = []
+            self._slowest_files = []
+            self._slowest_by_stage = {}
+        if self.sampler:
+            self.sampler.stacks.clear()
+            self.sampler.samples = 0
+            self.sampler.start()
+
+    def stop(self):
+        """Beendet den Stichproben-Profiler"""
+        if self.sampler:
+            self.sampler.stop()
+
+    def begin_file(self):
+        """Beginnt die Messung einer Datei im aktuellen Thread"""
+        self._local.stages = {}
+
+    def add_stage(self, name: str, seconds: float):
+        """Ordnet eine gemessene Phase der aktuellen Datei des Threads zu"""
+        stages = getattr(self._local, 'stages', None)
+        if stages is not None:
+            stages[name] = stages.get(name, 0.0) + seconds
+
+    def finish_file(self, file_path: str, file_type: str, seconds: float) -> FileProfile:
+        """Schließt die Messung der aktuellen Datei des Threads ab"""
+        stages = getattr(self._local, 'stages', None) or {}
+        self._local.stages = None
+        profile = FileProfile(str(file_path), file_type, seconds, stages)
+        self.add_file(profile)
+        return profile
+
+    def add_file(self, profile: FileProfile):
+        """Übernimmt ein Dateiprofil (auch aus Worker-Prozessen)"""
+        with self._lock:
+            self.files_profiled += 1
+            if self.record_all:
+                self._records.append(profile)
+            if self.top_n <= 0:
+                return
+            order = next(self._counter)
+            self._push(self._slowest_files, (profile.seconds, order, profile))
+            for stage, seconds in profile.stages.items():
+                heap = self._slowest_by_stage.setdefault(stage, [])
+                self._push(heap, (seconds, order, profile.file_path))
+
+    def _push(self, heap: List[Any], item: Any):
+        """Behält die top_n größten Einträge in einem Min-Heap"""
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, item)
+        elif item[0] > heap[0][0]:
+            heapq.heapreplace(heap, item)
+
+    def take_records(self) -> List[FileProfile]:
+        """Gibt die seit dem letzten Aufruf gesammelten Dateiprofile zurück (record_all)"""
+        with self._lock:
+            records, self._records = self._records, []
+        return records
+
+    def get_report(self) -> Dict[str, Any]:
+        """Gibt die langsamsten Dateien insgesamt und pro Phase zurück"""
+        with self._lock:
+            slowest_files = [
+                {
+                    'file_path': profile.file_path,
+                    'file_type': profile.file_type,
+                    'seconds': round(profile.seconds, 6),
+                    'stages': {stage: round(seconds, 6) for stage, seconds in profile.stages.items()}
+                }
+                for _, _, profile in sorted(self._slowest_files, reverse=True)
+            ]
+            stages = [stage for stage in PHASES if stage in self._slowest_by_stage]
+            stages += sorted(stage for stage in self._slowest_by_stage if stage not in PHASES)
+            slowest_stages = {
+                stage: [
+                    {'file_path': file_path, 'seconds': round(seconds, 6)}
+                    for seconds, _, file_path in sorted(self._slowest_by_stage[stage], reverse=True)
+                ]
+                for stage in stages
+            }
+            files_profiled = self.files_profiled
+
+        sampling = None
+        if self.sampler:
+            sampling = {
+                'samples': self.sampler.samples,
+                'interval_ms': self.sampler.interval * 1000,
+                'distinct_stacks': len(self.sampler.stacks)
+            }
+        return {
+            'mode': 'sampling' if self.sampler else 'files',
+            'files_profiled': files_profiled,
+            'slowest_files': slowest_files,
+            'slowest_stages': slowest_stages,
+            'sampling': sampling
+        }
+
+    def write_profile(self, output_path: str) -> bool:
+        """
+        Speichert die Stacks des Stichproben-Profilers im gefalteten Format
+
+        Returns:
+            True, wenn eine Datei geschrieben wurde
+        """
+        if not self.sampler:
+            return False
+        try:
+            self.sampler.write_folded(output_path)
+        except OSError as e:
+            print(f"Warnung: Profil konnte nicht gespeichert werden: {e}")
+            return False
+        return True
+
+    def finish(self, output_path: Optional[str] = None):
+        """Gibt den Bericht auf der Konsole aus und speichert ggf. das Profil"""
+        self.print_report()
+        if output_path and self.write_profile(output_path):
+            print(f"Profil gespeichert: {output_path}")
+
+    def print_report(self):
+        """Gibt die langsamsten Dateien und Phasen auf der Konsole aus"""
+        report = self.get_report()
+        print(f"\n=== Profil: langsamste Dateien ({report['files_profiled']} gemessen) ===")
+        for entry in report['slowest_files']:
+            stages = ", ".join(f"{stage} {seconds * 1000:.1f} ms" for stage, seconds in entry['stages'].items())
+            print(f"{entry['seconds'] * 1000:>10.1f} ms  {entry['file_path']}  ({stages})")
+        for stage, entries in report['slowest_stages'].items():
+            if entries:
+                slowest = entries[0]
+                print(f"Langsamste Datei in {stage}: {slowest['file_path']} ({slowest['seconds'] * 1000:.1f} ms)")
+        if report['sampling']:
+            print(f"Stichproben: {report['sampling']['samples']}")
+
+
+def create_profiler(config: Any) -> Optional[ScanProfiler]:
+    """
+    Erstellt den Profiler entsprechend config.profiling
+
+    Returns:
+        ScanProfiler oder None, wenn das Profiling abgeschaltet ist
+    """
+    mode = getattr(config, 'profiling', 'off')
+    if mode not in PROFILING_MODES:
+        print(f"Warnung: Unbekannter Profiling-Modus '{mode}', Profiling bleibt abgeschaltet")
+        return None
+    if mode == 'off':
+        return None
+    return ScanProfiler(top_n=getattr(config, 'profile_top_n', 20), sampling=mode == 'sampling')
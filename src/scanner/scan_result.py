@@ -0,0 +1,77 @@
+"""
+Ergebnisse eines gestreamten Projekt-Scans
+
+scan_project_iter liefert für jede eingeschlossene Datei ein FileScanResult;
+die laufende Zusammenfassung wird dabei in einer ScanSummary fortgeschrieben.
+"""
+from typing import Any, Dict, List, NamedTuple, Optional
+
+CODE_FILE = 'code'
+DOC_FILE = 'doc'
+
+
+class FileScanResult(NamedTuple):
+    """Elemente einer gescannten Datei"""
+    file_path: str
+    file_type: str  # CODE_FILE oder DOC_FILE
+    elements: List[Any]
+    from_cache: bool = False
+    content_hash: Optional[str] = None  # Nur gesetzt, wenn weitere Dateien denselben Inhalt haben
+    duplicate_of: Optional[str] = None  # Erste Datei mit identischem Inhalt, deren Elemente übernommen wurden
+
+    @property
+    def is_code(self) -> bool:
+        """Gibt an, ob es sich um eine Code-Datei handelt"""
+        return self.file_type == CODE_FILE
+
+
+class ScanSummary:
+    """Laufende Zusammenfassung eines Scans, wird nach jeder Datei aktualisiert"""
+
+    def __init__(self, project_path: str, framework_used: Optional[str] = None):
+        self.project_path = project_path
+        self.framework_used = framework_used
+        self.code_files = 0
+        self.doc_files = 0
+        self.code_elements = 0
+        self.doc_elements = 0
+        self.cached_files = 0
+        self.duplicate_files = 0
+        self.ignored_files = 0
+        self.cache_statistics: Optional[Dict[str, Any]] = None
+        self.completed = False
+
+    def add(self, result: FileScanResult) -> None:
+        """Zählt die Elemente einer gescannten Datei"""
+        if result.is_code:
+            self.code_files += 1
+            self.code_elements += len(result.elements)
+        else:
+            self.doc_files += 1
+            self.doc_elements += len(result.elements)
+        if result.from_cache:
+            self.cached_files += 1
+        if result.duplicate_of:
+            self.duplicate_files += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Gibt die Zusammenfassung im Format von scan_summary zurück
+
+        total_files_scanned, code_files und doc_files zählen wie bisher die Elemente;
+        die Dateianzahlen stehen unter files_with_code und files_with_docs.
+        """
+        return {
+            'total_files_scanned': self.code_elements + self.doc_elements,
+            'code_files': self.code_elements,
+            'doc_files': self.doc_elements,
+            'files_with_code': self.code_files,
+            'files_with_docs': self.doc_files,
+            'files_from_cache': self.cached_files,
+            'duplicate_files': self.duplicate_files,
+            'files_ignored': self.ignored_files,
+            'project_path': self.project_path,
+            'framework_used': self.framework_used,
+            'cache': self.cache_statistics,
+            'completed': self.completed
+        }
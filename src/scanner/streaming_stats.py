@@ -0,0 +1,186 @@
+"""
+Streaming-Statistiken mit beschränktem Speicherbedarf
+
+QuantileSketch schätzt Quantile (z.B. von Dateigrößen) mit fester relativer
+Genauigkeit über logarithmische Buckets; ReservoirSample behält eine
+gleichverteilte Stichprobe fester Größe. Beide lassen sich zusammenführen,
+sodass Worker eigene Aggregate bilden und der Elternprozess sie nur addiert.
+"""
+import math
+import random
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class QuantileSketch:
+    """
+    Mergebarer Quantil-Sketch für nicht-negative Werte
+
+    Jeder Wert wird einem Bucket [gamma^(i-1), gamma^i) zugeordnet; die Schätzung
+    eines Quantils weicht damit höchstens um relative_accuracy vom wahren Wert ab.
+    Die Anzahl der Buckets wächst nur logarithmisch mit dem Wertebereich
+    (bei 1% Genauigkeit etwa 1200 Buckets für 1 Byte bis 10 GB).
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Args:
+            relative_accuracy: Maximale relative Abweichung der Quantile (0 < x < 1)
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy muss zwischen 0 und 1 liegen")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float, count: int = 1):
+        """Fügt einen Wert (count-mal) hinzu"""
+        if value < 0:
+            raise ValueError("QuantileSketch unterstützt nur nicht-negative Werte")
+        if value == 0:
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: 'QuantileSketch'):
+        """Übernimmt die Werte eines anderen Sketches mit gleicher Genauigkeit"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Sketches mit unterschiedlicher Genauigkeit können nicht zusammengeführt werden")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """
+        Schätzt ein Quantil
+
+        Args:
+            q: Quantil zwischen 0 und 1 (0.5 = Median)
+
+        Returns:
+            Geschätzter Wert oder 0, wenn der Sketch leer ist
+        """
+        if not self.count:
+            return 0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Mittelpunkt des Buckets mit minimalem relativen Fehler
+                estimate = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        """Mittelwert (exakt)"""
+        return self.total / self.count if self.count else 0
+
+    def as_dict(self, quantiles=(0.5, 0.9, 0.99)) -> Dict[str, Any]:
+        """Gibt Anzahl, Summe, Extremwerte und die gewünschten Quantile zurück"""
+        result = {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.mean,
+            'min': self.min or 0,
+            'max': self.max or 0
+        }
+        for q in quantiles:
+            result[f"p{q * 100:g}"] = self.quantile(q)
+        return result
+
+
+class ReservoirSample:
+    """
+    Gleichverteilte Stichprobe fester Größe aus einem Datenstrom (Algorithmus R)
+
+    Iteration, len() und "in" beziehen sich auf die Stichprobe; seen zählt alle
+    hinzugefügten Elemente.
+    """
+
+    def __init__(self, capacity: int = 1000, seed: Optional[int] = 0):
+        """
+        Args:
+            capacity: Maximale Anzahl behaltener Elemente
+            seed: Seed für reproduzierbare Stichproben (None: zufällig)
+        """
+        self.capacity = capacity
+        self.seen = 0
+        self.items: List[Any] = []
+        self._random = random.Random(seed)
+
+    def add(self, item: Any):
+        """Fügt ein Element des Datenstroms hinzu"""
+        self.seen += 1
+        if len(self.items) < self.capacity:
+            self.items.append(item)
+            return
+        slot = self._random.randrange(self.seen)
+        if slot < self.capacity:
+            self.items[slot] = item
+
+    def merge(self, other: 'ReservoirSample'):
+        """
+        Führt eine Stichprobe eines anderen Datenstroms hinzu
+
+        Das Ergebnis ist wieder eine gleichverteilte Stichprobe der Vereinigung:
+        Jeder Platz wird aus einer der beiden Stichproben gezogen, gewichtet mit der
+        Zahl der dort noch nicht gezogenen Elemente des jeweiligen Datenstroms.
+        """
+        if not other.seen:
+            return
+        if self.seen + other.seen <= self.capacity:
+            self.items.extend(other.items)
+            self.seen += other.seen
+            return
+
+        own_pool, other_pool = list(self.items), list(other.items)
+        own_remaining, other_remaining = self.seen, other.seen
+        merged = []
+        while len(merged) < self.capacity and (own_pool or other_pool):
+            take_own = other_remaining == 0 or not other_pool or (
+                own_pool and self._random.randrange(own_remaining + other_remaining) < own_remaining)
+            pool = own_pool if take_own else other_pool
+            merged.append(pool.pop(self._random.randrange(len(pool))))
+            if take_own:
+                own_remaining -= 1
+            else:
+                other_remaining -= 1
+        self.items = merged
+        self.seen += other.seen
+
+    @property
+    def is_complete(self) -> bool:
+        """True, solange die Stichprobe alle Elemente enthält"""
+        return self.seen <= self.capacity
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self.items
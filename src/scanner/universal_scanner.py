@@ -1,16 +1,24 @@
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Iterator
 import os
+import time
 import mimetypes
 from .code_scanner import CodeScanner
 from .doc_scanner import DocScanner
 from .file_handler import FileHandler
 from .file_analyzer import FileAnalyzer
-from .performance_analyzer import PerformanceAnalyzer
+from .file_manifest import FileEntry
+from .performance_analyzer import PerformanceAnalyzer, measure_phase
+from .scan_profiler import create_profiler
+from .streaming_stats import QuantileSketch
 from .progress_callback import ScanProgressCallback
 from .framework_parsers import get_framework_parser
-from .parallel_scanner import ParallelScanner
+from .parallel_scanner import ParallelScanner, CODE_EXTENSIONS, DOC_EXTENSIONS
+from .scan_cache import ScanCache, compute_content_hash, hash_file
+from .content_dedup import DuplicateIndex
+from .scan_result import FileScanResult, ScanSummary, CODE_FILE, DOC_FILE
 from src.core.config_manager import ProjectConfig
+from src.models.element_store import ElementStore
 
 class UniversalScanner:
     def __init__(self, config: ProjectConfig, progress_callback: Optional[ScanProgressCallback] = None):
@@ -19,39 +27,102 @@ class UniversalScanner:
         self.doc_scanner = DocScanner(config)
         self.file_handler = FileHandler(config)
         self.file_analyzer = FileAnalyzer()
-        self.performance_analyzer = PerformanceAnalyzer()
+        self.performance_analyzer = PerformanceAnalyzer(
+            trace_allocations=getattr(config, 'trace_allocations', False))
+        self.performance_analyzer.profiler = create_profiler(config)
         self.progress_callback = progress_callback or ScanProgressCallback()
+        self.scan_summary: Optional[ScanSummary] = None
     
     def scan_project(self, project_path: str) -> Dict[str, Any]:
-        """Scannt das gesamte Projekt und gibt alle gefundenen Elemente zurück"""
+        """
+        Scannt das gesamte Projekt und gibt alle gefundenen Elemente zurück
+
+        content_hashes enthält den Inhalts-Hash jeder Datei, die Kopien mit identischem
+        Inhalt hat; der ChromaUpdater bettet deren Elemente nur einmal ein.
+        """
+        code_elements = []
+        doc_elements = []
+        content_hashes = {}
+        for result in self.scan_project_iter(project_path):
+            if result.content_hash:
+                content_hashes[result.file_path] = result.content_hash
+            if result.is_code:
+                code_elements.extend(result.elements)
+            else:
+                doc_elements.extend(result.elements)
+
+        # Abschlussmeldung
+        print(f"\n\n{'='*60}")
+        print(f"✅ Scan abgeschlossen!")
+        print(f"{'='*60}")
+        print(f"📊 Gefunden:")
+        print(f"   • Code-Elemente:   {len(code_elements)}")
+        print(f"   • Doku-Elemente:   {len(doc_elements)}")
+        print(f"   • Dateien gescannt: {self.progress_callback.files_scanned}")
+        print(f"{'='*60}\n")
+
+        summary = self.scan_summary.as_dict()
+        return {
+            'code_elements': code_elements,
+            'doc_elements': doc_elements,
+            'content_hashes': content_hashes,
+            'scan_summary': {
+                key: summary[key]
+                for key in ('total_files_scanned', 'code_files', 'doc_files',
+                            'project_path', 'framework_used', 'cache')
+            },
+            'scan_report': self.file_analyzer.get_scan_report(),
+            'performance_report': self.performance_analyzer.get_performance_report(),
+            'progress_info': self.progress_callback.get_progress_info()
+        }
+
+    def scan_project_store(self, project_path: str) -> ElementStore:
+        """
+        Scannt das Projekt in einen kompakten, spaltenorientierten ElementStore
+
+        Geeignet für sehr große Projekte: Scanner und Scan-Cache schreiben die
+        Elemente direkt als Zeilen in den Speicher; Pydantic-Modelle entstehen
+        erst über ElementRow.to_model().
+        """
+        store = ElementStore()
+        for _ in self.scan_project_iter(project_path, store):
+            pass
+        return store
+
+    def scan_project_iter(self, project_path: str, store: Optional[ElementStore] = None) -> Iterator[FileScanResult]:
+        """
+        Scannt das Projekt und liefert die Ergebnisse Datei für Datei
+
+        Die Elemente werden nicht gesammelt; der Speicherbedarf hängt damit nur
+        von der Verarbeitung durch den Aufrufer ab. Fortschritt, Filterstatistik
+        und self.scan_summary werden nach jeder Datei aktualisiert. Cache-Bereinigung
+        und Performance-Messung werden abgeschlossen, sobald der Generator erschöpft ist.
+
+        Args:
+            project_path: Pfad zum zu scannenden Projekt
+            store: Optionaler ElementStore; die Elemente werden dann direkt als Zeilen
+                   geschrieben und die Ergebnisse enthalten ElementRow-Sichten
+
+        Returns:
+            Generator über FileScanResult-Objekte, eines pro eingeschlossener Datei
+        """
         project_path = Path(project_path)
 
         # Starte Performance-Analyse
         start_time = self.performance_analyzer.start_timing()
-        file_sizes = []
+        file_sizes = QuantileSketch()
         directories_scanned = 0
 
-        # Zähle alle Dateien und Verzeichnisse vor dem Scannen
-        all_files = []
-        scan_paths_list = []
-
-        for scan_path_str in self.config.scan_paths:
-            scan_path = project_path / scan_path_str
-            if not scan_path.exists():
-                continue
-            scan_paths_list.append(scan_path)
-
-            # Hole alle relevanten Dateien
-            files = self.file_handler.get_filtered_files(scan_path)
-            all_files.extend(files)
+        # Ein einziger Verzeichnisdurchlauf pro Scan-Pfad; das Manifest dient
+        # anschließend für Zählung, Statistik und Scannen
+        self.progress_callback.set_stage('discovery')
+        with measure_phase('walk'):
+            manifests = self.file_handler.build_manifests(project_path)
 
         # Informiere den Callback über die Gesamtanzahlen
-        self.progress_callback.update_total_directories(len(scan_paths_list))
-        self.progress_callback.update_total_files(len(all_files))
-
-        # Dateien filtern und scannen
-        code_elements = []
-        doc_elements = []
+        self.progress_callback.update_total_directories(len(manifests))
+        self.progress_callback.update_total_files(sum(len(manifest) for manifest in manifests))
+        self.progress_callback.set_stage('scan')
 
         # Bestimme das Framework basierend auf dem Projekttyp
         framework_parser = None
@@ -66,75 +137,199 @@ class UniversalScanner:
             elif 'express' in self.config.project_type:
                 framework_parser = get_framework_parser('express')
 
-        for scan_path in scan_paths_list:
-            # Benachrichtige den Callback, dass ein Verzeichnis gescannt wird
-            self.progress_callback.scanning_directory(scan_path)
+        summary = ScanSummary(
+            str(project_path),
+            framework_parser.get_framework_name() if framework_parser else None
+        )
+        self.scan_summary = summary
+
+        # Persistenter Cache: unveränderte Dateien werden nicht erneut geparst
+        scan_cache = self._open_scan_cache(project_path, framework_parser)
+        scanned_paths = []
 
-            directories_scanned += 1
-            files = self.file_handler.get_filtered_files(scan_path)
+        # Dateien mit identischem Inhalt werden nur einmal geparst (das Hashen zählt als Lesen)
+        with measure_phase('read'):
+            duplicates = self._find_duplicates(manifests, scan_cache)
 
-            for file_path in files:
-                file_ext = file_path.suffix.lower()
-                file_sizes.append(file_path.stat().st_size)
+        try:
+            for manifest in manifests:
+                # Benachrichtige den Callback, dass ein Verzeichnis gescannt wird
+                self.progress_callback.scanning_directory(manifest.root)
 
-                # Benachrichtige den Callback, dass eine Datei gescannt wird
-                self.progress_callback.scanning_file(file_path)
+                directories_scanned += 1
+                for excluded_dir in manifest.excluded_dirs:
+                    self.file_analyzer.analyze_directory_exclusion(excluded_dir)
 
-                if file_ext in ['.py', '.js', '.jsx', '.ts', '.tsx']:
-                    # Code-Datei scannen
-                    elements = self.code_scanner.scan_file(file_path)
+                for entry in manifest:
+                    file_path = entry.path
+                    file_sizes.add(entry.size)
 
-                    # Wenn ein Framework-Parser verfügbar ist, verwende diesen zusätzlich
-                    if framework_parser and self._is_relevant_for_framework(file_path, framework_parser.get_framework_name()):
-                        framework_elements = framework_parser.parse_file(file_path)
-                        elements.extend(framework_elements)
+                    # Benachrichtige den Callback, dass eine Datei gescannt wird
+                    self.progress_callback.scanning_file(file_path)
 
-                    code_elements.extend(elements)
-                    # Analysiere die eingeschlossene Datei
-                    self.file_analyzer.analyze_file(file_path, is_included=True)
-                elif file_ext in ['.md', '.rst', '.txt']:
-                    # Dokumentations-Datei scannen
-                    elements = self.doc_scanner.scan_file(file_path)
-                    doc_elements.extend(elements)
+                    result = self._scan_entry(entry, scan_cache, framework_parser, duplicates, store)
+                    if result is None:
+                        # Analysiere die ignorierte Datei
+                        summary.ignored_files += 1
+                        self.file_analyzer.analyze_file(file_path, is_included=False, file_size=entry.size)
+                        continue
+
+                    scanned_paths.append(result.file_path)
                     # Analysiere die eingeschlossene Datei
-                    self.file_analyzer.analyze_file(file_path, is_included=True)
-                else:
-                    # Analysiere die ignorierte Datei
-                    self.file_analyzer.analyze_file(file_path, is_included=False)
-
-        # Stoppe Performance-Analyse
-        total_files = len(code_elements) + len(doc_elements)
-        metrics = self.performance_analyzer.stop_timing(
-            start_time,
-            files_processed=total_files,
-            file_sizes=file_sizes,
-            directories_scanned=directories_scanned
-        )
+                    self.file_analyzer.analyze_file(file_path, is_included=True, file_size=entry.size)
+                    summary.add(result)
+                    yield result
 
-        # Abschlussmeldung
-        print(f"\n\n{'='*60}")
-        print(f"✅ Scan abgeschlossen!")
-        print(f"{'='*60}")
-        print(f"📊 Gefunden:")
-        print(f"   • Code-Elemente:   {len(code_elements)}")
-        print(f"   • Doku-Elemente:   {len(doc_elements)}")
-        print(f"   • Dateien gescannt: {self.progress_callback.files_scanned}")
-        print(f"{'='*60}\n")
+            if scan_cache:
+                # Nur nach vollständigem Durchlauf sind alle noch vorhandenen Dateien bekannt
+                scan_cache.prune(scanned_paths)
+                summary.cache_statistics = scan_cache.get_statistics()
+            summary.completed = True
+        finally:
+            self.progress_callback.finish()
+            if scan_cache:
+                scan_cache.close()
 
-        return {
-            'code_elements': code_elements,
-            'doc_elements': doc_elements,
-            'scan_summary': {
-                'total_files_scanned': total_files,
-                'code_files': len(code_elements),
-                'doc_files': len(doc_elements),
-                'project_path': str(project_path),
-                'framework_used': framework_parser.get_framework_name() if framework_parser else None
-            },
-            'scan_report': self.file_analyzer.get_scan_report(),
-            'performance_report': self.performance_analyzer.get_performance_report(),
-            'progress_info': self.progress_callback.get_progress_info()
-        }
+            # Stoppe Performance-Analyse
+            self.performance_analyzer.stop_timing(
+                start_time,
+                files_processed=summary.code_elements + summary.doc_elements,
+                file_sizes=file_sizes,
+                directories_scanned=directories_scanned
+            )
+            if self.performance_analyzer.profiler:
+                self.performance_analyzer.profiler.finish(getattr(self.config, 'profile_output', None))
+
+    def _scan_entry(self, entry: FileEntry, scan_cache: Optional[ScanCache],
+                    framework_parser, duplicates: Optional[DuplicateIndex] = None,
+                    store: Optional[ElementStore] = None) -> Optional[FileScanResult]:
+        """
+        Scannt eine Datei des Manifests (oder lädt sie aus dem Cache)
+
+        Kopien einer bereits gescannten Datei erhalten deren Elemente mit
+        angepasstem Dateipfad und verweisen über duplicate_of auf sie.
+
+        Returns:
+            FileScanResult oder None, wenn die Datei weder Code noch Dokumentation ist
+        """
+        file_path = entry.path
+        file_ext = entry.suffix
+
+        if file_ext in CODE_EXTENSIONS:
+            file_type = CODE_FILE
+        elif file_ext in DOC_EXTENSIONS:
+            file_type = DOC_FILE
+        else:
+            return None
+
+        path = str(file_path)
+        content_hash = None
+        if duplicates:
+            content_hash = duplicates.content_hash(path)
+            duplicate_of = duplicates.duplicate_of(path)
+            if duplicate_of:
+                elements = duplicates.take(path)
+                if elements is not None:
+                    return FileScanResult(path, file_type, elements, content_hash=content_hash,
+                                          duplicate_of=duplicate_of)
+
+        elements = self._load_from_cache(scan_cache, entry, content_hash, store)
+        from_cache = elements is not None
+        if not from_cache:
+            # Latenz pro Dateityp nur für tatsächlich gescannte Dateien
+            self.performance_analyzer.begin_file()
+            start = time.perf_counter()
+            # Für den Cache werden die Bytes hier gelesen: Der Scanner verarbeitet genau diese
+            # Bytes und ihr Hash wird gespeichert, auch wenn die Datei während des Scans geändert wird
+            data, store_hash = None, entry.blob_id
+            if scan_cache and not store_hash:
+                data = self._read_bytes(file_path)
+                store_hash = compute_content_hash(data) if data is not None else None
+            if file_type == CODE_FILE:
+                # Wenn ein Framework-Parser verfügbar ist, verwende diesen zusätzlich;
+                # er teilt sich Lesen, Parsen und AST-Durchlauf mit dem CodeScanner
+                framework_parsers = []
+                if framework_parser and self._is_relevant_for_framework(file_path, framework_parser.get_framework_name()):
+                    framework_parsers.append(framework_parser)
+                elements = self.code_scanner.scan_file(file_path, framework_parsers, data, store)
+            else:
+                elements = self.doc_scanner.scan_file(file_path, data, store)
+            self.performance_analyzer.record_file(file_ext, time.perf_counter() - start, path)
+            if store_hash:
+                self._store_in_cache(scan_cache, entry, elements, store_hash)
+
+        if duplicates:
+            duplicates.remember(path, elements)
+        return FileScanResult(path, file_type, elements, from_cache=from_cache, content_hash=content_hash)
+
+    def _find_duplicates(self, manifests: List[Any], scan_cache: Optional[ScanCache]) -> Optional[DuplicateIndex]:
+        """Ermittelt Dateien mit identischem Inhalt, falls aktiviert"""
+        if not self.config.deduplicate_content:
+            return None
+
+        def hash_entry(entry: FileEntry) -> Optional[str]:
+            # Bekannte Hashes (Git-Index, Scan-Cache) ersparen das Lesen der Datei
+            if entry.blob_id:
+                return entry.blob_id
+            if scan_cache:
+                try:
+                    cached = scan_cache.known_hash(entry.path, entry.size, entry.mtime_ns)
+                except Exception:
+                    cached = None
+                if cached:
+                    return cached
+            return hash_file(entry.path)
+
+        entries = [entry for manifest in manifests for entry in manifest
+                   if entry.suffix in CODE_EXTENSIONS or entry.suffix in DOC_EXTENSIONS]
+        return DuplicateIndex.build(entries, hash_entry)
+
+    def _open_scan_cache(self, project_path: Path, framework_parser) -> Optional[ScanCache]:
+        """Öffnet den persistenten Scan-Cache des Projekts, falls aktiviert"""
+        if not getattr(self.config, 'use_scan_cache', False):
+            return None
+
+        # Framework-Parser, JavaScript-Extraktor und lazy_content beeinflussen die extrahierten Elemente
+        framework_name = framework_parser.get_framework_name() if framework_parser else ""
+        fingerprint = f"{framework_name}:{self.config.javascript_extractor}:{int(self.config.lazy_content)}"
+        cache_dir = Path(self.config.scan_cache_dir) if self.config.scan_cache_dir else None
+        try:
+            return ScanCache(project_path, cache_dir=cache_dir, fingerprint=fingerprint)
+        except Exception as e:
+            print(f"Warnung: Scan-Cache konnte nicht geöffnet werden: {e}")
+            return None
+
+    def _load_from_cache(self, scan_cache: Optional[ScanCache], entry: FileEntry,
+                         content_hash: Optional[str] = None,
+                         store: Optional[ElementStore] = None) -> Optional[List[Any]]:
+        """Lädt die Elemente einer unveränderten Datei aus dem Cache (mit store direkt als Zeilen)"""
+        if not scan_cache:
+            return None
+        try:
+            return scan_cache.lookup(entry.path, entry.size, entry.mtime_ns, entry.blob_id or content_hash, store)
+        except Exception as e:
+            print(f"Warnung: Cache-Eintrag für {entry.path} nicht lesbar: {e}")
+            return None
+
+    @staticmethod
+    def _read_bytes(file_path: Path) -> Optional[bytes]:
+        """Liest eine Datei für Scan und Cache-Hash (None, wenn sie nicht lesbar ist)"""
+        try:
+            with measure_phase('read'):
+                with open(file_path, 'rb') as f:
+                    return f.read()
+        except OSError:
+            return None
+
+    def _store_in_cache(self, scan_cache: Optional[ScanCache], entry: FileEntry, elements: List[Any],
+                        content_hash: str):
+        """Speichert die Elemente einer gescannten Datei unter dem Hash der gescannten Bytes im Cache"""
+        if not scan_cache:
+            return
+        try:
+            scan_cache.store(entry.path, elements, entry.size, entry.mtime_ns, content_hash)
+        except Exception as e:
+            print(f"Warnung: Cache-Eintrag für {entry.path} nicht speicherbar: {e}")
 
     def _is_relevant_for_framework(self, file_path: Path, framework_name: str) -> bool:
         """Prüft, ob eine Datei für ein bestimmtes Framework relevant ist"""
@@ -146,15 +341,26 @@ class UniversalScanner:
             return file_path.suffix.lower() in ['.js', '.ts']
         return True
 
-    def scan_project_parallel(self, project_path: str, max_workers: Optional[int] = None) -> Dict[str, Any]:
-        """Scannt das Projekt mit paralleler Verarbeitung für verbesserte Performance"""
-        # Erstelle einen ParallelScanner mit der gleichen Konfiguration
-        parallel_scanner = ParallelScanner(self.config, max_workers=max_workers)
+    def scan_project_parallel(self, project_path: str, max_workers: Optional[int] = None,
+                              use_processes: bool = False) -> Dict[str, Any]:
+        """
+        Scannt das Projekt mit paralleler Verarbeitung für verbesserte Performance
+
+        Args:
+            project_path: Pfad zum zu scannenden Projekt
+            max_workers: Maximale Anzahl an Workern
+            use_processes: Prozess-Pool statt Threads verwenden (skaliert beim AST-Parsen mit den CPU-Kernen)
+        """
+        # Erstelle einen ParallelScanner mit der gleichen Konfiguration; er misst mit dem Analyzer dieses Scanners
+        parallel_scanner = ParallelScanner(self.config, max_workers=max_workers,
+                                           performance_analyzer=self.performance_analyzer,
+                                           progress_callback=self.progress_callback)
 
         # Führe den parallelen Scan durch
-        result = parallel_scanner.scan_project_parallel(project_path)
+        result = parallel_scanner.scan_project_parallel(project_path, use_threading=not use_processes)
 
         # Ergänze die Ergebnisse mit Analysedaten, die normalerweise im Standard-Scan erfasst werden
+        self.file_analyzer.merge(parallel_scanner.file_analyzer)
         result['scan_report'] = self.file_analyzer.get_scan_report()
         result['performance_report'] = self.performance_analyzer.get_performance_report()
         result['progress_info'] = self.progress_callback.get_progress_info() if self.progress_callback else {}
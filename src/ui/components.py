@@ -62,6 +62,11 @@ def display_filter_statistics(scan_report: Dict[str, Any]):
         col1.metric("Durchschnittliche Größe", f"{size_stats['average_size_bytes']/1024:.2f} KB")
         col2.metric("Maximale Größe", f"{size_stats['max_size_bytes']/1024:.2f} KB")
         col3.metric("Minimale Größe", f"{size_stats['min_size_bytes']/1024:.2f} KB")
+        if 'median_size_bytes' in size_stats:
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Median", f"{size_stats['median_size_bytes']/1024:.2f} KB")
+            col2.metric("90. Perzentil", f"{size_stats['p90_size_bytes']/1024:.2f} KB")
+            col3.metric("99. Perzentil", f"{size_stats['p99_size_bytes']/1024:.2f} KB")
 
 
 def display_performance_statistics(performance_report: Dict[str, Any]):
@@ -91,6 +96,11 @@ def display_performance_statistics(performance_report: Dict[str, Any]):
     col1, col2 = st.columns(2)
     col1.metric("CPU-Auslastung", f"{resources['cpu_percent']:.2f}%")
     col2.metric("Speichernutzung", f"{resources['memory_used_mb']:.2f} MB")
+    if resources.get('peak_rss_mb') is not None:
+        col1, col2 = st.columns(2)
+        col1.metric("Speicher-Spitze (RSS)", f"{resources['peak_rss_mb']:.2f} MB")
+        if resources.get('tracemalloc_peak_mb') is not None:
+            col2.metric("Speicher-Spitze (tracemalloc)", f"{resources['tracemalloc_peak_mb']:.2f} MB")
     
     # Dateiverarbeitung
     col1, col2, col3 = st.columns(3)
@@ -98,6 +108,30 @@ def display_performance_statistics(performance_report: Dict[str, Any]):
     col2.metric("Verzeichnisse gescannt", processing['directories_scanned'])
     col3.metric("Durchsatz", f"{indicators['files_per_second']} Dateien/Sek")
 
+    # Phasen der Pipeline
+    if timing.get('phases'):
+        st.subheader("Phasen")
+        phases_data = {
+            'Phase': list(timing['phases'].keys()),
+            'Wandzeit (s)': [stats['wall_seconds'] for stats in timing['phases'].values()],
+            'CPU-Zeit (s)': [stats['cpu_seconds'] for stats in timing['phases'].values()]
+        }
+        st.bar_chart(pd.DataFrame(phases_data).set_index('Phase'))
+
+    # Latenz pro Dateityp
+    if processing.get('latency_by_type'):
+        st.subheader("Latenz pro Dateityp")
+        latency = processing['latency_by_type']
+        latency_data = {
+            'Dateityp': list(latency.keys()),
+            'Dateien': [stats['files'] for stats in latency.values()],
+            'Mittel (ms)': [stats['mean_ms'] for stats in latency.values()],
+            'p50 (ms)': [stats['p50_ms'] for stats in latency.values()],
+            'p95 (ms)': [stats['p95_ms'] for stats in latency.values()],
+            'Max (ms)': [stats['max_ms'] for stats in latency.values()]
+        }
+        st.dataframe(pd.DataFrame(latency_data).set_index('Dateityp'))
+
 
 def display_scan_progress(current: int, total: int, description: str = "Scanning..."):
     """
@@ -163,7 +197,7 @@ def create_export_options(scan_report: Dict[str, Any], performance_report: Dict[
                 )
 
         if col3.button("Export Dateilisten als CSV"):
-            # Exportiere die vollständigen Dateilisten
+            # Exportiere die Dateilisten (bei großen Projekten eine Stichprobe, siehe file_samples)
             csv_data = []
 
             # Eingeschlossene Dateien
@@ -393,10 +427,12 @@ def display_directory_visualization(scan_path: str, scan_report: Dict[str, Any]
     # Zusätzliche Filter-Statistiken
     if scan_report:
         col1, col2, col3 = st.columns(3)
+        # Die Dateilisten sind nur Stichproben; die Anzahl steht in der Zusammenfassung
+        summary = scan_report.get('summary', {})
         with col1:
-            st.metric("Eingeschlossene Dateien", len(included_files))
+            st.metric("Eingeschlossene Dateien", summary.get('included_files', len(included_files)))
         with col2:
-            st.metric("Ausgeschlossene Dateien", len(excluded_files))
+            st.metric("Ausgeschlossene Dateien", summary.get('excluded_files', len(excluded_files)))
         with col3:
             excluded_dirs_count = len(excluded_dirs) if excluded_dirs else 0
             st.metric("Ausgeschlossene Verzeichnisse", excluded_dirs_count)
\ No newline at end of file
@@ -112,17 +112,21 @@ def main():
         if st.button("Projekt scannen", disabled=not st.session_state.project_path):
             if Path(st.session_state.project_path).exists():
                 # Initialisiere den Fortschritts-Callback
-                from src.scanner.progress_callback import ScanProgressCallback
+                from src.scanner.progress_callback import ScanProgressCallback, format_duration
 
                 # Erstelle einen Fortschritts-Callback mit Streamlit-Integration
                 progress_callback = ScanProgressCallback()
 
-                def update_progress(current, total, description):
-                    progress_value = current / max(1, total) if total > 0 else 0
-                    progress_bar.progress(progress_value, text=f"{description} ({current}/{total})")
+                def update_progress(event):
+                    progress_value = min(1.0, event.current / event.total) if event.total > 0 else 0
+                    progress_bar.progress(
+                        progress_value,
+                        text=f"{event.description} ({event.current}/{event.total}) - "
+                             f"{event.files_per_second:.0f} Dateien/s - ETA {format_duration(event.eta_seconds)}"
+                    )
 
-                # Setze die Callback-Funktion
-                progress_callback.set_progress_callback(update_progress)
+                # Setze die Callback-Funktion (gebündelte Ereignisse mit Durchsatz und Restzeit)
+                progress_callback.set_event_callback(update_progress)
 
                 # Initialisiere die Fortschrittsanzeige
                 progress_bar = st.progress(0)
@@ -190,12 +194,15 @@ def main():
         st.header("Diskrepanz-Analyse")
         if st.button("Diskrepanzen analysieren"):
             with st.spinner("Diskrepanzen werden analysiert..."):
-                matcher = MatcherEngine()
+                # Mit dem Projektpfad nutzt der Matcher MatchCache und DocSectionCache im Cache-Verzeichnis
+                matcher = MatcherEngine(st.session_state.config.get_effective_config(),
+                                        project_path=st.session_state.project_path)
                 results = st.session_state.scan_results
                 discrepancies = matcher.find_discrepancies(
                     results['code_elements'],
                     results['doc_elements']
                 )
+                matcher.close()
                 
                 st.session_state.discrepancies = discrepancies
                 
@@ -212,7 +219,8 @@ def main():
                 success = updater.update_chroma_db(
                     st.session_state.scan_results['code_elements'],
                     st.session_state.scan_results['doc_elements'],
-                    st.session_state.project_path
+                    st.session_state.project_path,
+                    st.session_state.scan_results.get('content_hashes')
                 )
 
                 if success:
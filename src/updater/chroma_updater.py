@@ -1,8 +1,17 @@
+import hashlib
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable
 from src.models.element import CodeElement, DocElement
 from src.chroma.client import ChromaDBClient
 from src.core.service_config import ServiceConfig
+from src.scanner.performance_analyzer import measure_phase
+from src.matcher.embedding_similarity import ElementEmbeddings, element_key, doc_qualified_name, np
+from src.matcher.symbol_index import SymbolIndex
+
+# Schema der Eintrags-IDs; Collections mit einem anderen Schema werden neu aufgebaut,
+# da ihre Einträge sonst neben denen des aktuellen Schemas liegen bleiben
+ELEMENT_ID_SCHEME = 2
+ID_SCHEME_KEY = "element_id_scheme"
 
 class ChromaUpdater:
     def __init__(self, service_config: ServiceConfig):
@@ -16,12 +25,23 @@ class ChromaUpdater:
         from src.llm.client import OllamaClient
         self.embedding_model = service_config.embedding_model
         self.ollama_client = OllamaClient(host=service_config.ollama_host if hasattr(service_config, 'ollama_host') else "http://localhost:11434")
+        # Embeddings von Inhalten, die in mehreren Dateien identisch vorkommen (Hash des Inhalts -> Embedding)
+        self._shared_embeddings: Dict[str, List[float]] = {}
+        self.reused_embeddings = 0
 
     def update_chroma_with_elements(self, code_elements: List[CodeElement], 
                                   doc_elements: List[DocElement], 
-                                  project_path: str) -> bool:
+                                  project_path: str,
+                                  content_hashes: Optional[Dict[str, str]] = None) -> bool:
         """
         Aktualisiert die ChromaDB mit den aktuellen Code- und Dokumentationselementen
+
+        Args:
+            code_elements: Code-Elemente
+            doc_elements: Dokumentations-Elemente
+            project_path: Pfad zum gescannten Projekt
+            content_hashes: Dateien mit Kopien und ihr Inhalts-Hash (content_hashes von
+                            UniversalScanner.scan_project); ihre Elemente teilen sich die Embeddings
         """
         try:
             # Prüfe Verbindung zu ChromaDB
@@ -29,68 +49,70 @@ class ChromaUpdater:
                 print("ChromaDB ist nicht erreichbar")
                 return False
 
+            self._shared_embeddings = {}
+            self.reused_embeddings = 0
+            shared_files = content_hashes or {}
+
             print("Aktualisiere ChromaDB mit Code-Elementen...")
-            # Bestimme Collection-Namen basierend auf Projektname
-            project_name = Path(project_path).name
-            collection_name = f"{project_name}_code"
-
-            # Erstelle Collection, falls sie nicht existiert
-            if not self.chroma_client.create_collection(collection_name):
-                print(f"Konnte Collection '{collection_name}' nicht erstellen. Überspringe Code-Elemente.")
-            else:
-                # Füge Code-Elemente hinzu
-                for elem in code_elements:
-                    # Erstelle Embeddings für Code-Elemente
-                    embedding_data = self._create_embedding_data_for_code(elem, project_path)
-                    if embedding_data:
-                        # Konvertiere zu dem Format, das die API erwartet
-                        embeddings_formatted = [{
-                            "ids": [f"code_{elem.name}_{elem.file_path}"],
-                            "embeddings": [embedding_data.get('embedding', [0.0])],  # Placeholder für echte Embeddings
-                            "metadatas": [embedding_data.get('metadata', {})],
-                            "documents": [embedding_data.get('content', '')]
-                        }]
-
-                        for emb in embeddings_formatted:
-                            self.chroma_client.add_embeddings(
-                                collection_name=collection_name,
-                                embeddings=emb['embeddings'],
-                                documents=emb['documents'],
-                                metadatas=emb['metadatas'],
-                                ids=emb['ids']
-                            )
+            code_collection = self._prepare_collection(project_path, "code", "Code-Elemente")
+            if code_collection:
+                for elements, shared in self._split_shared(code_elements, shared_files):
+                    self._add_code_elements(code_collection, elements, project_path, shared)
 
             print("Aktualisiere ChromaDB mit Dokumentations-Elementen...")
-            # Bestimme Collection-Namen basierend auf Projektname
-            project_name = Path(project_path).name
-            collection_name = f"{project_name}_docs"
-
-            # Erstelle Collection, falls sie nicht existiert
-            if not self.chroma_client.create_collection(collection_name):
-                print(f"Konnte Collection '{collection_name}' nicht erstellen. Überspringe Dokumentations-Elemente.")
-            else:
-                # Füge Dokumentations-Elemente hinzu
-                for elem in doc_elements:
-                    # Erstelle Embeddings für Dokumentations-Elemente
-                    embedding_data = self._create_embedding_data_for_doc(elem, project_path)
-                    if embedding_data:
-                        # Konvertiere zu dem Format, das die API erwartet
-                        embeddings_formatted = [{
-                            "ids": [f"doc_{elem.name}"],
-                            "embeddings": [embedding_data.get('embedding', [0.0])],  # Placeholder für echte Embeddings
-                            "metadatas": [embedding_data.get('metadata', {})],
-                            "documents": [embedding_data.get('content', '')]
-                        }]
-
-                        for emb in embeddings_formatted:
-                            self.chroma_client.add_embeddings(
-                                collection_name=collection_name,
-                                embeddings=emb['embeddings'],
-                                documents=emb['documents'],
-                                metadatas=emb['metadatas'],
-                                ids=emb['ids']
-                            )
+            doc_collection = self._prepare_collection(project_path, "docs", "Dokumentations-Elemente")
+            if doc_collection:
+                for elements, shared in self._split_shared(doc_elements, shared_files):
+                    self._add_doc_elements(doc_collection, elements, project_path, shared)
+
+            if self.reused_embeddings:
+                print(f"{self.reused_embeddings} Embeddings aus identischen Dateien wiederverwendet")
+            self._shared_embeddings = {}
+            print("ChromaDB erfolgreich aktualisiert")
+            return True
+
+        except Exception as e:
+            print(f"Fehler bei der Aktualisierung der ChromaDB: {e}")
+            return False
+
+    def update_chroma_from_stream(self, file_results: Iterable[Any], project_path: str) -> bool:
+        """
+        Aktualisiert die ChromaDB Datei für Datei aus einem gestreamten Scan
+
+        Die Elemente jeder Datei werden sofort eingefügt und nicht gesammelt,
+        sodass der Speicherbedarf nicht mit der Projektgröße wächst.
 
+        Args:
+            file_results: Ergebnisse von UniversalScanner.scan_project_iter
+            project_path: Pfad zum gescannten Projekt
+
+        Returns:
+            True, wenn die Aktualisierung durchgeführt wurde
+        """
+        try:
+            # Prüfe Verbindung zu ChromaDB
+            if not self.chroma_client.health_check():
+                print("ChromaDB ist nicht erreichbar")
+                return False
+
+            print("Aktualisiere ChromaDB mit Code- und Dokumentations-Elementen...")
+            self._shared_embeddings = {}
+            self.reused_embeddings = 0
+            code_collection = self._prepare_collection(project_path, "code", "Code-Elemente")
+            doc_collection = self._prepare_collection(project_path, "docs", "Dokumentations-Elemente")
+
+            for result in file_results:
+                # Dateien mit Kopien (content_hash gesetzt) teilen sich ihre Embeddings
+                shared = getattr(result, 'content_hash', None) is not None
+                if result.is_code:
+                    if code_collection:
+                        self._add_code_elements(code_collection, result.elements, project_path, shared)
+                elif doc_collection:
+                    self._add_doc_elements(doc_collection, result.elements, project_path, shared)
+
+            if self.reused_embeddings:
+                print(f"{self.reused_embeddings} Embeddings aus identischen Dateien wiederverwendet")
+            self._shared_embeddings = {}
             print("ChromaDB erfolgreich aktualisiert")
             return True
 
@@ -98,8 +120,143 @@ class ChromaUpdater:
             print(f"Fehler bei der Aktualisierung der ChromaDB: {e}")
             return False
 
-    def _create_embedding_data_for_code(self, code_elem: CodeElement, project_path: str) -> Optional[Dict[str, Any]]:
-        """Erstellt Embedding-Daten für ein Code-Element"""
+    def load_element_embeddings(self, project_path: str) -> Optional[ElementEmbeddings]:
+        """
+        Lädt die gespeicherten Embeddings der Code- und Dokumentations-Elemente eines Projekts
+
+        Die Vektoren werden seitenweise direkt in float32-Matrizen übernommen;
+        zugeordnet werden sie über qualifizierten Namen und Zeile aus den Metadaten.
+
+        Returns:
+            ElementEmbeddings für den Matcher oder None, wenn ChromaDB oder numpy nicht verfügbar sind
+        """
+        if np is None:
+            print("Warnung: numpy ist nicht installiert, Embeddings werden nicht geladen")
+            return None
+        if not self.chroma_client.health_check():
+            print("ChromaDB ist nicht erreichbar")
+            return None
+
+        loaded = []
+        for suffix in ("code", "docs"):
+            keys, blocks = [], []
+            for embeddings, metadatas in self.chroma_client.get_embeddings(self._collection_name(project_path, suffix)):
+                blocks.append(np.asarray(embeddings, dtype=np.float32))
+                keys.extend(element_key((metadata or {}).get('qualified_name', ''), (metadata or {}).get('line_number'))
+                            for metadata in metadatas)
+            matrix = np.vstack(blocks) if blocks else np.zeros((0, 0), dtype=np.float32)
+            loaded.append((keys, matrix))
+        (code_keys, code_vectors), (doc_keys, doc_vectors) = loaded
+        return ElementEmbeddings(code_keys, code_vectors, doc_keys, doc_vectors)
+
+    @staticmethod
+    def _split_shared(elements: Iterable[Any], shared_files: Dict[str, str]) -> List[tuple]:
+        """
+        Teilt Elemente in solche aus Dateien ohne und mit Kopien
+
+        Die Elemente einer Datei bleiben zusammen, damit der SymbolIndex Methoden
+        ihrer Klasse zuordnen kann.
+
+        Returns:
+            [(Elemente ohne Kopien, False), (Elemente aus Dateien mit Kopien, True)]
+        """
+        if not shared_files:
+            return [(elements, False)]
+        single, shared = [], []
+        for element in elements:
+            (shared if getattr(element, 'file_path', None) in shared_files else single).append(element)
+        return [(single, False), (shared, True)]
+
+    @staticmethod
+    def _collection_name(project_path: str, suffix: str) -> str:
+        """Name der Collection eines Projekts (Projektname und Suffix)"""
+        return f"{Path(project_path).name}_{suffix}"
+
+    @staticmethod
+    def _element_id(prefix: str, key: tuple) -> str:
+        """ID eines Eintrags aus dem Schlüssel des Elements (qualifizierter Name und Zeile)"""
+        qualified_name, line_number = key
+        return f"{prefix}_{qualified_name}:{line_number}"
+
+    def _prepare_collection(self, project_path: str, suffix: str, label: str) -> Optional[str]:
+        """Erstellt die Collection des Projekts, falls nötig, und gibt ihren Namen zurück"""
+        # Bestimme Collection-Namen basierend auf Projektname
+        collection_name = self._collection_name(project_path, suffix)
+
+        # Einträge eines älteren ID-Schemas (z.B. code_{name}_{datei}) würden nie ersetzt
+        metadata = self.chroma_client.get_collection_metadata(collection_name)
+        if metadata is not None and metadata.get(ID_SCHEME_KEY) != ELEMENT_ID_SCHEME:
+            print(f"Collection '{collection_name}' verwendet ein älteres ID-Schema und wird neu aufgebaut")
+            if not self.chroma_client.delete_collection(collection_name):
+                return None
+
+        # Erstelle Collection, falls sie nicht existiert
+        if not self.chroma_client.create_collection(collection_name, metadata={ID_SCHEME_KEY: ELEMENT_ID_SCHEME}):
+            print(f"Konnte Collection '{collection_name}' nicht erstellen. Überspringe {label}.")
+            return None
+        return collection_name
+
+    def _add_code_elements(self, collection_name: str, code_elements: Iterable[Any], project_path: str,
+                           shared: bool = False):
+        """Erstellt Embeddings für Code-Elemente und fügt sie der Collection hinzu"""
+        # Der Index überspringt Rohdaten der Framework-Parser und liefert "datei::Klasse.methode"
+        index = SymbolIndex(code_elements)
+        for position, elem in enumerate(index.elements):
+            # Erstelle Embeddings für Code-Elemente
+            qualified_name = index.qualified_name(position)
+            embedding_data = self._create_embedding_data_for_code(elem, project_path, shared, qualified_name)
+            if embedding_data:
+                with measure_phase('upsert'):
+                    self.chroma_client.add_embeddings(
+                        collection_name=collection_name,
+                        embeddings=[embedding_data.get('embedding', [0.0])],  # Placeholder für echte Embeddings
+                        documents=[embedding_data.get('content', '')],
+                        metadatas=[embedding_data.get('metadata', {})],
+                        ids=[self._element_id("code", element_key(qualified_name, elem.line_number))]
+                    )
+
+    def _add_doc_elements(self, collection_name: str, doc_elements: Iterable[Any], project_path: str,
+                          shared: bool = False):
+        """Erstellt Embeddings für Dokumentations-Elemente und fügt sie der Collection hinzu"""
+        for elem in doc_elements:
+            # Erstelle Embeddings für Dokumentations-Elemente
+            embedding_data = self._create_embedding_data_for_doc(elem, project_path, shared)
+            if embedding_data:
+                with measure_phase('upsert'):
+                    self.chroma_client.add_embeddings(
+                        collection_name=collection_name,
+                        embeddings=[embedding_data.get('embedding', [0.0])],  # Placeholder für echte Embeddings
+                        documents=[embedding_data.get('content', '')],
+                        metadatas=[embedding_data.get('metadata', {})],
+                        ids=[self._element_id("doc", element_key(doc_qualified_name(elem), elem.line_number))]
+                    )
+
+    def _create_embedding(self, content: str, shared: bool = False) -> Optional[List[float]]:
+        """
+        Erzeugt das Embedding eines Inhalts
+
+        Bei shared wird das Embedding unter dem Hash des Inhalts gemerkt, sodass
+        identische Elemente aus kopierten Dateien nur einmal eingebettet werden.
+        """
+        if not shared:
+            with measure_phase('embed'):
+                return self.ollama_client.create_embedding(self.embedding_model, content)
+
+        key = hashlib.sha1(content.encode('utf-8', 'surrogatepass')).hexdigest()
+        embedding = self._shared_embeddings.get(key)
+        if embedding is not None:
+            self.reused_embeddings += 1
+            return embedding
+        with measure_phase('embed'):
+            embedding = self.ollama_client.create_embedding(self.embedding_model, content)
+        if embedding:
+            self._shared_embeddings[key] = embedding
+        return embedding
+
+    def _create_embedding_data_for_code(self, code_elem: CodeElement, project_path: str,
+                                        shared: bool = False,
+                                        qualified_name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Erstellt Embedding-Daten für ein Code-Element (qualified_name wie SymbolIndex.qualified_name)"""
         try:
             # Erstelle Inhalt für das Code-Element
             content_parts = []
@@ -113,22 +270,24 @@ class ChromaUpdater:
                 content_parts.append(f"Parameter: {', '.join([str(p) for p in code_elem.parameters])}")
             if code_elem.docstring:
                 content_parts.append(f"Docstring: {code_elem.docstring}")
-            if code_elem.code_snippet:
-                content_parts.append(f"Code: {code_elem.code_snippet}")
+            code_snippet = code_elem.get_code_snippet()
+            if code_snippet:
+                content_parts.append(f"Code: {code_snippet}")
 
             content = "\n".join(content_parts)
 
             metadata = {
                 'name': code_elem.name,
+                'qualified_name': qualified_name or f"{code_elem.file_path or ''}::{code_elem.name}",
                 'type': code_elem.type.value if code_elem.type else '',
                 'file_path': code_elem.file_path,
                 'signature': code_elem.signature or '',
-                'line_number': code_elem.line_number,
+                'line_number': code_elem.line_number or 0,
                 'project_path': project_path
             }
 
             # Embeddings generieren
-            embedding = self.ollama_client.create_embedding(self.embedding_model, content)
+            embedding = self._create_embedding(content, shared)
             
             if not embedding:
                 print(f"Warnung: Konnte kein Embedding generieren für {code_elem.name}. Verwende Placeholder.")
@@ -143,25 +302,29 @@ class ChromaUpdater:
             print(f"Fehler bei der Erstellung von Embedding-Daten für Code-Element: {e}")
             return None
 
-    def _create_embedding_data_for_doc(self, doc_elem: DocElement, project_path: str) -> Optional[Dict[str, Any]]:
+    def _create_embedding_data_for_doc(self, doc_elem: DocElement, project_path: str,
+                                       shared: bool = False) -> Optional[Dict[str, Any]]:
         """Erstellt Embedding-Daten für ein Dokumentations-Element"""
         try:
             # Erstelle Inhalt für das Dokumentations-Element
             # Bevorzuge full_content für das Embedding, falls verfügbar (damit nicht nur die Vorschau embeddet wird)
-            text_to_embed = doc_elem.full_content if doc_elem.full_content else doc_elem.content
+            full_content = doc_elem.get_full_content()
+            text_to_embed = full_content if full_content else doc_elem.content
             
             content = f"Name: {doc_elem.name}\nTyp: {doc_elem.type.value}\nInhalt: {text_to_embed}"
 
             metadata = {
                 'name': doc_elem.name,
+                'qualified_name': doc_qualified_name(doc_elem),
                 'type': doc_elem.type.value if doc_elem.type else '',
                 'file_path': doc_elem.file_path,
+                'line_number': doc_elem.line_number or 0,
                 'format': doc_elem.format,
                 'project_path': project_path
             }
 
             # Embeddings generieren
-            embedding = self.ollama_client.create_embedding(self.embedding_model, content)
+            embedding = self._create_embedding(content, shared)
             
             if not embedding:
                 print(f"Warnung: Konnte kein Embedding generieren für {doc_elem.name}. Verwende Placeholder.")
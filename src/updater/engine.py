@@ -1,10 +1,12 @@
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable
 from src.models.element import CodeElement, DocElement
 from .chroma_updater import ChromaUpdater
+from src.matcher.embedding_similarity import ElementEmbeddings
 from src.core.service_config import ServiceConfig
 from src.quality.quality_manager import DocumentationQualityManager
 from src.utils.name_generator import UniqueNameGenerator
+from src.scanner.performance_analyzer import measure_phase
 import shutil
 import tempfile
 import os
@@ -68,7 +70,7 @@ class UpdaterEngine:
         - Docstring: {code_element.docstring or 'nicht vorhanden'}
         - API-Info: {code_element.api_info or 'nicht zutreffend'}
         - Datei: {code_element.file_path}
-        - Code-Snippet: {code_element.code_snippet or 'nicht verfügbar'}
+        - Code-Snippet: {code_element.get_code_snippet() or 'nicht verfügbar'}
 
         Bitte erstelle eine klare, professionelle Dokumentation im Markdown-Format mit folgender Struktur:
 
@@ -94,7 +96,8 @@ class UpdaterEngine:
 
         # Generiere die Dokumentation mit dem konfigurierten LLM-Modell
         try:
-            generated_doc = llm_client.generate(self.service_config.llm_model, prompt)
+            with measure_phase('generate'):
+                generated_doc = llm_client.generate(self.service_config.llm_model, prompt)
             return generated_doc
         except Exception as e:
             print(f"Fehler bei der Generierung der Dokumentation: {e}")
@@ -154,11 +157,26 @@ class UpdaterEngine:
             print(f"Fehler beim Abrufen des Kontexts aus ChromaDB: {e}")
             return f"Fehler beim Abrufen des Kontexts aus ChromaDB: {str(e)}"
     
-    def update_chroma_db(self, code_elements: List[CodeElement], doc_elements: List[DocElement], project_path: str) -> bool:
+    def update_chroma_db(self, code_elements: List[CodeElement], doc_elements: List[DocElement], project_path: str,
+                         content_hashes: Optional[Dict[str, str]] = None) -> bool:
         """
         Aktualisiert die ChromaDB mit den aktuellen Code- und Dokumentationselementen
+
+        content_hashes (aus UniversalScanner.scan_project) kennzeichnet Dateien mit Kopien,
+        deren Elemente nur einmal eingebettet werden.
+        """
+        return self.chroma_updater.update_chroma_with_elements(code_elements, doc_elements, project_path,
+                                                               content_hashes)
+
+    def update_chroma_db_from_stream(self, file_results: Iterable[Any], project_path: str) -> bool:
         """
-        return self.chroma_updater.update_chroma_with_elements(code_elements, doc_elements, project_path)
+        Aktualisiert die ChromaDB Datei für Datei aus UniversalScanner.scan_project_iter
+        """
+        return self.chroma_updater.update_chroma_from_stream(file_results, project_path)
+
+    def load_element_embeddings(self, project_path: str) -> Optional[ElementEmbeddings]:
+        """Lädt die in der ChromaDB gespeicherten Embeddings für die Embedding-Analyse des Matchers"""
+        return self.chroma_updater.load_element_embeddings(project_path)
 
     def generate_documentation_updates(self, discrepancies: Dict[str, Any], llm_client: Any, output_dir: str = "./docs", project_path: str = None) -> Dict[str, Any]:
         """
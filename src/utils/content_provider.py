@@ -0,0 +1,194 @@
+"""
+Gemeinsamer Zugriff auf Dateiinhalte für verzögert geladene Snippets und Dokumente
+
+Elemente speichern bei lazy_content nur einen Byte-Bereich ihrer Datei; der
+Text wird erst beim Zugriff über memory-mapped Dateien gelesen. Die zuletzt
+verwendeten Dateien bleiben geöffnet (LRU), alle anderen werden geschlossen.
+"""
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+from pathlib import Path
+
+
+def decode_text(data: bytes) -> str:
+    """
+    Dekodiert Dateiinhalt wie das Öffnen im Textmodus
+
+    UTF-8 mit ignorierten Fehlern und universellen Zeilenumbrüchen (\\r\\n und \\r werden zu \\n).
+    """
+    text = data.decode('utf-8', errors='ignore')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+class _MappedFile(NamedTuple):
+    """Eine geöffnete, memory-mapped Datei"""
+    file: Optional[object]
+    view: Union[mmap.mmap, bytes]
+    size: int
+    mtime_ns: int
+
+
+class ContentProvider:
+    """
+    Liest Byte-Bereiche aus Dateien über mmap
+
+    Geöffnete Dateien werden nach ihrer letzten Verwendung verdrängt, sobald mehr
+    als max_open_files offen sind. Hat sich eine Datei seit dem Öffnen geändert
+    (Größe oder mtime), wird sie neu eingeblendet.
+    """
+
+    def __init__(self, max_open_files: int = 64):
+        self.max_open_files = max_open_files
+        self._open: 'OrderedDict[str, _MappedFile]' = OrderedDict()
+        self._file_ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def file_id(self, file_path: Union[str, Path]) -> int:
+        """Gibt die fortlaufende ID einer Datei zurück"""
+        path = str(file_path)
+        with self._lock:
+            return self._file_ids.setdefault(path, len(self._file_ids))
+
+    def read_span(self, file_path: Union[str, Path], start: int, end: int) -> Optional[str]:
+        """
+        Liest einen Byte-Bereich einer Datei als Text
+
+        Args:
+            file_path: Pfad zur Datei
+            start: Start-Offset in Bytes
+            end: End-Offset in Bytes (exklusiv)
+
+        Returns:
+            Dekodierter Text oder None, wenn die Datei nicht lesbar ist oder
+            der Bereich nicht mehr in der Datei liegt
+        """
+        path = str(file_path)
+        with self._lock:
+            mapped = self._get_mapping(path)
+            if mapped is None:
+                return None
+            if start < 0 or start > end or end > mapped.size:
+                print(f"Warnung: Bereich {start}-{end} liegt außerhalb von {path} (Datei geändert?)")
+                return None
+            data = mapped.view[start:end]
+        return decode_text(data)
+
+    def read_file(self, file_path: Union[str, Path]) -> Optional[str]:
+        """Liest den gesamten Inhalt einer Datei als Text"""
+        path = str(file_path)
+        with self._lock:
+            mapped = self._get_mapping(path)
+            if mapped is None:
+                return None
+            data = mapped.view[:]
+        return decode_text(data)
+
+    def _get_mapping(self, path: str) -> Optional[_MappedFile]:
+        """Gibt die eingeblendete Datei zurück und öffnet sie bei Bedarf"""
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            print(f"Warnung: Datei {path} nicht lesbar: {e}")
+            return None
+
+        mapped = self._open.get(path)
+        if mapped is not None:
+            if mapped.size == stat.st_size and mapped.mtime_ns == stat.st_mtime_ns:
+                self._open.move_to_end(path)
+                self.hits += 1
+                return mapped
+            self._close_mapping(self._open.pop(path))
+
+        self.misses += 1
+        try:
+            mapped = self._map_file(path, stat)
+        except (OSError, ValueError) as e:
+            print(f"Warnung: Datei {path} nicht lesbar: {e}")
+            return None
+
+        self._open[path] = mapped
+        while len(self._open) > self.max_open_files:
+            _, evicted = self._open.popitem(last=False)
+            self._close_mapping(evicted)
+        return mapped
+
+    @staticmethod
+    def _map_file(path: str, stat: os.stat_result) -> _MappedFile:
+        """Blendet eine Datei schreibgeschützt ein"""
+        if stat.st_size == 0:
+            # Leere Dateien lassen sich nicht einblenden
+            return _MappedFile(None, b'', 0, stat.st_mtime_ns)
+        file = open(path, 'rb')
+        try:
+            view = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            file.close()
+            raise
+        return _MappedFile(file, view, len(view), stat.st_mtime_ns)
+
+    @staticmethod
+    def _close_mapping(mapped: _MappedFile):
+        """Schließt eine eingeblendete Datei"""
+        if isinstance(mapped.view, mmap.mmap):
+            mapped.view.close()
+        if mapped.file is not None:
+            mapped.file.close()
+
+    @property
+    def open_files(self) -> int:
+        """Anzahl der aktuell geöffneten Dateien"""
+        return len(self._open)
+
+    def close(self):
+        """Schließt alle geöffneten Dateien"""
+        with self._lock:
+            while self._open:
+                _, mapped = self._open.popitem()
+                self._close_mapping(mapped)
+
+
+_default_provider: Optional[ContentProvider] = None
+_default_lock = threading.Lock()
+
+
+def get_content_provider() -> ContentProvider:
+    """Gibt den gemeinsam genutzten ContentProvider des Prozesses zurück"""
+    global _default_provider
+    if _default_provider is None:
+        with _default_lock:
+            if _default_provider is None:
+                _default_provider = ContentProvider()
+    return _default_provider
+
+
+def line_spans(data: bytes) -> Tuple[list, list]:
+    """
+    Ermittelt Start- und End-Offsets (ohne Zeilenumbruch) aller Zeilen
+
+    Zeilenumbrüche werden wie beim Öffnen im Textmodus erkannt (\\n, \\r\\n, \\r),
+    sodass Zeile n hier Zeile n des dekodierten Texts entspricht.
+    """
+    starts = [0]
+    ends = []
+    position = 0
+    length = len(data)
+    while True:
+        newline = data.find(b'\n', position)
+        carriage = data.find(b'\r', position, newline if newline != -1 else length)
+        if carriage != -1:
+            ends.append(carriage)
+            position = carriage + 2 if data[carriage + 1:carriage + 2] == b'\n' else carriage + 1
+        elif newline != -1:
+            ends.append(newline)
+            position = newline + 1
+        else:
+            ends.append(length)
+            return starts, ends
+        starts.append(position)
@@ -53,7 +53,22 @@ class ReportGenerator:
         for item in discrepancies['mismatched_elements']:
             code_elem = item['code']
             doc_elem = item['documentation']
-            report.append(f"- Code: {code_elem.name} vs Doc: {doc_elem.name}")
+            confidence = item.get('match_confidence', 1.0)
+            suffix = f" (Zuordnung {confidence:.2f})" if confidence < 1.0 else ""
+            report.append(f"- Code: {code_elem.name} vs Doc: {doc_elem.name}{suffix}")
         report.append("")
+
+        if discrepancies.get('fuzzy_matches'):
+            report.append("## Unscharf zugeordnete Dokumentation")
+            for match in discrepancies['fuzzy_matches']:
+                report.append(f"- Doc: {match['doc_name']} -> Code: {match['qualified_name']} "
+                              f"(Konfidenz {match['match_confidence']:.2f})")
+            report.append("")
+
+        if discrepancies.get('ambiguous_documentation'):
+            report.append("## Mehrdeutig zugeordnete Dokumentation")
+            for entry in discrepancies['ambiguous_documentation']:
+                report.append(f"- Doc: {entry['doc_name']} -> nicht abgedeckt: {', '.join(entry['candidates'])}")
+            report.append("")
         
         return "\n".join(report)
\ No newline at end of file
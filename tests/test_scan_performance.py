@@ -0,0 +1,2059 @@
+"""
+Tests für die Performance-Erweiterungen des Scanners
+"""
+import unittest
+import tempfile
+import shutil
+import os
+import subprocess
+import ast
+import json
+import re
+import time
+import asyncio
+import random
+import threading
+from unittest import mock
+from pathlib import Path
+from typing import Optional
+from src.core.config_manager import ProjectConfig
+from src.scanner.universal_scanner import UniversalScanner
+from src.scanner.scan_cache import ScanCache, compute_content_hash, CACHE_GITIGNORE
+from src.scanner.file_handler import FileHandler
+from src.scanner.gitignore_handler import GitIgnoreHandler
+from src.scanner.git_file_lister import parse_ls_files_output
+from src.scanner.file_manifest import FileEntry
+from src.scanner.parallel_scanner import ParallelScanner, AsyncScanner, split_into_balanced_chunks
+from src.scanner.progress_callback import ScanProgressCallback, ProgressEvent, format_duration
+from src.scanner.file_analyzer import FileAnalyzer
+from src.scanner.streaming_stats import QuantileSketch, ReservoirSample
+from src.scanner import element_codec
+from src.scanner.code_scanner import CodeScanner
+from src.scanner.framework_parsers import FastAPIParser
+from src.scanner.parse_context import ParseContext, NodeExtractor, dispatch_ast
+from src.scanner.line_index import LineIndex
+from src.scanner.js_extractor import JavaScriptExtractor, extract_javascript_elements
+from src.scanner.scan_result import FileScanResult
+from src.models.element_store import ElementStore, ElementRow, CODE_KIND, DOC_KIND
+from src.utils.content_provider import ContentProvider
+from src.matcher.advanced_matcher import AdvancedMatcherEngine, compact_scan_result
+from src.docs_updater import _json_default
+from src.matcher.match_cache import MatchCache
+from src.updater.chroma_updater import ChromaUpdater
+from src.chroma.client import ChromaDBClient
+from src.scanner.doc_scanner import DocScanner
+from src.models.element import CodeElement, DocElement, ElementType
+from src.scanner.performance_analyzer import PerformanceAnalyzer, LatencyHistogram, measure_phase, get_active_analyzer
+from src.matcher import MatcherEngine
+from src.matcher.symbol_index import (SymbolIndex, normalize_name, trigrams, trigram_similarity, fuzzy_key,
+                                      MATCH_QUALIFIED, MATCH_NORMALIZED, MATCH_FUZZY)
+from src.scanner.scan_profiler import ScanProfiler, StackSampler
+from src.benchmarks.synthetic_repo import generate_project
+from src.benchmarks import pipeline as pipeline_benchmark
+from src.benchmarks import similarity as similarity_benchmark
+from src.matcher.similarity import (SIMILARITY_MEASURES, MinHashSimilarity, ShingleSimilarity,
+                                    TokenSetSimilarity, create_similarity)
+from src.matcher.embedding_similarity import (ElementEmbeddings, EmbeddingSimilarity, blocked_top_k, element_key,
+                                              normalize_rows)
+from src.matcher.doc_sections import DocSectionCache, parse_doc_sections
+from src.utils.report_generator import ReportGenerator
+import numpy as np
+import chromadb
+
+
+class TestScanCache(unittest.TestCase):
+    """Tests für den persistenten Scan-Cache"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.project_dir = self.temp_dir / "project"
+        self.project_dir.mkdir()
+        (self.project_dir / "module.py").write_text(
+            "def first():\n    return 1\n\n\nclass Second:\n    pass\n"
+        )
+        (self.project_dir / "README.md").write_text("# Projekt\n\n## first\n")
+
+        self.config = ProjectConfig()
+        self.config.scan_paths = ["."]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_content_hash_matches_git_blob_id(self):
+        """Testet, dass der Inhalts-Hash einer Git-Blob-ID entspricht"""
+        # Bekannte Blob-ID von `printf 'hello\\n' | git hash-object --stdin`
+        self.assertEqual(compute_content_hash(b"hello\n"), "ce013625030ba8dba906f756967f9e9ca394464a")
+
+    def test_cache_dir_is_ignored_by_git(self):
+        """Testet, dass das Cache-Verzeichnis im gescannten Repository nicht als unversioniert erscheint"""
+        subprocess.run(["git", "init", "-q"], cwd=self.project_dir, check=True)
+        ScanCache(self.project_dir).close()
+
+        self.assertEqual((self.project_dir / ".daut_cache" / ".gitignore").read_text(encoding="utf-8"),
+                         CACHE_GITIGNORE)
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=all"], cwd=self.project_dir,
+                                check=True, capture_output=True, text=True).stdout
+        self.assertNotIn(".daut_cache", status)
+        self.assertIn("module.py", status)
+
+    def test_lookup_and_store_roundtrip(self):
+        """Testet das Speichern und Laden von Elementen"""
+        cache = ScanCache(self.project_dir)
+        file_path = self.project_dir / "module.py"
+        stat = file_path.stat()
+        element = CodeElement(name="first", type=ElementType.FUNCTION, line_number=1)
+
+        self.assertIsNone(cache.lookup(file_path, stat.st_size, stat.st_mtime_ns))
+        cache.store(file_path, [element, {'name': 'raw', 'type': 'api_endpoint'}],
+                    stat.st_size, stat.st_mtime_ns)
+
+        cached = cache.lookup(file_path, stat.st_size, stat.st_mtime_ns)
+        self.assertEqual(cached[0].name, "first")
+        self.assertEqual(cached[0].type, ElementType.FUNCTION)
+        self.assertEqual(cached[1]['name'], 'raw')
+        cache.close()
+
+    def test_touched_file_with_same_content_is_a_hit(self):
+        """Testet, dass eine geänderte mtime bei gleichem Inhalt ein Treffer bleibt"""
+        cache = ScanCache(self.project_dir)
+        file_path = self.project_dir / "module.py"
+        stat = file_path.stat()
+        cache.store(file_path, [], stat.st_size, stat.st_mtime_ns)
+
+        self.assertEqual(cache.lookup(file_path, stat.st_size, stat.st_mtime_ns + 1000), [])
+        self.assertEqual(cache.hits, 1)
+        cache.close()
+
+    def test_rescan_only_parses_changed_files(self):
+        """Testet, dass ein erneuter Scan nur geänderte Dateien parst"""
+        first = UniversalScanner(self.config).scan_project(str(self.project_dir))
+        self.assertEqual(first['scan_summary']['cache']['cache_misses'], 2)
+
+        module = self.project_dir / "module.py"
+        module.write_text(module.read_text() + "\n\ndef third():\n    return 3\n")
+        stat = module.stat()
+        os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        second = UniversalScanner(self.config).scan_project(str(self.project_dir))
+        cache_stats = second['scan_summary']['cache']
+        self.assertEqual(cache_stats['cache_hits'], 1)
+        self.assertEqual(cache_stats['cache_misses'], 1)
+        names = {elem.name for elem in second['code_elements']}
+        self.assertIn('third', names)
+        self.assertIn('Second', names)
+
+    def test_file_edited_during_scan_is_not_served_stale(self):
+        """Testet, dass der Cache den Hash der gescannten Bytes speichert, nicht den des späteren Inhalts"""
+        module = self.project_dir / "module.py"
+        edited = module.read_text().replace("first", "fixed")  # gleiche Größe
+        scanner = UniversalScanner(self.config)
+        original_scan = scanner.code_scanner.scan_file
+
+        def scan_then_edit(file_path, *args):
+            elements = original_scan(file_path, *args)
+            module.write_text(edited)
+            return elements
+
+        with mock.patch.object(scanner.code_scanner, 'scan_file', side_effect=scan_then_edit), \
+                mock.patch('builtins.open', wraps=open) as opened:
+            first = scanner.scan_project(str(self.project_dir))
+        self.assertIn('first', {elem.name for elem in first['code_elements']})
+        # Die Datei wird für Scan und Cache nur einmal gelesen
+        self.assertEqual(sum(1 for call in opened.call_args_list if Path(call.args[0]) == module), 1)
+
+        stat = module.stat()
+        os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        second = UniversalScanner(self.config).scan_project(str(self.project_dir))
+        names = {elem.name for elem in second['code_elements']}
+        self.assertIn('fixed', names)
+        self.assertNotIn('first', names)
+
+    def test_store_without_hash_skips_changed_file(self):
+        """Testet, dass store ohne Hash nichts speichert, wenn sich die Datei seit dem Stat geändert hat"""
+        cache = ScanCache(self.project_dir)
+        file_path = self.project_dir / "module.py"
+        stat = file_path.stat()
+        cache.store(file_path, [], stat.st_size, stat.st_mtime_ns - 10 ** 9)
+        self.assertIsNone(cache.lookup(file_path, stat.st_size, stat.st_mtime_ns - 10 ** 9))
+        cache.close()
+
+    def test_cache_can_be_disabled(self):
+        """Testet, dass der Cache über die Konfiguration abschaltbar ist"""
+        self.config.use_scan_cache = False
+        result = UniversalScanner(self.config).scan_project(str(self.project_dir))
+        self.assertIsNone(result['scan_summary']['cache'])
+        self.assertFalse((self.project_dir / ".daut_cache").exists())
+
+
+class TestFileManifest(unittest.TestCase):
+    """Tests für das Datei-Manifest aus einem einzigen Verzeichnisdurchlauf"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / "src").mkdir()
+        (self.temp_dir / "src" / "app.py").write_text("x = 1\n")
+        (self.temp_dir / "node_modules").mkdir()
+        (self.temp_dir / "node_modules" / "lib.js").write_text("var a;\n")
+        (self.temp_dir / "README.md").write_text("# Titel\n")
+        self.config = ProjectConfig()
+        self.handler = FileHandler(self.config)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_manifest_contains_stat_metadata(self):
+        """Testet, dass das Manifest Größe, mtime und Inode enthält"""
+        manifest = self.handler.build_manifest(self.temp_dir)
+        entries = {entry.path.name: entry for entry in manifest}
+
+        self.assertEqual(set(entries), {"app.py", "README.md"})
+        stat = (self.temp_dir / "src" / "app.py").stat()
+        self.assertEqual(entries["app.py"].size, stat.st_size)
+        self.assertEqual(entries["app.py"].mtime_ns, stat.st_mtime_ns)
+        self.assertEqual(entries["app.py"].inode, stat.st_ino)
+        self.assertIn(self.temp_dir / "node_modules", manifest.excluded_dirs)
+
+    def test_symlink_loop_is_not_followed(self):
+        """Testet den Schutz vor Symlink-Schleifen"""
+        os.symlink(self.temp_dir, self.temp_dir / "src" / "loop")
+        manifest = self.handler.build_manifest(self.temp_dir)
+        self.assertEqual(len(manifest), 2)
+
+    def test_overlapping_scan_paths_are_deduplicated(self):
+        """Testet, dass Dateien aus überlappenden Scan-Pfaden nur einmal erscheinen"""
+        self.config.scan_paths = [".", "src"]
+        manifests = self.handler.build_manifests(self.temp_dir)
+        self.assertEqual(len(manifests), 2)
+        self.assertEqual(sum(len(manifest) for manifest in manifests), 2)
+
+
+class TestCompiledGitIgnore(unittest.TestCase):
+    """Tests für die kompilierten .gitignore-Regeln"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / ".gitignore").write_text(
+            "*.log\n!keep.log\nbuild/\n/root_only.py\ndocs_gen/**/*.html\n"
+        )
+        (self.temp_dir / "pkg").mkdir()
+        (self.temp_dir / "pkg" / ".gitignore").write_text("!debug.log\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_negation_and_nested_precedence(self):
+        """Testet Negation und den Vorrang tieferer .gitignore-Dateien"""
+        handler = GitIgnoreHandler(self.temp_dir)
+        self.assertTrue(handler.is_ignored(self.temp_dir / "app.log"))
+        self.assertFalse(handler.is_ignored(self.temp_dir / "keep.log"))
+        self.assertTrue(handler.is_ignored(self.temp_dir / "pkg" / "other.log"))
+        self.assertFalse(handler.is_ignored(self.temp_dir / "pkg" / "debug.log"))
+
+    def test_directory_only_and_anchored_rules(self):
+        """Testet Regeln mit abschließendem / und verankerte Muster"""
+        handler = GitIgnoreHandler(self.temp_dir)
+        self.assertTrue(handler.matches(self.temp_dir / "build", is_dir=True))
+        self.assertFalse(handler.matches(self.temp_dir / "build", is_dir=False))
+        self.assertTrue(handler.is_ignored(self.temp_dir / "pkg" / "build" / "out.py"))
+        self.assertTrue(handler.is_ignored(self.temp_dir / "root_only.py"))
+        self.assertFalse(handler.is_ignored(self.temp_dir / "pkg" / "root_only.py"))
+        self.assertTrue(handler.is_ignored(self.temp_dir / "docs_gen" / "a" / "b" / "index.html"))
+
+    def test_ignored_directories_are_pruned(self):
+        """Testet, dass ignorierte Verzeichnisse beim Durchlauf nicht betreten werden"""
+        (self.temp_dir / "build").mkdir()
+        (self.temp_dir / "build" / "generated.py").write_text("x = 1\n")
+        (self.temp_dir / "main.py").write_text("x = 1\n")
+
+        manifest = FileHandler(ProjectConfig()).build_manifest(self.temp_dir)
+        self.assertEqual([entry.path.name for entry in manifest], ["main.py"])
+        self.assertIn(self.temp_dir / "build", manifest.excluded_dirs)
+        self.assertEqual(manifest.directories_walked, 2)
+
+
+class TestGitEnumeration(unittest.TestCase):
+    """Tests für die Dateiauflistung über git ls-files"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / ".gitignore").write_text("ignored/\nauto_docs/\n")
+        (self.temp_dir / "tracked.py").write_text("x = 1\n")
+        (self.temp_dir / "changed.py").write_text("y = 1\n")
+        self._git("init", "-q")
+        self._git("add", ".")
+        self._git("-c", "user.name=Test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "init")
+
+        (self.temp_dir / "changed.py").write_text("y = 2\n")
+        (self.temp_dir / "untracked.py").write_text("z = 1\n")
+        (self.temp_dir / "ignored").mkdir()
+        (self.temp_dir / "ignored" / "skip.py").write_text("a = 1\n")
+        (self.temp_dir / "auto_docs").mkdir()
+        (self.temp_dir / "auto_docs" / "api.md").write_text("# API\n")
+
+        self.config = ProjectConfig()
+        self.config.file_enumeration = "git"
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _git(self, *args):
+        subprocess.run(["git", *args], cwd=self.temp_dir, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def test_git_manifest_matches_walker(self):
+        """Testet, dass Git-Auflistung und Verzeichnisdurchlauf dieselben Dateien liefern"""
+        git_manifest = FileHandler(self.config).build_manifest(self.temp_dir)
+        self.config.file_enumeration = "walk"
+        walk_manifest = FileHandler(self.config).build_manifest(self.temp_dir)
+
+        self.assertEqual(git_manifest.enumeration, "git")
+        self.assertEqual(walk_manifest.enumeration, "walk")
+        self.assertEqual(sorted(git_manifest.paths), sorted(walk_manifest.paths))
+        self.assertIn(self.temp_dir / "auto_docs" / "api.md", git_manifest.paths)
+        self.assertNotIn(self.temp_dir / "ignored" / "skip.py", git_manifest.paths)
+
+    def test_nested_ignored_docs_are_scanned(self):
+        """Testet, dass gitignorierte docs-Verzeichnisse in beliebiger Tiefe wie beim Durchlauf gescannt werden"""
+        package = self.temp_dir / "pkg"
+        (package / "docs" / "api").mkdir(parents=True)
+        (package / ".gitignore").write_text("docs/\n")
+        (package / "module.py").write_text("def f():\n    pass\n")
+        (package / "docs" / "guide.md").write_text("# Guide\n")
+        (package / "docs" / "api" / "ref.md").write_text("# Ref\n")
+        # Ignorierte Datei in einem nicht ignorierten docs-Verzeichnis
+        (self.temp_dir / "site" / "docs").mkdir(parents=True)
+        (self.temp_dir / "site" / "docs" / "index.md").write_text("# Index\n")
+        (self.temp_dir / "site" / ".gitignore").write_text("generated.md\n")
+        (self.temp_dir / "site" / "docs" / "generated.md").write_text("# Generiert\n")
+        # Unterhalb eines ignorierten Verzeichnisses bleibt docs unsichtbar
+        (self.temp_dir / "ignored" / "docs").mkdir()
+        (self.temp_dir / "ignored" / "docs" / "hidden.md").write_text("# Versteckt\n")
+
+        git_manifest = FileHandler(self.config).build_manifest(self.temp_dir)
+        self.config.file_enumeration = "walk"
+        walk_manifest = FileHandler(self.config).build_manifest(self.temp_dir)
+
+        self.assertEqual(git_manifest.enumeration, "git")
+        self.assertEqual(sorted(git_manifest.paths), sorted(walk_manifest.paths))
+        self.assertIn(package / "docs" / "api" / "ref.md", git_manifest.paths)
+        self.assertIn(self.temp_dir / "site" / "docs" / "generated.md", git_manifest.paths)
+        self.assertNotIn(self.temp_dir / "ignored" / "docs" / "hidden.md", git_manifest.paths)
+
+    def test_blob_ids_only_for_unmodified_files(self):
+        """Testet, dass Blob-IDs nur für unveränderte Dateien übernommen werden"""
+        manifest = FileHandler(self.config).build_manifest(self.temp_dir)
+        entries = {entry.path.name: entry for entry in manifest}
+
+        tracked = (self.temp_dir / "tracked.py").read_bytes()
+        self.assertEqual(entries["tracked.py"].blob_id, compute_content_hash(tracked))
+        self.assertIsNone(entries["changed.py"].blob_id)
+        self.assertIsNone(entries["untracked.py"].blob_id)
+
+    def test_falls_back_to_walker_outside_git(self):
+        """Testet den Rückfall auf den Verzeichnisdurchlauf außerhalb von Git"""
+        shutil.rmtree(self.temp_dir / ".git")
+        self.config.file_enumeration = "auto"
+        manifest = FileHandler(self.config).build_manifest(self.temp_dir)
+        self.assertEqual(manifest.enumeration, "walk")
+        self.assertIn(self.temp_dir / "tracked.py", manifest.paths)
+
+    def test_parse_ls_files_output(self):
+        """Testet die Auswertung geänderter, gelöschter und neuer Einträge"""
+        output = "\0".join([
+            "? new.py",
+            "H 100644 aaa 0\tsame.py",
+            "H 100644 bbb 0\tedited.py",
+            "C 100644 bbb 0\tedited.py",
+            "H 100644 ccc 0\tgone.py",
+            "R 100644 ccc 0\tgone.py",
+            "H 160000 ddd 0\tsubmodule",
+        ]) + "\0"
+        listed = {item.path: item.blob_id for item in parse_ls_files_output(output)}
+        self.assertEqual(listed, {"new.py": None, "same.py": "aaa", "edited.py": None})
+
+
+class TestProcessPoolScanning(unittest.TestCase):
+    """Tests für das Scannen mit einem Prozess-Pool"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        for index in range(6):
+            (self.temp_dir / f"module_{index}.py").write_text(
+                f"def func_{index}(a, b=1):\n    return a\n\n\nclass Klasse{index}:\n    pass\n"
+            )
+        (self.temp_dir / "README.md").write_text("# Titel\n\n## Abschnitt\n\nText\n")
+        self.config = ProjectConfig()
+        self.config.max_file_size_mb = 1
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_process_pool_matches_threading(self):
+        """Testet, dass Prozess-Pool und Threading dieselben Elemente liefern"""
+        scanner = ParallelScanner(self.config, max_workers=2)
+        threaded = scanner.scan_project_parallel(str(self.temp_dir), use_threading=True)
+        processed = scanner.scan_project_parallel(str(self.temp_dir), use_threading=False)
+
+        def key(element):
+            return (element.file_path, element.name, element.line_number, element.type)
+
+        self.assertEqual(sorted(map(key, threaded['code_elements'])), sorted(map(key, processed['code_elements'])))
+        self.assertEqual(sorted(map(key, threaded['doc_elements'])), sorted(map(key, processed['doc_elements'])))
+        self.assertTrue(all(isinstance(element, CodeElement) for element in processed['code_elements']))
+        self.assertTrue(all(isinstance(element.type, ElementType) for element in processed['code_elements']))
+
+    def test_size_balanced_chunks(self):
+        """Testet die Verteilung der Dateien auf Chunks ähnlicher Gesamtgröße"""
+        sizes = [900, 500, 400, 300, 300, 100]
+        entries = [FileEntry(Path(f"/p/f{index}.py"), size, 0, index) for index, size in enumerate(sizes)]
+        chunks = split_into_balanced_chunks(entries, 2)
+
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(sorted(path for chunk in chunks for path in chunk), sorted(str(entry.path) for entry in entries))
+        by_path = {str(entry.path): entry.size for entry in entries}
+        totals = sorted(sum(by_path[path] for path in chunk) for chunk in chunks)
+        self.assertEqual(totals, [1200, 1300])
+
+    def test_codec_roundtrip(self):
+        """Testet die kompakte Kodierung von Elementen"""
+        elements = [
+            CodeElement(name="f", type=ElementType.FUNCTION, parameters=[{'name': 'a'}], file_path="/p/a.py"),
+            DocElement(name="Titel", type=ElementType.DOC_HEADING, level=1, file_path="/p/a.md"),
+            {'name': 'GET /', 'type': 'api_endpoint'}
+        ]
+        packed = element_codec.pack_records([element_codec.encode_element(element) for element in elements])
+        decoded = [element_codec.decode_element(record) for record in element_codec.unpack_records(packed)]
+
+        self.assertEqual(decoded[0], elements[0])
+        self.assertEqual(decoded[1], elements[1])
+        self.assertEqual(decoded[2], elements[2])
+
+
+class TestSharedParseContext(unittest.TestCase):
+    """Tests für den gemeinsamen Parse-Kontext"""
+
+    SOURCE = (
+        "from fastapi import FastAPI\n"
+        "app = FastAPI()\n\n"
+        "@app.get('/items')\n"
+        "def list_items():\n"
+        "    \"\"\"Listet Items\"\"\"\n"
+        "    return []\n"
+    )
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.file_path = self.temp_dir / "main.py"
+        self.file_path.write_text(self.SOURCE)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_framework_parser_shares_single_parse(self):
+        """Testet, dass CodeScanner und Framework-Parser nur einmal lesen und parsen"""
+        scanner = CodeScanner(ProjectConfig())
+        with mock.patch('src.scanner.parse_context.ast.parse', wraps=ast.parse) as parse, \
+                mock.patch('src.scanner.parse_context.ast.walk', wraps=ast.walk) as walk, \
+                mock.patch('builtins.open', wraps=open) as opened:
+            elements = scanner.scan_file(self.file_path, [FastAPIParser()])
+
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(walk.call_count, 1)
+        self.assertEqual(opened.call_count, 1)
+        endpoints = [element for element in elements if isinstance(element, dict)]
+        self.assertEqual(endpoints[0]['api_info']['path'], '/items')
+        self.assertEqual(endpoints[0]['code_snippet'].splitlines()[0], "def list_items():")
+        self.assertIn('list_items', {element.name for element in elements if isinstance(element, CodeElement)})
+
+    def test_dispatch_by_node_type(self):
+        """Testet die Verteilung der Knoten an die zuständigen Extraktoren"""
+        class NameCollector(NodeExtractor):
+            node_types = (ast.FunctionDef,)
+
+            def extract_node(self, node, context):
+                return [node.name]
+
+        context = ParseContext(self.file_path, self.SOURCE)
+        results = dispatch_ast(context, [NameCollector(), NodeExtractor()])
+        self.assertEqual(results, [['list_items'], []])
+        self.assertEqual(context.line_number_at(self.SOURCE.index('def')), 5)
+        self.assertEqual(context.get_lines(4, 5), "@app.get('/items')\ndef list_items():")
+
+
+class TestHeaderSignatures(unittest.TestCase):
+    """Tests für Signaturen aus dem def-/class-Kopf"""
+
+    SOURCE = (
+        "@decorator\n"
+        "def compute(a: int,\n"
+        "            b: str = ':',  # Kommentar\n"
+        "            ) -> Dict[str, int]:\n"
+        "    return {}\n\n\n"
+        "class Service(Base, metaclass=Meta):\n"
+        "    \"\"\"Dienst\"\"\"\n\n"
+        "    def run(self): return 1\n"
+    )
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.file_path = self.temp_dir / "module.py"
+        self.file_path.write_text(self.SOURCE)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_signatures_contain_only_the_header(self):
+        """Testet, dass Signaturen weder Rumpf noch Dekoratoren enthalten"""
+        elements = {element.name: element for element in CodeScanner(ProjectConfig()).scan_file(self.file_path)}
+
+        self.assertEqual(elements['compute'].signature, "def compute(a: int, b: str = ':',) -> Dict[str, int]")
+        self.assertEqual(elements['Service'].signature, "class Service(Base, metaclass=Meta)")
+        self.assertEqual(elements['run'].signature, "def run(self)")
+        self.assertEqual(elements['run'].code_snippet, "    def run(self): return 1")
+
+
+class TestLineIndex(unittest.TestCase):
+    """Tests für den Zeilenindex der regex-basierten Scanner"""
+
+    def test_line_numbers_match_newline_count(self):
+        """Testet, dass der Index dieselben Zeilennummern wie das Zählen von Zeilenumbrüchen liefert"""
+        text = "a\n\nfunction b() {}\nconst c = () => 1\n"
+        index = LineIndex(text)
+        for offset in range(len(text) + 1):
+            self.assertEqual(index.line_number(offset), text[:offset].count('\n') + 1)
+
+    def test_markdown_code_block_lines(self):
+        """Testet die Zeilennummern von Code-Blöcken in Markdown"""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            file_path = temp_dir / "guide.md"
+            file_path.write_text("# Titel\n\nText\n\n```python\nx = 1\n```\n\n```\ny\n```\n")
+            blocks = [element for element in DocScanner(ProjectConfig()).scan_file(file_path)
+                      if element.type == ElementType.DOC_CODE_BLOCK]
+            self.assertEqual([block.line_number for block in blocks], [5, 9])
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestJavaScriptExtractor(unittest.TestCase):
+    """Tests für den tokenbasierten JavaScript/TypeScript-Extraktor"""
+
+    SOURCE = (
+        "import { x } from './x';\n"
+        "// function commented() {}\n"
+        "const text = 'function inString() {}';\n"
+        "const tpl = `function inTemplate() { ${value} }`;\n"
+        "const re = /function inRegex\\(\\)/g;\n"
+        "export async function fetchData(url: string, retries = 3): Promise<Data> {\n"
+        "  if (retries) { call(url); }\n"
+        "  return request(url);\n"
+        "}\n"
+        "export const square = (n: number) => n * n;\n"
+        "class Service extends Base {\n"
+        "  constructor(private api: Api) { super(); }\n"
+        "  async load(id) { return this.api.get(id); }\n"
+        "  #secret() { return 1; }\n"
+        "}\n"
+        "exports.legacy = function (a, b) { return a + b; };\n"
+        "foo(bar);\n"
+    )
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.file_path = self.temp_dir / "service.ts"
+        self.file_path.write_text(self.SOURCE)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_declarations_and_line_numbers(self):
+        """Testet, dass nur Deklarationen mit korrekten Zeilennummern gefunden werden"""
+        elements = extract_javascript_elements(self.SOURCE)
+        lines = {element.name: element.line_number for element in elements}
+
+        self.assertEqual(lines, {
+            'fetchData': 6, 'square': 10, 'Service': 11, 'constructor': 12,
+            'load': 13, '#secret': 14, 'legacy': 16
+        })
+
+        fetch = next(element for element in elements if element.name == 'fetchData')
+        self.assertTrue('async function fetchData(' in fetch.signature)
+        self.assertEqual([param['name'] for param in fetch.parameters], ['url', 'retries'])
+        self.assertTrue(fetch.code_snippet.rstrip().endswith('}'))
+
+    def test_regex_extractor_remains_available(self):
+        """Testet, dass der bisherige regex-basierte Extraktor per Konfiguration wählbar bleibt"""
+        tokenizer_names = {element.name for element in CodeScanner(ProjectConfig()).scan_file(self.file_path)}
+        regex_config = ProjectConfig(javascript_extractor="regex")
+        regex_names = {element.name for element in CodeScanner(regex_config).scan_file(self.file_path)}
+
+        self.assertNotIn('foo', tokenizer_names)
+        self.assertNotIn('inString', tokenizer_names)
+        self.assertIn('foo', regex_names)
+
+    def test_object_literal_methods(self):
+        """Testet, dass Methoden und Funktionswerte in Objektliteralen gefunden werden"""
+        source = (
+            "const api = {\n"
+            "  fetch() { return get(); },\n"
+            "  save: function (item) { return put(item); },\n"
+            "  remove: async (id) => { del(id); },\n"
+            "  nested: { list() { return []; } },\n"
+            "  value: 1, short,\n"
+            "};\n"
+            "function handle({ a, b }) { if (a) { b(); } }\n"
+        )
+        elements = extract_javascript_elements(source)
+        lines = {element.name: element.line_number for element in elements}
+
+        self.assertEqual(lines, {'fetch': 2, 'save': 3, 'remove': 4, 'list': 5, 'handle': 8})
+        save = next(element for element in elements if element.name == 'save')
+        self.assertEqual([param['name'] for param in save.parameters], ['item'])
+        self.assertTrue(save.code_snippet.rstrip().endswith('},'))
+
+    def test_bracket_pairs_in_one_pass(self):
+        """Testet die einmalig bestimmten Klammerpaare bei verschachtelten und offenen Klammern"""
+        extractor = JavaScriptExtractor("f(a[0], { b: (c) });\n(unclosed")
+        values = [token.value for token in extractor.tokens]
+        pairs = {values[open_index] + values[close]: (open_index, close)
+                 for open_index, close in extractor._bracket_pairs().items()}
+
+        self.assertEqual(set(pairs), {'()', '[]', '{}'})
+        self.assertEqual(len(extractor._bracket_pairs()), 4)
+        self.assertIsNone(extractor._matching(values.index('unclosed') - 1))
+        self.assertEqual(values[extractor._matching(1)], ')')
+        self.assertEqual(extractor._matching(1), values.index(';') - 1)
+
+
+class TestStreamingScan(unittest.TestCase):
+    """Tests für den dateiweisen Projekt-Scan und seine Verbraucher"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.project_dir = self.temp_dir / "project"
+        self.project_dir.mkdir()
+        (self.project_dir / "module.py").write_text("def first():\n    return 1\n\n\ndef second():\n    pass\n")
+        (self.project_dir / "other.py").write_text("class Third:\n    pass\n")
+        (self.project_dir / "README.md").write_text("# Projekt\n\n## first\n\nText\n")
+
+        self.config = ProjectConfig()
+        self.config.scan_paths = ["."]
+        self.config.use_scan_cache = False
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_results_are_yielded_per_file(self):
+        """Testet, dass jede Datei einzeln geliefert und die Zusammenfassung fortgeschrieben wird"""
+        scanner = UniversalScanner(self.config)
+        seen_elements = []
+        for result in scanner.scan_project_iter(str(self.project_dir)):
+            seen_elements.append(len(result.elements))
+            summary = scanner.scan_summary
+            self.assertEqual(summary.code_elements + summary.doc_elements, sum(seen_elements))
+            self.assertFalse(summary.completed)
+
+        self.assertEqual(len(seen_elements), 3)
+        self.assertTrue(scanner.scan_summary.completed)
+        self.assertEqual(scanner.scan_summary.code_files, 2)
+
+        full = UniversalScanner(self.config).scan_project(str(self.project_dir))
+        self.assertEqual(sum(seen_elements), len(full['code_elements']) + len(full['doc_elements']))
+        self.assertEqual(full['scan_summary']['total_files_scanned'], sum(seen_elements))
+
+    def test_matcher_consumes_stream_without_full_content(self):
+        """Testet, dass der Matcher den Stream verarbeitet und full_content nicht behält"""
+        scanner = UniversalScanner(self.config)
+        streamed = AdvancedMatcherEngine().find_discrepancies_stream(scanner.scan_project_iter(str(self.project_dir)))
+        full = UniversalScanner(self.config).scan_project(str(self.project_dir))
+        expected = AdvancedMatcherEngine().find_discrepancies(full['code_elements'], full['doc_elements'])
+
+        for key in ('undocumented_code', 'outdated_documentation'):
+            self.assertEqual([elem.name for elem in streamed[key]], [elem.name for elem in expected[key]])
+        self.assertTrue(all(elem.full_content is None for elem in streamed['outdated_documentation']))
+
+    def test_pydantic_v1_models_in_stream_consumers(self):
+        """Testet Reduktion und JSON-Ausgabe auch für Modelle mit der Pydantic-v1-API"""
+        from pydantic.v1 import BaseModel as V1BaseModel
+
+        class LegacyDoc(V1BaseModel):
+            name: str
+            full_content: Optional[str] = None
+
+        compacted = compact_scan_result(FileScanResult("README.md", "doc", [LegacyDoc(name="a", full_content="x")]))
+        self.assertEqual(compacted.elements, [LegacyDoc(name="a")])
+        self.assertEqual(json.loads(json.dumps([LegacyDoc(name="a")], default=_json_default)),
+                         [{'name': "a", 'full_content': None}])
+
+    def test_chroma_updater_consumes_stream(self):
+        """Testet, dass der ChromaUpdater jede Datei aus dem Stream einfügt"""
+        updater = ChromaUpdater.__new__(ChromaUpdater)
+        updater.chroma_client = mock.Mock()
+        updater.chroma_client.health_check.return_value = True
+        updater.chroma_client.create_collection.return_value = True
+        updater.ollama_client = mock.Mock()
+        updater.ollama_client.create_embedding.return_value = [0.1, 0.2]
+        updater.embedding_model = "test"
+
+        stream = [
+            FileScanResult("a.py", "code", [CodeElement(name="first", type=ElementType.FUNCTION), {'name': 'raw'}]),
+            FileScanResult("README.md", "doc", [DocElement(name="first", type=ElementType.DOC_HEADING, content="x")])
+        ]
+        self.assertTrue(updater.update_chroma_from_stream(iter(stream), str(self.project_dir)))
+
+        collections = [call.kwargs['collection_name'] for call in updater.chroma_client.add_embeddings.call_args_list]
+        self.assertEqual(collections, ["project_code", "project_docs"])
+
+
+class TestElementStore(unittest.TestCase):
+    """Tests für den spaltenorientierten Element-Speicher"""
+
+    def test_models_roundtrip(self):
+        """Testet, dass die Fassaden den ursprünglichen Modellen entsprechen"""
+        elements = [
+            CodeElement(name="compute", type=ElementType.FUNCTION, signature="def compute(a: int) -> str",
+                        parameters=[{'name': 'a', 'type_annotation': 'int', 'default': None}],
+                        return_type="str", docstring="Berechnet ä→ß", line_number=3,
+                        file_path="/p/mod.py", project_path="/p", code_snippet="def compute(a):\n    pass"),
+            {'name': 'GET /items', 'type': 'api_endpoint'},
+            DocElement(name="Titel", type=ElementType.DOC_HEADING, content="# Titel", level=1,
+                       line_number=1, file_path="/p/README.md"),
+            CodeElement(name="Service", type=ElementType.CLASS, methods=[{'name': 'run', 'is_private': False}],
+                        file_path="/p/mod.py")
+        ]
+        store = ElementStore.from_elements(elements)
+
+        self.assertEqual(len(store), 4)
+        self.assertEqual(list(store.code_elements()), [elements[0], elements[1], elements[3]])
+        self.assertEqual(list(store.doc_elements()), [elements[2]])
+        self.assertEqual(store[0].to_model(), elements[0])
+
+    def test_row_views(self):
+        """Testet den Feldzugriff über Zeilensichten"""
+        store = ElementStore.from_elements([
+            CodeElement(name="a", type=ElementType.FUNCTION, file_path="/p/x.py", line_number=5),
+            DocElement(name="b", type=ElementType.DOCUMENTATION, file_path="/p/x.md", full_content="Text"),
+            CodeElement(name="c", type=ElementType.CLASS, file_path="/p/x.py")
+        ])
+        row = store[0]
+        self.assertEqual((row.name, row.type, row.line_number, row.docstring), ("a", ElementType.FUNCTION, 5, None))
+        self.assertEqual(store[-2].full_content, "Text")
+        self.assertEqual([row.name for row in store.rows(CODE_KIND)], ["a", "c"])
+        self.assertEqual([row.kind for row in store], [CODE_KIND, DOC_KIND, CODE_KIND])
+        # Gleiche Pfade werden nur einmal gespeichert (dazu das Format "md")
+        self.assertEqual(sorted(store.strings.values), ["/p/x.md", "/p/x.py", "md"])
+        with self.assertRaises(AttributeError):
+            row.unknown_field
+
+    def test_scan_into_store(self):
+        """Testet den Scan eines Projekts direkt in den Speicher"""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            (temp_dir / "module.py").write_text("def first():\n    return 1\n")
+            (temp_dir / "README.md").write_text("# first\n")
+            config = ProjectConfig()
+            config.scan_paths = ["."]
+            config.use_scan_cache = False
+
+            store = UniversalScanner(config).scan_project_store(str(temp_dir))
+            full = UniversalScanner(config).scan_project(str(temp_dir))
+            self.assertEqual(list(store.code_elements()), full['code_elements'])
+            self.assertEqual(list(store.doc_elements()), full['doc_elements'])
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_scanners_write_rows(self):
+        """Testet, dass die Scanner ihre Elemente direkt als Zeilen in den Speicher schreiben"""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            py_file = temp_dir / "service.py"
+            py_file.write_text("import os\n\nclass Service:\n    def run(self, x: int = 1) -> str:\n"
+                               "        \"\"\"Startet\"\"\"\n        return str(x)\n")
+            js_file = temp_dir / "app.js"
+            js_file.write_text("class App {\n  start(port) {\n    return port;\n  }\n}\n")
+            md_file = temp_dir / "README.md"
+            md_file.write_text("# Service\n\n```python\nrun()\n```\n")
+            config = ProjectConfig(lazy_content=True)
+            code, docs = CodeScanner(config), DocScanner(config)
+
+            store = ElementStore()
+            rows = (code.scan_file(py_file, store=store) + code.scan_file(js_file, store=store)
+                    + docs.scan_file(md_file, store=store))
+            models = code.scan_file(py_file) + code.scan_file(js_file) + docs.scan_file(md_file)
+
+            self.assertEqual(len(store), len(models))
+            self.assertTrue(all(isinstance(row, ElementRow) for row in rows))
+            self.assertEqual([row.to_model() for row in rows], models)
+            self.assertEqual([row.get_code_snippet() for row in rows if row.kind == CODE_KIND],
+                             [model.get_code_snippet() for model in models if isinstance(model, CodeElement)])
+            self.assertEqual(rows[-1].get_full_content(), models[-1].get_full_content())
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_store_with_cache_and_duplicates(self):
+        """Testet Cache-Treffer und Dateikopien beim Scan in den Speicher"""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            source = "class Api:\n    def get(self):\n        return 1\n"
+            (temp_dir / "api.py").write_text(source)
+            (temp_dir / "mirror").mkdir()
+            (temp_dir / "mirror" / "api.py").write_text(source)
+            (temp_dir / "README.md").write_text("# Api\n")
+            config = ProjectConfig(deduplicate_content=True, use_scan_cache=True,
+                                   scan_cache_dir=str(temp_dir / ".cache"))
+            config.scan_paths = ["."]
+
+            expected = UniversalScanner(config).scan_project(str(temp_dir))
+            scanner = UniversalScanner(config)
+            store = scanner.scan_project_store(str(temp_dir))
+            self.assertEqual(scanner.scan_summary.cached_files, 2)
+            self.assertEqual(scanner.scan_summary.duplicate_files, 1)
+            self.assertEqual(list(store.code_elements()), expected['code_elements'])
+            self.assertEqual(list(store.doc_elements()), expected['doc_elements'])
+            self.assertEqual({row.file_path for row in store.rows(CODE_KIND)},
+                             {str(temp_dir / "api.py"), str(temp_dir / "mirror" / "api.py")})
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_matcher_on_rows(self):
+        """Testet, dass der Abgleich auf den Zeilen dasselbe Ergebnis wie auf den Modellen liefert"""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            (temp_dir / "users.py").write_text(
+                "def get_user(user_id: int) -> dict:\n    return {}\n\ndef delete_user(user_id):\n    pass\n")
+            (temp_dir / "users.md").write_text("# get_user\n\nParameter: name\n\n# legacy_function\n")
+            config = ProjectConfig(use_scan_cache=False)
+            config.scan_paths = ["."]
+
+            full = UniversalScanner(config).scan_project(str(temp_dir))
+            expected = AdvancedMatcherEngine().find_discrepancies(full['code_elements'], full['doc_elements'])
+            store = UniversalScanner(config).scan_project_store(str(temp_dir))
+            discrepancies = AdvancedMatcherEngine().find_discrepancies_store(store)
+
+            def conflicts(result):
+                # Die Lösungsvorschläge sind Objekte ohne Gleichheitsvergleich
+                return [(entry['qualified_name'], [conflict['conflict_type'] for conflict in entry['conflict_analysis']])
+                        for entry in result['conflict_analysis']]
+
+            for key in ('undocumented_code', 'outdated_documentation', 'fuzzy_matches', 'ambiguous_documentation'):
+                self.assertEqual(discrepancies[key], expected[key])
+            self.assertEqual(conflicts(discrepancies), conflicts(expected))
+            self.assertTrue(conflicts(expected))
+            self.assertEqual(discrepancies['mismatched_elements'][0]['code'], expected['mismatched_elements'][0]['code'])
+            self.assertEqual([elem.name for elem in discrepancies['undocumented_code']], ["delete_user"])
+            self.assertIsInstance(discrepancies['undocumented_code'][0], CodeElement)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestLazyContent(unittest.TestCase):
+    """Tests für Byte-Bereiche statt gespeicherter Snippets und Dokumentinhalte"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.py_file = self.temp_dir / "service.py"
+        self.py_file.write_bytes(
+            "# Kommentar äöü\r\nclass Service:\r\n    def run(self):\r\n        return 1\r\n\r\n"
+            "    def stop(self):\r\n        pass\r\n".encode('utf-8')
+        )
+        self.js_file = self.temp_dir / "app.js"
+        self.js_file.write_text("const a = 1;\nfunction start(x) {\n  return x;\n}\n")
+        self.md_file = self.temp_dir / "README.md"
+        self.md_file.write_text("# Titel\n\nInhalt\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _scan(self, lazy: bool):
+        config = ProjectConfig(lazy_content=lazy)
+        code = CodeScanner(config)
+        return code.scan_file(self.py_file) + code.scan_file(self.js_file) + DocScanner(config).scan_file(self.md_file)
+
+    def test_lazy_elements_load_same_text(self):
+        """Testet, dass verzögert geladene Texte den direkt gespeicherten entsprechen"""
+        eager = self._scan(lazy=False)
+        lazy = self._scan(lazy=True)
+        self.assertEqual(len(eager), len(lazy))
+
+        for eager_elem, lazy_elem in zip(eager, lazy):
+            if isinstance(eager_elem, CodeElement):
+                if eager_elem.code_snippet:
+                    self.assertIsNone(lazy_elem.code_snippet)
+                    self.assertIsNotNone(lazy_elem.snippet_span)
+                self.assertEqual(lazy_elem.get_code_snippet(), eager_elem.code_snippet)
+            else:
+                self.assertIsNone(lazy_elem.full_content)
+                self.assertEqual(lazy_elem.get_full_content(), eager_elem.full_content)
+
+        # Klasse und Methoden verweisen auf überlappende Bereiche derselben Datei
+        spans = {elem.name: elem.snippet_span for elem in lazy if isinstance(elem, CodeElement)}
+        self.assertLessEqual(spans['Service'][0], spans['run'][0])
+        self.assertGreaterEqual(spans['Service'][1], spans['stop'][1])
+
+    def test_store_keeps_spans(self):
+        """Testet, dass der ElementStore Byte-Bereiche erhält"""
+        lazy = [elem for elem in self._scan(lazy=True) if isinstance(elem, CodeElement)]
+        store = ElementStore.from_elements(lazy)
+        self.assertEqual(list(store.code_elements()), lazy)
+
+    def test_provider_lru_and_changed_files(self):
+        """Testet die Verdrängung geöffneter Dateien und das Neueinblenden geänderter Dateien"""
+        provider = ContentProvider(max_open_files=2)
+        self.assertEqual(provider.read_span(self.md_file, 2, 7), "Titel")
+        provider.read_file(self.js_file)
+        provider.read_file(self.py_file)
+        self.assertEqual(provider.open_files, 2)
+
+        self.md_file.write_text("# Neu\n")
+        self.assertEqual(provider.read_file(self.md_file), "# Neu\n")
+        self.assertIsNone(provider.read_span(self.md_file, 0, 100))
+        provider.close()
+        self.assertEqual(provider.open_files, 0)
+
+
+class TestContentDeduplication(unittest.TestCase):
+    """Tests für das einmalige Parsen identischer Dateien"""
+
+    SOURCE = "def helper(value):\n    return value * 2\n"
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / "src").mkdir()
+        (self.temp_dir / "copy").mkdir()
+        (self.temp_dir / "src" / "util.py").write_text(self.SOURCE)
+        (self.temp_dir / "copy" / "util.py").write_text(self.SOURCE)
+        # Gleiche Größe, anderer Inhalt
+        (self.temp_dir / "src" / "other.py").write_text(self.SOURCE.replace("2", "3"))
+
+        self.config = ProjectConfig()
+        self.config.scan_paths = ["."]
+        self.config.use_scan_cache = False
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_identical_files_are_parsed_once(self):
+        """Testet, dass Kopien nicht erneut geparst werden und eigene Dateipfade erhalten"""
+        scanner = UniversalScanner(self.config)
+        with mock.patch.object(scanner.code_scanner, 'scan_file', wraps=scanner.code_scanner.scan_file) as scan_file:
+            results = {Path(result.file_path).relative_to(self.temp_dir).as_posix(): result
+                       for result in scanner.scan_project_iter(str(self.temp_dir))}
+        self.assertEqual(scan_file.call_count, 2)
+
+        first, copy = sorted((results['src/util.py'], results['copy/util.py']),
+                             key=lambda result: result.duplicate_of is not None)
+        self.assertEqual(copy.duplicate_of, first.file_path)
+        self.assertIsNone(first.duplicate_of)
+        self.assertEqual(copy.content_hash, first.content_hash)
+        self.assertIsNone(results['src/other.py'].content_hash)
+        self.assertEqual(copy.elements[0].name, "helper")
+        self.assertEqual(copy.elements[0].file_path, copy.file_path)
+        self.assertEqual(first.elements[0].file_path, first.file_path)
+        self.assertEqual(scanner.scan_summary.duplicate_files, 1)
+
+    def test_copies_get_their_own_document_name(self):
+        """Testet, dass das dateiweite Dokumentations-Element einer Kopie nach der Kopie benannt wird"""
+        (self.temp_dir / "docs").mkdir()
+        for name in ("alpha", "beta"):
+            (self.temp_dir / "docs" / f"{name}.md").write_text("# Hilfe\n\nText\n")
+
+        def documents(elements):
+            return sorted((Path(elem.file_path).name, elem.name) for elem in elements
+                          if elem.type == ElementType.DOCUMENTATION)
+
+        expected = [("alpha.md", "alpha"), ("beta.md", "beta")]
+        results = UniversalScanner(self.config).scan_project(str(self.temp_dir))
+        self.assertEqual(documents(results['doc_elements']), expected)
+        store = UniversalScanner(self.config).scan_project_store(str(self.temp_dir))
+        self.assertEqual(documents(store.rows(DOC_KIND)), expected)
+
+    def test_deduplication_can_be_disabled(self):
+        """Testet, dass die Deduplizierung abschaltbar ist"""
+        self.config.deduplicate_content = False
+        results = list(UniversalScanner(self.config).scan_project_iter(str(self.temp_dir)))
+        self.assertTrue(all(result.duplicate_of is None for result in results))
+
+    def test_chroma_updater_embeds_shared_content_once(self):
+        """Testet, dass identische Elemente aus Kopien nur einmal eingebettet werden"""
+        updater = ChromaUpdater.__new__(ChromaUpdater)
+        updater.chroma_client = mock.Mock()
+        updater.chroma_client.health_check.return_value = True
+        updater.chroma_client.create_collection.return_value = True
+        updater.ollama_client = mock.Mock()
+        updater.ollama_client.create_embedding.return_value = [0.5]
+        updater.embedding_model = "test"
+
+        results = list(UniversalScanner(self.config).scan_project_iter(str(self.temp_dir)))
+        self.assertTrue(updater.update_chroma_from_stream(iter(results), str(self.temp_dir)))
+
+        # Drei Dateien, aber nur zwei unterschiedliche Inhalte
+        self.assertEqual(updater.chroma_client.add_embeddings.call_count, 3)
+        self.assertEqual(updater.ollama_client.create_embedding.call_count, 2)
+        self.assertEqual(updater.reused_embeddings, 1)
+
+    def test_chroma_update_from_full_scan_embeds_shared_content_once(self):
+        """Testet die Wiederverwendung der Embeddings auch für das Ergebnis von scan_project"""
+        updater = ChromaUpdater.__new__(ChromaUpdater)
+        updater.chroma_client = mock.Mock()
+        updater.chroma_client.health_check.return_value = True
+        updater.chroma_client.create_collection.return_value = True
+        updater.ollama_client = mock.Mock()
+        updater.ollama_client.create_embedding.return_value = [0.5]
+        updater.embedding_model = "test"
+
+        results = UniversalScanner(self.config).scan_project(str(self.temp_dir))
+        self.assertEqual(sorted(Path(path).relative_to(self.temp_dir).as_posix() for path in results['content_hashes']),
+                         ['copy/util.py', 'src/util.py'])
+        self.assertTrue(updater.update_chroma_with_elements(
+            results['code_elements'], results['doc_elements'], str(self.temp_dir), results['content_hashes']))
+
+        self.assertEqual(updater.chroma_client.add_embeddings.call_count, 3)
+        self.assertEqual(updater.ollama_client.create_embedding.call_count, 2)
+        self.assertEqual(updater.reused_embeddings, 1)
+
+
+class TestPerformanceMeasurement(unittest.TestCase):
+    """Tests für die gemessenen (statt geschätzten) Performance-Werte"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / "app.py").write_text(
+            "from fastapi import FastAPI\napp = FastAPI()\n\n"
+            "@app.get('/items')\ndef list_items():\n    return []\n"
+        )
+        (self.temp_dir / "client.js").write_text("function load(url) {\n  return fetch(url);\n}\n")
+        (self.temp_dir / "README.md").write_text("# Projekt\n\nBeschreibung\n")
+
+        self.config = ProjectConfig()
+        self.config.scan_paths = ["."]
+        self.config.use_scan_cache = False
+        self.config.project_type = "python_fastapi"
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_report_contains_phases_and_latencies(self):
+        """Testet, dass der Bericht Phasen, CPU-Zeit und Latenz pro Dateityp enthält"""
+        scanner = UniversalScanner(self.config)
+        results = scanner.scan_project(str(self.temp_dir))
+        report = results['performance_report']
+
+        self.assertEqual(set(report), {'timing', 'system_resources', 'file_processing', 'performance_indicators'})
+        phases = report['timing']['phases']
+        for name in ('walk', 'read', 'parse', 'extract', 'framework-parse'):
+            self.assertIn(name, phases)
+        self.assertEqual(phases['parse']['calls'], 2)  # app.py und README.md
+        self.assertGreaterEqual(report['timing']['cpu_seconds'], 0)
+
+        latency = report['file_processing']['latency_by_type']
+        self.assertEqual(set(latency), {'.py', '.js', '.md'})
+        self.assertEqual(latency['.py']['files'], 1)
+        self.assertEqual(sum(latency['.js']['histogram'].values()), 1)
+
+        resources = report['system_resources']
+        self.assertGreater(resources['memory_used_mb'], 0)
+        self.assertIsNone(resources['tracemalloc_peak_mb'])
+
+    def test_later_phases_appear_in_report(self):
+        """Testet, dass nach dem Scan gemessene Phasen (z.B. match) mit activate nachträglich erscheinen"""
+        scanner = UniversalScanner(self.config)
+        results = scanner.scan_project(str(self.temp_dir))
+        self.assertNotIn('match', results['performance_report']['timing']['phases'])
+
+        # Nach stop_timing ist der Analyzer nicht mehr aktiv
+        code_elements = [element for element in results['code_elements'] if isinstance(element, CodeElement)]
+        MatcherEngine().find_discrepancies(code_elements, results['doc_elements'])
+        self.assertNotIn('match', scanner.performance_analyzer.get_performance_report()['timing']['phases'])
+
+        with scanner.performance_analyzer.activate():
+            MatcherEngine().find_discrepancies(code_elements, results['doc_elements'])
+        phases = scanner.performance_analyzer.get_performance_report()['timing']['phases']
+        self.assertEqual(phases['match']['calls'], 1)
+        self.assertEqual(list(phases)[-1], 'match')
+
+    def test_tracemalloc_peak(self):
+        """Testet die optionale Messung mit tracemalloc"""
+        analyzer = PerformanceAnalyzer(trace_allocations=True)
+        start_time = analyzer.start_timing()
+        data = [bytes(1024) for _ in range(2048)]
+        analyzer.stop_timing(start_time, files_processed=1)
+        del data
+
+        report = analyzer.get_performance_report()
+        self.assertGreaterEqual(report['system_resources']['tracemalloc_peak_mb'], 2)
+
+    def test_measure_phase_without_active_analyzer(self):
+        """Testet, dass measure_phase ohne aktiven Analyzer nichts misst"""
+        self.assertIsNone(get_active_analyzer())
+        with measure_phase('embed'):
+            pass
+
+    def test_analyzers_in_parallel_contexts_stay_separate(self):
+        """Testet, dass zwei gleichzeitig laufende Scans ihre Phasen nicht gegenseitig erfassen"""
+        barrier = threading.Barrier(2)
+        analyzers = [PerformanceAnalyzer(), PerformanceAnalyzer()]
+
+        def run(analyzer, phase_name):
+            start_time = analyzer.start_timing()
+            barrier.wait()  # beide Analyzer sind gestartet
+            with measure_phase(phase_name):
+                pass
+            barrier.wait()
+            analyzer.stop_timing(start_time)
+
+        threads = [threading.Thread(target=run, args=(analyzer, name))
+                   for analyzer, name in zip(analyzers, ('walk', 'read'))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(list(analyzers[0].phases), ['walk'])
+        self.assertEqual(list(analyzers[1].phases), ['read'])
+
+    def test_phase_cpu_excludes_other_threads(self):
+        """Testet, dass einer Phase nur die CPU-Zeit des eigenen Threads angerechnet wird"""
+        analyzer = PerformanceAnalyzer()
+        stop = threading.Event()
+
+        def busy():
+            while not stop.is_set():
+                sum(range(1000))
+
+        worker = threading.Thread(target=busy)
+        worker.start()
+        try:
+            with analyzer.phase('walk'):
+                time.sleep(0.2)
+        finally:
+            stop.set()
+            worker.join()
+        self.assertLess(analyzer.phases['walk'].cpu_seconds, 0.05)
+
+    def test_thread_pool_scan_records_phases(self):
+        """Testet, dass Phasen aus den Threads des ParallelScanner im Bericht erscheinen"""
+        (self.temp_dir / "src").mkdir(exist_ok=True)
+        (self.temp_dir / "src" / "mod.py").write_text("def f():\n    pass\n")
+        config = ProjectConfig()
+        config.scan_paths = ["src"]
+        scanner = ParallelScanner(config, max_workers=2)
+        results = scanner.scan_project_parallel(str(self.temp_dir), use_threading=True)
+        self.assertIn('parse', results['performance_report']['timing']['phases'])
+        self.assertIsNone(get_active_analyzer())
+
+    def test_latency_histogram_quantiles(self):
+        """Testet die Bucket-Zuordnung und die Quantil-Schätzung"""
+        histogram = LatencyHistogram()
+        for _ in range(9):
+            histogram.add(0.0008)  # 0.8 ms -> Bucket <=1ms
+        histogram.add(0.2)  # 200 ms -> Bucket <=250ms
+
+        data = histogram.as_dict()
+        self.assertEqual(data['files'], 10)
+        self.assertEqual(data['histogram'], {'<=1ms': 9, '<=250ms': 1})
+        self.assertEqual(data['p50_ms'], 1.0)
+        self.assertEqual(data['p95_ms'], 200.0)
+        self.assertEqual(data['max_ms'], 200.0)
+
+
+class TestScanProfiling(unittest.TestCase):
+    """Tests für den Profiling-Modus"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / "small.py").write_text("def small():\n    return 1\n")
+        # Viele Funktionen: deutlich langsamer zu parsen und zu extrahieren
+        (self.temp_dir / "large.py").write_text(
+            "".join(f"def function_{index}(value):\n    return value + {index}\n\n" for index in range(2000))
+        )
+        (self.temp_dir / "guide.md").write_text("# Anleitung\n")
+
+        self.config = ProjectConfig()
+        self.config.scan_paths = ["."]
+        self.config.use_scan_cache = False
+        self.config.profiling = "files"
+        self.config.profile_top_n = 2
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_slowest_files_report(self):
+        """Testet, dass die langsamsten Dateien mit ihren Phasen berichtet werden"""
+        scanner = UniversalScanner(self.config)
+        list(scanner.scan_project_iter(str(self.temp_dir)))
+        profile = scanner.performance_analyzer.get_performance_report()['profile']
+
+        self.assertEqual(profile['mode'], 'files')
+        self.assertEqual(profile['files_profiled'], 3)
+        self.assertEqual(len(profile['slowest_files']), 2)
+        slowest = profile['slowest_files'][0]
+        self.assertTrue(slowest['file_path'].endswith("large.py"))
+        self.assertEqual(set(slowest['stages']), {'read', 'parse', 'extract'})
+        self.assertTrue(profile['slowest_stages']['extract'][0]['file_path'].endswith("large.py"))
+        self.assertIsNone(profile['sampling'])
+
+    def test_profiling_is_off_by_default(self):
+        """Testet, dass ohne Profiling kein Profil im Bericht steht"""
+        self.config.profiling = "off"
+        scanner = UniversalScanner(self.config)
+        list(scanner.scan_project_iter(str(self.temp_dir)))
+        self.assertNotIn('profile', scanner.performance_analyzer.get_performance_report())
+
+    def test_process_pool_profiles(self):
+        """Testet, dass Dateiprofile und Phasen aus Worker-Prozessen übernommen werden"""
+        scanner = ParallelScanner(self.config, max_workers=2)
+        result = scanner.scan_project_parallel(str(self.temp_dir), use_threading=False)
+        report = result['performance_report']
+
+        self.assertEqual(report['profile']['files_profiled'], 3)
+        self.assertTrue(report['profile']['slowest_files'][0]['file_path'].endswith("large.py"))
+        self.assertEqual(report['file_processing']['latency_by_type']['.py']['files'], 2)
+        self.assertEqual(report['timing']['phases']['parse']['calls'], 3)
+
+    def test_sampling_profile_dump(self):
+        """Testet den Stichproben-Profiler und das gefaltete Ausgabeformat"""
+        def busy_loop():
+            end = time.perf_counter() + 0.2
+            while time.perf_counter() < end:
+                sum(range(100))
+
+        sampler = StackSampler(interval=0.002)
+        sampler.start()
+        busy_loop()
+        sampler.stop()
+
+        self.assertGreater(sampler.samples, 0)
+        output = self.temp_dir / "scan.folded"
+        sampler.write_folded(str(output))
+        lines = output.read_text().splitlines()
+        self.assertTrue(all(re.match(r"^MainThread;.+ \d+$", line) for line in lines))
+        self.assertTrue(any("busy_loop (test_scan_performance.py:" in line for line in lines))
+
+    def test_top_n_is_bounded(self):
+        """Testet, dass nur die top_n langsamsten Dateien behalten werden"""
+        profiler = ScanProfiler(top_n=3)
+        for index in range(10):
+            profiler.begin_file()
+            profiler.add_stage('parse', index / 100)
+            profiler.finish_file(f"file_{index}.py", '.py', index / 10)
+
+        report = profiler.get_report()
+        self.assertEqual([entry['file_path'] for entry in report['slowest_files']],
+                         ["file_9.py", "file_8.py", "file_7.py"])
+        self.assertEqual(len(report['slowest_stages']['parse']), 3)
+        self.assertEqual(report['files_profiled'], 10)
+
+
+class TestPipelineBenchmark(unittest.TestCase):
+    """Tests für den Pipeline-Benchmark auf synthetischen Projekten"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_generated_project_respects_gitignore(self):
+        """Testet, dass die erzeugten Artefakte über die (verschachtelten) .gitignore-Dateien ausgeschlossen werden"""
+        counts = generate_project(self.temp_dir, file_count=40, language_mix={'py': 1, 'md': 1},
+                                  large_doc_every=2, large_doc_bytes=20_000, ignored_share=0.5)
+        self.assertEqual(counts['py'] + counts['md'], 40)
+        self.assertEqual(counts['ignored'], 20)
+
+        config = ProjectConfig()
+        config.scan_paths = ["."]
+        manifests = FileHandler(config).build_manifests(self.temp_dir)
+        paths = [str(entry.path) for manifest in manifests for entry in manifest]
+        self.assertFalse(any(".generated." in path or "/cache/" in path or "/build/" in path for path in paths))
+        self.assertEqual(sum(1 for path in paths if path.endswith((".py", ".md"))), 40)
+
+        sizes = [entry.size for manifest in manifests for entry in manifest if entry.suffix == '.md']
+        self.assertGreaterEqual(max(sizes), 20_000)
+
+    def test_run_and_compare(self):
+        """Testet, dass alle Stufen gemessen werden und Regressionen erkannt werden"""
+        results = pipeline_benchmark.run_benchmark(sizes=(30,), repeat=1, work_dir=str(self.temp_dir))
+        stages = results['results'][0]['stages']
+        self.assertEqual(set(stages), set(pipeline_benchmark.STAGES))
+        self.assertGreater(stages['chroma_update']['items'], 0)
+        self.assertEqual(stages['full_scan']['items'], stages['discovery']['items'])
+
+        output = self.temp_dir / "results.json"
+        pipeline_benchmark.save_results(results, str(output))
+        baseline = pipeline_benchmark.load_results(str(output))
+        self.assertEqual(pipeline_benchmark.compare_results(baseline, results), [])
+
+        slower = json.loads(json.dumps(results))
+        slower['results'][0]['stages']['match']['seconds'] = baseline['results'][0]['stages']['match']['seconds'] * 2 + 1
+        regressions = pipeline_benchmark.compare_results(baseline, slower)
+        self.assertEqual([regression['stage'] for regression in regressions], ['match'])
+
+
+class TestProgressEvents(unittest.TestCase):
+    """Tests für die gebündelten Fortschrittsereignisse"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        for index in range(6):
+            (self.temp_dir / f"module_{index}.py").write_text(f"def function_{index}():\n    return {index}\n")
+        (self.temp_dir / "guide.md").write_text("# Anleitung\n")
+        (self.temp_dir / "notes.cfg").write_text("ignoriert\n")
+
+        self.config = ProjectConfig()
+        self.config.scan_paths = ["."]
+        self.config.use_scan_cache = False
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _progress(self):
+        progress = ScanProgressCallback(console=False)
+        events = []
+        progress.set_event_callback(events.append)
+        return progress, events
+
+    def test_events_are_throttled(self):
+        """Testet, dass viele Dateien nur wenige Ereignisse erzeugen"""
+        progress, events = self._progress()
+        progress.min_interval = 60
+        legacy_calls = []
+        progress.set_progress_callback(lambda current, total, description: legacy_calls.append(current))
+        progress.update_total_files(1000)
+        for index in range(999):
+            progress.scanning_file(Path(f"file_{index}.py"))
+
+        # Nur das erste Ereignis, die übrigen werden zurückgehalten
+        self.assertEqual(len(events), 1)
+        self.assertEqual(progress.files_scanned, 999)
+
+        progress.scanning_file(Path("file_999.py"))
+        progress.finish()
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[-1].current, 1000)
+        self.assertTrue(events[-1].final)
+        self.assertEqual(legacy_calls, [1, 1000])
+
+    def test_batch_size_and_interval(self):
+        """Testet die Bündelung nach Anzahl, sobald der Mindestabstand erreicht ist"""
+        progress, events = self._progress()
+        progress.min_interval = 0.1
+        progress.batch_size = 10
+        progress.update_total_files(100)
+        # Jede Datei dauert 20 ms: zehn Dateien überschreiten den Mindestabstand
+        clock = (step * 0.02 for step in range(1000))
+        with mock.patch('src.scanner.progress_callback.time.perf_counter', side_effect=lambda: next(clock)):
+            progress.set_stage('scan')
+            for index in range(100):
+                progress.scanning_file(Path(f"file_{index}.py"))
+            progress.finish()
+
+        self.assertEqual([event.current for event in events], [1] + list(range(11, 100, 10)) + [100])
+        self.assertTrue(events[-1].final)
+
+    def test_event_carries_throughput_eta_and_stage(self):
+        """Testet Durchsatz, Restzeit und Phase der Ereignisse"""
+        progress, events = self._progress()
+        progress.update_total_files(4)
+        progress.set_stage('scan')
+        progress._stage_started -= 2.0
+        progress.files_completed(2, Path("chunk_end.py"))
+
+        event = events[-1]
+        self.assertIsInstance(event, ProgressEvent)
+        self.assertEqual(event.stage, 'scan')
+        self.assertEqual(event.percentage, 50.0)
+        self.assertAlmostEqual(event.files_per_second, 1.0, places=1)
+        self.assertAlmostEqual(event.eta_seconds, 2.0, places=1)
+        self.assertEqual(event.description, "Scanne Datei: chunk_end.py")
+        self.assertEqual(format_duration(65), "1:05")
+        self.assertEqual(format_duration(None), "?")
+
+        info = progress.get_progress_info()
+        self.assertEqual(info['stage'], 'scan')
+        self.assertEqual(info['events_emitted'], 1)
+
+    def _assert_complete(self, progress, events):
+        self.assertEqual(progress.total_files, 7)
+        self.assertEqual(progress.files_scanned, 7)
+        self.assertEqual(events[-1].current, 7)
+        self.assertEqual(events[-1].stage, 'scan')
+        self.assertTrue(events[-1].final)
+        self.assertEqual(sum(1 for event in events if event.final), 1)
+
+    def test_serial_scanner_reports_progress(self):
+        """Testet den Fortschritt des seriellen Scanners"""
+        progress, events = self._progress()
+        scanner = UniversalScanner(self.config, progress_callback=progress)
+        scanner.scan_project(str(self.temp_dir))
+        self._assert_complete(progress, events)
+
+    def test_parallel_scanners_report_same_progress(self):
+        """Testet, dass Thread- und Prozess-Pool denselben Fortschritt melden"""
+        for use_threading in (True, False):
+            with self.subTest(use_threading=use_threading):
+                progress, events = self._progress()
+                scanner = ParallelScanner(self.config, max_workers=2, progress_callback=progress)
+                scanner.scan_project_parallel(str(self.temp_dir), use_threading=use_threading)
+                self._assert_complete(progress, events)
+
+    def test_async_scanner_reports_progress(self):
+        """Testet den Fortschritt des asynchronen Scanners"""
+        progress, events = self._progress()
+        scanner = AsyncScanner(self.config, progress_callback=progress)
+        result = asyncio.run(scanner.scan_project_async(str(self.temp_dir)))
+        self._assert_complete(progress, events)
+        self.assertEqual(result['progress_info']['files_scanned'], 7)
+
+    def test_async_scanner_finishes_progress(self):
+        """Testet, dass der asynchrone Scanner den Fortschritt auch bei Fehlern abschließt"""
+        progress, events = self._progress()
+        scanner = AsyncScanner(self.config, progress_callback=progress)
+        with mock.patch.object(progress, 'finish', wraps=progress.finish) as finish:
+            asyncio.run(scanner.scan_project_async(str(self.temp_dir)))
+        self.assertEqual(finish.call_count, 1)
+
+        def failing_gather(*coroutines, **kwargs):
+            for coroutine in coroutines:
+                coroutine.close()
+            raise RuntimeError("abgebrochen")
+
+        progress, events = self._progress()
+        scanner = AsyncScanner(self.config, progress_callback=progress)
+        with mock.patch.object(progress, 'finish', wraps=progress.finish) as finish, \
+                mock.patch('asyncio.gather', side_effect=failing_gather):
+            with self.assertRaises(RuntimeError):
+                asyncio.run(scanner.scan_project_async(str(self.temp_dir)))
+        self.assertEqual(finish.call_count, 1)
+        self.assertTrue(events[-1].final)
+
+
+class TestStreamingStatistics(unittest.TestCase):
+    """Tests für die Streaming-Statistiken des FileAnalyzers"""
+
+    def test_quantile_sketch_accuracy_and_merge(self):
+        """Testet die relative Genauigkeit und das Zusammenführen des Sketches"""
+        rng = random.Random(7)
+        values = [int(rng.lognormvariate(8, 2)) for _ in range(20000)]
+        first, second = QuantileSketch(), QuantileSketch()
+        for index, value in enumerate(values):
+            (first if index % 2 else second).add(value)
+        first.merge(second)
+
+        values.sort()
+        self.assertEqual(first.count, len(values))
+        self.assertEqual(first.total, sum(values))
+        self.assertEqual((first.min, first.max), (values[0], values[-1]))
+        for q in (0.1, 0.5, 0.9, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            self.assertAlmostEqual(first.quantile(q), exact, delta=exact * 0.011 + 1)
+        self.assertLess(len(first.buckets), 2000)
+
+        with self.assertRaises(ValueError):
+            first.merge(QuantileSketch(relative_accuracy=0.05))
+
+    def test_reservoir_sample_is_bounded_and_merges(self):
+        """Testet Größe und Gewichtung der Stichproben"""
+        small = ReservoirSample(capacity=10)
+        for index in range(4):
+            small.add(index)
+        other = ReservoirSample(capacity=10)
+        for index in range(4, 8):
+            other.add(index)
+        small.merge(other)
+        self.assertEqual(sorted(small), list(range(8)))
+        self.assertTrue(small.is_complete)
+
+        # Die Stichprobe der Vereinigung folgt dem Verhältnis der Datenströme (9000 zu 1000)
+        large = ReservoirSample(capacity=200)
+        for index in range(9000):
+            large.add(('a', index))
+        minor = ReservoirSample(capacity=200, seed=3)
+        for index in range(1000):
+            minor.add(('b', index))
+        large.merge(minor)
+        self.assertEqual(len(large), 200)
+        self.assertEqual(large.seen, 10000)
+        self.assertFalse(large.is_complete)
+        from_minor = sum(1 for source, _ in large if source == 'b')
+        self.assertTrue(5 <= from_minor <= 40, from_minor)
+
+    def test_file_analyzer_keeps_bounded_samples(self):
+        """Testet, dass Zähler exakt und Pfadlisten begrenzt sind"""
+        analyzer = FileAnalyzer(sample_size=10)
+        for index in range(5000):
+            analyzer.analyze_file(Path(f"src/pkg_{index % 4}/file_{index}.py"), is_included=True, file_size=index)
+        for index in range(300):
+            analyzer.analyze_file(Path(f"node_modules/lib_{index}.js"), is_included=False, file_size=0)
+
+        report = analyzer.get_scan_report()
+        self.assertEqual(report['summary']['included_files'], 5000)
+        self.assertEqual(report['summary']['excluded_files'], 300)
+        self.assertEqual(len(report['filtered_files']), 10)
+        self.assertEqual(len(report['excluded_files']), 10)
+        self.assertFalse(report['file_samples']['filtered_files_complete'])
+        self.assertEqual(report['directories'][str(Path("src/pkg_0"))], 1250)
+        self.assertEqual(report['file_size_stats']['max_size_bytes'], 4999)
+        self.assertAlmostEqual(report['file_size_stats']['median_size_bytes'], 2499.5, delta=30)
+
+    def test_worker_aggregates_merge(self):
+        """Testet, dass zusammengeführte Analyzer denselben Bericht liefern wie ein einzelner"""
+        single, first, second = FileAnalyzer(), FileAnalyzer(), FileAnalyzer()
+        for index in range(100):
+            path = Path(f"dir_{index % 3}/file_{index}{'.py' if index % 5 else '.md'}")
+            single.analyze_file(path, is_included=index % 7 != 0, file_size=index * 10)
+            (first if index % 2 else second).analyze_file(path, is_included=index % 7 != 0, file_size=index * 10)
+        first.merge(second)
+
+        merged, expected = first.get_scan_report(), single.get_scan_report()
+        for key in ('summary', 'file_types', 'file_extensions', 'directories', 'file_size_stats'):
+            self.assertEqual(merged[key], expected[key], key)
+        self.assertEqual(sorted(merged['filtered_files']), sorted(expected['filtered_files']))
+
+    def test_process_pool_report_matches_serial_scan(self):
+        """Testet, dass die Worker-Statistiken beim Prozess-Pool zusammengeführt werden"""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            for index in range(5):
+                (temp_dir / f"module_{index}.py").write_text(f"def function_{index}():\n    return {index}\n")
+            (temp_dir / "docs").mkdir()
+            (temp_dir / "docs" / "guide.md").write_text("# Anleitung\n")
+            config = ProjectConfig()
+            config.scan_paths = ["."]
+            config.use_scan_cache = False
+
+            serial = UniversalScanner(config).scan_project(str(temp_dir))['scan_report']
+            parallel = UniversalScanner(config).scan_project_parallel(
+                str(temp_dir), max_workers=2, use_processes=True)['scan_report']
+            for key in ('summary', 'file_extensions', 'directories', 'file_size_stats'):
+                self.assertEqual(parallel[key], serial[key], key)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestSymbolIndex(unittest.TestCase):
+    """Tests für den Symbolindex des Matchers"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / "users.py").write_text(
+            "class UserService:\n"
+            "    def __init__(self):\n        pass\n\n"
+            "    def get(self, user_id):\n        return user_id\n\n\n"
+            "def get_user(user_id):\n    return user_id\n"
+        )
+        (self.temp_dir / "orders.py").write_text(
+            "class OrderService:\n"
+            "    def __init__(self):\n        pass\n\n"
+            "    def get(self, order_id):\n        return order_id\n"
+        )
+        config = ProjectConfig()
+        config.scan_paths = ["."]
+        config.use_scan_cache = False
+        self.code_elements = UniversalScanner(config).scan_project(str(self.temp_dir))['code_elements']
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _doc(self, name, file_name="guide.md"):
+        return DocElement(name=name, type=ElementType.DOC_HEADING, content=f"## {name}",
+                          file_path=str(self.temp_dir / file_name))
+
+    def test_same_names_are_kept_apart(self):
+        """Testet, dass gleichnamige Methoden unter eigenen qualifizierten Namen stehen"""
+        index = SymbolIndex(self.code_elements)
+        self.assertEqual(len(index.by_name["__init__"]), 2)
+        self.assertEqual(len(index.by_name["get"]), 2)
+        users = str(self.temp_dir / "users.py")
+        self.assertEqual(len(index.get(f"{users}::UserService.get")), 1)
+        self.assertEqual(len(index.get(f"{users}::get_user")), 1)
+        self.assertEqual(len(index.in_file(users)), 4)
+        self.assertEqual(len(index.of_type(ElementType.CLASS)), 2)
+
+    def test_lookup_levels(self):
+        """Testet die Kandidatensuche über qualifizierte und normalisierte Namen"""
+        index = SymbolIndex(self.code_elements)
+        match = index.lookup("OrderService.get")
+        self.assertEqual(match.level, MATCH_QUALIFIED)
+        self.assertTrue(match.candidates[0].file_path.endswith("orders.py"))
+
+        match = index.lookup("`getUser(user_id)`")
+        self.assertEqual(match.level, MATCH_NORMALIZED)
+        self.assertEqual(match.candidates[0].name, "get_user")
+        self.assertEqual(normalize_name("Get User"), "getuser")
+        self.assertIsNone(index.lookup("legacy_function"))
+
+    def test_find_discrepancies_uses_all_candidates(self):
+        """Testet, dass keine gleichnamigen Elemente beim Abgleich verloren gehen"""
+        doc_elements = [self._doc("get", "orders.md"), self._doc("UserService"), self._doc("legacy_function")]
+        discrepancies = AdvancedMatcherEngine().find_discrepancies(self.code_elements, doc_elements)
+
+        undocumented = sorted((elem.name, Path(elem.file_path).name) for elem in discrepancies['undocumented_code'])
+        # "get" in orders.md deckt nur OrderService.get ab; UserService.get bleibt undokumentiert und mehrdeutig
+        self.assertEqual(undocumented, [("OrderService", "orders.py"), ("__init__", "orders.py"),
+                                        ("__init__", "users.py"), ("get", "users.py"), ("get_user", "users.py")])
+        self.assertEqual([elem.name for elem in discrepancies['outdated_documentation']], ["legacy_function"])
+        ambiguous = discrepancies['ambiguous_documentation']
+        self.assertEqual(len(ambiguous), 1)
+        self.assertEqual(ambiguous[0]['doc_name'], "get")
+        self.assertEqual(ambiguous[0]['documented'], [f"{self.temp_dir / 'orders.py'}::OrderService.get"])
+        self.assertEqual(ambiguous[0]['candidates'], [f"{self.temp_dir / 'users.py'}::UserService.get"])
+
+        index = SymbolIndex(self.code_elements)
+        level, key, positions = index.lookup_indexes("get")
+        chosen = index.elements[index.best_candidate(level, key, positions, str(self.temp_dir / "orders.md"))]
+        self.assertTrue(chosen.file_path.endswith("orders.py"))
+
+    def test_qualified_documentation_covers_only_its_method(self):
+        """Testet, dass "Klasse.methode" nur die eine Methode als dokumentiert zählt"""
+        discrepancies = AdvancedMatcherEngine().find_discrepancies(
+            self.code_elements, [self._doc("UserService.get")])
+        undocumented = [(elem.name, Path(elem.file_path).name) for elem in discrepancies['undocumented_code']]
+        self.assertIn(("get", "orders.py"), undocumented)
+        self.assertNotIn(("get", "users.py"), undocumented)
+
+    def test_same_name_without_file_match_documents_one_element(self):
+        """Testet, dass eine Überschrift ohne passende Datei nur ein gleichnamiges Element abdeckt"""
+        discrepancies = AdvancedMatcherEngine().find_discrepancies(self.code_elements, [self._doc("__init__")])
+        undocumented = [elem.name for elem in discrepancies['undocumented_code']]
+        self.assertEqual(undocumented.count("__init__"), 1)
+        self.assertEqual(len(discrepancies['ambiguous_documentation'][0]['candidates']), 1)
+        report = ReportGenerator().generate_discrepancy_report(discrepancies)
+        self.assertIn("Mehrdeutig zugeordnete Dokumentation", report)
+
+
+class TestSimilarityMeasures(unittest.TestCase):
+    """Tests für die linearen Ähnlichkeitsmaße des Matchers"""
+
+    def test_bounds(self):
+        """Testet gleiche, verschiedene und leere Texte für alle Maße"""
+        for name, measure_class in SIMILARITY_MEASURES.items():
+            with self.subTest(measure=name):
+                measure = measure_class()
+                self.assertAlmostEqual(measure.similarity("Berechnet den Wert", "berechnet den wert"), 1.0)
+                self.assertLess(measure.similarity("alpha beta gamma", "xylophon quiz"), 0.3)
+                self.assertEqual(measure.similarity("", ""), 1.0)
+
+    def test_token_set_ignores_order(self):
+        """Testet, dass die Wortmenge unabhängig von Reihenfolge und Bezeichner-Schreibweise ist"""
+        measure = TokenSetSimilarity()
+        self.assertEqual(measure.similarity("get_user id", "id get user"), 1.0)
+        self.assertAlmostEqual(measure.similarity("a b c d", "a b x y"), 0.5)
+
+    def test_minhash_estimates_shingle_similarity(self):
+        """Testet, dass der MinHash-Sketch die exakte Shingle-Ähnlichkeit gut schätzt"""
+        rng = random.Random(3)
+        document = similarity_benchmark.generate_text(rng, 20000, 'prose')
+        docstring = document[:3000] + similarity_benchmark.generate_text(rng, 3000, 'prose')
+        exact = ShingleSimilarity().similarity(docstring, document)
+        estimate = MinHashSimilarity(sketch_size=256).similarity(docstring, document)
+        self.assertAlmostEqual(estimate, exact, delta=0.1)
+        self.assertEqual(len(MinHashSimilarity(sketch_size=64).sketch(document)[1]), 64)
+
+    def test_matcher_uses_configured_measure_and_threshold(self):
+        """Testet Ähnlichkeitsmaß und Schwellenwert aus der Konfiguration"""
+        code = [CodeElement(name="load", type=ElementType.FUNCTION, signature="def load(path)",
+                            docstring="Lädt die Datei vom angegebenen Pfad")]
+        docs = [DocElement(name="load", type=ElementType.DOC_HEADING,
+                           content="load lädt die Datei vom angegebenen Pfad und gibt den Inhalt zurück")]
+
+        config = ProjectConfig()
+        config.similarity_method = "shingle"
+        matcher = MatcherEngine(config)
+        self.assertEqual(matcher.advanced_matcher.similarity.name, "shingle")
+        conflicts = matcher.find_discrepancies(code, docs)['conflict_analysis'][0]['conflict_analysis']
+        self.assertTrue(all(conflict['details']['similarity_method'] == "shingle" for conflict in conflicts))
+
+        config.similarity_threshold = 0.0
+        self.assertEqual(MatcherEngine(config).find_discrepancies(code, docs)['conflict_analysis'], [])
+
+        self.assertEqual(AdvancedMatcherEngine().similarity.name, "token_set")
+        self.assertEqual(create_similarity("unbekannt").name, "token_set")
+
+    def test_benchmark_against_difflib(self):
+        """Testet, dass der Benchmark alle Maße misst und difflib für lange Texte auslässt"""
+        rows = similarity_benchmark.run_benchmark(sizes=(500, 3000), repeat=1, difflib_max_chars=1000)
+        self.assertEqual(len(rows), 2 * len(similarity_benchmark.PROFILES))
+        for row in rows:
+            self.assertEqual(set(row['methods']), set(SIMILARITY_MEASURES))
+            self.assertEqual(row['methods']['difflib'] is None, row['chars'] > 1000)
+            self.assertGreater(row['methods']['token_set']['similarity'], 0)
+
+
+class TestParallelConflictAnalysis(unittest.TestCase):
+    """Tests für die prozessparallele Konfliktanalyse des Matchers"""
+
+    def _elements(self, count):
+        code, docs = [], []
+        for i in range(count):
+            code.append(CodeElement(name=f"func_{i}", type=ElementType.FUNCTION, file_path=f"mod_{i % 7}.py",
+                                    signature=f"def func_{i}(value_{i}, limit)",
+                                    parameters=[{'name': f"value_{i}"}, {'name': 'limit'}],
+                                    return_type="int" if i % 3 else "None",
+                                    docstring=f"Berechnet Wert {i} mit Grenze"))
+            docs.append(DocElement(name=f"func_{i}", type=ElementType.DOC_HEADING,
+                                   content=f"Parameter: value_{i}, extra_{i % 4}\nReturns: str\nBeschreibung {i % 5}"))
+        return code, docs
+
+    @staticmethod
+    def _summary(discrepancies):
+        return [(entry['qualified_name'],
+                 [(conflict['conflict_type'], conflict['resolution'].resolution_strategy,
+                   conflict['resolution'].confidence, conflict['details']) for conflict in entry['conflict_analysis']])
+                for entry in discrepancies['conflict_analysis']]
+
+    def test_parallel_matches_serial(self):
+        """Testet, dass die parallele Analyse dieselben Konflikte in derselben Reihenfolge liefert"""
+        code, docs = self._elements(60)
+        serial = AdvancedMatcherEngine(similarity="shingle").find_discrepancies(code, docs)
+        parallel_matcher = AdvancedMatcherEngine(similarity="shingle", workers=2, parallel_min_pairs=0)
+        with mock.patch('src.matcher.advanced_matcher.os.cpu_count', return_value=2):
+            self.assertEqual(parallel_matcher._process_count(), 2)
+            parallel = parallel_matcher.find_discrepancies(code, docs)
+
+        self.assertEqual(len(serial['conflict_analysis']), 60)
+        self.assertEqual(self._summary(parallel), self._summary(serial))
+        self.assertEqual([entry['code'].name for entry in parallel['mismatched_elements']],
+                         [entry['code'].name for entry in serial['mismatched_elements']])
+
+    def test_serial_below_min_pairs(self):
+        """Testet, dass für wenige Paare und workers=1 kein Prozess-Pool gestartet wird"""
+        code, docs = self._elements(5)
+        with mock.patch('src.matcher.advanced_matcher.concurrent.futures.ProcessPoolExecutor') as pool, \
+                mock.patch('src.matcher.advanced_matcher.os.cpu_count', return_value=4):
+            AdvancedMatcherEngine(workers=4, parallel_min_pairs=10).find_discrepancies(code, docs)
+            AdvancedMatcherEngine(workers=1, parallel_min_pairs=0).find_discrepancies(code, docs)
+            pool.assert_not_called()
+            self.assertEqual(AdvancedMatcherEngine(workers=0)._process_count(), 4)
+            self.assertEqual(AdvancedMatcherEngine(workers=16)._process_count(), 4)
+
+    def test_config_workers(self):
+        """Testet die Übernahme der Prozessanzahl aus der Konfiguration"""
+        config = ProjectConfig()
+        self.assertEqual(MatcherEngine(config).advanced_matcher.workers, 1)
+        config.matcher_workers = 0
+        config.matcher_parallel_min_pairs = 50
+        matcher = MatcherEngine(config).advanced_matcher
+        self.assertEqual((matcher.workers, matcher.parallel_min_pairs), (0, 50))
+
+
+class TestIncrementalMatching(unittest.TestCase):
+    """Tests für die inkrementelle Konfliktanalyse mit dem MatchCache"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.code, self.docs = TestParallelConflictAnalysis()._elements(20)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _summary_of(discrepancies, name):
+        """Qualifizierter Name und Konflikttypen eines Elements"""
+        entry = next(entry for entry in discrepancies['conflict_analysis'] if entry['element_name'] == name)
+        return entry['qualified_name'], [conflict['conflict_type'] for conflict in entry['conflict_analysis']]
+
+    def _run(self, code, docs, threshold=None):
+        matcher = AdvancedMatcherEngine(similarity_threshold=threshold)
+        matcher.cache = MatchCache(Path(self.temp_dir), fingerprint=matcher.analysis_fingerprint())
+        try:
+            return matcher.find_discrepancies(code, docs), matcher.last_run_statistics
+        finally:
+            matcher.cache.close()
+
+    def test_cache_dir_is_ignored_by_git(self):
+        """Testet, dass der MatchCache sein Verzeichnis wie der Scan-Cache von Git ausschließt"""
+        cache_dir = Path(self.temp_dir) / ".daut_cache"
+        MatchCache(cache_dir).close()
+        self.assertEqual((cache_dir / ".gitignore").read_text(encoding="utf-8"), CACHE_GITIGNORE)
+
+    def test_unchanged_pairs_are_reused(self):
+        """Testet, dass ein zweiter Lauf ohne Änderungen keine Paare analysiert und dasselbe Ergebnis liefert"""
+        first, stats = self._run(self.code, self.docs)
+        self.assertEqual(stats, {'pairs': 20, 'analyzed': 20, 'reused': 0})
+        second, stats = self._run(self.code, self.docs)
+        self.assertEqual(stats, {'pairs': 20, 'analyzed': 0, 'reused': 20})
+
+        summary = TestParallelConflictAnalysis._summary
+        self.assertEqual(summary(second), summary(first))
+        self.assertEqual(summary(second), summary(AdvancedMatcherEngine().find_discrepancies(self.code, self.docs)))
+
+    def test_changed_side_or_candidate_is_reanalyzed(self):
+        """Testet, dass geänderte Elemente und geänderte Zuordnungen neu analysiert werden"""
+        self._run(self.code, self.docs)
+
+        docs = list(self.docs)
+        docs[3] = docs[3].model_copy(update={'content': "Parameter: value_3, limit\nReturns: int"})
+        code = list(self.code)
+        code[5] = code[5].model_copy(update={'docstring': "Neue Beschreibung"})
+        discrepancies, stats = self._run(code, docs)
+        self.assertEqual(stats['analyzed'], 2)
+        self.assertEqual(self._summary_of(discrepancies, 'func_3'), self._summary_of(
+            AdvancedMatcherEngine().find_discrepancies(code, docs), 'func_3'))
+
+        # Ein neues gleichnamiges Element in der passenden Datei ändert den Kandidaten für func_7
+        docs[7] = docs[7].model_copy(update={'file_path': "docs/extra.md"})
+        self._run(code, docs)
+        code.append(CodeElement(name="func_7", type=ElementType.FUNCTION, file_path="extra.py",
+                                signature="def func_7()"))
+        discrepancies, stats = self._run(code, docs)
+        self.assertEqual(stats['analyzed'], 1)
+        self.assertTrue(self._summary_of(discrepancies, 'func_7')[0].startswith("extra.py::"))
+
+        # Geänderte Einstellungen verwerfen den Cache
+        _, stats = self._run(code, docs, threshold=0.2)
+        self.assertEqual(stats['reused'], 0)
+
+    def test_matcher_engine_opens_cache(self):
+        """Testet, dass MatcherEngine den Cache nur mit Projektpfad und use_match_cache öffnet"""
+        config = ProjectConfig()
+        self.assertIsNone(MatcherEngine(config).match_cache)
+        matcher = MatcherEngine(config, project_path=self.temp_dir)
+        self.assertIsNotNone(matcher.advanced_matcher.cache)
+        matcher.find_discrepancies(self.code, self.docs)
+        matcher.close()
+        self.assertTrue((Path(self.temp_dir) / ".daut_cache" / "match_cache.sqlite").exists())
+        self.assertTrue((Path(self.temp_dir) / ".daut_cache" / "doc_sections.sqlite").exists())
+
+        config.use_match_cache = False
+        self.assertIsNone(MatcherEngine(config, project_path=self.temp_dir).match_cache)
+
+
+class TestFuzzyMatching(unittest.TestCase):
+    """Tests für die unscharfe Zuordnung über den Trigramm-Index"""
+
+    def setUp(self):
+        self.code = [
+            CodeElement(name="MyService", type=ElementType.CLASS, file_path="service.py"),
+            CodeElement(name="install", type=ElementType.FUNCTION, file_path="setup.py"),
+            CodeElement(name="parse_config", type=ElementType.FUNCTION, file_path="config.py"),
+        ]
+
+    def test_headings_link_to_code(self):
+        """Testet, dass Überschriften wie "MyService class" verknüpft werden und die Konfidenz ausgegeben wird"""
+        docs = [DocElement(name=name, type=ElementType.DOC_HEADING, content="Beschreibung")
+                for name in ("MyService class", "parse config function", "Installation")]
+        discrepancies = AdvancedMatcherEngine().find_discrepancies(self.code, docs)
+
+        self.assertEqual([elem.name for elem in discrepancies['undocumented_code']], ["install"])
+        self.assertEqual([elem.name for elem in discrepancies['outdated_documentation']], ["Installation"])
+        fuzzy = {match['doc_name']: match for match in discrepancies['fuzzy_matches']}
+        self.assertEqual(fuzzy["MyService class"]['qualified_name'], "service.py::MyService")
+        self.assertEqual(fuzzy["parse config function"]['element_name'], "parse_config")
+        self.assertTrue(all(0 < match['match_confidence'] < 1 for match in fuzzy.values()))
+
+        exact = AdvancedMatcherEngine(fuzzy_threshold=None).find_discrepancies(self.code, docs)
+        self.assertEqual(len(exact['undocumented_code']), 3)
+        self.assertEqual(exact['fuzzy_matches'], [])
+
+    def test_confidence_in_conflict_output(self):
+        """Testet Trefferstufe und Konfidenz in den Konflikteinträgen"""
+        code = [CodeElement(name="MyService", type=ElementType.CLASS, signature="class MyService", docstring="Dienst")]
+        docs = [DocElement(name="Klasse `MyService`", type=ElementType.DOC_HEADING, content="völlig anderer Text")]
+        entry = AdvancedMatcherEngine().find_discrepancies(code, docs)['conflict_analysis'][0]
+        self.assertEqual(entry['match_level'], MATCH_FUZZY)
+        self.assertAlmostEqual(entry['match_confidence'], 0.85)
+
+    def test_candidates_match_brute_force(self):
+        """Testet, dass die Kandidatensuche über die seltensten Trigramme keine Treffer verliert"""
+        rng = random.Random(5)
+        syllables = ["get", "set", "user", "order", "item", "list", "load", "save", "config", "parse", "data"]
+        names = {"_".join(rng.choice(syllables) for _ in range(rng.randint(1, 3))) for _ in range(400)}
+        index = SymbolIndex(CodeElement(name=name, type=ElementType.FUNCTION) for name in names)
+        for query in ["get user list", "Load config", "orders item", "save_data()", "parse"]:
+            for threshold in (0.5, 0.75):
+                expected = {key for key in index.by_normalized_name
+                            if trigram_similarity(trigrams(fuzzy_key(query)), trigrams(key)) >= threshold}
+                found = {key for _, key in index.fuzzy_candidates(query, threshold, limit=len(names))}
+                self.assertEqual(found, expected, (query, threshold))
+
+
+class TestEmbeddingSimilarity(unittest.TestCase):
+    """Tests für die blockweise Embedding-Ähnlichkeit"""
+
+    def test_blocked_top_k_matches_full_matrix(self):
+        """Testet, dass die blockweise Suche dieselben Kandidaten wie die vollständige Matrix liefert"""
+        rng = np.random.default_rng(3)
+        code, _ = normalize_rows(rng.normal(size=(37, 16)))
+        docs, _ = normalize_rows(rng.normal(size=(53, 16)))
+        full = code @ docs.T
+        expected = np.argsort(-full, axis=1, kind='stable')[:, :4]
+
+        indices, scores, doc_best = blocked_top_k(code, docs, k=4, block_size=10)
+        np.testing.assert_array_equal(indices, expected)
+        np.testing.assert_allclose(scores, np.take_along_axis(full, expected, axis=1), rtol=1e-5)
+        np.testing.assert_allclose(doc_best, full.max(axis=0), rtol=1e-5)
+
+        few_docs, _ = normalize_rows(rng.normal(size=(2, 16)))
+        indices, _, _ = blocked_top_k(code, few_docs, k=4, block_size=10)
+        self.assertEqual(indices.shape, (37, 2))
+
+    def test_zero_vectors_are_ignored(self):
+        """Testet, dass Platzhalter-Nullvektoren nicht normiert und nicht verglichen werden"""
+        normalized, valid = normalize_rows([[3.0, 4.0], [0.0, 0.0]])
+        self.assertEqual(valid.tolist(), [True, False])
+        np.testing.assert_allclose(normalized, [[0.6, 0.8], [0.0, 0.0]])
+
+        code = [CodeElement(name="a", type=ElementType.FUNCTION, file_path="a.py"),
+                CodeElement(name="b", type=ElementType.FUNCTION, file_path="b.py")]
+        docs = [DocElement(name="A", type=ElementType.DOC_HEADING, file_path="README.md")]
+        embeddings = ElementEmbeddings.from_vectors(
+            {element_key("a.py::a", None): [1.0, 0.0], element_key("b.py::b", None): [0.0, 0.0]},
+            {element_key("README.md::A", None): [1.0, 0.0]})
+        result = EmbeddingSimilarity().analyze(code, docs, embeddings)
+        self.assertEqual(result['statistics']['code_vectors'], 1)
+        self.assertEqual([entry['element_name'] for entry in result['top_candidates']], ["a.py::a"])
+
+    def test_matcher_flags_outdated_and_low_similarity(self):
+        """Testet die Embedding-Analyse als Stufe von find_discrepancies"""
+        code = [CodeElement(name="load", type=ElementType.FUNCTION, file_path="io.py", docstring="Lädt"),
+                CodeElement(name="save", type=ElementType.FUNCTION, file_path="io.py", docstring="Speichert")]
+        docs = [DocElement(name="load", type=ElementType.DOC_HEADING, file_path="README.md", content="Lädt"),
+                DocElement(name="save", type=ElementType.DOC_HEADING, file_path="README.md", content="Speichert"),
+                DocElement(name="Altes Kapitel", type=ElementType.DOC_HEADING, file_path="README.md")]
+        embeddings = ElementEmbeddings.from_vectors(
+            {element_key("io.py::load", None): [1.0, 0.0, 0.0], element_key("io.py::save", None): [0.0, 1.0, 0.0]},
+            {element_key("README.md::load", None): [0.9, 0.1, 0.0], element_key("README.md::save", None): [1.0, 0.0, 0.0],
+             element_key("README.md::Altes Kapitel", None): [0.0, 0.0, 1.0]})
+
+        analysis = AdvancedMatcherEngine().find_discrepancies(code, docs, embeddings)['embedding_analysis']
+        self.assertEqual([entry['doc_name'] for entry in analysis['likely_outdated']], ["Altes Kapitel"])
+        self.assertEqual([(entry['element_name'], entry['doc_name']) for entry in analysis['low_similarity_pairs']],
+                         [("io.py::save", "save")])
+        candidates = {entry['element_name']: entry['candidates'] for entry in analysis['top_candidates']}
+        self.assertEqual(candidates["io.py::load"][0]['doc_name'], "save")
+        self.assertEqual(len(candidates["io.py::load"]), 3)
+
+        self.assertNotIn('embedding_analysis', AdvancedMatcherEngine().find_discrepancies(code, docs))
+
+    def test_same_named_methods_keep_their_embeddings(self):
+        """Testet, dass gleichnamige Methoden einer Datei eigene Einträge in ChromaDB erhalten"""
+        temp_dir = Path(tempfile.mkdtemp(prefix="embeddings"))
+        try:
+            client = ChromaDBClient.__new__(ChromaDBClient)
+            client.client = chromadb.EphemeralClient()
+            client.health_check = lambda: True
+            updater = ChromaUpdater.__new__(ChromaUpdater)
+            updater.chroma_client = client
+            updater.ollama_client = mock.Mock()
+            updater.ollama_client.create_embedding.side_effect = \
+                lambda model, content: [1.0, 0.0] if "Reader" in content else [0.0, 1.0]
+            updater.embedding_model = "test"
+            updater._shared_embeddings = {}
+            updater.reused_embeddings = 0
+
+            # Einträge im alten ID-Schema dürfen nicht neben den neuen liegen bleiben
+            code_collection = ChromaUpdater._collection_name(str(temp_dir), "code")
+            client.client.create_collection(code_collection).add(
+                ids=["code_read_service.py"], embeddings=[[0.5, 0.5]],
+                metadatas=[{'name': 'read', 'file_path': 'service.py'}])
+
+            code = [
+                CodeElement(name="Reader", type=ElementType.CLASS, file_path="service.py", line_number=1,
+                            methods=[{'name': 'read'}]),
+                CodeElement(name="read", type=ElementType.FUNCTION, file_path="service.py", line_number=2,
+                            signature="def read(self) # Reader"),
+                CodeElement(name="Writer", type=ElementType.CLASS, file_path="service.py", line_number=5,
+                            methods=[{'name': 'read'}]),
+                CodeElement(name="read", type=ElementType.FUNCTION, file_path="service.py", line_number=6)
+            ]
+            docs = [DocElement(name="read", type=ElementType.DOC_HEADING, file_path="service.md", line_number=3)]
+            self.assertTrue(updater.update_chroma_with_elements(code, docs, str(temp_dir)))
+
+            ids = client.client.get_collection(code_collection).get()['ids']
+            self.assertEqual(sorted(ids), ["code_service.py::Reader.read:2", "code_service.py::Reader:1",
+                                           "code_service.py::Writer.read:6", "code_service.py::Writer:5"])
+            embeddings = updater.load_element_embeddings(str(temp_dir))
+            vectors = dict(zip(embeddings.code_keys, embeddings.code_vectors.tolist()))
+            self.assertEqual(vectors[("service.py::Reader.read", 2)], [1.0, 0.0])
+            self.assertEqual(vectors[("service.py::Writer.read", 6)], [0.0, 1.0])
+            self.assertEqual(embeddings.doc_keys, [("service.md::read", 3)])
+
+            analysis = EmbeddingSimilarity().analyze(code, docs, embeddings)
+            self.assertEqual(analysis['statistics']['code_vectors'], 4)
+        finally:
+            for suffix in ("code", "docs"):
+                try:
+                    client.client.delete_collection(ChromaUpdater._collection_name(str(temp_dir), suffix))
+                except Exception:
+                    pass
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestDocSections(unittest.TestCase):
+    """Tests für die einmal geparsten Dokumentationsabschnitte"""
+
+    DOC = ("Lädt die Konfiguration aus einer Datei.\n"
+           "\n"
+           "| Parameter | Typ | Beschreibung |\n"
+           "|-----------|-----|--------------|\n"
+           "| `path` | str | Pfad der Datei |\n"
+           "| strict | bool | Fehler bei unbekannten Schlüsseln |\n"
+           "\n"
+           "Returns: dict\n"
+           "```python\n"
+           "load_config(path='x', args=None)\n"
+           "```\n"
+           ">>> load_config('a.toml')")
+
+    def test_parse_sections(self):
+        """Testet Beschreibung, Parametertabelle, Rückgabetyp und Beispiele"""
+        sections = parse_doc_sections(self.DOC)
+        self.assertEqual(sections.parameters, ["path", "strict"])
+        self.assertEqual(sections.return_type, "dict")
+        self.assertEqual(sections.examples, ["load_config(path='x', args=None)", "load_config('a.toml')"])
+        self.assertEqual(sections.description, "Lädt die Konfiguration aus einer Datei.")
+
+        inline = parse_doc_sections("Parameter: value_3, limit\nReturns: int")
+        self.assertEqual((inline.parameters, inline.return_type, inline.description), (["value_3", "limit"], "int", ""))
+        self.assertEqual(parse_doc_sections("").return_type, "unknown")
+
+    def test_same_content_is_parsed_once(self):
+        """Testet, dass gleicher Dokumentationsinhalt für alle Paare und Analysen nur einmal geparst wird"""
+        code = [CodeElement(name=f"load_{i}", type=ElementType.FUNCTION, return_type="list",
+                            parameters=[{'name': "path"}], docstring="Lädt etwas") for i in range(5)]
+        docs = [DocElement(name=f"load_{i}", type=ElementType.DOC_HEADING, content=self.DOC) for i in range(5)]
+        with mock.patch('src.matcher.doc_sections.parse_doc_sections', wraps=parse_doc_sections) as parser:
+            matcher = AdvancedMatcherEngine()
+            discrepancies = matcher.find_discrepancies(code, docs)
+        self.assertEqual(parser.call_count, 1)
+        self.assertEqual(matcher.doc_sections.get_statistics(), {'sections_reused': 4, 'sections_parsed': 1})
+        conflicts = discrepancies['conflict_analysis'][0]['conflict_analysis']
+        parameter_conflict = next(c for c in conflicts if c['conflict_type'] == 'mismatched_parameters')
+        self.assertEqual(parameter_conflict['details']['extra_in_doc'], ["strict"])
+        return_conflict = next(c for c in conflicts if c['conflict_type'] == 'mismatched_return_type')
+        self.assertEqual(return_conflict['details']['doc_return_type'], "dict")
+
+    def test_cache_dir_is_ignored_by_git(self):
+        """Testet, dass der DocSectionCache sein Verzeichnis wie der Scan-Cache von Git ausschließt"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            cache_dir = Path(temp_dir) / ".daut_cache"
+            DocSectionCache(cache_dir).close()
+            self.assertEqual((cache_dir / ".gitignore").read_text(encoding="utf-8"), CACHE_GITIGNORE)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_sections_persist_across_runs(self):
+        """Testet die Wiederverwendung gespeicherter Abschnitte in einem späteren Lauf"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            cache = DocSectionCache(Path(temp_dir))
+            first = cache.get(self.DOC)
+            cache.close()
+
+            cache = DocSectionCache(Path(temp_dir))
+            with mock.patch('src.matcher.doc_sections.parse_doc_sections') as parser:
+                self.assertEqual(cache.get(self.DOC), first)
+            parser.assert_not_called()
+            cache.close()
+
+            with mock.patch('src.matcher.doc_sections.PARSER_VERSION', 99):
+                cache = DocSectionCache(Path(temp_dir))
+                cache.get(self.DOC)
+                self.assertEqual(cache.parsed, 1)
+                cache.close()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()